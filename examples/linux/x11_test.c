@@ -3,7 +3,10 @@
 // for details.
 
 // This will create a window and print out the X11 keycode and corresponding HID
-// keycode and name for every key down event.
+// keycode and name for every key down event. If a file is given on the command
+// line, every key down and key up event is also recorded to that file, which
+// can be read with python/keycode_rec.py.
+#include "keycode_rec.h"
 #include "keytable.h"
 
 #include <X11/Xlib.h>
@@ -11,7 +14,23 @@
 #include <stdlib.h>
 #include <unistd.h>
 
+// The recording, if record is nonzero.
+static struct keycode_rec rec;
+static int record;
+
+static void record_key(XKeyEvent *e, unsigned value) {
+    if (!record) {
+        return;
+    }
+    unsigned keycode = e->keycode - KEYCODE_EVDEV_OFFSET;
+    // X11 event times are in milliseconds.
+    keycode_rec_event(&rec, e->time / 1000, (e->time % 1000) * 1000,
+                      keycode_linux_to_hid(keycode), value, KEYCODE_REC_LINUX,
+                      keycode);
+}
+
 static void key_press(XKeyEvent *e) {
+    record_key(e, KEYCODE_REC_PRESS);
     printf("Key Press:\n");
     unsigned keycode = e->keycode - KEYCODE_EVDEV_OFFSET;
     const char *keyname = keycode_linux_rawname(keycode);
@@ -31,8 +50,17 @@ static void key_press(XKeyEvent *e) {
 }
 
 int main(int argc, char **argv) {
-    (void)argc;
-    (void)argv;
+    if (argc > 2) {
+        fprintf(stderr, "usage: x11_test [recording]\n");
+        exit(1);
+    }
+    if (argc == 2) {
+        if (keycode_rec_open(&rec, argv[1]) != KEYCODE_REC_OK) {
+            perror(argv[1]);
+            exit(1);
+        }
+        record = 1;
+    }
     Display *dpy = XOpenDisplay(NULL);
     if (!dpy) {
         fprintf(stderr, "error: unable to open display '%s'\n",
@@ -48,7 +76,8 @@ int main(int argc, char **argv) {
     Window win = XCreateSimpleWindow(dpy, RootWindow(dpy, screen), 0, 0, width,
                                      height, 0, white_color, white_color);
 
-    long event_mask = KeyPressMask | StructureNotifyMask | ExposureMask;
+    long event_mask =
+        KeyPressMask | KeyReleaseMask | StructureNotifyMask | ExposureMask;
     XSelectInput(dpy, win, event_mask);
     XMapWindow(dpy, win);
     Atom wm_protocols = XInternAtom(dpy, "WM_PROTOCOLS", False);
@@ -87,10 +116,18 @@ int main(int argc, char **argv) {
         case KeyPress:
             key_press(&e.xkey);
             break;
+
+        case KeyRelease:
+            record_key(&e.xkey, KEYCODE_REC_RELEASE);
+            break;
         }
     }
 done:
 
     XCloseDisplay(dpy);
+    if (record && keycode_rec_close(&rec) != KEYCODE_REC_OK) {
+        perror(argv[1]);
+        return 1;
+    }
     return 0;
 }
@@ -1,10 +1,33 @@
 // Copyright 2019 Dietrich Epp.
 // This file is licensed under the terms of the MIT license. See LICENSE.txt
 // for details.
+
+// This will create a window and show the macOS keycode and corresponding HID
+// keycode and name for every key down event. If the KEYCODE_RECORD environment
+// variable is set, every key event is also recorded to the file it names, which
+// can be read with python/keycode_rec.py.
+#import "keycode_rec.h"
 #import "keytable.h"
 
 #import <Cocoa/Cocoa.h>
 
+// The recording, if gRecord is nonzero.
+static struct keycode_rec gRec;
+static int gRecord;
+
+static void recordKey(NSEvent *event, unsigned value) {
+    if (!gRecord) {
+        return;
+    }
+    unsigned keyCode = [event keyCode];
+    // Event timestamps are in seconds.
+    NSTimeInterval time = [event timestamp];
+    unsigned long sec = (unsigned long)time;
+    unsigned long usec = (unsigned long)((time - sec) * 1e6);
+    keycode_rec_event(&gRec, sec, usec, keycode_macos_to_hid(keyCode), value,
+                      KEYCODE_REC_MACOS, keyCode);
+}
+
 @interface KCApplicationDelegate : NSObject
 @end
 
@@ -12,6 +35,14 @@
 - (BOOL)applicationShouldTerminateAfterLastWindowClosed:(NSApplication *)theApplication {
     return YES;
 }
+- (void)applicationWillTerminate:(NSNotification *)notification {
+    if (gRecord) {
+        gRecord = 0;
+        if (keycode_rec_close(&gRec) != KEYCODE_REC_OK) {
+            NSLog(@"Could not write recording");
+        }
+    }
+}
 @end
 
 @interface KCView : NSView
@@ -34,10 +65,15 @@
     _hidKeyCode.stringValue = [NSString stringWithFormat:@"0x%02x (%s)", hidCode, hidName];
 }
 - (void)keyDown:(NSEvent *)event {
+    recordKey(event,
+              [event isARepeat] ? KEYCODE_REC_REPEAT : KEYCODE_REC_PRESS);
     unsigned keyCode = [event keyCode];
     unsigned hidCode = keycode_macos_to_hid(keyCode);
     [self showKey:keyCode hidCode:hidCode];
 }
+- (void)keyUp:(NSEvent *)event {
+    recordKey(event, KEYCODE_REC_RELEASE);
+}
 - (void)flagsChanged:(NSEvent *)event {
     unsigned keyCode = [event keyCode];
     unsigned hidCode = keycode_macos_to_hid(keyCode);
@@ -45,7 +81,10 @@
     unsigned modifiers = [event modifierFlags];
     if ((mask & modifiers) != 0) {
         // Key down.
+        recordKey(event, KEYCODE_REC_PRESS);
         [self showKey:keyCode hidCode:hidCode];
+    } else {
+        recordKey(event, KEYCODE_REC_RELEASE);
     }
 }
 - (BOOL)acceptsFirstResponder {
@@ -54,5 +93,13 @@
 @end
 
 int main(int argc, const char *argv[]) {
+    const char *path = getenv("KEYCODE_RECORD");
+    if (path != NULL && *path != '\0') {
+        if (keycode_rec_open(&gRec, path) != KEYCODE_REC_OK) {
+            perror(path);
+            return 1;
+        }
+        gRecord = 1;
+    }
     return NSApplicationMain(argc, argv);
 }
@@ -1,6 +1,12 @@
 // Copyright 2019 Dietrich Epp.
 // This file is licensed under the terms of the MIT license. See LICENSE.txt
 // for details.
+
+// This will create a window and show the Windows keycode and corresponding HID
+// keycode and name for every key event. If a file is given on the command line,
+// every key event is also recorded to that file, which can be read with
+// python/keycode_rec.py.
+#include "keycode_rec.h"
 #include "keytable.h"
 
 #define WIN32_LEAN_AND_MEAN
@@ -17,13 +23,57 @@ static wchar_t gLine1[64], gLine2[64];
 // Whether the alt buttons are pressed.
 static int gAlt[2];
 
+// The recording, if gRecord is nonzero.
+static struct keycode_rec gRec;
+static int gRecord;
+
 static void die(const wchar_t *msg) {
     MessageBoxW(NULL, msg, L"Error", MB_ICONEXCLAMATION | MB_OK);
     ExitProcess(1);
 }
 
+static void start_recording(const wchar_t *path) {
+    FILE *fp;
+    if (_wfopen_s(&fp, path, L"wb") != 0 ||
+        keycode_rec_init(&gRec, fp) != KEYCODE_REC_OK) {
+        die(L"Could not create recording.");
+    }
+    gRecord = 1;
+}
+
+static void finish_recording(void) {
+    if (!gRecord) {
+        return;
+    }
+    gRecord = 0;
+    if (keycode_rec_close(&gRec) != KEYCODE_REC_OK) {
+        die(L"Could not write recording.");
+    }
+}
+
+static void record_key(UINT msg, LPARAM lParam, unsigned keyCode) {
+    if (!gRecord) {
+        return;
+    }
+    unsigned value;
+    if (msg == WM_KEYUP || msg == WM_SYSKEYUP) {
+        value = KEYCODE_REC_RELEASE;
+    } else if ((lParam & (1 << 30)) != 0) {
+        // The key was already down.
+        value = KEYCODE_REC_REPEAT;
+    } else {
+        value = KEYCODE_REC_PRESS;
+    }
+    // Message times are in milliseconds.
+    DWORD time = (DWORD)GetMessageTime();
+    keycode_rec_event(&gRec, time / 1000, (time % 1000) * 1000,
+                      keycode_windows_to_hid(keyCode), value,
+                      KEYCODE_REC_WINDOWS, keyCode);
+}
+
 static void handle_key(HWND hwnd, UINT msg, WPARAM wParam, LPARAM lParam) {
     unsigned keyCode = keycode_windows_from_lparam(lParam);
+    record_key(msg, lParam, keyCode);
     const char *keyName = keycode_windows_rawname(keyCode);
     if (keyName == NULL) {
         keyName = "unknown";
@@ -57,6 +107,7 @@ LRESULT CALLBACK wnd_proc(HWND hwnd, UINT msg, WPARAM wParam, LPARAM lParam) {
         break;
     case WM_SYSKEYDOWN:
         if (wParam == VK_F4 && GetKeyState(VK_MENU)) {
+            finish_recording();
             ExitProcess(0);
         }
         handle_key(hwnd, msg, wParam, lParam);
@@ -68,6 +119,7 @@ LRESULT CALLBACK wnd_proc(HWND hwnd, UINT msg, WPARAM wParam, LPARAM lParam) {
         DestroyWindow(hwnd);
         break;
     case WM_DESTROY:
+        finish_recording();
         PostQuitMessage(0);
         break;
     default:
@@ -105,7 +157,9 @@ static HWND create_window(HINSTANCE hInstance) {
 int APIENTRY wWinMain(HINSTANCE hInstance, HINSTANCE hPrevInstance,
                       LPWSTR lpCmdLine, int nCmdShow) {
     UNREFERENCED_PARAMETER(hPrevInstance);
-    UNREFERENCED_PARAMETER(lpCmdLine);
+    if (lpCmdLine[0] != L'\0') {
+        start_recording(lpCmdLine);
+    }
     HWND hwnd = create_window(hInstance);
 
     ShowWindow(hwnd, nCmdShow);
@@ -0,0 +1,659 @@
+# This file is automatically generated.
+"""Keycode translation tables.
+
+HID keycodes are portable, and correspond to locations on the keyboard. This
+module translates between HID keycodes and platform-specific keycodes, and
+provides names for keycodes. It is the Python equivalent of keytable.h.
+"""
+import sys
+
+# Indicates that a platform-specific keycode does not exist, in tables which
+# translate HID keycodes to platform-specific keycodes.
+KEYCODE_NONE = 255
+
+# Linux keycodes are offset by this amount when they are sent by evdev.
+KEYCODE_EVDEV_OFFSET = 8
+
+# Zero, does not correspond to any key.
+KEY_None = 0
+
+# Keycode definitions.
+KEY_A = 4
+KEY_B = 5
+KEY_C = 6
+KEY_D = 7
+KEY_E = 8
+KEY_F = 9
+KEY_G = 10
+KEY_H = 11
+KEY_I = 12
+KEY_J = 13
+KEY_K = 14
+KEY_L = 15
+KEY_M = 16
+KEY_N = 17
+KEY_O = 18
+KEY_P = 19
+KEY_Q = 20
+KEY_R = 21
+KEY_S = 22
+KEY_T = 23
+KEY_U = 24
+KEY_V = 25
+KEY_W = 26
+KEY_X = 27
+KEY_Y = 28
+KEY_Z = 29
+KEY_1 = 30
+KEY_2 = 31
+KEY_3 = 32
+KEY_4 = 33
+KEY_5 = 34
+KEY_6 = 35
+KEY_7 = 36
+KEY_8 = 37
+KEY_9 = 38
+KEY_0 = 39
+KEY_Escape = 41
+KEY_Delete = 42
+KEY_Tab = 43
+KEY_Space = 44
+KEY_Minus = 45
+KEY_Equals = 46
+KEY_LeftBracket = 47
+KEY_RightBracket = 48
+KEY_Backslash = 49
+KEY_Semicolon = 51
+KEY_Quote = 52
+KEY_Grave = 53
+KEY_Comma = 54
+KEY_Period = 55
+KEY_Slash = 56
+KEY_CapsLock = 57
+KEY_F1 = 58
+KEY_F2 = 59
+KEY_F3 = 60
+KEY_F4 = 61
+KEY_F5 = 62
+KEY_F6 = 63
+KEY_F7 = 64
+KEY_F8 = 65
+KEY_F9 = 66
+KEY_F10 = 67
+KEY_F11 = 68
+KEY_F12 = 69
+KEY_PrintScreen = 70
+KEY_ScrollLock = 71
+KEY_Pause = 72
+KEY_Insert = 73
+KEY_Home = 74
+KEY_PageUp = 75
+KEY_DeleteForward = 76
+KEY_End = 77
+KEY_PageDown = 78
+KEY_Right = 79
+KEY_Left = 80
+KEY_Down = 81
+KEY_Up = 82
+KP_NumLock = 83
+KP_Divide = 84
+KP_Multiply = 85
+KP_Subtract = 86
+KP_Add = 87
+KP_Enter = 88
+KP_1 = 89
+KP_2 = 90
+KP_3 = 91
+KP_4 = 92
+KP_5 = 93
+KP_6 = 94
+KP_7 = 95
+KP_8 = 96
+KP_9 = 97
+KP_0 = 98
+KP_Point = 99
+KEY_NonUSBackslash = 100
+KP_Equals = 103
+KEY_F13 = 104
+KEY_F14 = 105
+KEY_F15 = 106
+KEY_F16 = 107
+KEY_F17 = 108
+KEY_F18 = 109
+KEY_F19 = 110
+KEY_F20 = 111
+KEY_F21 = 112
+KEY_F22 = 113
+KEY_F23 = 114
+KEY_F24 = 115
+KEY_Help = 117
+KEY_Menu = 118
+KEY_Mute = 127
+KEY_SysReq = 154
+KEY_Return = 158
+KP_Clear = 216
+KP_Decimal = 220
+KEY_LeftControl = 224
+KEY_LeftShift = 225
+KEY_LeftAlt = 226
+KEY_LeftGUI = 227
+KEY_RightControl = 228
+KEY_RightShift = 229
+KEY_RightAlt = 230
+KEY_RightGUI = 231
+
+
+def _array(typecode, data):
+    """Create an array from little-endian data, without copying if possible."""
+    if sys.byteorder == "little":
+        return memoryview(data).cast(typecode)
+    import array
+    result = array.array(typecode)
+    result.frombytes(data)
+    result.byteswap()
+    return result
+
+
+def _string(data, offset):
+    """Get the NUL-terminated string at the given offset."""
+    if not offset:
+        return None
+    return data[offset:data.index(0, offset)].decode("UTF-8")
+
+
+_TO_ID_DATA = (
+    b"\0A\0B\0C\0CapsLock\0Comma\0D\0Delete\0DeleteForward\0E\0End\0Escape\0F"
+    b"\0F1\0F10\0F11\0F12\0F13\0F14\0F15\0F16\0F17\0F18\0F19\0F2\0F20\0F21\0F2"
+    b"2\0F23\0F24\0F3\0F4\0F5\0F6\0F7\0F8\0F9\0G\0Grave\0H\0Help\0Home\0Insert"
+    b"\0J\0K\0KP0\0KP1\0KP2\0KP3\0KP4\0KP5\0KP6\0KP7\0KP8\0KP9\0KPAdd\0KPClear"
+    b"\0KPDecimal\0KPDivide\0KPEnter\0KPEquals\0KPMultiply\0KPNumLock\0KPPoint"
+    b"\0KPSubtract\0L\0Left\0LeftAlt\0LeftBracket\0LeftControl\0LeftGUI\0LeftS"
+    b"hift\0M\0Menu\0Minus\0Mute\0N\0NonUSBackslash\0O\0P\0PageDown\0PageUp\0P"
+    b"ause\0Period\0PrintScreen\0Q\0Quote\0R\0Return\0Right\0RightAlt\0RightBr"
+    b"acket\0RightControl\0RightGUI\0RightShift\0S\0ScrollLock\0Semicolon\0Sla"
+    b"sh\0Space\0SysReq\0T\0Tab\0U\0V\0W\0X\0Y\0Z\0")
+_TO_ID_OFFSET = _array("H", (
+    b"\0\0\0\0\0\0\0\0\001\0\003\0\005\0\026\0-\0:\0\223\0\233\0a\001\256\0"
+    b"\260\0004\001m\001\177\001\220\001\222\001\275\001\305\001\013\0025\002;"
+    b"\002=\002?\002A\002C\002E\002E\0I\0M\0Q\0U\0Y\0]\0a\0e\0A\0\0\0003\0\030"
+    b"\0007\002(\002t\001\005\001C\001\335\001\206\001\0\0\030\002\277\001\225"
+    b"\0\020\0\252\001\"\002\007\0<\0g\0~\0\201\0\204\0\207\0\212\0\215\0\220"
+    b"\0?\0C\0G\0\261\001\015\002\244\001\247\0\242\0\235\001\037\0/\0\224\001"
+    b"\316\0016\001\230\001\241\001\027\001\362\0\014\001)\001\332\0\373\0\266"
+    b"\0\272\0\276\0\302\0\306\0\312\0\316\0\322\0\326\0\262\0!\001\201\001\0"
+    b"\0\0\0\003\001K\0O\0S\0W\0[\0_\0c\0j\0n\0r\0v\0z\0\0\0\235\0o\001\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0z\001\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0.\002\0"
+    b"\0\0\0\0\0\307\001\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\340\0\0\0\0\0\0\0\350\0\0\0\0\0\0\0O\001c"
+    b"\001;\001[\001\352\001\0\002\324\001\367\001"))
+
+
+def to_id(keycode):
+    """Get the identifier for an HID keycode, or None."""
+    if 0 <= keycode < 232:
+        return _string(_TO_ID_DATA, _TO_ID_OFFSET[keycode])
+    return None
+
+
+_ID_SEED = 0
+_ID_MAXLEN = 14
+_ID_DISPLACEMENT = _array("B", (
+    b"\005\003\012\002\010\002\005\001\0\0\007\002\003\0\003\0\002\015\0\0\0"
+    b"\002\002\001\025\0\002\005\026\011\003 \014\011\002\002\016\014\0\004"
+    b"\013\001\006\010\025\0\016\0\004\012\001H\001\271\001Fz1\001\001\002\0"))
+_ID_SLOT = _array("B", (
+    b"K3h-`\346\035\020\330a\236\030D,rop\012H\017 [\026/\334V;\025\031Au\347^"
+    b"Z:jJ\032+S1\\5Fc$>\022%=\3419\011Y!\344C\027.Bdn7&i\232\343<\021IOE\023"
+    b"\345@\"\0150Xks#\006gT\0344'l6]\004U\340N\024qM\177R_\033\010)\007\005*"
+    b"\3428?G\016\014W\013LP\037mvQb\036"))
+
+
+def from_id(ident):
+    """Look up an HID keycode by its identifier.
+
+    Returns 0 if no keycode has the given identifier. Lookup is case
+    insensitive.
+    """
+    try:
+        data = ident.encode("ASCII").lower()
+    except UnicodeEncodeError:
+        return 0
+    if len(data) > _ID_MAXLEN:
+        return 0
+    h = 2166136261 ^ _ID_SEED
+    for c in data:
+        h = ((h ^ c) * 16777619) & 0xffffffff
+    h ^= _ID_DISPLACEMENT[h % 62]
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & 0xffffffff
+    h ^= h >> 13
+    h = (h * 0xc2b2ae35) & 0xffffffff
+    h ^= h >> 16
+    code = _ID_SLOT[h % 123]
+    name = to_id(code)
+    if name is None or name.lower().encode("ASCII") != data:
+        return 0
+    return code
+
+
+# Mapping from Linux keycodes to HID keycodes.
+# KEY_None (0) indicates no mapping.
+LINUX_TO_HID = (
+    b"\0)\036\037 !\"#$%&'-.*+\024\032\010\025\027\034\030\014\022\023/0\236"
+    b"\340\004\026\007\011\012\013\015\016\017345\3411\035\033\006\031\005\021"
+    b"\020678\345U\342,9:;<=>?@ABCSG_`aV\\]^WYZ[bc\0\0dDE\0\0\0\0\0\0\0X\344T"
+    b"\232\346\0JRKPOMQNIL\0\0\0\0\0g\0H\0\0\0\0\0\343\347\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0v\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0hijklmnopqrs\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0")
+
+# Mapping from HID keycodes to Linux keycodes.
+# KEYCODE_NONE (255) indicates no mapping.
+LINUX_FROM_HID = (
+    b"\377\377\377\377\0360. \022!\"#\027$%&21\030\031\020\023\037\024\026/"
+    b"\021-\025,\002\003\004\005\006\007\010\011\012\013\377\001\016\0179\014"
+    b"\015\032\033+\377'()345:;<=>?@ABCDWX\377FwnfhokmjilgEb7JN`OPQKLMGHIRSV"
+    b"\377\377u\267\270\271\272\273\274\275\276\277\300\301\302\377\377\213"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377c"
+    b"\377\377\377\034\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\035*8}a6d~"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377")
+
+
+def linux_to_hid(scancode):
+    """Get the HID keycode for the given Linux keycode.
+
+    Returns KEY_None (0) if the keycode is not mapped to an HID keycode.
+    """
+    if 0 <= scancode < 768:
+        return LINUX_TO_HID[scancode]
+    return 0
+
+
+_LINUX_NAME_DATA = (
+    b"\0'\0,\0;\0A\0B\0Backspace\0C\0Caps Lock\0D\0Delete\0E\0End\0Escape\0F\0"
+    b"F1\0F10\0F11\0F12\0F13\0F14\0F15\0F16\0F17\0F18\0F19\0F2\0F20\0F21\0F22"
+    b"\0F23\0F24\0F3\0F4\0F5\0F6\0F7\0F8\0F9\0G\0H\0Home\0I\0Insert\0J\0K\0KP "
+    b"*\0KP +\0KP -\0KP .\0KP /\0KP 0\0KP 1\0KP 2\0KP 3\0KP 4\0KP 5\0KP 6\0KP "
+    b"7\0KP 8\0KP 9\0KP =\0KP Enter\0KP NumLock\0L\0Left\0Left Alt\0Left Contr"
+    b"ol\0Left Shift\0Left Super\0M\0Menu\0N\0Non-US \\\0O\0P\0Page Down\0Page"
+    b" Up\0Pause\0Q\0R\0Right\0Right Alt\0Right Control\0Right Shift\0Right Su"
+    b"per\0S\0Scroll Lock\0Space\0SysReq/Attention\0T\0Tab\0U\0V\0W\0X\0Y\0Z\0"
+    b"[\0]\0`\0")
+_LINUX_NAME_OFFSET = _array("H", (
+    b"\0\0\0\0\0\0\0\0\007\0\011\0\025\0!\0*\0007\0\220\0\222\0\231\0\242\0"
+    b"\244\0\012\001=\001D\001O\001Q\001k\001m\001\245\001\312\001\320\001\322"
+    b"\001\324\001\326\001\330\001\332\001\307\0\314\0\321\0\326\0\333\0\340\0"
+    b"\345\0\352\0\357\0\302\0\0\0000\0\013\0\314\001\263\001\263\0\364\0\334"
+    b"\001\336\001M\001\0\0\005\0\001\0\340\001\003\0\270\0\275\0\027\09\0d\0{"
+    b"\0~\0\201\0\204\0\207\0\212\0\215\0<\0@\0D\0\0\0\247\001e\001\233\0\224"
+    b"\0]\001#\0,\0S\001o\001\014\001X\001b\001\377\0\272\0\246\0\260\0\253\0"
+    b"\366\0\304\0\311\0\316\0\323\0\330\0\335\0\342\0\347\0\354\0\277\0\265\0"
+    b"F\001\0\0\0\0\361\0H\0L\0P\0T\0X\0\\\0`\0g\0k\0o\0s\0w\0\0\0\0\0?\001\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\271"
+    b"\001\0\0\0\0\0\0\371\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\032"
+    b"\001'\001\021\0012\001\177\001\215\001u\001\231\001"))
+
+
+def linux_name(keycode):
+    """Get the display name for an HID keycode on Linux."""
+    if 0 <= keycode < 232:
+        return _string(_LINUX_NAME_DATA, _LINUX_NAME_OFFSET[keycode])
+    return None
+
+
+_LINUX_RAWNAME_DATA = (
+    b"\000102ND\00010CHANNELSDOWN\00010CHANNELSUP\0003D_MODE\0ADDRESSBOOK\0AGA"
+    b"IN\0ALS_TOGGLE\0ALTERASE\0ANGLE\0APOSTROPHE\0APPSELECT\0ARCHIVE\0ASSISTA"
+    b"NT\0ATTENDANT_OFF\0ATTENDANT_ON\0ATTENDANT_TOGGLE\0AUDIO\0AUDIO_DESC\0AU"
+    b"X\0BACKSLASH\0BACKSPACE\0BASSBOOST\0BATTERY\0BLUE\0BLUETOOTH\0BOOKMARKS"
+    b"\0BREAK\0BRIGHTNESSDOWN\0BRIGHTNESSUP\0BRIGHTNESS_AUTO\0BRIGHTNESS_CYCLE"
+    b"\0BRIGHTNESS_MAX\0BRIGHTNESS_MIN\0BRL_DOT1\0BRL_DOT10\0BRL_DOT2\0BRL_DOT"
+    b"3\0BRL_DOT4\0BRL_DOT5\0BRL_DOT6\0BRL_DOT7\0BRL_DOT8\0BRL_DOT9\0BUTTONCON"
+    b"FIG\0CALC\0CALENDAR\0CAMERA\0CAMERA_DOWN\0CAMERA_FOCUS\0CAMERA_LEFT\0CAM"
+    b"ERA_RIGHT\0CAMERA_UP\0CAMERA_ZOOMIN\0CAMERA_ZOOMOUT\0CAPSLOCK\0CHANNEL\0"
+    b"CHANNELDOWN\0CHANNELUP\0CHAT\0CLEAR\0CLOSE\0COFFEE\0COMPOSE\0COMPUTER\0C"
+    b"ONNECT\0CONTEXT_MENU\0CONTROLPANEL\0COPY\0CUT\0CYCLEWINDOWS\0DASHBOARD\0"
+    b"DATA\0DATABASE\0DELETE\0DELETEFILE\0DEL_EOL\0DEL_EOS\0DEL_LINE\0DIGITS\0"
+    b"DIRECTORY\0DISPLAYTOGGLE\0DISPLAY_OFF\0DOCUMENTS\0DOLLAR\0DVD\0EDIT\0EJE"
+    b"CTCD\0EJECTCLOSECD\0EPG\0EURO\0EXIT\0F13\0F14\0F15\0F16\0F17\0F18\0F19\0"
+    b"F20\0F21\0F22\0F23\0F24\0FASTFORWARD\0FASTREVERSE\0FAVORITES\0FINANCE\0F"
+    b"IND\0FIRST\0FN\0FN_1\0FN_2\0FN_B\0FN_D\0FN_E\0FN_ESC\0FN_F\0FN_F1\0FN_F1"
+    b"0\0FN_F11\0FN_F12\0FN_F2\0FN_F3\0FN_F4\0FN_F5\0FN_F6\0FN_F7\0FN_F8\0FN_F"
+    b"9\0FN_S\0FORWARDMAIL\0FRAMEBACK\0FRAMEFORWARD\0FRONT\0GAMES\0GOTO\0GRAPH"
+    b"ICSEDITOR\0GRAVE\0GREEN\0HANGEUL\0HANJA\0HELP\0HOME\0HOMEPAGE\0I\0IMAGES"
+    b"\0INFO\0INSERT\0INS_LINE\0ISO\0J\0JOURNAL\0KATAKANA\0KATAKANAHIRAGANA\0K"
+    b"BDILLUMDOWN\0KBDILLUMTOGGLE\0KBDILLUMUP\0KBDINPUTASSIST_ACCEPT\0KBDINPUT"
+    b"ASSIST_CANCEL\0KBDINPUTASSIST_NEXT\0KBDINPUTASSIST_NEXTGROUP\0KBDINPUTAS"
+    b"SIST_PREV\0KBDINPUTASSIST_PREVGROUP\0KP0\0KP1\0KP2\0KP3\0KP4\0KP5\0KP6\0"
+    b"KP7\0KP8\0KP9\0KPASTERISK\0KPCOMMA\0KPDOT\0KPENTER\0KPEQUAL\0KPJPCOMMA\0"
+    b"KPLEFTPAREN\0KPMINUS\0KPPLUS\0KPPLUSMINUS\0KPRIGHTPAREN\0KPSLASH\0LANGUA"
+    b"GE\0LAST\0LEFTALT\0LEFTBRACE\0LEFTCTRL\0LEFTMETA\0LEFTSHIFT\0LEFT_DOWN\0"
+    b"LEFT_UP\0LIGHTS_TOGGLE\0LINEFEED\0LIST\0LOGOFF\0MACRO\0MEDIA\0MEDIA_REPE"
+    b"AT\0MEDIA_TOP_MENU\0MEMO\0MESSENGER\0MHP\0MICMUTE\0MOVE\0MP3\0MSDOS\0MUH"
+    b"ENKAN\0NEW\0NEWS\0NEXTSONG\0NEXT_FAVORITE\0NUMERIC_0\0NUMERIC_1\0NUMERIC"
+    b"_11\0NUMERIC_12\0NUMERIC_2\0NUMERIC_3\0NUMERIC_4\0NUMERIC_5\0NUMERIC_6\0"
+    b"NUMERIC_7\0NUMERIC_8\0NUMERIC_9\0NUMERIC_A\0NUMERIC_B\0NUMERIC_C\0NUMERI"
+    b"C_D\0NUMERIC_POUND\0NUMERIC_STAR\0NUMLOCK\0ONSCREEN_KEYBOARD\0OPEN\0OPTI"
+    b"ON\0PAGEDOWN\0PAGEUP\0PASTE\0PAUSECD\0PAUSE_RECORD\0PC\0PLAYCD\0PLAYER\0"
+    b"PLAYPAUSE\0POWER\0POWER2\0PRESENTATION\0PREVIOUS\0PREVIOUSSONG\0PRINT\0P"
+    b"ROG1\0PROG2\0PROG3\0PROG4\0PROGRAM\0PROPS\0PVR\0QUESTION\0RADIO\0RED\0RE"
+    b"DO\0REFRESH\0REPLY\0RESERVED\0RESTART\0REWIND\0RFKILL\0RIGHTALT\0RIGHTBR"
+    b"ACE\0RIGHTCTRL\0RIGHTMETA\0RIGHTSHIFT\0RIGHT_DOWN\0RIGHT_UP\0ROOT_MENU\0"
+    b"ROTATE_DISPLAY\0ROTATE_LOCK_TOGGLE\0SAT\0SAT2\0SAVE\0SCALE\0SCREEN\0SCRE"
+    b"ENSAVER\0SCROLLDOWN\0SCROLLLOCK\0SCROLLUP\0SEARCH\0SEMICOLON\0SEND\0SEND"
+    b"FILE\0SETUP\0SHOP\0SHUFFLE\0SLEEP\0SLOW\0SLOWREVERSE\0SOUND\0SPELLCHECK"
+    b"\0SPORT\0SPREADSHEET\0STOP\0STOPCD\0STOP_RECORD\0SUBTITLE\0SUSPEND\0SWIT"
+    b"CHVIDEOMODE\0SYSRQ\0TAB\0TAPE\0TASKMANAGER\0TEEN\0TEXT\0TIME\0TOUCHPAD_O"
+    b"FF\0TOUCHPAD_ON\0TOUCHPAD_TOGGLE\0TUNER\0TV\0TV2\0TWEN\0UNDO\0UNKNOWN\0U"
+    b"NMUTE\0UWB\0VCR\0VCR2\0VENDOR\0VIDEO\0VIDEOPHONE\0VIDEO_NEXT\0VIDEO_PREV"
+    b"\0VOD\0VOICECOMMAND\0VOICEMAIL\0VOLUMEDOWN\0VOLUMEUP\0WAKEUP\0WLAN\0WORD"
+    b"PROCESSOR\0WPS_BUTTON\0WWAN\0WWW\0XFER\0YELLOW\0YEN\0Z\0ZENKAKUHANKAKU\0"
+    b"ZOOM\0ZOOMRESET\0")
+_LINUX_RAWNAME_OFFSET = _array("H", (
+    b"\332\010\267\0\007\004\016\004j\003n\003r\003v\003z\003~\003\202\003\0"
+    b"\004\021\006\363\005\311\0]\012[\012\015\007\321\0\323\001\307\006W\011"
+    b"\207\013\265\004\312\010\350\011U\006\002\011\353\005_\006\272\006\274"
+    b"\004X\003\256\006\305\001\267\011\327\004\002\001\337\004\271\011W\0\210"
+    b"\004q\006\277\0x\013N\001\312\001\011\013_\012\011\007\250\010\375\005"
+    b"\345\005\303\0!\011\320\005M\006\315\0005\002\370\003\023\004\031\004"
+    b"\037\004%\004+\0041\0047\004=\004\376\003\350\007\236\011\304\005\310"
+    b"\005\314\005\017\006\270\005\274\005\300\005\027\006\254\005\260\005\264"
+    b"\005\250\005\343\005\0\0z\013\001\0\005\004\014\004\263\006\341\004\362"
+    b"\004\004\007\352\004\002\007\371\005\351\005\015\0117\006W\012\371\010"
+    b"\233\006\247\004\033\010\027\010\374\001\010\002C\012\022\010\016\010"
+    b"\303\004\325\002\260\006\356\006&\0131\013T\010\361\005\036\006N\010z"
+    b"\011\333\005\224\004\234\004t\013h\006\027\011t\002\036\0127\0\252\010"
+    b"\274\012h\004\247\002\002\010\036\010\302\003\254\002\242\004\323\006"
+    b"\307\001\321\011\344\011:\013\314\011\310\011\334\002h\013\212\010\220"
+    b"\010d\013\374\006m\002J\011\260\002L\004\364\0|\002V\004`\004R\003E\003M"
+    b"\003\024\007J\010w\010#\0122\010\353\010\357\012\323\004\300\001\254\004"
+    b"\314\010c\003\363\006@\003\251\011\223\011\003\006*\006\013\007\307\010h"
+    b"\003l\003p\003t\003x\003|\003\200\003\204\003\210\003\214\003\220\003"
+    b"\224\003\0\0\0\0\0\0\0\0\0\0<\010$\010\226\010\234\010\275\002?\012g\002"
+    b"T\011\230\003\323\0\204\010\350\006\325\001\373\011\264\010 \013\\\002"
+    b"\262\011\205\002\272\003\014\012\327\011H\0G\005\004\001\023\001\266\006"
+    b"G\012\010\005\373\004\027\005\303\011\324\010E\004u\011+\003\335\0\352\0"
+    b"A\013\320\012\301\012\365\012\0\0130\001 \001\037\003_\013\362\010\353"
+    b"\006\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0004\0e\0t\004a"
+    b"\002Z\010\007\010\276\004|\012\335\012l\0\242\010>\002\260\003Z\003\260"
+    b"\010\347\006?\0069\0126\012Q\0\211\013R\012\371\007\200\0119\010\260\012"
+    b"\263\012\324\012\330\012l\011p\011W\003a\012\275\010\252\012C\010w\012<"
+    b"\003\273\0\370\006\252\0\344\012\007\003\244\006\330\006\314\001\303\010"
+    b"\216\004m\013\345\0R\002F\002\307\003H\006^\012\373\012\343\010\352\011"
+    b"\334\011\376\0n\010\0\003r\012\267\012\352\012n\004\037\002-\002\216\013"
+    b"F\013\201\004\022\012y\004a\010\314\002\017\007\034\013+\0\335\006\021"
+    b"\003\001\012\251\0065\003^\003Q\004[\004\215\002\274\006\026\0\007\0\267"
+    b"\004\0\0\0\0\0\0\0\0\0\0\347\002\357\002\312\004\367\002\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\315\003\351\003\365\003\020\004\026\004"
+    b"\034\004\"\004(\004.\0044\004:\004\373\003\002\004\011\004\320\003\325"
+    b"\003\337\003\344\003\360\003@\004\332\003\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0_\001r\001{\001\204\001\215\001\226\001\237\001\250"
+    b"\001\261\001h\001\0\0\0\0\0\0\0\0\0\0+\0075\007U\007_\007i\007s\007}\007"
+    b"\207\007\221\007\233\007\333\007\315\007\245\007\257\007\271\007\303\007"
+    b"\350\001T\013\232\012\216\012\201\012\030\002&\002\016\002\334\001\365"
+    b"\001\001\002\214\0~\0\231\0\215\006\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0=\0Y\011\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\272\001f\012\331\004\232\002b\0\207\011\017\013"
+    b"t\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0P\001A\001\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0{\005N\005\217\005b\005\"\0058\0057\011,"
+    b"\011\205\006{\006@\011\311\006?\007J\007\260\0#\0\035\007*\012,\010\013"
+    b"\013\311\012\244\003\357\011\307\002\360\007\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0L\001"))
+
+
+def linux_rawname(scancode):
+    """Get the raw name of a Linux keycode."""
+    if 0 <= scancode < 768:
+        return _string(_LINUX_RAWNAME_DATA, _LINUX_RAWNAME_OFFSET[scancode])
+    return None
+
+
+# Mapping from macOS keycodes to HID keycodes.
+# KEY_None (0) indicates no mapping.
+MACOS_TO_HID = (
+    b"\004\026\007\011\013\012\035\033\006\031\0\005\024\032\010\025\034\027"
+    b"\036\037 !#\".&$-%'0\022\030/\014\023\236\017\0154\0163168\021\0207+,5*"
+    b"\0)\347\343\3419\342\340\345\346\344\0l\334\0U\0W\0\330\0\0\177TX\0Vmngb"
+    b"YZ[\\]^_o`a\0\0\0>?@<AB\0D\0hki\0C\0E\0juJKL=M;N:POQR\0")
+
+# Mapping from HID keycodes to macOS keycodes.
+# KEYCODE_NONE (255) indicates no mapping.
+MACOS_FROM_HID = (
+    b"\377\377\377\377\0\013\010\002\016\003\005\004\"&(%.-\037#\014\017\001"
+    b"\021 \011\015\007\020\006\022\023\024\025\027\026\032\034\031\035\377530"
+    b"1\033\030!\036*\377)'2+/,9zxcv`abdemgo\377\377\377\377stuwy|{}~\377KCNEL"
+    b"STUVWXY[\\R\377\377\377\377Qikqj@OPZ\377\377\377\377\377r\377\377\377"
+    b"\377\377\377\377\377\377J\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377$\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377G\377\377\377A\377\377\377;8:7><=6\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377")
+
+
+def macos_to_hid(scancode):
+    """Get the HID keycode for the given macOS keycode.
+
+    Returns KEY_None (0) if the keycode is not mapped to an HID keycode.
+    """
+    if 0 <= scancode < 128:
+        return MACOS_TO_HID[scancode]
+    return 0
+
+
+_MACOS_NAME_DATA = (
+    b"\0'\0,\0.\0;\0A\0B\0C\0Caps Lock\0D\0Delete\0Delete Forward\0E\0End\0Esc"
+    b"ape\0F\0F1\0F10\0F11\0F12\0F13\0F14\0F15\0F16\0F17\0F18\0F19\0F2\0F20\0F"
+    b"3\0F4\0F5\0F6\0F7\0F8\0F9\0G\0H\0Help\0Home\0I\0J\0K\0KP *\0KP +\0KP -\0"
+    b"KP /\0KP 0\0KP 1\0KP 2\0KP 3\0KP 4\0KP 5\0KP 6\0KP 7\0KP 8\0KP 9\0KP =\0"
+    b"KP Clear\0KP Decimal\0KP Enter\0L\0Left\0Left Command\0Left Control\0Lef"
+    b"t Option\0Left Shift\0M\0Mute\0N\0O\0P\0Page Down\0Page Up\0Q\0R\0Return"
+    b"\0Right\0Right Command\0Right Control\0Right Option\0Right Shift\0S\0Spa"
+    b"ce\0T\0Tab\0U\0V\0W\0X\0Y\0Z\0[\0\\\0]\0`\0")
+_MACOS_NAME_OFFSET = _array("H", (
+    b"\0\0\0\0\0\0\0\0\011\0\013\0\015\0\031\0001\0>\0\207\0\211\0\225\0\227\0"
+    b"\231\0\003\001;\001B\001D\001F\001Z\001\\\001\240\001\250\001\256\001"
+    b"\260\001\262\001\264\001\266\001\270\001\267\0\274\0\301\0\306\0\313\0"
+    b"\320\0\325\0\332\0\337\0\262\0\0\0007\0\033\0\252\001\242\001\250\0\344"
+    b"\0\272\001\276\001\274\001\0\0\007\0\001\0\300\001\003\0\005\0\255\0\017"
+    b"\0@\0k\0r\0u\0x\0{\0~\0\201\0\204\0C\0G\0K\0\0\0\0\0\0\0\0\0\220\0R\001"
+    b"\"\0003\0H\001e\001\005\001M\001W\001\0\0\252\0\233\0\245\0\240\0\372\0"
+    b"\264\0\271\0\276\0\303\0\310\0\315\0\322\0\327\0\334\0\257\0\0\0\0\0\0\0"
+    b"\0\0\341\0O\0S\0W\0[\0_\0c\0g\0n\0\0\0\0\0\0\0\0\0\0\0\213\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0=\001\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0^\001\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\346\0\0\0\0\0\0\0\357\0\0\0\0\0\0\0\027\0010"
+    b"\001$\001\012\001y\001\224\001\207\001k\001"))
+
+
+def macos_name(keycode):
+    """Get the display name for an HID keycode on macOS."""
+    if 0 <= keycode < 232:
+        return _string(_MACOS_NAME_DATA, _MACOS_NAME_OFFSET[keycode])
+    return None
+
+
+_MACOS_RAWNAME_DATA = (
+    b"\0ANSI_0\0ANSI_1\0ANSI_2\0ANSI_3\0ANSI_4\0ANSI_5\0ANSI_6\0ANSI_7\0ANSI_8"
+    b"\0ANSI_9\0ANSI_A\0ANSI_B\0ANSI_Backslash\0ANSI_C\0ANSI_Comma\0ANSI_D\0AN"
+    b"SI_E\0ANSI_Equal\0ANSI_F\0ANSI_G\0ANSI_Grave\0ANSI_H\0ANSI_I\0ANSI_J\0AN"
+    b"SI_K\0ANSI_Keypad0\0ANSI_Keypad1\0ANSI_Keypad2\0ANSI_Keypad3\0ANSI_Keypa"
+    b"d4\0ANSI_Keypad5\0ANSI_Keypad6\0ANSI_Keypad7\0ANSI_Keypad8\0ANSI_Keypad9"
+    b"\0ANSI_KeypadClear\0ANSI_KeypadDecimal\0ANSI_KeypadDivide\0ANSI_KeypadEn"
+    b"ter\0ANSI_KeypadEquals\0ANSI_KeypadMinus\0ANSI_KeypadMultiply\0ANSI_Keyp"
+    b"adPlus\0ANSI_L\0ANSI_LeftBracket\0ANSI_M\0ANSI_Minus\0ANSI_N\0ANSI_O\0AN"
+    b"SI_P\0ANSI_Period\0ANSI_Q\0ANSI_Quote\0ANSI_R\0ANSI_RightBracket\0ANSI_S"
+    b"\0ANSI_Semicolon\0ANSI_Slash\0ANSI_T\0ANSI_U\0ANSI_V\0ANSI_W\0ANSI_X\0AN"
+    b"SI_Y\0ANSI_Z\0CapsLock\0DownArrow\0End\0Escape\0F1\0F10\0F11\0F12\0F13\0"
+    b"F14\0F15\0F16\0F17\0F18\0F19\0F2\0F20\0F3\0F4\0F5\0F6\0F7\0F8\0F9\0Forwa"
+    b"rdDelete\0Function\0Help\0Home\0ISO_Section\0JIS_Eisu\0JIS_Kana\0JIS_Key"
+    b"padComma\0JIS_Underscore\0JIS_Yen\0LeftArrow\0Mute\0PageDown\0PageUp\0Re"
+    b"turn\0RightArrow\0RightCommand\0RightControl\0RightOption\0RightShift\0S"
+    b"pace\0Tab\0UpArrow\0VolumeDown\0VolumeUp\0")
+_MACOS_RAWNAME_OFFSET = _array("H", (
+    b"G\0J\002v\0\217\0\250\0\226\0\225\002\207\002d\0y\002\"\003N\0\037\002"
+    b"\200\002}\0001\002\216\002k\002\010\0\017\0\026\0\035\0+\0$\0\204\0@\000"
+    b"2\0\363\0019\0\001\08\002\005\002r\002\333\001\257\0\014\002\206\003\324"
+    b"\001\266\0&\002\275\0Q\002U\0k\0`\002\376\001\354\001\023\002\317\003"
+    b"\311\003\235\0\010\003\0\0\263\002\230\003\235\003\303\003\234\002\267"
+    b"\003\252\003\276\003\262\003\245\003\017\003\331\002W\001\0\0\260\001\0"
+    b"\0\304\001\0\0F\001\346\003\333\003q\003j\001|\001\0\0\237\001\335\002"
+    b"\341\002\215\001\304\0\321\0\336\0\353\0\370\0\005\001\022\001\037\001"
+    b"\350\002,\0019\001_\003P\003@\003\362\002\365\002\370\002\354\002\373"
+    b"\002\376\002.\003\301\0027\003\311\002\325\002\315\002\0\0\275\002\0\0"
+    b"\305\002\0\0\321\002\030\003\035\003\177\003\001\003\357\002\257\002\345"
+    b"\002v\003\272\002g\003\215\003\245\002\323\003"))
+
+
+def macos_rawname(scancode):
+    """Get the raw name of a macOS keycode."""
+    if 0 <= scancode < 127:
+        return _string(_MACOS_RAWNAME_DATA, _MACOS_RAWNAME_OFFSET[scancode])
+    return None
+
+
+# Mapping from Windows keycodes to HID keycodes.
+# KEY_None (0) indicates no mapping.
+WINDOWS_TO_HID = (
+    b"\0)\036\037 !\"#$%&'-.*+\024\032\010\025\027\034\030\014\022\023/0\236"
+    b"\340\004\026\007\011\012\013\015\016\017345\3411\035\033\006\031\005\021"
+    b"\020678\345\0\342\09:;<=>?@ABCHG\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0DE\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\344\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0F\346\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0JRK\0P\0O\0MQNIL\0\0\0\0\0\0\0\343\347\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0")
+
+# Mapping from HID keycodes to Windows keycodes.
+# KEYCODE_NONE (255) indicates no mapping.
+WINDOWS_FROM_HID = (
+    b"\377\377\377\377\0360. \022!\"#\027$%&21\030\031\020\023\037\024\026/"
+    b"\021-\025,\002\003\004\005\006\007\010\011\012\013\377\001\016\017\377"
+    b"\014\015\032\033+\377'()345:;<=>?@ABCDWX\267FE\322\307\311\323\317\321"
+    b"\315\313\320\310\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\034\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\035*8\333\2356\270\334\377\377\377\377\377\377\377\377\377\377\377"
+    b"\377\377\377\377\377\377\377\377\377\377\377\377\377")
+
+
+def windows_to_hid(scancode):
+    """Get the HID keycode for the given Windows keycode.
+
+    Returns KEY_None (0) if the keycode is not mapped to an HID keycode.
+    """
+    if 0 <= scancode < 256:
+        return WINDOWS_TO_HID[scancode]
+    return 0
+
+
+_WINDOWS_NAME_DATA = (
+    b"\0'\0,\0-\0.\0/\0;\0=\0A\0B\0Backspace\0C\0Caps Lock\0D\0Delete\0E\0End"
+    b"\0Enter\0Escape\0F\0F1\0F10\0F11\0F12\0F2\0F3\0F4\0F5\0F6\0F7\0F8\0F9\0G"
+    b"\0H\0Home\0I\0Insert\0J\0K\0L\0Left\0Left Alt\0Left Control\0Left Shift"
+    b"\0Left Windows\0M\0N\0O\0P\0Page Down\0Page Up\0Pause\0Print Screen\0Q\0"
+    b"R\0Right\0Right Alt\0Right Control\0Right Shift\0Right Windows\0S\0Scrol"
+    b"l Lock\0T\0Tab\0U\0V\0W\0X\0Y\0Z\0[\0\\\0]\0`\0")
+_WINDOWS_NAME_OFFSET = _array("H", (
+    b"\0\0\0\0\0\0\0\0\017\0\021\0\035\0)\0002\0E\0n\0p\0w\0\200\0\202\0\204\0"
+    b"\271\0\273\0\275\0\277\0\346\0\350\0\"\0010\0016\0018\001:\001<\001>\001"
+    b"@\001P\0T\0Z\0]\0`\0c\0f\0i\0l\0L\0\0\0>\0\023\0002\001\0\0\005\0\015\0B"
+    b"\001F\001D\001\0\0\013\0\001\0H\001\003\0\007\0\011\0\037\0G\0V\0Y\0\\\0"
+    b"_\0b\0e\0h\0k\0J\0N\0R\0\331\0$\001\323\0y\0r\0\313\0+\0004\0\301\0\352"
+    b"\0\206\0\306\0\320\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\08\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\224\0\241\0\213\0\254\0\372\0\010\001\360\0\024\001"))
+
+
+def windows_name(keycode):
+    """Get the display name for an HID keycode on Windows."""
+    if 0 <= keycode < 232:
+        return _string(_WINDOWS_NAME_DATA, _WINDOWS_NAME_OFFSET[keycode])
+    return None
+
+
+_WINDOWS_RAWNAME_DATA = (
+    b"\0A\0B\0Backslash\0C\0Caps Lock\0Comma\0D\0Delete\0Delete Forward\0E\0En"
+    b"d\0Equals\0Escape\0F\0F1\0F10\0F11\0F12\0F2\0F3\0F4\0F5\0F6\0F7\0F8\0F9"
+    b"\0G\0Grave\0H\0Home\0Insert\0J\0K\0L\0Left\0Left Alt\0Left Bracket\0Left"
+    b" Control\0Left GUI\0Left Shift\0M\0Minus\0N\0O\0P\0Page Down\0Page Up\0P"
+    b"ause\0Period\0Print Screen\0Q\0Quote\0R\0Return\0Right\0Right Alt\0Right"
+    b" Bracket\0Right Control\0Right GUI\0Right Shift\0S\0Scroll Lock\0Semicol"
+    b"on\0Slash\0T\0Tab\0U\0V\0W\0X\0Y\0Z\0")
+_WINDOWS_RAWNAME_OFFSET = _array("H", (
+    b"\0\0F\0X\0\\\0b\0e\0h\0k\0n\0q\0t\0T\0\320\0?\0#\0{\001\010\001\203\0019"
+    b"\0\020\001y\001\207\001\177\001\301\0\330\0\332\0\240\0)\001\022\001\255"
+    b"\0\001\0[\001!\0M\0v\0~\0\214\0\216\0\220\0i\001\012\001x\0\303\0\005\0"
+    b"\211\001\205\001\017\0\201\001\003\0\326\0\316\0\033\0\364\0s\001O\001\0"
+    b"\0\227\0\0\0\021\0O\0^\0a\0d\0g\0j\0m\0p\0s\0R\0\356\0]\001\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0V\0Z\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0007\001\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\0\373\0\037\001\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0"
+    b"\0\0\200\0\353\0\346\0\0\0\222\0\0\0\031\001\0\0;\0\341\0\334\0\205\0*\0"
+    b"\0\0\0\0\0\0\0\0\0\0\0\0\0\0\272\0E\001"))
+
+
+def windows_rawname(scancode):
+    """Get the raw name of a Windows keycode."""
+    if 0 <= scancode < 221:
+        return _string(_WINDOWS_RAWNAME_DATA, _WINDOWS_RAWNAME_OFFSET[scancode])
+    return None
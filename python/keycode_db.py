@@ -0,0 +1,260 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Loader for binary keycode table files.
+
+A binary table file contains the same tables as the keycode module, but can be
+replaced without changing any code. The file is memory-mapped, and queries read
+directly from the mapping, so processes which load the same file share one
+copy in the page cache. The file format is described in scripts/bintable.py.
+
+Example:
+
+    with keycode_db.open_db("keycode_tables.bin") as db:
+        linux = db.platform("linux")
+        hid = linux.to_hid(30)
+        print(db.to_id(hid), linux.name(hid))
+"""
+import mmap
+import struct
+import sys
+import zlib
+
+MAGIC = b"KEYTABLE"
+VERSION = 1
+_HEADER = struct.Struct("<8s15I")
+_PLATFORM = struct.Struct("<16s8I")
+_CHECKSUM_START = 20
+
+# Constants for the identifier hash, which must match scripts/phash.py.
+_FNV_BASIS = 2166136261
+_FNV_PRIME = 16777619
+
+
+class FormatError(Exception):
+    """The table file is damaged or has an unsupported format."""
+
+
+class _Region:
+    """Creates bounds-checked views of the sections of a table file.
+
+    Every view is recorded, so they can all be released before the file is
+    unmapped.
+    """
+
+    def __init__(self, data, size):
+        self.size = size
+        self.views = [memoryview(data)]
+
+    def bytes(self, offset, count):
+        """Get a view of an array of bytes."""
+        if offset % 4 or offset + count > self.size:
+            raise FormatError("Section out of bounds")
+        view = self.views[0][offset:offset + count]
+        self.views.append(view)
+        return view
+
+    def u32(self, offset, count):
+        """Get a sequence of little-endian 32-bit integers."""
+        view = self.bytes(offset, 4 * count)
+        if sys.byteorder != "little":
+            return struct.unpack("<{}I".format(count), view)
+        view = view.cast("I")
+        self.views.append(view)
+        return view
+
+    def release(self):
+        """Release all views."""
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+
+
+class Platform:
+    """The keycode tables for one platform.
+
+    Attributes:
+      platform_name: Platform name, such as "linux"
+    """
+
+    def __init__(self, db, platform_name, to_hid, from_hid, rawnames, names):
+        self._db = db
+        self.platform_name = platform_name
+        self._to_hid = to_hid
+        self._from_hid = from_hid
+        self._rawnames = rawnames
+        self._names = names
+
+    def to_hid(self, keycode):
+        """Get the HID keycode for a platform keycode, or 0 if unmapped."""
+        if 0 <= keycode < len(self._to_hid):
+            return self._to_hid[keycode]
+        return 0
+
+    def from_hid(self, hid):
+        """Get the platform keycode for an HID keycode, or 255 if unmapped."""
+        if 0 <= hid < 256:
+            return self._from_hid[hid]
+        return 255
+
+    def name(self, hid):
+        """Get the display name for an HID keycode, or None."""
+        return self._db._lookup(self._names, hid)
+
+    def rawname(self, keycode):
+        """Get the raw name of a platform keycode, or None."""
+        return self._db._lookup(self._rawnames, keycode)
+
+
+class KeycodeDB:
+    """A memory-mapped binary keycode table file.
+
+    Attributes:
+      platforms: Map from platform name to Platform
+    """
+
+    def __init__(self, data, mapping=None):
+        """Load tables from a buffer.
+
+        Arguments:
+          data: Buffer containing the file contents, which must have a find()
+            method, such as bytes or mmap
+          mapping: Memory map which is closed with the tables, or None
+        Raises:
+          FormatError: if the data is not a valid table file
+        """
+        self._mapping = mapping
+        self._data = None
+        self._region = None
+        self.platforms = {}
+        try:
+            self._load(data)
+        except BaseException:
+            self.close()
+            raise
+
+    def _load(self, data):
+        header = memoryview(data)[:_HEADER.size]
+        try:
+            if len(header) < _HEADER.size:
+                raise FormatError("File too short")
+            (magic, version, size, checksum, strings_offset, strings_size,
+             seed, maxlen, nbuckets, nslots, disp_offset, slot_offset,
+             id_count, id_offset, platform_count,
+             platform_offset) = _HEADER.unpack(header)
+        finally:
+            header.release()
+        if magic != MAGIC:
+            raise FormatError("Not a keycode table file")
+        if version != VERSION:
+            raise FormatError("Unsupported version {}".format(version))
+        if size > len(data):
+            raise FormatError("File is truncated")
+        region = _Region(data, size)
+        self._region = region
+        with region.views[0][_CHECKSUM_START:size] as body:
+            if zlib.crc32(body) != checksum:
+                raise FormatError("Checksum mismatch")
+        strings = region.bytes(strings_offset, strings_size)
+        if not strings_size or strings[-1] != 0:
+            raise FormatError("Invalid string pool")
+        # Strings are found with the find() method of the underlying buffer,
+        # which is much faster than scanning a memoryview.
+        self._data = data
+        self._strings_offset = strings_offset
+        self._strings_size = strings_size
+        if not nbuckets or not nslots:
+            raise FormatError("Invalid identifier index")
+        self._seed = seed
+        self._maxlen = maxlen
+        self._displacements = region.u32(disp_offset, nbuckets)
+        self._slots = region.bytes(slot_offset, nslots)
+        self._ids = region.u32(id_offset, id_count)
+        records = region.bytes(platform_offset,
+                               _PLATFORM.size * platform_count)
+        for n in range(platform_count):
+            (name, to_hid_count, to_hid_offset, from_hid_offset,
+             rawname_count, rawname_offset, name_count, name_offset,
+             reserved) = _PLATFORM.unpack_from(records, _PLATFORM.size * n)
+            name = name.rstrip(b"\0").decode("ASCII")
+            self.platforms[name] = Platform(
+                self, name, region.bytes(to_hid_offset, to_hid_count),
+                region.bytes(from_hid_offset, 256),
+                region.u32(rawname_offset, rawname_count),
+                region.u32(name_offset, name_count))
+
+    def close(self):
+        """Close the tables and unmap the file."""
+        self.platforms = {}
+        self._data = None
+        if self._region is not None:
+            self._region.release()
+            self._region = None
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def platform(self, name):
+        """Get the tables for a platform, or raise KeyError."""
+        return self.platforms[name]
+
+    def _lookup(self, offsets, index):
+        if not 0 <= index < len(offsets):
+            return None
+        offset = offsets[index]
+        if not offset or offset >= self._strings_size:
+            return None
+        start = self._strings_offset + offset
+        return self._data[start:self._data.find(b"\0", start)].decode("UTF-8")
+
+    def to_id(self, hid):
+        """Get the identifier for an HID keycode, or None."""
+        return self._lookup(self._ids, hid)
+
+    def from_id(self, ident):
+        """Look up an HID keycode by its identifier, case insensitive.
+
+        Returns 0 if no keycode has the given identifier.
+        """
+        try:
+            data = ident.encode("ASCII").lower()
+        except UnicodeEncodeError:
+            return 0
+        if len(data) > self._maxlen:
+            return 0
+        h = _FNV_BASIS ^ self._seed
+        for c in data:
+            h = ((h ^ c) * _FNV_PRIME) & 0xffffffff
+        h ^= self._displacements[h % len(self._displacements)]
+        h ^= h >> 16
+        h = (h * 0x85ebca6b) & 0xffffffff
+        h ^= h >> 13
+        h = (h * 0xc2b2ae35) & 0xffffffff
+        h ^= h >> 16
+        code = self._slots[h % len(self._slots)]
+        name = self.to_id(code)
+        if name is None or name.lower().encode("ASCII") != data:
+            return 0
+        return code
+
+
+def open_db(path):
+    """Memory-map a binary table file.
+
+    Raises:
+      OSError: if the file cannot be read
+      FormatError: if the file is not a valid table file
+    """
+    with open(path, "rb") as fp:
+        mapping = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return KeycodeDB(mapping, mapping)
+    except BaseException:
+        mapping.close()
+        raise
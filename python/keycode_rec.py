@@ -0,0 +1,471 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Reader and writer for key event recordings.
+
+A recording is a compact, platform-neutral log of key events, keyed on HID
+keycodes. Recordings can be written by this module, or by the C writer in
+src/keycode_rec.c, which the example programs use. Both the reader and the
+writer hold at most one chunk of events in memory, so recordings can be larger
+than memory.
+
+Example:
+
+    with keycode_rec.open_writer("session.rec") as writer:
+        writer.write(1000, 4, keycode_rec.PRESS, scancode=30,
+                     platform="linux")
+    with keycode_rec.open_reader("session.rec") as reader:
+        for event in reader.events_from_time(1000):
+            print(event.time, event.code, event.value)
+
+All integers are little-endian. The file starts with this 16-byte header:
+
+    0   magic, the bytes "KEYEVENT"
+    8   format version, 32-bit, currently 1
+    12  reserved, 32-bit, zero
+
+The header is followed by chunks of events. Each chunk has a 20-byte header:
+
+    0   the bytes "CHNK"
+    4   size of the event data, 32-bit
+    8   number of events, 32-bit
+    12  chunk time, 64-bit
+
+followed by the event data, where each event is:
+
+    varint  time since the previous event, or since the chunk time for the
+            first event in the chunk
+    byte    flags: bits 0-1 are the value (0 = release, 1 = press,
+            2 = autorepeat), bit 2 is set if a native keycode follows, and
+            bit 3 is set if a platform tag follows
+    byte    HID keycode
+    byte    platform tag, if flag bit 3 is set
+    varint  native keycode, if flag bit 2 is set
+
+Times are in microseconds, on any clock. A varint is an unsigned LEB128
+integer, with seven bits in each byte, least significant first. The platform
+tag is 0 for no platform, 1 for Linux, 2 for macOS, or 3 for Windows. It
+applies to the following events in the same chunk, until the next tag. Each
+chunk starts with no platform, so chunks can be decoded independently.
+
+When the writer is closed, it writes an index of the chunks, so readers can
+seek by event number or time without reading the events before it:
+
+    0   the bytes "INDX"
+    4   number of chunks, 32-bit
+    8   total number of events, 64-bit
+    16  one 24-byte entry for each chunk: the offset of the chunk header, the
+        chunk time, and the number of events in earlier chunks, each 64-bit
+
+The file ends with a 12-byte trailer, which is the 64-bit offset of the index
+followed by the bytes "KEND". If a recording was not closed, for example
+because the recording program crashed, the reader rebuilds the index from the
+chunk headers and ignores an incomplete final chunk.
+"""
+import bisect
+import collections
+import os
+import struct
+
+MAGIC = b"KEYEVENT"
+VERSION = 1
+_HEADER = struct.Struct("<8sII")
+_CHUNK = struct.Struct("<4sIIQ")
+_INDEX = struct.Struct("<4sIQ")
+_INDEX_ENTRY = struct.Struct("<QQQ")
+_TRAILER = struct.Struct("<Q4s")
+_CHUNK_MAGIC = b"CHNK"
+_INDEX_MAGIC = b"INDX"
+_TRAILER_MAGIC = b"KEND"
+
+# Event values.
+RELEASE = 0
+PRESS = 1
+REPEAT = 2
+
+# Platform for each platform tag.
+PLATFORMS = (None, "linux", "macos", "windows")
+_PLATFORM_TAGS = {platform: tag for tag, platform in enumerate(PLATFORMS)}
+
+_VALUE_MASK = 0x03
+_HAS_SCANCODE = 0x04
+_HAS_PLATFORM = 0x08
+
+# Default size of the event data in each chunk, in bytes.
+CHUNK_SIZE = 1 << 16
+
+
+class FormatError(Exception):
+    """The recording is damaged or has an unsupported format."""
+
+
+Event = collections.namedtuple(
+    "Event", ["time", "code", "value", "scancode", "platform"])
+Event.__doc__ = """A key event.
+
+Attributes:
+  time: Time in microseconds
+  code: HID keycode
+  value: RELEASE, PRESS, or REPEAT
+  scancode: Native keycode, or None
+  platform: Platform of the native keycode, such as "linux", or None
+"""
+
+Chunk = collections.namedtuple("Chunk", ["offset", "time", "first"])
+Chunk.__doc__ = """A chunk in the index of a recording.
+
+Attributes:
+  offset: Offset of the chunk header in the file
+  time: Chunk time, which is no later than the time of its first event
+  first: Number of events in earlier chunks
+"""
+
+
+def _put_varint(buf, value):
+    while value >= 0x80:
+        buf.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _get_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise FormatError("Truncated event")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+        if shift >= 64:
+            raise FormatError("Varint too long")
+
+
+class Writer:
+    """Writes a key event recording.
+
+    Events are buffered until the chunk is full, then written to the file.
+    The file does not need to be seekable.
+    """
+
+    def __init__(self, fp, *, chunk_size=CHUNK_SIZE, owned=False):
+        """Start a recording.
+
+        Arguments:
+          fp: Binary file to write to
+          chunk_size: Size of the event data in each chunk, in bytes
+          owned: If true, the file is closed when the writer is closed
+        """
+        if chunk_size <= 0:
+            raise ValueError("Invalid chunk size: {}".format(chunk_size))
+        self._fp = fp
+        self._owned = owned
+        self._chunk_size = chunk_size
+        self._offset = 0
+        self._index = []
+        self._total = 0
+        self._buf = bytearray()
+        self._count = 0
+        self._chunk_time = 0
+        self._time = 0
+        self._platform = 0
+        self._write(_HEADER.pack(MAGIC, VERSION, 0))
+
+    def _write(self, data):
+        self._fp.write(data)
+        self._offset += len(data)
+
+    def write(self, time, code, value, scancode=None, platform=None):
+        """Add an event to the recording.
+
+        The arguments are the fields of Event, so writer.write(*event) copies
+        an event. If the time is earlier than the previous event, a new chunk
+        is started.
+        """
+        if time < 0:
+            raise ValueError("Invalid time: {}".format(time))
+        if not 0 <= code <= 255:
+            raise ValueError("Invalid HID keycode: {}".format(code))
+        if value not in (RELEASE, PRESS, REPEAT):
+            raise ValueError("Invalid value: {}".format(value))
+        if scancode is not None and scancode < 0:
+            raise ValueError("Invalid scancode: {}".format(scancode))
+        tag = _PLATFORM_TAGS.get(platform)
+        if tag is None:
+            raise ValueError("Unknown platform: {!r}".format(platform))
+        if self._count and time < self._time:
+            self._end_chunk()
+        if not self._count:
+            self._chunk_time = time
+            self._time = time
+            self._platform = 0
+        buf = self._buf
+        _put_varint(buf, time - self._time)
+        flags = value
+        if scancode is not None:
+            flags |= _HAS_SCANCODE
+        if tag != self._platform:
+            flags |= _HAS_PLATFORM
+        buf.append(flags)
+        buf.append(code)
+        if tag != self._platform:
+            buf.append(tag)
+            self._platform = tag
+        if scancode is not None:
+            _put_varint(buf, scancode)
+        self._time = time
+        self._count += 1
+        if len(buf) >= self._chunk_size:
+            self._end_chunk()
+
+    def _end_chunk(self):
+        if not self._count:
+            return
+        self._index.append(Chunk(self._offset, self._chunk_time, self._total))
+        self._write(
+            _CHUNK.pack(_CHUNK_MAGIC, len(self._buf), self._count,
+                        self._chunk_time))
+        self._write(self._buf)
+        self._total += self._count
+        self._count = 0
+        self._buf = bytearray()
+
+    def flush(self):
+        """Write the buffered events to the file.
+
+        The events will be readable even if the writer is not closed.
+        """
+        self._end_chunk()
+        self._fp.flush()
+
+    def close(self):
+        """Write the remaining events and the index, and finish the file."""
+        if self._fp is None:
+            return
+        self._end_chunk()
+        index_offset = self._offset
+        self._write(_INDEX.pack(_INDEX_MAGIC, len(self._index), self._total))
+        self._write(b"".join(
+            _INDEX_ENTRY.pack(*chunk) for chunk in self._index))
+        self._write(_TRAILER.pack(index_offset, _TRAILER_MAGIC))
+        self._fp.flush()
+        if self._owned:
+            self._fp.close()
+        self._fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+
+class Reader:
+    """Reads a key event recording.
+
+    Only the index is kept in memory. Events are read one chunk at a time.
+
+    Attributes:
+      chunks: List of Chunk objects
+    """
+
+    def __init__(self, fp, *, owned=False):
+        """Open a recording.
+
+        Arguments:
+          fp: Seekable binary file to read from
+          owned: If true, the file is closed when the reader is closed
+        Raises:
+          FormatError: if the file is not a valid recording
+        """
+        self._fp = fp
+        self._owned = owned
+        data = fp.read(_HEADER.size)
+        if len(data) < _HEADER.size:
+            raise FormatError("File too short")
+        magic, version, reserved = _HEADER.unpack(data)
+        if magic != MAGIC:
+            raise FormatError("Not a key event recording")
+        if version != VERSION:
+            raise FormatError("Unsupported version {}".format(version))
+        size = fp.seek(0, os.SEEK_END)
+        if not self._read_index(size):
+            self._scan(size)
+
+    def _read_index(self, size):
+        """Read the index written when the recording was closed.
+
+        Returns:
+          False if the recording has no index
+        """
+        fp = self._fp
+        if size < _HEADER.size + _INDEX.size + _TRAILER.size:
+            return False
+        fp.seek(size - _TRAILER.size)
+        index_offset, magic = _TRAILER.unpack(fp.read(_TRAILER.size))
+        if magic != _TRAILER_MAGIC:
+            return False
+        if not _HEADER.size <= index_offset <= size - _INDEX.size:
+            raise FormatError("Index out of bounds")
+        fp.seek(index_offset)
+        magic, count, total = _INDEX.unpack(fp.read(_INDEX.size))
+        if magic != _INDEX_MAGIC:
+            raise FormatError("Invalid index")
+        if (index_offset + _INDEX.size + count * _INDEX_ENTRY.size +
+                _TRAILER.size != size):
+            raise FormatError("Invalid index size")
+        data = fp.read(count * _INDEX_ENTRY.size)
+        self.chunks = [
+            Chunk(*entry) for entry in _INDEX_ENTRY.iter_unpack(data)
+        ]
+        self._total = total
+        self._end = index_offset
+        return True
+
+    def _scan(self, size):
+        """Rebuild the index from the chunk headers."""
+        fp = self._fp
+        offset = _HEADER.size
+        total = 0
+        self.chunks = []
+        fp.seek(offset)
+        while offset + _CHUNK.size <= size:
+            magic, dsize, count, time = _CHUNK.unpack(fp.read(_CHUNK.size))
+            if magic != _CHUNK_MAGIC:
+                break
+            end = offset + _CHUNK.size + dsize
+            if end > size:
+                break
+            self.chunks.append(Chunk(offset, time, total))
+            total += count
+            offset = end
+            fp.seek(offset)
+        self._total = total
+        self._end = offset
+
+    def __len__(self):
+        return self._total
+
+    def __iter__(self):
+        return self.events()
+
+    def read_chunk(self, index):
+        """Get the events in a chunk.
+
+        Arguments:
+          index: Index of the chunk in chunks
+        Returns:
+          A list of Event objects
+        """
+        chunk = self.chunks[index]
+        fp = self._fp
+        fp.seek(chunk.offset)
+        magic, size, count, time = _CHUNK.unpack(fp.read(_CHUNK.size))
+        if magic != _CHUNK_MAGIC:
+            raise FormatError("Invalid chunk")
+        if chunk.offset + _CHUNK.size + size > self._end:
+            raise FormatError("Chunk out of bounds")
+        if time != chunk.time:
+            raise FormatError("Chunk time does not match index")
+        data = fp.read(size)
+        result = []
+        pos = 0
+        platform = None
+        for _ in range(count):
+            delta, pos = _get_varint(data, pos)
+            time += delta
+            if pos + 2 > len(data):
+                raise FormatError("Truncated event")
+            flags = data[pos]
+            code = data[pos + 1]
+            pos += 2
+            if flags & ~0x0f or flags & _VALUE_MASK > REPEAT:
+                raise FormatError("Invalid event flags 0x{:02x}".format(flags))
+            if flags & _HAS_PLATFORM:
+                if pos >= len(data):
+                    raise FormatError("Truncated event")
+                tag = data[pos]
+                pos += 1
+                if tag >= len(PLATFORMS):
+                    raise FormatError("Unknown platform tag {}".format(tag))
+                platform = PLATFORMS[tag]
+            scancode = None
+            if flags & _HAS_SCANCODE:
+                scancode, pos = _get_varint(data, pos)
+            result.append(
+                Event(time, code, flags & _VALUE_MASK, scancode, platform))
+        if pos != len(data):
+            raise FormatError("Chunk size does not match its events")
+        return result
+
+    def events(self, start=0):
+        """Iterate over the events, starting with the given event number."""
+        n = bisect.bisect_right([chunk.first for chunk in self.chunks], start)
+        n = max(n - 1, 0)
+        for index in range(n, len(self.chunks)):
+            events = self.read_chunk(index)
+            skip = start - self.chunks[index].first
+            if skip > 0:
+                events = events[skip:]
+            yield from events
+
+    def events_from_time(self, time):
+        """Iterate over the events, starting with the first event at or after
+        the given time.
+
+        The search uses the index, so it assumes that times never go
+        backwards.
+        """
+        # Equal times can span chunks, so start with the last chunk which
+        # starts before the given time, rather than one which starts at it.
+        n = bisect.bisect_left([chunk.time for chunk in self.chunks], time)
+        n = max(n - 1, 0)
+        for index in range(n, len(self.chunks)):
+            events = self.read_chunk(index)
+            if index == n:
+                events = [event for event in events if event.time >= time]
+            yield from events
+
+    def close(self):
+        """Close the recording."""
+        if self._owned and self._fp is not None:
+            self._fp.close()
+        self._fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+
+def open_writer(path, **kw):
+    """Create a recording file, see Writer for arguments.
+
+    Raises:
+      OSError: if the file cannot be created
+    """
+    fp = open(path, "wb")
+    try:
+        return Writer(fp, owned=True, **kw)
+    except BaseException:
+        fp.close()
+        raise
+
+
+def open_reader(path):
+    """Open a recording file.
+
+    Raises:
+      OSError: if the file cannot be read
+      FormatError: if the file is not a valid recording
+    """
+    fp = open(path, "rb")
+    try:
+        return Reader(fp, owned=True)
+    except BaseException:
+        fp.close()
+        raise
@@ -0,0 +1,66 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Keycode table generator.
+
+The generator can be imported as a package, so a long-running process can
+generate the keycode library without starting Python for each target:
+
+    import scripts
+    output = scripts.build(datadir="data")
+    source = output.files["linux"]["linux_fromhid.c"]
+
+Modules are imported when they are first used, so importing the package is
+cheap. Each module is available as an attribute, such as scripts.tables, and
+build(), targets(), Output, and Error are also available at the top level.
+
+The modules which have command-line interfaces can also be run directly, as
+in "python scripts/generate.py", or as "python -m scripts.generate".
+"""
+import importlib
+
+_MODULES = frozenset([
+    "aliases",
+    "batch",
+    "benchmark",
+    "bintable",
+    "codegen",
+    "common",
+    "evdevlog",
+    "extract",
+    "footprint",
+    "generate",
+    "manifest",
+    "metrics",
+    "phash",
+    "pycodegen",
+    "tables",
+    "translate",
+    "xkb",
+])
+
+# Attributes which are defined in a module, as (module, attribute).
+_ATTRIBUTES = {
+    "Error": ("common", "Error"),
+    "Output": ("generate", "Output"),
+    "build": ("generate", "build"),
+    "targets": ("generate", "targets"),
+}
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        value = importlib.import_module("." + name, __name__)
+    elif name in _ATTRIBUTES:
+        modname, attr = _ATTRIBUTES[name]
+        value = getattr(importlib.import_module("." + modname, __name__),
+                        attr)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(
+            __name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | _MODULES | set(_ATTRIBUTES))
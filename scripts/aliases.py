@@ -0,0 +1,273 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Index of key names, display names, and aliases.
+
+The index maps names to HID keycodes. It contains the HID names and
+identifiers from hid.csv, the display names for each platform, and the aliases
+in aliases.csv. Names are matched without case and without spaces, so "Left
+Control", "leftcontrol", and "LEFT CONTROL" are the same name.
+
+Each name is tagged with the sources it came from: "hid" for HID names, or the
+platforms it is used on. A name may refer to different keys on different
+platforms, as long as no source has the name for more than one key. For
+example, "Delete" is the HID name for the key labeled Backspace on most
+keyboards, but the Linux and Windows display name for the forward delete key.
+
+The index is compiled into C as a minimal perfect hash over the names, see
+phash.py. The C implementation of the lookup is in keycode_name.c.
+"""
+import collections
+import csv
+import io
+import os
+
+from .common import Error
+
+from . import codegen
+from . import phash
+from . import tables
+
+# Source for HID names and identifiers, which is not a platform.
+HID_SOURCE = "hid"
+
+Alias = collections.namedtuple("Alias", ["code", "alias", "platforms"])
+Alias.__doc__ = """An alternate name for a key.
+
+Attributes:
+  code: HID keycode
+  alias: The alternate name
+  platforms: List of platforms which use the alias
+"""
+
+
+def normalize(name):
+    """Normalize a name for lookup, by removing spaces and ASCII case."""
+    return "".join(c.lower() if "A" <= c <= "Z" else c for c in name
+                   if c != " ")
+
+
+def read_aliases(fp, hid_names, platforms):
+    """Read the table of aliases for HID keycodes.
+
+    Arguments:
+      fp: Input file
+      hid_names: Map from name to Keycode for the HID keycodes which can
+        have aliases
+      platforms: List of platform names
+    Returns:
+      A list of Alias objects
+    """
+    result = []
+    reader = csv.reader(fp)
+
+    def error(msg):
+        return Error(msg, lineno=lineno)
+
+    row = next(reader)
+    headers = ["Name", "Alias", "Platforms"]
+    if row != headers:
+        raise Error("Got headers {!r}, expected {!r}".format(row, headers),
+                    lineno=1)
+    for lineno, row in enumerate(reader, 2):
+        if not row:
+            continue
+        try:
+            name, alias, names = row
+        except ValueError:
+            raise error("Got {} columns, expected 3".format(len(row)))
+        key = hid_names.get(name)
+        if key is None:
+            raise error("Unknown or unused HID name {!r}".format(name))
+        if not tables.VALID_DISPLAYNAME.fullmatch(alias):
+            raise error("Invalid alias {!r}".format(alias))
+        names = names.split()
+        for platform in names:
+            if platform not in platforms:
+                raise error("Unknown platform {!r}".format(platform))
+        if len(set(names)) != len(names):
+            raise error("Duplicate platform")
+        result.append(Alias(key.code, alias, names or platforms))
+    return result
+
+
+def source_bits(platforms):
+    """Get the mask bit for each source of names.
+
+    Returns:
+      A list of (source, bit), with the platforms in order followed by the HID
+      source
+    """
+    sources = list(platforms) + [HID_SOURCE]
+    return [(source, 1 << n) for n, source in enumerate(sources)]
+
+
+def make_index(hid_table, keytables, aliases):
+    """Merge every name for each key into one index.
+
+    Arguments:
+      hid_table: List of Keycode objects which are used on any platform
+      keytables: List of Keytable objects
+      aliases: List of Alias objects
+    Returns:
+      A dictionary mapping each normalized name to a list of (code, sources),
+      where sources is a set of sources, ordered so the HID source comes
+      first and then the platforms in the order of keytables
+    """
+    used = {key.code: key for key in hid_table}
+    order = {HID_SOURCE: -1}
+    for n, keytable in enumerate(keytables):
+        order[keytable.name] = n
+    index = {}
+
+    def add(name, code, source):
+        norm = normalize(name)
+        if not norm:
+            raise Error("Empty name for {}".format(used[code].name))
+        if not norm.isascii():
+            raise Error("Name {!r} is not ASCII".format(name))
+        entries = index.setdefault(norm, {})
+        entries.setdefault(code, set()).add(source)
+
+    for key in hid_table:
+        add(key.name, key.code, HID_SOURCE)
+        if key.displayname:
+            add(key.displayname, key.code, HID_SOURCE)
+    for keytable in keytables:
+        for code, displayname in keytable.displaynames:
+            if code in used:
+                add(displayname, code, keytable.name)
+    for alias in aliases:
+        for platform in alias.platforms:
+            add(alias.alias, alias.code, platform)
+    result = {}
+    for norm, entries in sorted(index.items()):
+        entries = sorted(
+            entries.items(),
+            key=lambda item: min(order[source] for source in item[1]))
+        for n, (code1, sources1) in enumerate(entries):
+            for code2, sources2 in entries[n + 1:]:
+                common = sources1 & sources2
+                if common:
+                    raise Error(
+                        "Name {!r} refers to both {} and {} in {}".format(
+                            norm, used[code1].name, used[code2].name,
+                            ", ".join(sorted(common))))
+        result[norm] = entries
+    return result
+
+
+HEADER_TEMPLATE = """\
+#ifdef __cplusplus
+extern "C" {{
+#endif
+
+/* Sources of key names, for keycode_from_name. */
+enum {{
+{sources}
+}};
+
+/* Look up an HID keycode by name. The name may be an HID name or identifier,
+   such as "Left Control" or "LeftControl", a platform display name, such as
+   "Left Command", or an alias, such as "Ctrl". Lookup ignores case and spaces.
+   Only names from the given sources match, and a name may refer to different
+   keys for different sources. If it does, the HID name is used, then the
+   first platform in the order of the KEYCODE_NAME constants. Returns 0 if no
+   key has the name. If found is not NULL, it is set to the sources which use
+   the name for the returned key, or 0 if no key was found. */
+unsigned keycode_from_name(const char *name, unsigned sources,
+                           unsigned *found);
+
+#ifdef __cplusplus
+}} /* extern "C" */
+#endif
+"""
+
+SOURCE_TEMPLATE = """\
+#include "keycode_name.h"
+
+#include <stddef.h>
+
+enum {{
+    KEYCODE_NAME_MAXLEN = {maxlen},
+    KEYCODE_NAME_SEED = {seed},
+    KEYCODE_NAME_BUCKETS = {nbuckets},
+    KEYCODE_NAME_SLOTS = {nslots}
+}};
+static const {dtype} KEYCODE_NAME_DISPLACEMENT[] = {{
+{displacements}
+}};
+static const char KEYCODE_NAME_TEXT[] =
+{text};
+static const {otype} KEYCODE_NAME_OFFSET[] = {{
+{offsets}
+}};
+static const {stype} KEYCODE_NAME_START[] = {{
+{starts}
+}};
+static const unsigned char KEYCODE_NAME_KEY[] = {{
+{keys}
+}};
+static const {mtype} KEYCODE_NAME_SOURCES[] = {{
+{masks}
+}};
+"""
+
+
+def emit_names(open_file, index, platforms):
+    """Emit the name index.
+
+    Arguments:
+      open_file: Function to open an output file
+      index: Name index, from make_index
+      platforms: List of platform names
+    """
+    bits = source_bits(platforms)
+    enums = io.StringIO()
+    mask = 0
+    for source, bit in bits:
+        enums.write("    KEYCODE_NAME_{} = 0x{:02x},\n".format(
+            source.upper(), bit))
+        mask |= bit
+    enums.write("    KEYCODE_NAME_ALL = 0x{:02x}".format(mask))
+    with open_file("keycode_name.h", guard="KEYCODE_KEYCODE_NAME_H") as fp:
+        fp.write(HEADER_TEMPLATE.format(sources=enums.getvalue()))
+
+    bits = dict(bits)
+    hashtable = phash.make_perfect_hash(sorted(index))
+    data, strmap = codegen.make_string_table(hashtable.slots)
+    starts = [0]
+    keys = []
+    masks = []
+    for norm in hashtable.slots:
+        for code, sources in index[norm]:
+            keys.append(code)
+            value = 0
+            for source in sources:
+                value |= bits[source]
+            masks.append(value)
+        starts.append(len(keys))
+    offsets = [strmap[norm] for norm in hashtable.slots]
+    dirpath = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(dirpath, "keycode_name.c")) as fp:
+        functions = fp.read()
+    with open_file("keycode_name.c") as fp:
+        fp.write(
+            SOURCE_TEMPLATE.format(
+                maxlen=max(len(norm) for norm in index),
+                seed=hashtable.seed,
+                nbuckets=len(hashtable.displacements),
+                nslots=len(hashtable.slots),
+                dtype=codegen.ctype(max(hashtable.displacements)),
+                displacements=codegen.format_numbers(hashtable.displacements,
+                                                     "    "),
+                text=codegen.format_data(data, "    "),
+                otype=codegen.ctype(max(offsets)),
+                offsets=codegen.format_numbers(offsets, "    "),
+                stype=codegen.ctype(max(starts)),
+                starts=codegen.format_numbers(starts, "    "),
+                keys=codegen.format_numbers(keys, "    "),
+                mtype=codegen.ctype(max(masks)),
+                masks=codegen.format_numbers(masks, "    "),
+            ))
+        fp.write(functions)
@@ -0,0 +1,98 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Batch keycode translation using NumPy.
+
+This translates entire arrays of keycodes at once, using the tables in a
+Keytable object. Inputs which are out of range are translated the same way as
+the C functions: scancodes translate to KEY_None (0) and HID keycodes translate
+to KEYCODE_NONE (255).
+"""
+from .common import Error
+
+from . import tables
+
+KEY_NONE = 0
+KEYCODE_NONE = 255
+
+
+def import_numpy():
+    """Import NumPy, raising Error if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        raise Error("NumPy is required for batch translation")
+    return numpy
+
+
+def _make_table(np, table, default):
+    """Create a lookup table with an extra entry for out-of-range inputs."""
+    table = list(table)
+    table.append(default)
+    return np.array(table, dtype=np.min_scalar_type(max(table)))
+
+
+def _gather(np, table, codes):
+    """Look up every element of an integer array in a table.
+
+    The last entry in the table is used for out-of-range inputs.
+    """
+    codes = np.asarray(codes)
+    if codes.dtype.kind not in "iu":
+        raise Error("Expected an integer array, got dtype {}".format(
+            codes.dtype))
+    limit = len(table) - 1
+    # The limit may not fit in the input type, such as 255 for HID keycodes in
+    # a uint8 array, so compare in a wider type. Unsigned values too large for
+    # intp become negative, and are out of range either way.
+    index = codes.astype(np.intp, copy=False)
+    index = np.where((index < 0) | (index > limit), limit, index)
+    return np.take(table, index)
+
+
+class BatchTranslator:
+    """Translates arrays of keycodes for one platform.
+
+    Attributes:
+      name: Platform name
+      to_hid_table: NumPy array mapping scancodes to HID keycodes
+      from_hid_table: NumPy array mapping HID keycodes to scancodes
+    """
+
+    def __init__(self, keytable):
+        np = import_numpy()
+        self.name = keytable.name
+        self.to_hid_table = _make_table(np, keytable.to_hid_table, KEY_NONE)
+        self.from_hid_table = _make_table(np, keytable.from_hid_table,
+                                          KEYCODE_NONE)
+
+    def to_hid(self, scancodes):
+        """Translate an array of platform scancodes to HID keycodes.
+
+        Scancodes which are out of range or not mapped translate to KEY_None.
+        """
+        return _gather(import_numpy(), self.to_hid_table, scancodes)
+
+    def from_hid(self, keycodes):
+        """Translate an array of HID keycodes to platform scancodes.
+
+        Keycodes which are out of range or not mapped translate to
+        KEYCODE_NONE.
+        """
+        return _gather(import_numpy(), self.from_hid_table, keycodes)
+
+
+def read_translators(datadir):
+    """Read the keycode tables and create a translator for every platform.
+
+    Arguments:
+      datadir: Directory containing input data
+    Returns:
+      A map from platform name to BatchTranslator
+    """
+    with tables.ReadFile(datadir, "hid.csv") as fp:
+        hid_table = tables.read_hid(fp)
+    return {
+        keytable.name: BatchTranslator(keytable)
+        for keytable in tables.read_all(datadir, hid_table)
+    }
@@ -0,0 +1,274 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Measure how the table generator scales with table size.
+
+Synthetic HID, scancode, and keymap tables are generated at each size, and each
+stage of the generator is timed. The keymap contains a mix of direct rules and
+regular expression rules, with one regular expression rule for every
+REGEX_GROUP scancodes, so the number of rules grows with the table.
+
+Results can be written to a JSON file, and compared against a baseline file
+from an earlier run. A stage fails the comparison if it becomes much slower
+than the baseline, or if its time grows faster with table size than it did in
+the baseline, which catches quadratic behavior even when the absolute times
+are small.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+if not __package__:
+    # Run as a script, rather than as part of the package. Import the package
+    # so the relative imports below work.
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "scripts"
+
+from .common import Error
+
+from . import codegen
+from . import tables
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+# Number of scancodes matched by each regular expression rule.
+REGEX_GROUP = 100
+
+# Runs of a stage stop repeating once a single run takes this long, in seconds.
+REPEAT_LIMIT = 1.0
+
+# Times shorter than this, in seconds, are too noisy for scaling estimates.
+MIN_SCALING_TIME = 1e-3
+
+
+def synthesize(size):
+    """Create synthetic input tables.
+
+    Returns:
+      (hid, scancodes, keymap), the contents of the CSV files
+    """
+    hid = io.StringIO()
+    hid.write("Keycode,Name,Display Name\n")
+    for i in range(size):
+        hid.write("{},Key {},\n".format(i + 1, i))
+    scancodes = io.StringIO()
+    scancodes.write("Keycode,Name\n")
+    keymap = io.StringIO()
+    keymap.write("Platform Name,HID Name\n")
+    ngroups = max(1, size // (2 * REGEX_GROUP))
+    for i in range(size):
+        if i % 2 == 0:
+            name = "D{}".format(i)
+            keymap.write("{},Key {}\n".format(name, i))
+        else:
+            name = "R{}_{}".format((i // 2) % ngroups, i)
+        scancodes.write("{},{}\n".format(i, name))
+    for group in range(ngroups):
+        keymap.write("/R{}_([0-9]+)/,Key \\1\n".format(group))
+    return hid.getvalue(), scancodes.getvalue(), keymap.getvalue()
+
+
+def time_call(func, repeat):
+    """Time a function, returning (best time in seconds, last result)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+        if elapsed > REPEAT_LIMIT:
+            break
+    return best, result
+
+
+def run_size(size, repeat):
+    """Run every stage at one size.
+
+    Returns:
+      A map from stage name to time in seconds
+    """
+    hid_csv, scancodes_csv, keymap_csv = synthesize(size)
+    times = {}
+
+    def stage(name, func):
+        elapsed, result = time_call(func, repeat)
+        times[name] = elapsed
+        return result
+
+    hid_table = stage("read_hid",
+                      lambda: tables.read_hid(io.StringIO(hid_csv)))
+    scancodes = stage(
+        "read_scancodes",
+        lambda: tables.read_scancodes(io.StringIO(scancodes_csv)))
+    hid_names = {key.name: key for key in hid_table}
+
+    def apply_keymap():
+        builder = tables.KeymapBuilder(scancodes, hid_names)
+        builder.apply_keymap(io.StringIO(keymap_csv))
+        return builder
+
+    builder = stage("apply_keymap", apply_keymap)
+    if len(builder.keymap) != size:
+        raise Error("Keymap has {} entries, expected {}".format(
+            len(builder.keymap), size))
+    names = [name for code, name in scancodes]
+    stage("make_string_table", lambda: codegen.make_string_table(names))
+    stage("make_namemap",
+          lambda: codegen.make_namemap(scancodes, "keycode_bench_rawname"))
+    numbers = [key.code for key in builder.keymap.values()]
+    stage("format_numbers", lambda: codegen.format_numbers(numbers, "    "))
+    return times
+
+
+def scaling_exponent(sizetimes):
+    """Estimate the exponent k, where time grows as size^k.
+
+    Arguments:
+      sizetimes: Map from size to time in seconds
+    Returns:
+      The exponent, or None if there are not enough measurements
+    """
+    points = [(math.log(size), math.log(elapsed))
+              for size, elapsed in sorted(sizetimes.items())
+              if elapsed >= MIN_SCALING_TIME]
+    if len(points) < 2:
+        return None
+    mx = sum(x for x, y in points) / len(points)
+    my = sum(y for x, y in points) / len(points)
+    sxx = sum((x - mx)**2 for x, y in points)
+    sxy = sum((x - mx) * (y - my) for x, y in points)
+    return sxy / sxx
+
+
+def benchmark(*, sizes, repeat, quiet=False):
+    """Run the benchmark.
+
+    Returns:
+      Results as a JSON-compatible object
+    """
+    stages = {}
+    for size in sizes:
+        if not quiet:
+            print("Size {}".format(size), file=sys.stderr)
+        for name, elapsed in run_size(size, repeat).items():
+            stages.setdefault(name, {})[str(size)] = elapsed
+            if not quiet:
+                print("  {:<20} {:10.6f} s".format(name, elapsed),
+                      file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "sizes": sizes,
+        "stages": {
+            name: {
+                "times": times,
+                "exponent": scaling_exponent(
+                    {int(size): elapsed
+                     for size, elapsed in times.items()}),
+            }
+            for name, times in stages.items()
+        },
+    }
+
+
+def compare(results, baseline, *, tolerance, exponent_slack):
+    """Compare results against a baseline.
+
+    Arguments:
+      results: Results from benchmark()
+      baseline: Results from an earlier run
+      tolerance: Allowed relative slowdown, 1.0 allows twice the baseline time
+      exponent_slack: Allowed increase in the scaling exponent
+    Returns:
+      A list of failure messages
+    """
+    failures = []
+    for name, stage in results["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if base is None:
+            continue
+        for size, elapsed in stage["times"].items():
+            base_time = base["times"].get(size)
+            if base_time is None or base_time < MIN_SCALING_TIME:
+                continue
+            if elapsed > base_time * (1 + tolerance):
+                failures.append(
+                    "{} at size {}: {:.6f} s, baseline {:.6f} s".format(
+                        name, size, elapsed, base_time))
+        exponent = stage["exponent"]
+        base_exponent = base.get("exponent")
+        if (exponent is not None and base_exponent is not None
+                and exponent > base_exponent + exponent_slack):
+            failures.append(
+                "{} scales as size^{:.2f}, baseline size^{:.2f}".format(
+                    name, exponent, base_exponent))
+    return failures
+
+
+def main(argv):
+    p = argparse.ArgumentParser(
+        description="Measure how the table generator scales with table size")
+    p.add_argument("--sizes",
+                   help="comma-separated list of table sizes",
+                   type=lambda s: [int(x) for x in s.split(",")],
+                   default=DEFAULT_SIZES)
+    p.add_argument("--repeat",
+                   help="number of times to run each stage (default 3)",
+                   type=int,
+                   default=3)
+    p.add_argument("--output", "-o", help="write results to JSON file")
+    p.add_argument("--baseline", help="compare against results in JSON file")
+    p.add_argument("--tolerance",
+                   help="allowed slowdown relative to the baseline "
+                   "(default 1.0, twice as slow)",
+                   type=float,
+                   default=1.0)
+    p.add_argument("--exponent-slack",
+                   help="allowed increase in scaling exponent relative to "
+                   "the baseline (default 0.3)",
+                   type=float,
+                   default=0.3)
+    p.add_argument("--quiet",
+                   "-q",
+                   help="print no informational messages",
+                   action="store_true")
+    args = p.parse_args(argv)
+
+    try:
+        baseline = None
+        if args.baseline is not None:
+            try:
+                with open(args.baseline) as fp:
+                    baseline = json.load(fp)
+            except (OSError, ValueError) as ex:
+                raise Error("Could not read baseline: {}".format(ex),
+                            filename=args.baseline)
+        results = benchmark(sizes=args.sizes,
+                            repeat=args.repeat,
+                            quiet=args.quiet)
+        if args.output is not None:
+            with open(args.output, "w") as fp:
+                json.dump(results, fp, indent=2, sort_keys=True)
+                fp.write("\n")
+        if baseline is not None:
+            failures = compare(results,
+                               baseline,
+                               tolerance=args.tolerance,
+                               exponent_slack=args.exponent_slack)
+            if failures:
+                for failure in failures:
+                    print("Regression:", failure, file=sys.stderr)
+                raise SystemExit(1)
+    except Error as ex:
+        print("Error:", ex, file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
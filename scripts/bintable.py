@@ -0,0 +1,155 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Binary keycode table files.
+
+A binary table file contains every keycode table, the names, and the
+identifier index, so programs can load updated tables at run time instead of
+compiling them in. The file is designed to be memory-mapped: every field is at
+a fixed, aligned offset, all offsets are relative to the start of the file, and
+nothing needs to be parsed or copied to answer a query. The C loader is in
+src/keycode_db.c and the Python loader is python/keycode_db.py.
+
+All integers are little-endian, and all sections start at a multiple of four
+bytes. The file starts with this header, where each field after the magic is a
+32-bit unsigned integer:
+
+    0   magic, the bytes "KEYTABLE"
+    8   format version, currently 1
+    12  file size
+    16  CRC-32 of the file contents after this field
+    20  string pool offset
+    24  string pool size
+    28  identifier hash seed
+    32  maximum identifier length
+    36  identifier hash bucket count
+    40  identifier hash slot count
+    44  identifier displacements offset, 32-bit array with one per bucket
+    48  identifier slots offset, 8-bit array with one HID keycode per slot
+    52  identifier count, the number of HID keycodes with identifiers
+    56  identifier offset, 32-bit array of string pool offsets
+    60  platform count
+    64  platform records offset
+
+Each platform record is 48 bytes:
+
+    0   platform name, NUL-padded to 16 bytes
+    16  number of entries in the table to HID keycodes
+    20  offset of the table to HID keycodes, 8-bit array
+    24  offset of the table from HID keycodes, 8-bit array with 256 entries
+    28  number of raw names
+    32  raw name offset, 32-bit array of string pool offsets
+    36  number of display names
+    40  display name offset, 32-bit array of string pool offsets
+    44  reserved, zero
+
+The string pool contains NUL-terminated UTF-8 strings. Offset zero in the pool
+is an empty string, and a string offset of zero means there is no string.
+"""
+import io
+import struct
+import zlib
+
+from .common import Error
+
+from . import codegen
+from . import phash
+
+MAGIC = b"KEYTABLE"
+VERSION = 1
+HEADER = struct.Struct("<8s15I")
+PLATFORM = struct.Struct("<16s8I")
+PLATFORM_NAME_SIZE = 16
+
+# Offset of the first byte covered by the checksum.
+CHECKSUM_START = 20
+
+
+class Builder:
+    """Lays out the sections of a binary table file."""
+
+    def __init__(self):
+        self.fp = io.BytesIO()
+        self.fp.write(bytes(HEADER.size))
+
+    def add(self, data):
+        """Add a section to the file, returning its offset."""
+        fp = self.fp
+        fp.write(bytes(-fp.tell() % 4))
+        offset = fp.tell()
+        fp.write(data)
+        return offset
+
+    def add_u32(self, numbers):
+        """Add an array of 32-bit integers to the file."""
+        return self.add(struct.pack("<{}I".format(len(numbers)), *numbers))
+
+    def add_names(self, table, pool):
+        """Add a name map to the file.
+
+        Returns:
+          (count, offset)
+        """
+        codegen.check_namemap(table)
+        count = max(code for code, name in table) + 1
+        offsets = [0] * count
+        for code, name in table:
+            offsets[code] = pool.strmap[name]
+        return count, self.add_u32(offsets)
+
+
+def make_binary(hid_table, keytables):
+    """Create a binary table file.
+
+    Arguments:
+      hid_table: List of HID Keycode objects which are used on any platform
+      keytables: List of Keytable objects
+    Returns:
+      The file contents, as bytes
+    """
+    idents = codegen.keycode_names(hid_table)
+    name_tables = [idents]
+    for keytable in keytables:
+        name_tables.extend(codegen.keytable_names(keytable))
+    pool = codegen.StringPool(name_tables)
+    codes = {ident.lower(): code for code, ident in idents}
+    hashtable = phash.make_perfect_hash(sorted(codes))
+    slots = [codes[ident] for ident in hashtable.slots]
+
+    builder = Builder()
+    strings_offset = builder.add(pool.data)
+    displacement_offset = builder.add_u32(hashtable.displacements)
+    slot_offset = builder.add(bytes(slots))
+    id_count, id_offset = builder.add_names(idents, pool)
+    records = []
+    for keytable in keytables:
+        name = keytable.name.encode("ASCII")
+        if len(name) >= PLATFORM_NAME_SIZE:
+            raise Error("Platform name too long: {!r}".format(keytable.name))
+        to_hid_offset = builder.add(bytes(keytable.to_hid_table))
+        from_hid_offset = builder.add(bytes(keytable.from_hid_table))
+        rawname_count, rawname_offset = builder.add_names(
+            keytable.scancodes, pool)
+        name_count, name_offset = builder.add_names(keytable.displaynames,
+                                                    pool)
+        records.append(
+            PLATFORM.pack(name, len(keytable.to_hid_table), to_hid_offset,
+                          from_hid_offset, rawname_count, rawname_offset,
+                          name_count, name_offset, 0))
+    platform_offset = builder.add(b"".join(records))
+    builder.fp.write(bytes(-builder.fp.tell() % 4))
+    data = bytearray(builder.fp.getvalue())
+    HEADER.pack_into(
+        data, 0, MAGIC, VERSION, len(data), 0, strings_offset, len(pool.data),
+        hashtable.seed, max(len(ident) for code, ident in idents),
+        len(hashtable.displacements), len(slots), displacement_offset,
+        slot_offset, id_count, id_offset, len(keytables), platform_offset)
+    struct.pack_into("<I", data, CHECKSUM_START - 4,
+                     zlib.crc32(data[CHECKSUM_START:]))
+    return bytes(data)
+
+
+def emit_binary(open_file, hid_table, keytables):
+    """Emit the binary table file."""
+    with open_file("keycode_tables.bin", binary=True) as fp:
+        fp.write(make_binary(hid_table, keytables))
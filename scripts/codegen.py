@@ -4,76 +4,143 @@
 """Code generation helper functions."""
 import io
 import os
+import random
 import sys
 
-from common import Error
+from .common import Error
+
+from . import metrics
+from . import phash
 
 
 class WriteFile:
     """Context manager for writing output files.
 
     This will add guards, print out informational messages, and decorate
-    exceptions inside the context with the filename.
+    exceptions inside the context with the filename. The output is buffered in
+    memory and the file is only written if its contents changed, so unchanged
+    files keep their modification times. Changed files are replaced
+    atomically, so readers never see a partially written file. Binary files
+    are written exactly as given, without a header. If dirname is None, the
+    file is only kept in memory and is never written.
+
+    Attributes:
+      data: The file contents as a bytestring, once the context exits
+      changed: True if the file was written, once the context exits
     """
 
-    def __init__(self, dirname, filename, quiet=False, guard=None):
-        if not quiet:
-            print("Writing", filename, file=sys.stderr)
-        try:
-            fp = open(os.path.join(dirname, filename), "w")
-        except Exception as ex:
-            raise Error("Could not create output file: {}".format(ex),
-                        filename=filename)
-        try:
+    def __init__(self,
+                 dirname,
+                 filename,
+                 quiet=False,
+                 guard=None,
+                 binary=False):
+        self.path = None
+        if dirname is not None:
+            self.path = os.path.join(dirname, filename)
+        self.filename = filename
+        self.quiet = quiet
+        self.guard = guard
+        self.binary = binary
+        self.data = None
+        self.changed = False
+        if binary:
+            self.fp = io.BytesIO()
+            return
+        fp = io.StringIO()
+        if filename.endswith(".py"):
+            fp.write("# This file is automatically generated.\n")
+        else:
             fp.write("/* This file is automatically generated. */\n")
-            if guard is not None:
-                fp.write("#ifndef {0}\n#define {0}\n".format(guard))
-        except:
-            fp.close()
-            raise
+        if guard is not None:
+            fp.write("#ifndef {0}\n#define {0}\n".format(guard))
         self.fp = fp
-        self.guard = guard
 
     def __enter__(self):
         return self.fp
 
     def __exit__(self, exc_type, exc_value, exc_tb):
-        try:
-            if exc_type is None:
-                if self.guard is not None:
-                    self.fp.write("#endif\n")
-        finally:
-            self.fp.close()
+        if exc_type is None:
+            if self.guard is not None:
+                self.fp.write("#endif\n")
+            self.data = self.fp.getvalue()
+            if not self.binary:
+                self.data = self.data.encode("UTF-8")
+            metrics.count("files")
+            metrics.count("bytes_emitted", len(self.data))
+            if self.path is not None:
+                with metrics.stage("write"):
+                    self._write()
         if isinstance(exc_value, Error):
-            if exc_value.filename is not None:
+            if exc_value.filename is None:
                 exc_value.filename = self.filename
 
+    def _write(self):
+        try:
+            with open(self.path, "rb") as fp:
+                if fp.read() == self.data:
+                    return
+        except FileNotFoundError:
+            pass
+        except OSError as ex:
+            raise Error("Could not read output file: {}".format(ex),
+                        filename=self.filename)
+        if not self.quiet:
+            print("Writing", self.filename, file=sys.stderr)
+        # Write a temporary file and move it into place, rather than
+        # truncating the old file, which may be mapped by a running program.
+        tmppath = self.path + ".tmp"
+        try:
+            with open(tmppath, "wb") as fp:
+                fp.write(self.data)
+            os.replace(tmppath, self.path)
+        except OSError as ex:
+            try:
+                os.remove(tmppath)
+            except OSError:
+                pass
+            raise Error("Could not create output file: {}".format(ex),
+                        filename=self.filename)
+        self.changed = True
 
-def format_data(data, indent):
+
+@metrics.timed("format")
+def format_data(data, indent, *, prefix="", terminated=True):
     """Format a bytestring as a C string literal.
 
+    The same syntax is also valid for Python bytes literals, if the prefix is
+    "b" and the literal is enclosed in parentheses.
+
     Arguments:
       data: Bytestring to write
       indent: Indentation for each line, a string
+      prefix: Prefix to write before each quoted string
+      terminated: If true, trailing NUL bytes are omitted, because C string
+        literals have an implicit NUL terminator
     Returns:
       A multiline string containing the code, with indentation before every line
       including the first. There is no final newline.
     """
     fp = io.StringIO()
     fp.write(indent)
+    fp.write(prefix)
     fp.write('"')
-    rem = 80 - 3 - len(indent)
+    width = 80 - 3 - len(indent) - len(prefix)
+    rem = width
 
     def advance(n):
         nonlocal rem
         if rem < n:
             fp.write('"\n')
             fp.write(indent)
+            fp.write(prefix)
             fp.write('"')
-            rem = 80 - 3 - len(indent)
+            rem = width
         rem -= n
 
-    for n, c in enumerate(data.rstrip(b"\0")):
+    if terminated:
+        data = data.rstrip(b"\0")
+    for n, c in enumerate(data):
         if 32 <= c <= 126:
             if c in b'\\"':
                 advance(2)
@@ -92,6 +159,7 @@ def format_data(data, indent):
     return fp.getvalue()
 
 
+@metrics.timed("format")
 def format_numbers(numbers, indent):
     """Format an array as comma-separated values across multiple lines.
 
@@ -124,9 +192,16 @@ def format_numbers(numbers, indent):
     return fp.getvalue()
 
 
+@metrics.timed("make_string_table")
 def make_string_table(strings):
     """Combine many strings into a single bytestring.
 
+    Strings are NUL-terminated, so the only way two strings can share storage
+    is if one is a suffix of the other. Any other overlap would leave one of the
+    strings without a terminator. Suffixes are found by sorting the reversed
+    strings: a string is a suffix of another string if and only if it is a
+    suffix of the string which follows it in this order.
+
     Arguments:
       strings: List of strings
 
@@ -135,20 +210,31 @@ def make_string_table(strings):
       data, and strmap maps the input strings to their offsets in the
       bytestring. An empty string is always present at offset 0.
     """
-    strset = set()
-    strlist = []
-    for s in sorted(strings, key=lambda s: len(s), reverse=True):
-        if s not in strset:
-            strlist.append(s)
-            strset.update(s[n:] for n in range(len(s)))
-    strlist.sort()
+    rstrings = sorted({s[::-1] for s in strings if s})
+    # Map from each reversed string to the reversed string containing it.
+    container = {}
+    following = None
+    for r in reversed(rstrings):
+        if following is not None and following.startswith(r):
+            container[r] = container[following]
+        else:
+            container[r] = r
+        following = r
+    strlist = sorted(r[::-1] for r, c in container.items() if r is c)
     result = io.BytesIO()
     result.write(b"\0")
+    offsets = {}
     for s in strlist:
-        result.write(s.encode("ASCII"))
+        offsets[s] = result.tell()
+        result.write(s.encode("UTF-8"))
         result.write(b"\0")
     data = result.getvalue()
-    strmap = {s: data.index(s.encode("ASCII") + b"\0") for s in strings}
+    strmap = {"": 0}
+    for r, c in container.items():
+        s = c[::-1]
+        strmap[r[::-1]] = offsets[s] + len(s) - len(r)
+    metrics.count("strings", len(strmap) - 1)
+    metrics.count("string_bytes", len(data))
     return data, strmap
 
 
@@ -161,9 +247,12 @@ def ctype(maxval):
     return "unsigned"
 
 
-NAMEMAP_TEMPLATE = """\
-static const char {uname}_DATA[] =
+NAMEMAP_DATA_TEMPLATE = """\
+static const char {dname}[] =
 {ddata};
+"""
+
+NAMEMAP_DENSE_TEMPLATE = """\
 static const {otype} {uname}_OFFSET[] = {{
 {odata}
 }};
@@ -174,21 +263,75 @@ const char *{lname}(unsigned index) {{
     offset = {uname}_OFFSET[index];
     if (offset == 0)
         return 0;
-    return {uname}_DATA + offset;
+    return {dname} + offset;
 }}
 """
 
+NAMEMAP_BITMAP_TEMPLATE = """\
+static const unsigned long {uname}_BITMAP[] = {{
+{bdata}
+}};
+static const {rtype} {uname}_RANK[] = {{
+{rdata}
+}};
+static const {otype} {uname}_OFFSET[] = {{
+{odata}
+}};
+const char *{lname}(unsigned index) {{
+    unsigned long word, bit;
+    unsigned rank;
+    if ({count} <= index)
+        return 0;
+    word = {uname}_BITMAP[index >> 5];
+    bit = 1ul << (index & 31);
+    if ((word & bit) == 0)
+        return 0;
+    /* Count the names below this one in the same word. */
+    word &= bit - 1;
+    word -= (word >> 1) & 0x55555555ul;
+    word = (word & 0x33333333ul) + ((word >> 2) & 0x33333333ul);
+    word = (word + (word >> 4)) & 0x0f0f0f0ful;
+    rank = {uname}_RANK[index >> 5] +
+           (unsigned)(((word * 0x01010101ul) & 0xfffffffful) >> 24);
+    return {dname} + {uname}_OFFSET[rank];
+}}
+"""
 
-def make_namemap(table, fname):
-    """Create a function that maps integers to strings.
+NAMEMAP_SORTED_TEMPLATE = """\
+static const {ktype} {uname}_KEY[] = {{
+{kdata}
+}};
+static const {otype} {uname}_OFFSET[] = {{
+{odata}
+}};
+const char *{lname}(unsigned index) {{
+    unsigned lo = 0, hi = {size}, mid;
+    while (lo < hi) {{
+        mid = (lo + hi) / 2;
+        if ({uname}_KEY[mid] < index)
+            lo = mid + 1;
+        else
+            hi = mid;
+    }}
+    if (lo == {size} || {uname}_KEY[lo] != index)
+        return 0;
+    return {dname} + {uname}_OFFSET[lo];
+}}
+"""
+
+# Encodings for name maps, fastest first. The smallest encoding is used, and
+# ties go to the faster encoding.
+NAMEMAP_ENCODINGS = ["dense", "bitmap", "sorted"]
+
+# Number of entries in each word of a name map bitmap.
+BITMAP_BITS = 32
+
+
+def check_namemap(table):
+    """Check that a name table maps each code to at most one name.
 
-    Arguments:
-      table: List of (input, output) pairs, where inputs are integers and
-        outputs are strings
-      fname: The output function name
     Returns:
-      A string, contaning C source code which defines a function converting
-      integers to strings according to the table.
+      A map from code to name
     """
     kmap = {}
     for code, kname in table:
@@ -197,37 +340,278 @@ def make_namemap(table, fname):
             raise Error("Name conflict: code {} is {!r} and {!r}".format(
                 code, kname, kname2))
         kmap[code] = kname
-    data, strmap = make_string_table([kname for (code, kname) in table])
+    return kmap
+
+
+def csize(maxval):
+    """Return the size in bytes of the type returned by ctype."""
+    if maxval < (1 << 8):
+        return 1
+    if maxval < (1 << 16):
+        return 2
+    return 4
+
+
+def namemap_sizes(count, codes, offsets):
+    """Compute the size of the arrays for each name map encoding.
+
+    Arguments:
+      count: Number of entries in a dense table
+      codes: List of codes which have names, in increasing order
+      offsets: List of string offsets for the codes
+    Returns:
+      A map from encoding name to size in bytes
+    """
+    osize = len(offsets) * csize(max(offsets))
+    nwords = (count + BITMAP_BITS - 1) // BITMAP_BITS
+    return {
+        "dense": count * csize(max(offsets)),
+        "bitmap": nwords * (4 + csize(len(offsets))) + osize,
+        "sorted": len(codes) * csize(codes[-1]) + osize,
+    }
+
+
+def make_namemap(table, fname, pool=None):
+    """Create a function that maps integers to strings.
+
+    The offsets of the strings are stored with whichever encoding is smallest:
+    a dense array indexed by code; a bitmap of the codes which have names,
+    with the number of names before each word of the bitmap; or a sorted array
+    of the codes which have names, searched with binary search. The encoding
+    and the size of each encoding are written in a comment.
+
+    Arguments:
+      table: List of (input, output) pairs, where inputs are integers and
+        outputs are strings
+      fname: The output function name
+      pool: A StringPool containing the strings, or None to emit the strings
+        together with the function
+    Returns:
+      A string, contaning C source code which defines a function converting
+      integers to strings according to the table.
+    """
+    check_namemap(table)
+    if pool is None:
+        data, strmap = make_string_table([kname for (code, kname) in table])
+        dname = "{}_DATA".format(fname.upper())
+    else:
+        data, strmap = pool.data, pool.strmap
+        dname = pool.name
     count = max(code for code, kname in table) + 1
     stridx = [0] * count
     for code, kname in table:
         stridx[code] = strmap[kname]
-    return NAMEMAP_TEMPLATE.format(
-        lname=fname.lower(),
-        uname=fname.upper(),
-        ddata=format_data(data, "    "),
-        odata=format_numbers(stridx, "    "),
-        otype=ctype(max(stridx)),
-        count=count,
-    )
+    codes = [code for code, offset in enumerate(stridx) if offset]
+    if not codes:
+        raise Error("Name table for {} is empty".format(fname))
+    offsets = [stridx[code] for code in codes]
+    sizes = namemap_sizes(count, codes, offsets)
+    encoding = min(NAMEMAP_ENCODINGS, key=lambda name: sizes[name])
+    metrics.count("namemap_" + encoding)
+    fmt = {
+        "lname": fname.lower(),
+        "uname": fname.upper(),
+        "dname": dname,
+        "count": count,
+        "otype": ctype(max(offsets)),
+    }
+    if encoding == "dense":
+        template = NAMEMAP_DENSE_TEMPLATE
+        fmt["odata"] = format_numbers(stridx, "    ")
+    else:
+        fmt["odata"] = format_numbers(offsets, "    ")
+        if encoding == "bitmap":
+            template = NAMEMAP_BITMAP_TEMPLATE
+            nwords = (count + BITMAP_BITS - 1) // BITMAP_BITS
+            words = [0] * nwords
+            for code in codes:
+                words[code // BITMAP_BITS] |= 1 << (code % BITMAP_BITS)
+            ranks = [0] * nwords
+            for n in range(1, nwords):
+                ranks[n] = ranks[n - 1] + bin(words[n - 1]).count("1")
+            fmt["bdata"] = format_numbers(
+                ["0x{:08x}ul".format(word) for word in words], "    ")
+            fmt["rtype"] = ctype(ranks[-1])
+            fmt["rdata"] = format_numbers(ranks, "    ")
+        else:
+            template = NAMEMAP_SORTED_TEMPLATE
+            fmt["size"] = len(codes)
+            fmt["ktype"] = ctype(codes[-1])
+            fmt["kdata"] = format_numbers(codes, "    ")
+    code = "/* Name map encoding: {}, {} bytes.\n   Sizes: {}. */\n".format(
+        encoding, sizes[encoding],
+        ", ".join("{} {}".format(name, sizes[name])
+                  for name in NAMEMAP_ENCODINGS))
+    if pool is None:
+        code += NAMEMAP_DATA_TEMPLATE.format(dname=dname,
+                                             ddata=format_data(data, "    "))
+    return code + template.format(**fmt)
+
+
+class StringPool:
+    """A string table shared by many name maps.
+
+    Attributes:
+      name: Name of the C array containing the string data
+      data: The string data, a bytestring
+      strmap: Map from strings to offsets in the data
+      separate_size: Total size of the string data if every name table had
+        its own string table
+    """
+
+    def __init__(self, tables, name="KEYCODE_STRING_DATA"):
+        """Create a string pool for a list of name tables.
+
+        Arguments:
+          tables: List of name tables, each a list of (code, name) pairs
+        """
+        strings = set()
+        separate_size = 0
+        for table in tables:
+            names = [kname for code, kname in table]
+            strings.update(names)
+            separate_size += len(make_string_table(names)[0])
+        self.name = name
+        self.data, self.strmap = make_string_table(sorted(strings))
+        self.separate_size = separate_size
+
+
+STRING_POOL_HEADER_TEMPLATE = """\
+extern const char {name}[];
+"""
+
+STRING_POOL_TEMPLATE = """\
+#include "keycode_strings.h"
+const char {name}[] =
+{data};
+"""
+
+
+def emit_string_pool(open_file, pool):
+    """Emit the shared string pool."""
+    with open_file("keycode_strings.h", guard="KEYCODE_STRINGS_H") as fp:
+        fp.write(STRING_POOL_HEADER_TEMPLATE.format(name=pool.name))
+    with open_file("keycode_strings.c") as fp:
+        fp.write(
+            STRING_POOL_TEMPLATE.format(name=pool.name,
+                                        data=format_data(pool.data, "    ")))
+
+
+def keycode_names(hid_table):
+    """Get the name table for HID keycode identifiers."""
+    return [(key.code, key.name.replace(" ", "")) for key in hid_table]
+
+
+def keytable_names(keytable):
+    """Get the name tables for a platform keycode table."""
+    return [keytable.scancodes, keytable.displaynames]
 
 
 XTABLE_TEMPLATE = """\
-const unsigned char {name}[{size}] = {{
+const {etype} {name}[{size}] = {{
 {data}
 }};
 """
 
 
 def make_xtable(table, name):
-    """Format a translation table as C source code."""
+    """Format a translation table as C source code.
+
+    The element type is the smallest unsigned type which holds every entry.
+    """
     return XTABLE_TEMPLATE.format(
         name=name,
+        etype=ctype(max(table)),
         size=len(table),
         data=format_numbers(table, "    "),
     )
 
 
+# Number of bits in the index within a page of a paged translation table.
+PAGE_BITS = 8
+PAGE_SIZE = 1 << PAGE_BITS
+
+
+def split_pages(table):
+    """Split a translation table into pages.
+
+    Trailing empty pages are removed, and identical pages are stored once, so
+    every empty page shares the same storage.
+
+    Arguments:
+      table: List of integers, where 0 indicates no entry
+    Returns:
+      (directory, pages), where pages is a list of distinct pages and directory
+      maps each page number to an index in pages
+    """
+    npages = 1
+    for n, value in enumerate(table):
+        if value:
+            npages = max(npages, (n >> PAGE_BITS) + 1)
+    directory = []
+    pages = []
+    index = {}
+    for n in range(npages):
+        page = tuple(table[n * PAGE_SIZE:(n + 1) * PAGE_SIZE])
+        page += (0, ) * (PAGE_SIZE - len(page))
+        pos = index.get(page)
+        if pos is None:
+            pos = len(pages)
+            pages.append(page)
+            index[page] = pos
+        directory.append(pos)
+    return directory, pages
+
+
+PAGED_TEMPLATE = """\
+static const {etype} {name}_PAGES[{npages}][{psize}] = {{
+{pages}
+}};
+static const {dtype} {name}_DIRECTORY[{ndir}] = {{
+{directory}
+}};
+"""
+
+
+def make_paged_xtable(table, name):
+    """Format a translation table as a two-level paged table in C.
+
+    The first page is emitted as an ordinary array with the given name, so
+    small scancodes can be looked up directly. The remaining pages are emitted
+    as an array of distinct pages, {name}_PAGES, and a directory which maps
+    each page number, minus one, to an index in {name}_PAGES.
+
+    Returns:
+      (code, limit), where code is the C source code and limit is the number
+      of entries in the table, after removing trailing empty pages
+    """
+    directory, pages = split_pages(table)
+    etype = ctype(max(table))
+    code = XTABLE_TEMPLATE.format(
+        name=name,
+        etype=etype,
+        size=PAGE_SIZE,
+        data=format_numbers(pages[directory[0]], "    "),
+    )
+    if len(directory) > 1:
+        # Only keep the pages referenced from the directory.
+        used = sorted(set(directory[1:]))
+        renumber = {pos: n for n, pos in enumerate(used)}
+        code += PAGED_TEMPLATE.format(
+            name=name,
+            etype=etype,
+            npages=len(used),
+            psize=PAGE_SIZE,
+            pages=",\n".join("    {{\n{}\n    }}".format(
+                format_numbers(pages[pos], "        ")) for pos in used),
+            dtype=ctype(len(used) - 1),
+            ndir=len(directory) - 1,
+            directory=format_numbers([renumber[pos] for pos in directory[1:]],
+                                     "    "),
+        )
+    return code, len(directory) * PAGE_SIZE
+
+
 TOHID_TEMPLATE = """\
 unsigned keycode_{name}_to_hid(unsigned scancode) {{
     if (scancode >= {size})
@@ -236,37 +620,234 @@ unsigned keycode_{name}_to_hid(unsigned scancode) {{
 }}
 """
 
+TOHID_PAGED_TEMPLATE = """\
+unsigned keycode_{name}_to_hid(unsigned scancode) {{
+    if (scancode < {psize})
+        return KEYCODE_{uname}_TO_HID[scancode];
+    if (scancode >= {size})
+        return 0;
+    return KEYCODE_{uname}_TO_HID_PAGES
+        [KEYCODE_{uname}_TO_HID_DIRECTORY[(scancode >> {pbits}) - 1]]
+        [scancode & {pmask}];
+}}
+"""
+
+
+FROMHID_ALL_TEMPLATE = """\
+#include "keytable.h"
+const unsigned short KEYCODE_{uname}_FROM_HID_OFFSET[257] = {{
+{offsets}
+}};
+const unsigned short KEYCODE_{uname}_FROM_HID_ALL[{count}] = {{
+{codes}
+}};
+unsigned keycode_{name}_from_hid_all(unsigned hid_keycode,
+                               {pad}const unsigned short **scancodes) {{
+    unsigned start;
+    if (hid_keycode >= 256) {{
+        *scancodes = KEYCODE_{uname}_FROM_HID_ALL;
+        return 0;
+    }}
+    start = KEYCODE_{uname}_FROM_HID_OFFSET[hid_keycode];
+    *scancodes = KEYCODE_{uname}_FROM_HID_ALL + start;
+    return KEYCODE_{uname}_FROM_HID_OFFSET[hid_keycode + 1] - start;
+}}
+"""
+
+# Limit for entries in the unsigned short arrays of the multimap.
+FROMHID_ALL_LIMIT = 1 << 16
+
 
-def emit_keytable(open_file, keytable):
-    """Emit the code files for a keycode table."""
+def make_fromhid_all(keytable):
+    """Format the table of every scancode for each HID keycode as C code.
+
+    The table is in compressed sparse row form: the scancodes for HID keycode N
+    are at indexes OFFSET[N] through OFFSET[N+1]-1 of a single array.
+    """
+    name = keytable.name.lower()
+    offsets = [0]
+    codes = []
+    for scancodes in keytable.from_hid_all:
+        codes.extend(scancodes)
+        offsets.append(len(codes))
+    if len(offsets) != 257:
+        raise Error("Table from HID keycodes has {} entries".format(
+            len(offsets) - 1))
+    if not codes:
+        raise Error("No scancodes are mapped")
+    if len(codes) >= FROMHID_ALL_LIMIT or max(codes) >= FROMHID_ALL_LIMIT:
+        raise Error("Scancodes do not fit in table from HID keycodes")
+    return FROMHID_ALL_TEMPLATE.format(
+        name=name,
+        uname=name.upper(),
+        pad=" " * len(name),
+        offsets=format_numbers(offsets, "    "),
+        count=len(codes),
+        codes=format_numbers(codes, "    "),
+    )
+
+
+BATCH_TEMPLATE = """\
+#include "keytable.h"
+
+/* {comment} */
+void keycode_{name}_to_hid_n(const unsigned *scancodes,
+                       {pad}unsigned char *hid_keycodes, size_t n) {{
+    size_t i;
+    unsigned x, y;
+    for (i = 0; i < n; i++) {{
+        x = scancodes[i];
+        y = KEYCODE_{uname}_TO_HID[{index}];
+        hid_keycodes[i] ={select};
+    }}
+}}
+
+void keycode_{name}_from_hid_n(const unsigned *hid_keycodes,
+                         {pad}unsigned char *scancodes, size_t n) {{
+    size_t i;
+    unsigned x, y;
+    for (i = 0; i < n; i++) {{
+        x = hid_keycodes[i];
+        y = KEYCODE_{uname}_FROM_HID[x & 255];
+        scancodes[i] = (unsigned char)(x < 256 ? y : KEYCODE_NONE);
+    }}
+}}
+"""
+
+BATCH_COMMENT = """\
+The loops read the tables in bounds for any input and select the result
+   afterwards, so they have no branches."""
+
+BATCH_PAGED_COMMENT = """\
+The loops read the tables in bounds for any input and select the result
+   afterwards. Keycodes past the first page of the table are rare, and use the
+   paged lookup instead."""
+
+# Additional batch functions for specific platforms.
+BATCH_EXTRA = {
+    "windows":
+    """
+void keycode_windows_lparam_to_hid_n(const unsigned *lparams,
+                                     unsigned char *hid_keycodes, size_t n) {
+    size_t i;
+    unsigned x;
+    /* Same as keycode_windows_from_lparam: bit 24, the extended key flag,
+       moves to bit 7. The result is always in bounds. */
+    for (i = 0; i < n; i++) {
+        x = lparams[i];
+        hid_keycodes[i] =
+            KEYCODE_WINDOWS_TO_HID[((x >> 16) & 0x7f) | ((x >> 17) & 0x80)];
+    }
+}
+""",
+}
+
+
+def table_index(size):
+    """Get a C expression for an index of x which is always below size.
+
+    The expression is equal to x when x is below size.
+    """
+    if size & (size - 1) == 0:
+        return "x & {}".format(size - 1)
+    return "x < {0} ? x : 0".format(size)
+
+
+def make_batch(keytable):
+    """Format the batch translation functions for a platform as C code.
+
+    The functions use the tables from make_xtable or make_paged_xtable. For a
+    paged table, scancodes past the first page call the single lookup function.
+    """
+    name = keytable.name.lower()
+    size = len(keytable.to_hid_table)
+    comment = BATCH_COMMENT
+    select = " (unsigned char)(x < {} ? y : 0)".format(min(size, PAGE_SIZE))
+    if size > PAGE_SIZE:
+        directory, pages = split_pages(keytable.to_hid_table)
+        size = PAGE_SIZE
+        if len(directory) > 1:
+            comment = BATCH_PAGED_COMMENT
+            select = ("\n            (unsigned char)(x < {} ? y : "
+                      "keycode_{}_to_hid(x))".format(size, name))
+    code = BATCH_TEMPLATE.format(
+        name=name,
+        uname=name.upper(),
+        pad=" " * len(name),
+        size=size,
+        index=table_index(size),
+        comment=comment,
+        select=select,
+    )
+    return code + BATCH_EXTRA.get(name, "")
+
+
+def namemap_head(pool):
+    """Get the includes for a file containing name maps."""
+    if pool is None:
+        return '#include "keytable.h"\n'
+    return '#include "keytable.h"\n#include "keycode_strings.h"\n'
+
+
+def emit_keytable(open_file, keytable, pool=None):
+    """Emit the code files for a keycode table.
+
+    Arguments:
+      open_file: Function to open an output file
+      keytable: The Keytable object
+      pool: A StringPool containing the names, or None
+    """
     name = keytable.name.lower()
     common_head = '#include "keytable.h"\n'
     with open_file("{}_rawname.c".format(name)) as fp:
-        fp.write(common_head)
+        fp.write(namemap_head(pool))
         fp.write(
             make_namemap(keytable.scancodes,
-                         "keycode_{}_rawname".format(name)))
+                         "keycode_{}_rawname".format(name), pool))
     with open_file("{}_name.c".format(name)) as fp:
-        fp.write(common_head)
+        fp.write(namemap_head(pool))
         fp.write(
             make_namemap(keytable.displaynames,
-                         "keycode_{}_name".format(name)))
+                         "keycode_{}_name".format(name), pool))
     with open_file("{}_tohid.c".format(name)) as fp:
         fp.write(common_head)
+        table = keytable.to_hid_table
+        tname = "KEYCODE_{}_TO_HID".format(name.upper())
+        if len(table) <= PAGE_SIZE:
+            fp.write(make_xtable(table, tname))
+            template = TOHID_TEMPLATE
+            size = len(table)
+        else:
+            code, size = make_paged_xtable(table, tname)
+            fp.write(code)
+            if size > PAGE_SIZE:
+                template = TOHID_PAGED_TEMPLATE
+            else:
+                template = TOHID_TEMPLATE
         fp.write(
-            make_xtable(keytable.to_hid_table,
-                        "KEYCODE_{}_TO_HID".format(name.upper())))
-        fp.write(
-            TOHID_TEMPLATE.format(
+            template.format(
                 name=name,
                 uname=name.upper(),
-                size=len(keytable.to_hid_table),
+                size=size,
+                psize=PAGE_SIZE,
+                pbits=PAGE_BITS,
+                pmask=PAGE_SIZE - 1,
             ))
     with open_file("{}_fromhid.c".format(name)) as fp:
         fp.write(common_head)
         fp.write(
             make_xtable(keytable.from_hid_table,
                         "KEYCODE_{}_FROM_HID".format(name.upper())))
+    with open_file("{}_fromhid_all.c".format(name)) as fp:
+        fp.write(make_fromhid_all(keytable))
+    with open_file("{}_batch.c".format(name)) as fp:
+        fp.write(make_batch(keytable))
+    if keytable.modifier_flags is not None:
+        modifier, modflags = make_modifier_flags(keytable)
+        with open_file("{}_modifier.c".format(name)) as fp:
+            fp.write(modifier)
+        with open_file("{}_modflags.c".format(name)) as fp:
+            fp.write(modflags)
 
 
 KEYCODE_TEMPLATE = """\
@@ -305,16 +886,28 @@ def enum_name(name):
 
 KEYCODE_ID_TEMPLATE = """\
 enum {{
-    KEYCODE_ID_MAXLEN = {maxlen}
+    KEYCODE_ID_MAXLEN = {maxlen},
+    KEYCODE_ID_SEED = {seed},
+    KEYCODE_ID_BUCKETS = {nbuckets},
+    KEYCODE_ID_SLOTS = {nslots}
+}};
+static const {dtype} KEYCODE_ID_DISPLACEMENT[] = {{
+{displacements}
 }};
-static const unsigned char KEYCODE_ID_ORDER[] = {{
-{order}
+static const {stype} KEYCODE_ID_SLOT[] = {{
+{slots}
 }};
 """
 
 
-def emit_keycodes(open_file, hid_table):
-    """Emit the cross-platform generated source files."""
+def emit_keycodes(open_file, hid_table, pool=None):
+    """Emit the cross-platform generated source files.
+
+    Arguments:
+      open_file: Function to open an output file
+      hid_table: List of HID Keycode objects which are used on any platform
+      pool: A StringPool containing the identifiers, or None
+    """
     enums = io.StringIO()
     last = hid_table[-1]
     for key in hid_table:
@@ -323,19 +916,503 @@ def emit_keycodes(open_file, hid_table):
             enums.write(",\n")
     with open_file("keycode.h", guard="KEYCODE_KEYCODE_H") as fp:
         fp.write(KEYCODE_TEMPLATE.format(enums.getvalue()))
-    idents = [(key.code, key.name.replace(" ", "")) for key in hid_table]
-    alpha_order = [
-        code for code, ident in sorted(idents, key=lambda x: x[1].lower())
-    ]
+    idents = keycode_names(hid_table)
+    codes = {ident.lower(): code for code, ident in idents}
+    hashtable = phash.make_perfect_hash(sorted(codes))
+    slots = [codes[ident] for ident in hashtable.slots]
     dirpath = os.path.dirname(os.path.abspath(__file__))
     with open(os.path.join(dirpath, "keycode_id.c")) as fp:
         keycode_id = fp.read()
     with open_file("keycode_id.c") as fp:
-        fp.write('#include "keytable.h"\n')
-        fp.write(make_namemap(idents, "keycode_to_id"))
+        fp.write(namemap_head(pool))
+        fp.write(make_namemap(idents, "keycode_to_id", pool))
         fp.write(
             KEYCODE_ID_TEMPLATE.format(
                 maxlen=max(len(ident) for code, ident in idents),
-                order=format_numbers(alpha_order, "    "),
+                seed=hashtable.seed,
+                nbuckets=len(hashtable.displacements),
+                nslots=len(slots),
+                dtype=ctype(max(hashtable.displacements)),
+                displacements=format_numbers(hashtable.displacements, "    "),
+                stype=ctype(max(slots)),
+                slots=format_numbers(slots, "    "),
             ))
         fp.write(keycode_id)
+
+
+STATE_HEADER_TEMPLATE = """\
+#ifdef __cplusplus
+extern "C" {{
+#endif
+
+/* Modifier masks. Each modifier key has one bit in a modifier mask, and
+   KEYCODE_MOD_ALL contains every modifier key. */
+enum {{
+{masks}
+}};
+
+enum {{
+    /* Number of words in a key state bitmap. */
+    KEYCODE_STATE_WORDS = 8
+}};
+
+/* The set of keys which are pressed, with one bit for each HID keycode. The
+   state for HID keycode N is bit (N & 31) of bits[N >> 5]. Only the low 32 bits
+   of each word are used. Key states are compared and combined with bitwise
+   operations on the words, instead of one test per key. */
+struct keycode_state {{
+    unsigned long bits[KEYCODE_STATE_WORDS];
+}};
+
+/* Mapping from HID keycodes to modifier masks. Keys which are not modifiers
+   map to 0. */
+extern const {mtype} KEYCODE_HID_MODIFIER[256];
+
+/* Clear every key in a key state. */
+void keycode_state_reset(struct keycode_state *state);
+
+/* Mark a key as pressed. Keycodes 256 and higher are ignored. */
+void keycode_state_set(struct keycode_state *state, unsigned hid_keycode);
+
+/* Mark a key as released. Keycodes 256 and higher are ignored. */
+void keycode_state_clear(struct keycode_state *state, unsigned hid_keycode);
+
+/* Test whether a key is pressed. Returns 0 for keycodes 256 and higher. */
+int keycode_state_test(const struct keycode_state *state,
+                       unsigned hid_keycode);
+
+/* Get the modifier mask for the pressed modifier keys. */
+unsigned keycode_state_modifiers(const struct keycode_state *state);
+
+/* Compare the key states from two frames. Keys which are pressed in cur but
+   not prev are set in pressed, and keys which are pressed in prev but not cur
+   are set in released. The outputs may be the same as the inputs. */
+void keycode_state_diff(const struct keycode_state *prev,
+                        const struct keycode_state *cur,
+                        struct keycode_state *pressed,
+                        struct keycode_state *released);
+
+/* Get the first pressed key with a keycode greater than or equal to the given
+   keycode. Returns 256 if there is none. To loop over the pressed keys:
+
+   for (k = keycode_state_next(s, 0); k < 256; k = keycode_state_next(s, k+1))
+*/
+unsigned keycode_state_next(const struct keycode_state *state,
+                            unsigned hid_keycode);
+
+#ifdef __cplusplus
+}} /* extern "C" */
+#endif
+"""
+
+# The modifier mask for the modifier keys is read from the key state with one
+# operation when the keys are consecutive and fit in one word.
+STATE_MODIFIERS_FAST_TEMPLATE = """
+unsigned keycode_state_modifiers(const struct keycode_state *state) {{
+    return (unsigned){word} & 0x{mask:x}u;
+}}
+"""
+
+STATE_MODIFIERS_TEMPLATE = """
+static const unsigned char KEYCODE_MODIFIER_KEY[{count}] = {{
+{keys}
+}};
+
+unsigned keycode_state_modifiers(const struct keycode_state *state) {{
+    unsigned i, mask = 0;
+    for (i = 0; i < {count}; i++) {{
+        if (keycode_state_test(state, KEYCODE_MODIFIER_KEY[i])) {{
+            mask |= KEYCODE_HID_MODIFIER[KEYCODE_MODIFIER_KEY[i]];
+        }}
+    }}
+    return mask;
+}}
+"""
+
+
+def modifier_enum_name(name):
+    """Translate an HID name to a modifier mask enumeration name."""
+    return "KEYCODE_MOD_" + name.upper().replace(" ", "_")
+
+
+def make_state_modifiers(modifiers):
+    """Format the keycode_state_modifiers function as C source code."""
+    base = modifiers[0].code - modifiers[0].bit
+    last = max(mod.bit for mod in modifiers)
+    if (base >= 0 and base % 32 + last < 32
+            and all(mod.code - mod.bit == base for mod in modifiers)):
+        word = "state->bits[{}]".format(base >> 5)
+        if base % 32:
+            word = "({} >> {})".format(word, base % 32)
+        mask = 0
+        for mod in modifiers:
+            mask |= 1 << mod.bit
+        return STATE_MODIFIERS_FAST_TEMPLATE.format(word=word, mask=mask)
+    return STATE_MODIFIERS_TEMPLATE.format(
+        count=len(modifiers),
+        keys=format_numbers([mod.code for mod in modifiers], "    "))
+
+
+def emit_state(open_file, modifiers):
+    """Emit the key state and modifier mask source files.
+
+    Arguments:
+      open_file: Function to open an output file
+      modifiers: List of Modifier objects, sorted by bit
+    """
+    if not modifiers:
+        raise Error("No modifier keys")
+    mask = 0
+    masks = io.StringIO()
+    for mod in modifiers:
+        masks.write("    {} = 0x{:04x},\n".format(modifier_enum_name(mod.name),
+                                                  1 << mod.bit))
+        mask |= 1 << mod.bit
+    masks.write("    KEYCODE_MOD_ALL = 0x{:04x}".format(mask))
+    table = [0] * 256
+    for mod in modifiers:
+        table[mod.code] = 1 << mod.bit
+    with open_file("keycode_state.h", guard="KEYCODE_KEYCODE_STATE_H") as fp:
+        fp.write(
+            STATE_HEADER_TEMPLATE.format(masks=masks.getvalue(),
+                                         mtype=ctype(mask)))
+    dirpath = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(dirpath, "keycode_state.c")) as fp:
+        keycode_state = fp.read()
+    with open_file("keycode_state.c") as fp:
+        fp.write('#include "keycode_state.h"\n')
+        fp.write(make_xtable(table, "KEYCODE_HID_MODIFIER"))
+        fp.write(make_state_modifiers(modifiers))
+        fp.write(keycode_state)
+
+
+MODIFIER_TEMPLATE = """\
+/* Copyright 2019 Dietrich Epp.
+   This file is licensed under the terms of the MIT license. See LICENSE.txt
+   for details. */
+#include "keytable.h"
+
+/* {comment} */
+static const {etype} KEYCODE_{uname}_MODIFIER[{size}] = {{
+{data}
+}};
+
+unsigned keycode_{name}_modifier(unsigned {name}_keycode) {{
+    if ({test}) {{
+        return KEYCODE_{uname}_MODIFIER[{name}_keycode - {first}];
+    }}
+    return 0;
+}}
+"""
+
+# Explanation of the table of modifier flags for each platform.
+MODIFIER_COMMENTS = {
+    "macos":
+    """\
+For modifiers, we receive NSEventTypeFlagsChanged. This contains the keycode
+   of the modifier which changed, but in order to tell the difference between
+   key up and key down, we have to examine the modifier flags. This maps the
+   modifiers to their associated flags.
+
+   The flag values can be found in IOLLEvent.h. Note that we do not include the
+   function key. This is by design.""",
+}
+
+MODFLAGS_TEMPLATE = """\
+#include "keytable.h"
+#include "keycode_state.h"
+
+const struct keycode_modifier_flag KEYCODE_{uname}_MODIFIER_FLAGS[] = {{
+{flags}
+    {{0, 0, 0}}
+}};
+
+unsigned keycode_{name}_modifiers(unsigned long flags) {{
+    const struct keycode_modifier_flag *p;
+    unsigned mask = 0;
+    for (p = KEYCODE_{uname}_MODIFIER_FLAGS; p->flag != 0; p++) {{
+        if ((flags & p->flag) != 0) {{
+            mask |= KEYCODE_HID_MODIFIER[p->hid_keycode];
+        }}
+    }}
+    return mask;
+}}
+"""
+
+
+def make_modifier_flags(keytable):
+    """Format the modifier flag tables for a platform as C source code.
+
+    Returns:
+      (modifier, modflags), the code for the table from scancodes to flags, and
+      the code for the table from flags to keys, which uses keycode_state.c
+    """
+    name = keytable.name.lower()
+    flags = keytable.modifier_flags
+    first = min(flag.scancode for flag in flags)
+    last = max(flag.scancode for flag in flags)
+    table = [None] * (last - first + 1)
+    for flag in flags:
+        table[flag.scancode - first] = flag
+    rawnames = dict(keytable.scancodes)
+    displaynames = dict(keytable.displaynames)
+    data = []
+    for flag in table:
+        if flag is None:
+            data.append("    0x00000000,")
+        else:
+            data.append("    0x{:08x}, /* {}: {} */".format(
+                flag.flag, displaynames[flag.code], flag.constant))
+    test = "{}_keycode <= {}".format(name, last)
+    if first:
+        test = "{} <= {}_keycode && {}".format(first, name, test)
+    modifier = MODIFIER_TEMPLATE.format(
+        name=name,
+        uname=name.upper(),
+        first=first,
+        comment=MODIFIER_COMMENTS.get(
+            name,
+            "Modifier flags for keycodes {} to {}.".format(first, last)),
+        etype=ctype(max(flag.flag for flag in flags)),
+        size=len(table),
+        data="\n".join(data),
+        test=test,
+    )
+    modflags = MODFLAGS_TEMPLATE.format(
+        name=name,
+        uname=name.upper(),
+        flags="\n".join("    {{0x{:08x}ul, {}, {}}}, /* {} */".format(
+            flag.flag, flag.scancode, flag.code, rawnames[flag.scancode])
+                        for flag in flags),
+    )
+    return modifier, modflags
+
+
+BENCH_HEAD = """\
+#if !defined _WIN32
+#define _POSIX_C_SOURCE 199309L
+#endif
+#include "keytable.h"
+
+#include <stdio.h>
+#include <string.h>
+#if defined _WIN32
+#include <windows.h>
+#else
+#include <time.h>
+#endif
+
+enum {{
+    /* Number of inputs in each distribution, must be a power of two. */
+    BENCH_INPUT_COUNT = {count}
+}};
+
+enum {{
+    BENCH_TO_HID,
+    BENCH_TO_NAME,
+    BENCH_FROM_ID,
+    BENCH_TABLE,
+    BENCH_TO_HID_N
+}};
+
+struct benchmark {{
+    /* Name of the function or table. */
+    const char *name;
+    /* Name of the input distribution. */
+    const char *dist;
+    int kind;
+    unsigned (*to_hid)(unsigned);
+    const char *(*to_name)(unsigned);
+    unsigned (*from_id)(const char *);
+    const unsigned char *table;
+    void (*to_hid_n)(const unsigned *, unsigned char *, size_t);
+    const unsigned *codes;
+    const char *const *strings;
+}};
+
+static void fill_uniform(unsigned *out, unsigned limit);
+
+/* HID keycodes, weighted by how often the keys are typed. */
+static const unsigned BENCH_HID_TYPED[BENCH_INPUT_COUNT] = {{
+{hid_typed}
+}};
+static unsigned BENCH_HID_UNIFORM[BENCH_INPUT_COUNT];
+
+/* Identifiers which do not match any keycode. */
+static const char *const BENCH_ID_MISS_LIST[{nmisses}] = {{
+{misses}
+}};
+static const char *BENCH_ID_HITS[BENCH_INPUT_COUNT];
+static const char *BENCH_ID_MISSES[BENCH_INPUT_COUNT];
+"""
+
+BENCH_PLATFORM_TEMPLATE = """
+/* {name} keycodes, weighted by how often the keys are typed. */
+static const unsigned BENCH_{uname}_TYPED[BENCH_INPUT_COUNT] = {{
+{typed}
+}};
+static unsigned BENCH_{uname}_UNIFORM[BENCH_INPUT_COUNT];
+"""
+
+BENCH_INIT_TEMPLATE = """
+static void init_inputs(void) {{
+    unsigned i;
+    fill_uniform(BENCH_HID_UNIFORM, 256);
+{fill}
+    for (i = 0; i < BENCH_INPUT_COUNT; i++) {{
+        BENCH_ID_HITS[i] = keycode_to_id(BENCH_HID_TYPED[i]);
+        BENCH_ID_MISSES[i] = BENCH_ID_MISS_LIST[i % {nmisses}];
+    }}
+}}
+
+static const struct benchmark BENCHMARKS[] = {{
+{benchmarks}
+    {{NULL, NULL, 0, NULL, NULL, NULL, NULL, NULL, NULL, NULL}}
+}};
+"""
+
+# Relative frequency of typing each HID key in the "typed" benchmark inputs.
+# Keys which are not listed have weight 1.
+BENCH_KEY_WEIGHTS = {
+    "Space": 20,
+    "Enter": 5,
+    "Delete": 5,
+    "Left Shift": 5,
+    "Right Shift": 2,
+    "Tab": 3,
+    "Escape": 2,
+    "Left Control": 3,
+    "Left": 3,
+    "Right": 3,
+    "Up": 3,
+    "Down": 3,
+    "Period": 3,
+    "Comma": 3,
+}
+
+# Number of distinct identifiers in the "miss" benchmark inputs.
+BENCH_MISS_COUNT = 64
+
+# Number of inputs in each benchmark input distribution.
+BENCH_COUNT = 1024
+
+
+def bench_weight(name):
+    """Get the relative typing frequency of an HID key."""
+    weight = BENCH_KEY_WEIGHTS.get(name)
+    if weight is not None:
+        return weight
+    if len(name) == 1:
+        # Letters and digits.
+        return 10 if name.isalpha() else 3
+    return 1
+
+
+def bench_misses(rng, idents):
+    """Create identifiers which do not match any keycode.
+
+    Arguments:
+      rng: Random number generator
+      idents: List of keycode identifiers
+    """
+    known = {ident.lower() for ident in idents}
+    misses = []
+    while len(misses) < BENCH_MISS_COUNT:
+        ident = rng.choice(idents)
+        pos = rng.randrange(len(ident) + 1)
+        # Replace, insert, or remove a character, so most misses have the
+        # same length as a real identifier.
+        mode = rng.randrange(3)
+        c = rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")
+        if mode == 0 and pos < len(ident):
+            miss = ident[:pos] + c + ident[pos + 1:]
+        elif mode == 1:
+            miss = ident[:pos] + c + ident[pos:]
+        else:
+            miss = ident[:pos] + ident[pos + 1:]
+        if miss and miss.lower() not in known and miss not in misses:
+            misses.append(miss)
+    return misses
+
+
+def emit_benchmark(open_file, hid_table, keytables):
+    """Emit a C program which measures the speed of the lookup functions.
+
+    Arguments:
+      open_file: Function to open an output file
+      hid_table: List of HID Keycode objects which are used on any platform
+      keytables: List of Keytable objects
+    """
+    rng = random.Random(0)
+    hid_weights = {key.code: bench_weight(key.name) for key in hid_table}
+    codes = sorted(hid_weights)
+    hid_typed = rng.choices(codes, [hid_weights[code] for code in codes],
+                            k=BENCH_COUNT)
+    idents = [ident for code, ident in keycode_names(hid_table)]
+    misses = bench_misses(rng, idents)
+    platforms = io.StringIO()
+    fill = []
+    benchmarks = []
+
+    def benchmark(name, dist, kind, func, codes, strings="NULL"):
+        fields = ["NULL"] * 5
+        fields[["BENCH_TO_HID", "BENCH_TO_NAME", "BENCH_FROM_ID",
+                "BENCH_TABLE", "BENCH_TO_HID_N"].index(kind)] = func
+        benchmarks.append(
+            '    {{"{}", "{}", {},\n     {},\n     {}, {}}},'.format(
+                name, dist, kind, ", ".join(fields), codes, strings))
+
+    for dist in ["uniform", "typed"]:
+        codes = "BENCH_HID_{}".format(dist.upper())
+        benchmark("keycode_to_id", dist, "BENCH_TO_NAME", "keycode_to_id",
+                  codes)
+    benchmark("keycode_from_id", "hit", "BENCH_FROM_ID", "keycode_from_id",
+              "NULL", "BENCH_ID_HITS")
+    benchmark("keycode_from_id", "miss", "BENCH_FROM_ID", "keycode_from_id",
+              "NULL", "BENCH_ID_MISSES")
+    for keytable in keytables:
+        name = keytable.name.lower()
+        uname = name.upper()
+        scancodes = [
+            code for code, hid in enumerate(keytable.to_hid_table) if hid
+        ]
+        typed = rng.choices(
+            scancodes,
+            [hid_weights[keytable.to_hid_table[code]] for code in scancodes],
+            k=BENCH_COUNT)
+        platforms.write(
+            BENCH_PLATFORM_TEMPLATE.format(name=keytable.name,
+                                           uname=uname,
+                                           typed=format_numbers(typed,
+                                                                "    ")))
+        fill.append("    fill_uniform(BENCH_{}_UNIFORM, {});".format(
+            uname, len(keytable.to_hid_table)))
+        for func, kind, inputs in [
+            ("keycode_{}_to_hid", "BENCH_TO_HID", uname),
+            ("keycode_{}_rawname", "BENCH_TO_NAME", uname),
+            ("keycode_{}_name", "BENCH_TO_NAME", "HID"),
+            ("KEYCODE_{}_FROM_HID", "BENCH_TABLE", "HID"),
+            ("keycode_{}_to_hid_n", "BENCH_TO_HID_N", uname),
+        ]:
+            func = func.format(name if func.islower() else uname)
+            for dist in ["uniform", "typed"]:
+                benchmark(func, dist, kind, func,
+                          "BENCH_{}_{}".format(inputs, dist.upper()))
+    dirpath = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(dirpath, "keycode_bench.c")) as fp:
+        driver = fp.read()
+    with open_file("keycode_bench.c") as fp:
+        fp.write(
+            BENCH_HEAD.format(
+                count=BENCH_COUNT,
+                hid_typed=format_numbers(hid_typed, "    "),
+                nmisses=len(misses),
+                misses="\n".join('    "{}",'.format(miss)
+                                 for miss in misses).rstrip(","),
+            ))
+        fp.write(platforms.getvalue())
+        fp.write(
+            BENCH_INIT_TEMPLATE.format(fill="\n".join(fill),
+                                       nmisses=len(misses),
+                                       benchmarks="\n".join(benchmarks)))
+        fp.write(driver)
@@ -25,3 +25,26 @@ class Error(Exception):
         if self.lineno is not None:
             prefix += "line {}: ".format(self.lineno)
         return prefix + self.args[0]
+
+
+def map_jobs(func, items, jobs=1):
+    """Apply a function to each item, optionally in a process pool.
+
+    Results are returned in the same order as the items. If any call raises an
+    exception, the exception from the first failing item is raised, just as it
+    would be if the calls were made serially.
+
+    Arguments:
+      func: Function to call, which must be picklable if jobs > 1
+      items: List of arguments for func
+      jobs: Maximum number of worker processes, 1 to run serially
+    Returns:
+      A list of results
+    """
+    items = list(items)
+    if jobs <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(jobs, len(items))) as executor:
+        return list(executor.map(func, items))
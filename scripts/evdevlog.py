@@ -0,0 +1,233 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Translate evdev event logs to HID event streams.
+
+The input is a raw stream of Linux "struct input_event" records, as read from
+/dev/input/event*. The file is memory-mapped and processed in fixed-size chunks
+of records, so memory use does not depend on the size of the log. Each EV_KEY
+record is translated to an HID keycode using the Linux keycode table, and
+written out as a packed little-endian record:
+
+    uint64 time, in microseconds
+    uint16 HID keycode
+    uint8 value (0 = release, 1 = press, 2 = autorepeat)
+
+Events for keys which have no HID keycode are dropped. NumPy is required.
+"""
+import argparse
+import mmap
+import os
+import sys
+
+if not __package__:
+    # Run as a script, rather than as part of the package. Import the package
+    # so the relative imports below work.
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "scripts"
+
+from .common import Error
+
+from . import batch
+from . import tables
+
+EV_KEY = 1
+
+# Number of input records processed at a time.
+CHUNK_RECORDS = 1 << 18
+
+
+def input_event_dtype(np, time_bits):
+    """Get the NumPy dtype for struct input_event.
+
+    Arguments:
+      time_bits: Size of the fields in struct timeval, 64 on 64-bit systems
+        and 32 on 32-bit systems
+    """
+    if time_bits == 64:
+        time_type = "<i8"
+    elif time_bits == 32:
+        time_type = "<i4"
+    else:
+        raise Error("Invalid time size: {}".format(time_bits))
+    return np.dtype([
+        ("sec", time_type),
+        ("usec", time_type),
+        ("type", "<u2"),
+        ("code", "<u2"),
+        ("value", "<i4"),
+    ])
+
+
+def hid_event_dtype(np):
+    """Get the NumPy dtype for output HID event records."""
+    return np.dtype([
+        ("time", "<u8"),
+        ("code", "<u2"),
+        ("value", "u1"),
+    ])
+
+
+def read_linux_translator(datadir):
+    """Read the Linux keycode table and create a translator for it."""
+    with tables.ReadFile(datadir, "hid.csv") as fp:
+        hid_table = tables.read_hid(fp)
+    hid_names = {key.name: key for key in hid_table}
+    for name, size in tables.PLATFORMS:
+        if name == "linux":
+            break
+    try:
+        keytable = tables.read_keytable(datadir, name, size, hid_names)
+    except Error as ex:
+        ex.platform = name
+        raise
+    return batch.BatchTranslator(keytable)
+
+
+def advise(mm, name, start, length):
+    """Give advice about a memory map, if the advice is supported.
+
+    The start is rounded down to a page boundary, as madvise requires.
+    """
+    advice = getattr(mmap, name, None)
+    if advice is None or not hasattr(mm, "madvise"):
+        return
+    offset = start % mmap.PAGESIZE
+    start -= offset
+    length = min(length + offset, len(mm) - start)
+    mm.madvise(advice, start, length)
+
+
+def translate(*, infile, outfile, translator, time_bits=64):
+    """Translate an evdev event log to an HID event stream.
+
+    Arguments:
+      infile: Path to input event log
+      outfile: Path to output HID event stream
+      translator: BatchTranslator for Linux keycodes
+      time_bits: Size of the fields in struct timeval
+    Returns:
+      The number of HID events written
+    """
+    np = batch.import_numpy()
+    in_type = input_event_dtype(np, time_bits)
+    out_type = hid_event_dtype(np)
+    count = 0
+    try:
+        infp = open(infile, "rb")
+    except OSError as ex:
+        raise Error("Could not open input: {}".format(ex), filename=infile)
+    with infp, open(outfile, "wb") as outfp:
+        size = os.fstat(infp.fileno()).st_size
+        if size % in_type.itemsize != 0:
+            raise Error(
+                "File size {} is not a multiple of the record size {}".format(
+                    size, in_type.itemsize),
+                filename=infile)
+        if size == 0:
+            return 0
+        nrecords = size // in_type.itemsize
+        with mmap.mmap(infp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            advise(mm, "MADV_SEQUENTIAL", 0, size)
+            for start in range(0, nrecords, CHUNK_RECORDS):
+                # This is a view of the mapped file, nothing is copied until
+                # the key events are selected.
+                events = np.frombuffer(mm,
+                                       dtype=in_type,
+                                       count=min(CHUNK_RECORDS,
+                                                 nrecords - start),
+                                       offset=start * in_type.itemsize)
+                keys = events[events["type"] == EV_KEY]
+                codes = translator.to_hid(keys["code"])
+                mapped = codes != 0
+                keys = keys[mapped]
+                out = np.empty(len(keys), dtype=out_type)
+                out["time"] = (keys["sec"].astype("<u8") * 1000000 +
+                               keys["usec"].astype("<u8"))
+                out["code"] = codes[mapped]
+                out["value"] = keys["value"]
+                out.tofile(outfp)
+                count += len(out)
+                del events, keys
+                # Drop the pages we have processed, so the resident size of
+                # the mapping stays constant.
+                advise(mm, "MADV_DONTNEED", start * in_type.itemsize,
+                       CHUNK_RECORDS * in_type.itemsize)
+    return count
+
+
+def synthesize(*, outfile, count, time_bits=64, seed=0):
+    """Write a synthetic evdev event log, for testing.
+
+    The log contains a mix of EV_KEY events for random keycodes, including
+    keycodes with no HID mapping, and EV_SYN events.
+    """
+    np = batch.import_numpy()
+    rng = np.random.default_rng(seed)
+    in_type = input_event_dtype(np, time_bits)
+    with open(outfile, "wb") as fp:
+        time = 1000000000 * 1000000
+        for start in range(0, count, CHUNK_RECORDS):
+            n = min(CHUNK_RECORDS, count - start)
+            events = np.zeros(n, dtype=in_type)
+            times = time + np.cumsum(rng.integers(0, 20000, size=n))
+            time = int(times[-1])
+            events["sec"] = times // 1000000
+            events["usec"] = times % 1000000
+            is_key = rng.random(n) < 0.5
+            events["type"] = np.where(is_key, EV_KEY, 0)
+            events["code"] = np.where(is_key, rng.integers(0, 0x300, size=n),
+                                      0)
+            events["value"] = np.where(is_key, rng.integers(0, 3, size=n), 0)
+            events.tofile(fp)
+
+
+def main(argv):
+    p = argparse.ArgumentParser(
+        description="Translate evdev event logs to HID event streams")
+    p.add_argument("--data-dir", help="directory containing input CSV data")
+    p.add_argument("--time-bits",
+                   help="size of struct timeval fields (default 64)",
+                   type=int,
+                   choices=(32, 64),
+                   default=64)
+    p.add_argument("--synthesize",
+                   help="write a synthetic event log with COUNT events to "
+                   "INPUT instead of translating",
+                   metavar="COUNT",
+                   type=int)
+    p.add_argument("--quiet",
+                   "-q",
+                   help="print no informational messages",
+                   action="store_true")
+    p.add_argument("input", help="input evdev event log")
+    p.add_argument("output", nargs="?", help="output HID event stream")
+    args = p.parse_args(argv)
+
+    repodir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    datadir = os.path.join(repodir, "data")
+    if args.data_dir is not None:
+        datadir = args.data_dir
+
+    try:
+        if args.synthesize is not None:
+            synthesize(outfile=args.input,
+                       count=args.synthesize,
+                       time_bits=args.time_bits)
+            return
+        if args.output is None:
+            p.error("output is required")
+        count = translate(infile=args.input,
+                          outfile=args.output,
+                          translator=read_linux_translator(datadir),
+                          time_bits=args.time_bits)
+        if not args.quiet:
+            print("Wrote {} events".format(count), file=sys.stderr)
+    except Error as ex:
+        print("Error:", ex, file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
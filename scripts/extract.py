@@ -1,77 +1,225 @@
 # Copyright 2019 Dietrich Epp.
 # This file is licensed under the terms of the MIT license. See LICENSE.txt
 # for details.
-"""Extract keycode tables from various SDK headers."""
+"""Extract keycode tables from various SDK headers.
+
+Headers are memory-mapped and scanned in a single pass. Extracted tables are
+cached by a hash of the header contents, the platform, and the extractor
+version, so extracting from an unchanged header does not parse it again.
+"""
 import argparse
 import csv
+import hashlib
+import json
+import mmap
 import os
 import re
 import sys
 
-from common import Error
+if not __package__:
+    # Run as a script, rather than as part of the package. Import the package
+    # so the relative imports below work.
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "scripts"
 
+from .common import Error
 
-def linux_read_table(infile):
-    """Read the Linux keymap from linux/input-event-codes.h."""
-    if infile is None:
-        infile = "/usr/include/linux/input-event-codes.h"
-    with open(infile, "rb") as fp:
-        text = fp.read()
-    for m in re.finditer(rb"#define\s+KEY_(\w+)\s+(\w+)", text):
-        if not m.group(2).startswith(b"KEY_"):
-            yield int(m.group(2), 0), m.group(1).decode("ASCII")
+# Change this whenever the extracted tables would change for the same input.
+EXTRACTOR_VERSION = 1
 
 
-def macos_open_header(infile):
-    """Open the Carbon Events.h header file on macOS.
+class Extractor:
+    """Extracts a keycode table from a platform's header file.
 
-    Searches various SDK installation locations.
+    Attributes:
+      header: File name of the header
+      pattern: Compiled regular expression matching keycode definitions, with
+        the name in group 1 and the value in group 2
     """
-    if infile is not None:
-        return open(infile, "rb")
-    # The headers may be in one of these places.
-    bases = [
-        "/",
-        ("/Applications/Xcode.app/Contents/Developer/Platforms" +
-         "/MacOSX.platform/Developer/SDKs/MacOSX.sdk"),
-        "/Library/Developer/CommandLineTools/SDKs/MacOSX.sdk"
-    ]
-    for base in bases:
-        fpath = os.path.join(
-            base, "System/Library/Frameworks/Carbon.framework" +
-            "/Frameworks/HIToolbox.framework/Headers/Events.h")
-        try:
-            return open(fpath, "rb")
-        except FileNotFoundError:
-            pass
-    die("Could not find Carbon Events.h. Are the developer tools installed?")
 
+    def __init__(self, header, pattern):
+        self.header = header
+        self.pattern = re.compile(pattern)
 
-def macos_read_table(infile):
-    """Read the Linux keymap from Carbon Events.h."""
-    with macos_open_header(infile) as fp:
-        text = fp.read()
-    for m in re.finditer(rb"kVK_(\w+)\s*=\s*(\w+)", text):
-        yield int(m.group(2), 0), m.group(1).decode("ASCII")
+    def find_header(self):
+        """Find the header in its default location.
 
+        By default, the header has no default location and must be given on
+        the command line.
 
-def windows_read_table(infile):
-    """Read the Windows keymap from WinUser.h."""
-    if infile is None:
-        die("Cannot find WinUser.h automatically, use --input.")
-    with open(infile, "rb") as fp:
-        text = fp.read()
-    for m in re.finditer(rb"#define\s+VK_(\w+)\s+(\w+)", text):
-        yield int(m.group(2), 0), m.group(1).decode("ASCII")
+        Returns:
+          The path to the header
+        """
+        raise Error("Cannot find {} automatically, use --input.".format(
+            self.header))
+
+    def filter(self, name, value):
+        """Test whether a definition is a keycode."""
+        return True
+
+    def scan(self, data):
+        """Scan header data for keycode definitions.
+
+        Arguments:
+          data: Header contents, a bytes-like object
+        Returns:
+          A list of (keycode, name) pairs
+        """
+        table = []
+        for m in self.pattern.finditer(data):
+            name, value = m.group(1), m.group(2)
+            if self.filter(name, value):
+                table.append((int(value, 0), name.decode("ASCII")))
+        return table
+
+
+class LinuxExtractor(Extractor):
+
+    def __init__(self):
+        super().__init__("input-event-codes.h",
+                         rb"#define\s+KEY_(\w+)\s+(\w+)")
+
+    def find_header(self):
+        return "/usr/include/linux/input-event-codes.h"
+
+    def filter(self, name, value):
+        # Aliases like KEY_MIN_INTERESTING are defined as other keys.
+        return not value.startswith(b"KEY_")
+
+
+class MacOSExtractor(Extractor):
+
+    def __init__(self):
+        super().__init__("Events.h", rb"kVK_(\w+)\s*=\s*(\w+)")
+
+    def find_header(self):
+        # The headers may be in one of these places.
+        bases = [
+            "/",
+            ("/Applications/Xcode.app/Contents/Developer/Platforms" +
+             "/MacOSX.platform/Developer/SDKs/MacOSX.sdk"),
+            "/Library/Developer/CommandLineTools/SDKs/MacOSX.sdk"
+        ]
+        for base in bases:
+            fpath = os.path.join(
+                base, "System/Library/Frameworks/Carbon.framework" +
+                "/Frameworks/HIToolbox.framework/Headers/Events.h")
+            if os.path.exists(fpath):
+                return fpath
+        raise Error("Could not find Carbon Events.h. "
+                    "Are the developer tools installed?")
+
+
+class WindowsExtractor(Extractor):
+
+    def __init__(self):
+        super().__init__("WinUser.h", rb"#define\s+VK_(\w+)\s+(\w+)")
 
 
 PLATFORMS = {
-    "linux": linux_read_table,
-    "macos": macos_read_table,
-    "windows": windows_read_table,
+    "linux": LinuxExtractor(),
+    "macos": MacOSExtractor(),
+    "windows": WindowsExtractor(),
 }
 
 
+def default_cache_dir():
+    """Get the default directory for cached tables."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "keycode", "extract")
+
+
+def map_header(fp):
+    """Memory-map an open header file.
+
+    Returns:
+      A bytes-like object with the file contents
+    """
+    if os.fstat(fp.fileno()).st_size == 0:
+        # Empty files cannot be mapped.
+        return b""
+    return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def cache_key(platform, extractor, digest):
+    """Get the cache key for a header."""
+    h = hashlib.sha256()
+    h.update("{}\0{}\0".format(EXTRACTOR_VERSION, platform).encode("UTF-8"))
+    h.update(extractor.pattern.pattern)
+    h.update(b"\0")
+    h.update(digest)
+    return h.hexdigest()
+
+
+def read_cache(cache_dir, key):
+    """Read a cached table, or return None if it is not cached."""
+    try:
+        with open(os.path.join(cache_dir, key + ".json")) as fp:
+            data = json.load(fp)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, list):
+        return None
+    return [(code, name) for code, name in data]
+
+
+def write_cache(cache_dir, key, table):
+    """Write a table to the cache."""
+    path = os.path.join(cache_dir, key + ".json")
+    temp = path + ".tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(temp, "w") as fp:
+            json.dump(table, fp)
+        os.replace(temp, path)
+    except OSError as ex:
+        raise Error("Could not write cache: {}".format(ex), filename=path)
+
+
+def read_table(infile, platform, *, cache_dir=None):
+    """Read the keycode table from a header.
+
+    Arguments:
+      infile: Input file path, or None to automatically locate it
+      platform: Name of platform
+      cache_dir: Directory containing cached tables, or None to disable the
+        cache
+    Returns:
+      (table, cached), where table is a list of (keycode, name) pairs, and
+      cached is true if the table was read from the cache
+    """
+    extractor = PLATFORMS[platform]
+    if infile is None:
+        infile = extractor.find_header()
+    try:
+        fp = open(infile, "rb")
+    except FileNotFoundError:
+        raise Error("Input file not found", filename=infile)
+    with fp:
+        data = map_header(fp)
+        try:
+            key = None
+            if cache_dir is not None:
+                key = cache_key(platform, extractor,
+                                hashlib.sha256(data).digest())
+                table = read_cache(cache_dir, key)
+                if table is not None:
+                    return table, True
+            table = extractor.scan(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+    if not table:
+        raise Error("Could not find keycode definitions in input file",
+                    filename=infile)
+    if key is not None:
+        write_cache(cache_dir, key, table)
+    return table, False
+
+
 def write_table(table, fp):
     """Write a keycode table to a file in CSV format."""
     writer = csv.writer(fp)
@@ -80,32 +228,97 @@ def write_table(table, fp):
         writer.writerow(row)
 
 
-def extract(*, infile, outfile, platform, quiet=False):
+def default_output(platform):
+    """Get the default output path for a platform."""
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(repo, "data", "{}_scancodes.csv".format(platform))
+
+
+def extract(*, infile, outfile, platform, quiet=False, cache_dir=None):
     """Extract keycodes from a header file.
 
     Arguments:
       infile: Input file path, or None to automatically locate it
       outfile: Output file path, or None to automatically place it
       platform: Name of platform
+      cache_dir: Directory containing cached tables, or None to disable the
+        cache
     """
-    read_table = PLATFORMS[platform]
-    try:
-        table = list(read_table(infile))
-    except FileNotFoundError as ex:
-        raise Error("Input file not found: {!r}".format(infile))
-    if not table:
-        raise Error(
-            "Could not find keycode definitions in input file {!r}".format(
-                infile))
-        die("Could not find keycode definitions in input file.")
+    table, cached = read_table(infile, platform, cache_dir=cache_dir)
     if outfile is None:
-        repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        outfile = os.path.join(repo, "data",
-                               "{}_scancodes.csv".format(platform))
+        outfile = default_output(platform)
     if not quiet:
-        print("Writing {}".format(outfile))
-    with open(outfile, "w") as fp:
-        write_table(table, fp)
+        print("Writing {}{}".format(outfile, " (cached)" if cached else ""))
+    try:
+        with open(outfile, "w") as fp:
+            write_table(table, fp)
+    except OSError as ex:
+        raise Error("Could not write output file: {}".format(ex),
+                    filename=outfile)
+
+
+def find_headers(dirname):
+    """Find the header for each platform in a directory tree.
+
+    Header names are matched without regard to case, since the Windows SDK
+    and MinGW headers differ in case.
+
+    Returns:
+      A map from platform name to header path
+    """
+    names = {
+        extractor.header.lower(): platform
+        for platform, extractor in PLATFORMS.items()
+    }
+    headers = {}
+    for dirpath, dirnames, filenames in os.walk(dirname):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            platform = names.get(filename.lower())
+            if platform is not None and platform not in headers:
+                headers[platform] = os.path.join(dirpath, filename)
+    return headers
+
+
+def extract_batch(*, indir, outdir, quiet=False, cache_dir=None):
+    """Extract keycodes for every platform from a directory of headers.
+
+    Arguments:
+      indir: Directory containing headers, which is searched recursively
+      outdir: Directory to write CSV files, or None to write them to the data
+        directory
+      cache_dir: Directory containing cached tables, or None to disable the
+        cache
+    """
+    headers = find_headers(indir)
+    if not headers:
+        raise Error("No headers found in directory", filename=indir)
+    if outdir is not None:
+        try:
+            os.makedirs(outdir, exist_ok=True)
+        except OSError as ex:
+            raise Error("Could not create output directory: {}".format(ex),
+                        filename=outdir)
+    for platform in PLATFORMS:
+        infile = headers.get(platform)
+        if infile is None:
+            if not quiet:
+                print("Skipping {}: no {} found".format(
+                    platform, PLATFORMS[platform].header))
+            continue
+        outfile = None
+        if outdir is not None:
+            outfile = os.path.join(outdir,
+                                   "{}_scancodes.csv".format(platform))
+        try:
+            extract(infile=infile,
+                    outfile=outfile,
+                    platform=platform,
+                    quiet=quiet,
+                    cache_dir=cache_dir)
+        except Error as ex:
+            ex.platform = platform
+            raise
 
 
 def main(argv):
@@ -114,21 +327,52 @@ def main(argv):
     p.add_argument("--platform",
                    help="extract tables for PLATFORM",
                    metavar="PLATFORM",
-                   choices=PLATFORMS,
-                   required=True)
+                   choices=PLATFORMS)
     p.add_argument("--input", "-i", help="input header file")
     p.add_argument("--output", "-o", help="output CSV file")
+    p.add_argument("--batch",
+                   help="extract tables for every platform from the headers "
+                   "in DIR",
+                   metavar="DIR")
+    p.add_argument("--output-dir",
+                   help="directory to write CSV files in batch mode")
+    p.add_argument("--cache-dir",
+                   help="directory for cached tables (default {})".format(
+                       default_cache_dir()))
+    p.add_argument("--no-cache",
+                   help="do not read or write cached tables",
+                   action="store_true")
     p.add_argument("--quiet",
                    "-q",
                    help="print no informational messages",
                    action="store_true")
     args = p.parse_args(argv)
 
+    if args.batch is not None:
+        if (args.platform is not None or args.input is not None
+                or args.output is not None):
+            p.error("--batch cannot be used with --platform, --input, "
+                    "or --output")
+    elif args.platform is None:
+        p.error("--platform or --batch is required")
+    cache_dir = default_cache_dir()
+    if args.cache_dir is not None:
+        cache_dir = args.cache_dir
+    if args.no_cache:
+        cache_dir = None
+
     try:
-        extract(infile=args.input,
-                outfile=args.output,
-                platform=args.platform,
-                quiet=args.quiet)
+        if args.batch is not None:
+            extract_batch(indir=args.batch,
+                          outdir=args.output_dir,
+                          quiet=args.quiet,
+                          cache_dir=cache_dir)
+        else:
+            extract(infile=args.input,
+                    outfile=args.output,
+                    platform=args.platform,
+                    quiet=args.quiet,
+                    cache_dir=cache_dir)
     except Error as ex:
         print("Error:", ex, file=sys.stderr)
         raise SystemExit(1)
@@ -0,0 +1,389 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Report the size of the tables in the generated C code.
+
+The generated C files are scanned for constant array definitions, and the size
+of each array is computed from its element type and initializer, so the
+footprint of the tables can be checked without compiling anything. Sizes are
+for a 32-bit target, where int, long, and pointers are four bytes.
+
+For each string array, the report also shows how many bytes were saved by
+sharing strings, compared to storing a separate copy of the string for every
+offset which refers to it.
+
+A budget file is a CSV file with the headers "Name,Bytes". Each name is a
+symbol, a generated file name, or "total" for the size of every table. The
+check fails if any of these is larger than its budget.
+"""
+import argparse
+import collections
+import csv
+import json
+import os
+import re
+import sys
+
+if not __package__:
+    # Run as a script, rather than as part of the package. Import the package
+    # so the relative imports below work.
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "scripts"
+
+from .common import Error
+
+# Size of each element type, in bytes, on a 32-bit target.
+TYPE_SIZES = {
+    "char": 1,
+    "unsigned char": 1,
+    "unsigned short": 2,
+    "unsigned": 4,
+    "unsigned long": 4,
+    "char *const": 4,
+    "struct keycode_modifier_flag": 8,
+}
+
+# First line of every generated C file.
+GENERATED_HEADER = "/* This file is automatically generated. */\n"
+
+DEFINITION = re.compile(
+    r"^(?:static )?const ([a-z_ ]+?(?: \*const)?) ([A-Za-z_]\w*)"
+    r"((?:\[[^\]\n]*\])+) =",
+    re.MULTILINE)
+DIMENSION = re.compile(r"\[([^\]]*)\]")
+STRING_LITERAL = re.compile(r'"((?:[^"\\]|\\.)*)"')
+ESCAPE = re.compile(r"\\([0-7]{1,3}|.)")
+INITIALIZER_END = re.compile(r'"(?:[^"\\]|\\.)*"|;')
+
+Symbol = collections.namedtuple(
+    "Symbol", ["filename", "name", "etype", "count", "size", "kind", "saved"])
+Symbol.__doc__ = """A constant array in the generated code.
+
+Attributes:
+  filename: Name of the file containing the array
+  name: Symbol name
+  etype: Element type
+  count: Number of elements
+  size: Size in bytes
+  kind: "strings" for string data, "offsets" for offsets into string data, or
+    "table" for anything else
+  saved: For string data, the number of bytes saved by sharing strings,
+    otherwise None
+"""
+
+
+def _unescape(text):
+    """Decode the contents of a C string literal to bytes."""
+
+    def replace(match):
+        esc = match.group(1)
+        if esc[0] in "01234567":
+            return chr(int(esc, 8))
+        return {"n": "\n", "t": "\t"}.get(esc, esc)
+
+    return ESCAPE.sub(replace, text).encode("latin-1")
+
+
+def _initializer(text, pos):
+    """Get the initializer for a definition, up to the terminating semicolon.
+
+    Returns:
+      The initializer text, with string literals intact
+    """
+    # Semicolons can appear in string literals, so skip over the literals.
+    for match in INITIALIZER_END.finditer(text, pos):
+        if match.group() == ";":
+            return text[pos:match.start()]
+    raise Error("Unterminated definition")
+
+
+def _count_elements(init):
+    """Count the top-level elements in an array initializer."""
+    init = STRING_LITERAL.sub("0", init).strip()
+    if not init.startswith("{"):
+        raise Error("Unexpected initializer")
+    depth = 0
+    count = 1
+    empty = True
+    for c in init[1:-1]:
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+        elif c == "," and depth == 0:
+            count += 1
+        if not c.isspace():
+            empty = False
+    return 0 if empty else count
+
+
+def parse_file(filename, text):
+    """Find the constant array definitions in a generated C file.
+
+    Returns:
+      A list of (Symbol, data), where data is the contents of string arrays,
+      the list of values of arrays which may be offsets into string arrays,
+      or None
+    """
+    result = []
+    for match in DEFINITION.finditer(text):
+        etype, name, dims = match.groups()
+        esize = TYPE_SIZES.get(etype)
+        if esize is None:
+            raise Error("Unknown element type {!r} for {}".format(etype, name),
+                        filename=filename)
+        init = _initializer(text, match.end())
+        dims = DIMENSION.findall(dims)
+        data = None
+        if etype == "char":
+            data = b"".join(
+                _unescape(lit) for lit in STRING_LITERAL.findall(init)) + b"\0"
+            count = len(data)
+            kind = "strings"
+        else:
+            try:
+                count = _count_elements(init)
+            except Error as ex:
+                ex.filename = filename
+                raise
+            kind = "table"
+            if name.endswith("_OFFSET"):
+                data = [int(x) for x in re.findall(r"\d+", init)]
+        # Multidimensional arrays have the size of each element in the inner
+        # dimensions.
+        for dim in dims[1:]:
+            count *= int(dim)
+        result.append((Symbol(filename, name, etype, count, count * esize,
+                              kind, None), data))
+    return result
+
+
+def _string_savings(strings, offsets):
+    """Compute the bytes saved by sharing strings.
+
+    Arguments:
+      strings: String array contents
+      offsets: List of offset arrays which refer to the strings
+    """
+    unshared = 1
+    for array in offsets:
+        for offset in array:
+            if offset:
+                unshared += strings.index(b"\0", offset) - offset + 1
+    return unshared - len(strings)
+
+
+def scan(outdir):
+    """Find the tables in the generated C files in a directory.
+
+    Returns:
+      A list of Symbol objects, sorted by file and then symbol name
+    """
+    try:
+        names = sorted(os.listdir(outdir))
+    except OSError as ex:
+        raise Error("Could not list directory: {}".format(ex),
+                    filename=outdir)
+    parsed = []
+    texts = {}
+    for filename in names:
+        if not filename.endswith(".c"):
+            continue
+        path = os.path.join(outdir, filename)
+        try:
+            with open(path, encoding="UTF-8") as fp:
+                text = fp.read()
+        except OSError as ex:
+            raise Error("Could not read file: {}".format(ex),
+                        filename=filename)
+        if not text.startswith(GENERATED_HEADER):
+            continue
+        texts[filename] = text
+        parsed.extend(parse_file(filename, text))
+    # Offset arrays refer to the string array with the same prefix in the same
+    # file, or to a shared string pool defined in another file.
+    strings = {(sym.filename, sym.name): data
+               for sym, data in parsed if sym.kind == "strings"}
+    refs = collections.defaultdict(list)
+    offsets = set()
+    for sym, data in parsed:
+        if sym.kind != "table" or data is None:
+            continue
+        prefix = sym.name[:-len("_OFFSET")]
+        for suffix in ("_DATA", "_TEXT"):
+            key = sym.filename, prefix + suffix
+            if key in strings:
+                break
+        else:
+            key = next((key for key in strings
+                        if re.search(r"\b{}\b".format(key[1]),
+                                     texts[sym.filename])), None)
+        if key is not None:
+            refs[key].append(data)
+            offsets.add(sym.name)
+    result = []
+    for sym, data in parsed:
+        if sym.name in offsets:
+            sym = sym._replace(kind="offsets")
+        elif sym.kind == "strings":
+            sym = sym._replace(saved=_string_savings(
+                data, refs.get((sym.filename, sym.name), [])))
+        result.append(sym)
+    result.sort(key=lambda sym: (sym.filename, sym.name))
+    return result
+
+
+def totals(symbols):
+    """Compute the total size of the tables.
+
+    Returns:
+      A map from each file name, and "total", to the size in bytes
+    """
+    result = {"total": 0}
+    for sym in symbols:
+        result[sym.filename] = result.get(sym.filename, 0) + sym.size
+        result["total"] += sym.size
+    return result
+
+
+def report(symbols, fp):
+    """Write a human-readable size report to a file."""
+    for sym in symbols:
+        print("{:<24} {:<32} {:<16} {:6} {:7}{}".format(
+            sym.filename, sym.name, sym.etype, sym.count, sym.size,
+            "" if sym.saved is None else " (saved {})".format(sym.saved)),
+              file=fp)
+    kinds = collections.Counter()
+    saved = 0
+    for sym in symbols:
+        kinds[sym.kind] += sym.size
+        saved += sym.saved or 0
+    print("strings {}, offsets {}, tables {}, total {} bytes; "
+          "{} bytes saved by sharing strings".format(kinds["strings"],
+                                                     kinds["offsets"],
+                                                     kinds["table"],
+                                                     totals(symbols)["total"],
+                                                     saved),
+          file=fp)
+
+
+def write_json(symbols, path):
+    """Write the size report to a JSON file."""
+    result = {
+        "symbols": [sym._asdict() for sym in symbols],
+        "totals": totals(symbols),
+    }
+    try:
+        with open(path, "w") as fp:
+            json.dump(result, fp, indent=2, sort_keys=True)
+            fp.write("\n")
+    except OSError as ex:
+        raise Error("Could not write report: {}".format(ex), filename=path)
+
+
+def read_budget(fp):
+    """Read a budget file.
+
+    Returns:
+      A list of (lineno, name, size)
+    """
+    result = []
+    names = set()
+    reader = csv.reader(fp)
+
+    def error(msg):
+        return Error(msg, lineno=lineno)
+
+    row = next(reader)
+    headers = ["Name", "Bytes"]
+    if row != headers:
+        raise Error("Got headers {!r}, expected {!r}".format(row, headers),
+                    lineno=1)
+    for lineno, row in enumerate(reader, 2):
+        if not row:
+            continue
+        try:
+            name, size = row
+        except ValueError:
+            raise error("Got {} columns, expected 2".format(len(row)))
+        try:
+            size = int(size)
+        except ValueError:
+            raise error("Invalid size {!r}".format(size))
+        if size < 0:
+            raise error("Invalid size {!r}".format(size))
+        if name in names:
+            raise error("Duplicate name {!r}".format(name))
+        names.add(name)
+        result.append((lineno, name, size))
+    return result
+
+
+def check_budget(symbols, path):
+    """Check that the tables fit in a budget.
+
+    Arguments:
+      symbols: List of Symbol objects
+      path: Path to the budget file
+    """
+    try:
+        with open(path, newline="") as fp:
+            try:
+                budget = read_budget(fp)
+            except Error as ex:
+                ex.filename = path
+                raise
+    except OSError as ex:
+        raise Error("Could not read budget: {}".format(ex), filename=path)
+    sizes = totals(symbols)
+    for sym in symbols:
+        sizes[sym.name] = sym.size
+    over = []
+    for lineno, name, size in budget:
+        actual = sizes.get(name)
+        if actual is None:
+            raise Error("No table or file named {!r}".format(name),
+                        filename=path,
+                        lineno=lineno)
+        if actual > size:
+            over.append("{} is {} bytes, budget is {}".format(
+                name, actual, size))
+    if over:
+        raise Error("Tables are over budget: {}".format("; ".join(over)),
+                    filename=path)
+
+
+def main(argv):
+    p = argparse.ArgumentParser(
+        description="Report the size of the tables in the generated C code")
+    p.add_argument("--budget", help="check sizes against a CSV budget file")
+    p.add_argument("--output", "-o", help="write the report to a JSON file")
+    p.add_argument("--quiet",
+                   "-q",
+                   help="do not print the report",
+                   action="store_true")
+    p.add_argument("dir",
+                   nargs="?",
+                   help="directory containing generated code")
+    args = p.parse_args(argv)
+
+    outdir = args.dir
+    if outdir is None:
+        repodir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        outdir = os.path.join(repodir, "src")
+    try:
+        symbols = scan(outdir)
+        if not args.quiet:
+            report(symbols, sys.stdout)
+        if args.output is not None:
+            write_json(symbols, args.output)
+        if args.budget is not None:
+            check_budget(symbols, args.budget)
+    except Error as ex:
+        print("Error:", ex, file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -3,38 +3,564 @@
 # for details.
 """Generate keycode maps from extracted data files."""
 import argparse
+import collections
+import functools
 import os
 import sys
 
-from common import Error
+if not __package__:
+    # Run as a script, rather than as part of the package. Import the package
+    # so the relative imports below work.
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "scripts"
 
-import codegen
-import tables
+from .common import Error, map_jobs
 
+from . import aliases
+from . import bintable
+from . import codegen
+from . import footprint
+from . import manifest
+from . import metrics
+from . import pycodegen
+from . import tables
+from . import translate
+from . import xkb
 
-def generate(*, datadir, outdir, quiet):
+
+def hash_inputs(datadir, names):
+    """Hash input data files.
+
+    Returns:
+      A map from file name to hash
+    """
+    result = {}
+    for name in names:
+        digest = manifest.hash_file(os.path.join(datadir, name))
+        if digest is None:
+            raise Error("Data file not found", filename=name)
+        result[name] = digest
+    return result
+
+
+# Pseudo-input recorded for targets generated with a shared string pool, so
+# switching modes regenerates them.
+SHARED_STRINGS_INPUT = "<shared-strings>"
+
+# Data file listing the modifier keys and their bits in a modifier mask.
+MODIFIERS_INPUT = "modifiers.csv"
+
+# Data file listing aliases for key names.
+ALIASES_INPUT = "aliases.csv"
+
+# Data files used to compile XKB layouts, in addition to the symbols files.
+XKB_INPUTS = ["xkb_layouts.csv", "xkb_keycodes.csv", "xkb_keysyms.csv"]
+
+# Pseudo-input recorded for the XKB target, giving the directory containing the
+# symbols files, so switching directories regenerates it.
+XKB_DIR_INPUT = "<xkb-dir>"
+
+# Pseudo-input recorded for the translation tables between platforms, with the
+# list of platform pairs, so changing the pairs regenerates them.
+TRANSLATE_INPUT = "<translate>"
+
+
+def generate(*,
+             datadir,
+             outdir,
+             pydir=None,
+             benchdir=None,
+             quiet,
+             force=False,
+             jobs=1,
+             shared_strings=False,
+             rule_stats=False,
+             profile=False,
+             xkbdir=None,
+             translate_pairs=None,
+             translate_report=False):
     """Generate keycode library source files.
 
+    Targets whose inputs have not changed since the last run, according to the
+    manifest in the output directory, are skipped.
+
     Arguments:
       datadir: Directory containing data files
       outdir: Directory to write output source code
+      pydir: Directory to write the Python module, or None to skip it
+      benchdir: Directory to write the C benchmark program, or None to skip
+        it
       quiet: Print only informational messages
+      force: Generate all targets, even if they are up to date
+      jobs: Number of platforms to build in parallel
+      shared_strings: Put the names for every C name function in a single
+        string pool
+      rule_stats: Print the number of scancodes matched by each keymap rule
+      profile: Record the time and memory used by each stage
+      xkbdir: Directory containing XKB symbols files, or None to use the
+        files in the data directory
+      translate_pairs: List of (source, target) platform names to emit
+        direct translation tables for, or None for every pair
+      translate_report: Print the keys which cannot be translated for each
+        pair of platforms
+    Returns:
+      The metrics recorded if profile is true, otherwise None
+    """
+    kw = {
+        "datadir": datadir,
+        "outdir": outdir,
+        "pydir": pydir,
+        "benchdir": benchdir,
+        "quiet": quiet,
+        "force": force,
+        "jobs": jobs,
+        "shared_strings": shared_strings,
+        "rule_stats": rule_stats,
+        "profile": profile,
+        "xkbdir": xkbdir,
+        "translate_pairs": translate_pairs,
+        "translate_report": translate_report,
+    }
+    with metrics.collect("common", profile) as recorder:
+        with metrics.stage("total"):
+            generate_targets(**kw)
+    return metrics.data(recorder)
+
+
+Output = collections.namedtuple("Output",
+                                ["hid_table", "keytables", "files"])
+Output.__doc__ = """Source files generated in memory.
+
+Attributes:
+  hid_table: List of Keycode objects which are used on any platform
+  keytables: List of Keytable objects, in the order of tables.PLATFORMS
+  files: Map from each target name to a map from file name to the contents of
+    the file, as a bytestring
+"""
+
+
+def targets(shared_strings=False):
+    """Get the names of the targets, in the order they are generated."""
+    result = ["keycodes", "bench", "binary"]
+    result.extend(name for name, size in tables.PLATFORMS)
+    if shared_strings:
+        result.append("strings")
+    result.extend(["state", "names", "xkb", "translate", "python"])
+    return result
+
+
+def build(*,
+          datadir,
+          only=None,
+          jobs=1,
+          shared_strings=False,
+          xkbdir=None,
+          translate_pairs=None):
+    """Generate keycode library source files in memory.
+
+    No files are written and the manifest is not used, so every requested
+    target is generated. Warnings are not printed.
+
+    Arguments:
+      datadir: Directory containing data files
+      only: List of targets to generate, from targets(), or None for every
+        target
+      jobs: Number of platforms to build in parallel
+      shared_strings: Put the names for every C name function in a single
+        string pool
+      xkbdir: Directory containing XKB symbols files, or None to use the
+        files in the data directory
+      translate_pairs: List of (source, target) platform names to emit
+        direct translation tables for, or None for every pair
+    Returns:
+      An Output object
+    """
+    all_targets = targets(shared_strings)
+    if only is None:
+        only = all_targets
+    for target in only:
+        if target not in all_targets:
+            raise Error("Unknown target {!r}".format(target))
+    xkb_sources = None
+    if "xkb" in only:
+        if xkbdir is None:
+            xkbdir = os.path.join(datadir, "xkb")
+        xkb_sources, xkb_files = xkb.load_layouts(datadir, xkbdir)
+    if translate_pairs is None:
+        translate_pairs = translate.all_pairs(
+            [name for name, size in tables.PLATFORMS])
+    hid_table, keytables, outputs = emit_targets(
+        datadir=datadir,
+        target_dirs={},
+        stale=set(only),
+        quiet=True,
+        jobs=jobs,
+        shared_strings=shared_strings,
+        profile=False,
+        xkb_sources=xkb_sources,
+        translate_pairs=translate_pairs)
+    files = {}
+    for target in all_targets:
+        if target in outputs:
+            files[target] = {
+                filename: data
+                for filename, data, changed in outputs[target]
+            }
+    return Output(hid_table, keytables, files)
+
+
+def generate_targets(*, datadir, outdir, pydir, benchdir, quiet, force, jobs,
+                     shared_strings, rule_stats, profile, xkbdir,
+                     translate_pairs, translate_report):
+    """Generate the stale targets. See generate() for arguments."""
+    platform_inputs = {
+        name: hash_inputs(datadir, ["hid.csv"] + tables.keytable_inputs(name))
+        for name, size in tables.PLATFORMS
+    }
+    # The cross-platform files depend on which HID codes are used by any
+    # platform, so they depend on all inputs.
+    all_inputs = {}
+    for inputs in platform_inputs.values():
+        all_inputs.update(inputs)
+    target_inputs = {
+        "keycodes": all_inputs,
+        "binary": all_inputs,
+    }
+    target_inputs.update(platform_inputs)
+    if shared_strings:
+        # Every C target uses offsets into the pool, which contains strings
+        # from every input.
+        shared_inputs = dict(all_inputs)
+        shared_inputs[SHARED_STRINGS_INPUT] = "1"
+        target_inputs = {target: shared_inputs for target in target_inputs}
+        target_inputs["strings"] = shared_inputs
+    target_inputs["state"] = hash_inputs(datadir,
+                                         ["hid.csv", MODIFIERS_INPUT])
+    names_inputs = dict(all_inputs)
+    names_inputs.update(hash_inputs(datadir, [ALIASES_INPUT]))
+    target_inputs["names"] = names_inputs
+    state = manifest.Manifest.load(outdir, manifest.generator_version())
+    if xkbdir is None:
+        xkbdir = os.path.join(datadir, "xkb")
+    # Layouts are translated to HID keycodes with the Linux keycode table.
+    xkb_base = dict(platform_inputs["linux"])
+    xkb_base.update(hash_inputs(datadir, XKB_INPUTS))
+    xkb_base[XKB_DIR_INPUT] = os.path.relpath(xkbdir, datadir)
+    # Loading the layouts parses every symbols file, so check the symbols
+    # files recorded in the manifest first, and only load the layouts if the
+    # target must be generated.
+    xkb_sources = None
+    xkb_inputs = recorded_xkb_inputs(state, datadir, xkb_base)
+    if (force or xkb_inputs is None
+            or not state.is_current("xkb", xkb_inputs, outdir)):
+        xkb_sources, xkb_files = xkb.load_layouts(datadir, xkbdir)
+        xkb_inputs = dict(xkb_base)
+        xkb_inputs.update(
+            hash_inputs(
+                datadir,
+                [os.path.relpath(path, datadir) for path in xkb_files]))
+    target_inputs["xkb"] = xkb_inputs
+    if translate_pairs is None:
+        translate_pairs = translate.all_pairs(
+            [name for name, size in tables.PLATFORMS])
+    translate_inputs = dict(all_inputs)
+    translate_inputs[TRANSLATE_INPUT] = translate.format_pairs(translate_pairs)
+    target_inputs["translate"] = translate_inputs
+    target_dirs = {target: outdir for target in target_inputs}
+    if pydir is not None:
+        target_inputs["python"] = all_inputs
+        target_dirs["python"] = pydir
+    if benchdir is not None:
+        # The benchmark is a program, not part of the library, so it is kept
+        # out of the output directory.
+        target_inputs["bench"] = all_inputs
+        target_dirs["bench"] = benchdir
+    if not shared_strings:
+        remove_target(state, "strings", outdir, quiet)
+    stale = {
+        target
+        for target, inputs in target_inputs.items()
+        if force or not state.is_current(target, inputs, target_dirs[target])
+    }
+    if not stale and not rule_stats and not translate_report:
+        return
+
+    hid_table, keytables, outputs = emit_targets(
+        datadir=datadir,
+        target_dirs=target_dirs,
+        stale=stale,
+        quiet=quiet,
+        jobs=jobs,
+        shared_strings=shared_strings,
+        profile=profile,
+        xkb_sources=xkb_sources,
+        translate_pairs=translate_pairs)
+    if rule_stats:
+        print_rule_stats(keytables)
+    if translate_report:
+        translate.report(sys.stdout, keytables, translate_pairs, hid_table)
+    # Messages are printed here, rather than as the files are written, so the
+    # output is the same no matter which order the jobs finish in.
+    for target in target_inputs:
+        files = outputs.get(target)
+        if files is None:
+            continue
+        for filename, data, changed in files:
+            if changed and not quiet:
+                print("Writing", filename, file=sys.stderr)
+        state.record(
+            target, target_inputs[target], {
+                filename: manifest.hash_data(data)
+                for filename, data, changed in files
+            })
+    state.save()
+
+
+def recorded_xkb_inputs(state, datadir, base_inputs):
+    """Hash the inputs of the XKB target which are recorded in the manifest.
+
+    Arguments:
+      state: The manifest
+      datadir: Directory containing data files
+      base_inputs: Inputs of the XKB target other than the symbols files
+    Returns:
+      A map from input file name to hash, or None if the recorded inputs are
+      missing or no longer exist
+    """
+    recorded = state.inputs("xkb")
+    if recorded is None:
+        return None
+    inputs = dict(base_inputs)
+    for name in recorded:
+        if name in base_inputs:
+            continue
+        digest = manifest.hash_file(os.path.join(datadir, name))
+        if digest is None:
+            return None
+        inputs[name] = digest
+    return inputs
+
+
+def emit_targets(*, datadir, target_dirs, stale, quiet, jobs, shared_strings,
+                 profile, xkb_sources, translate_pairs):
+    """Read the data files and emit the stale targets.
+
+    Arguments:
+      datadir: Directory containing data files
+      target_dirs: Map from each target name to the directory to write its
+        output to, where a missing target is kept in memory
+      stale: Set of targets to emit
+      quiet: Print only informational messages
+      jobs: Number of platforms to build in parallel
+      shared_strings: Put the names for every C name function in a single
+        string pool
+      profile: Record the time and memory used by each stage
+      xkb_sources: XKB symbols sources, from xkb.load_layouts, or None if the
+        "xkb" target is not stale
+      translate_pairs: List of (source, target) platform names to emit direct
+        translation tables for
+    Returns:
+      (hid_table, keytables, outputs), where hid_table is the list of Keycode
+      objects used by any platform, keytables is the list of Keytable objects
+      in the order of tables.PLATFORMS, and outputs maps each emitted target
+      to the result of emit_target
     """
     with tables.ReadFile(datadir, "hid.csv") as fp:
         hid_table = tables.read_hid(fp)
-    keytables = tables.read_all(datadir, hid_table)
+    hid_names = {key.name: key for key in hid_table}
+    # With a shared string pool, the platform files can only be emitted once
+    # every platform has been read.
+    results = map_jobs(
+        functools.partial(build_platform,
+                          datadir=datadir,
+                          target_dirs=target_dirs,
+                          hid_names=hid_names,
+                          stale=set() if shared_strings else stale,
+                          profile=profile), tables.PLATFORMS, jobs)
+    for keytable, files, mdata in results:
+        metrics.merge(mdata)
+    results = [(keytable, files) for keytable, files, mdata in results]
+    keytables = [keytable for keytable, files in results]
     hid_used = set()
     for keytable in keytables:
         hid_used.update(keytable.to_hid_table)
     hid_used.discard(0)
 
-    def open_file(name, **kw):
-        return codegen.WriteFile(outdir, name, quiet=quiet, **kw)
+    hid_table = [key for key in hid_table if key.code in hid_used]
+    outputs = {}
+
+    def emit(target, func, *args, **kw):
+        outputs[target] = emit_target(target_dirs.get(target), func, *args,
+                                      **kw)
+
+    pool = None
+    if shared_strings:
+        name_tables = [codegen.keycode_names(hid_table)]
+        for keytable in keytables:
+            name_tables.extend(codegen.keytable_names(keytable))
+        pool = codegen.StringPool(name_tables)
+        if not quiet:
+            print("Shared string pool: {} bytes, {} bytes saved".format(
+                len(pool.data), pool.separate_size - len(pool.data)),
+                  file=sys.stderr)
+        if "strings" in stale:
+            emit("strings", codegen.emit_string_pool, pool)
+        stale_tables = [
+            keytable for keytable in keytables if keytable.name in stale
+        ]
+        results = []
+        for keytable, (files, mdata) in zip(
+                stale_tables,
+                map_jobs(
+                    functools.partial(emit_platform,
+                                      target_dirs=target_dirs,
+                                      pool=pool,
+                                      profile=profile), stale_tables, jobs)):
+            metrics.merge(mdata)
+            results.append((keytable, files))
+    if "keycodes" in stale:
+        emit("keycodes", codegen.emit_keycodes, hid_table, pool)
+    if "bench" in stale:
+        emit("bench", codegen.emit_benchmark, hid_table, keytables)
+    if "binary" in stale:
+        emit("binary", bintable.emit_binary, hid_table, keytables)
+    if "state" in stale:
+        with tables.ReadFile(datadir, MODIFIERS_INPUT) as fp:
+            modifiers = tables.read_modifiers(fp, hid_names)
+        emit("state", codegen.emit_state, modifiers)
+    if "names" in stale:
+        platforms = [keytable.name for keytable in keytables]
+        with tables.ReadFile(datadir, ALIASES_INPUT) as fp:
+            alias_table = aliases.read_aliases(
+                fp, {key.name: key
+                     for key in hid_table}, platforms)
+        index = aliases.make_index(hid_table, keytables, alias_table)
+        emit("names", aliases.emit_names, index, platforms)
+    if "xkb" in stale:
+        linux = next(keytable for keytable in keytables
+                     if keytable.name == "linux")
+        layouts = xkb.compile_layouts(datadir, xkb_sources,
+                                      linux.to_hid_table)
+        if not quiet:
+            for layout in layouts:
+                if layout.unknown:
+                    print("Warning: layout {}: unknown keysyms: {}".format(
+                        layout.name, " ".join(sorted(layout.unknown))),
+                          file=sys.stderr)
+        emit("xkb", xkb.emit_layouts, layouts)
+    if "translate" in stale:
+        emit("translate", translate.emit_translate, keytables,
+             translate_pairs)
+    if "python" in stale:
+        emit("python", pycodegen.emit_module, hid_table, keytables)
+    for keytable, files in results:
+        if files is not None:
+            outputs[keytable.name] = files
+    return hid_table, keytables, outputs
 
-    codegen.emit_keycodes(open_file,
-                          [key for key in hid_table if key.code in hid_used])
+
+def print_rule_stats(keytables):
+    """Print the number of scancodes matched by each keymap rule."""
     for keytable in keytables:
-        codegen.emit_keytable(open_file, keytable)
+        map_file = tables.keytable_inputs(keytable.name)[1]
+        for lineno, match, count in keytable.rule_matches:
+            print("{}:{}: {} {}".format(map_file, lineno, count, match))
+
+
+def remove_target(state, target, outdir, quiet):
+    """Remove the output files for a target which is no longer generated.
+
+    Arguments:
+      state: The Manifest
+      target: Target name
+      outdir: Directory containing outputs
+      quiet: Print only informational messages
+    """
+    entry = state.targets.pop(target, None)
+    if entry is None:
+        return
+    for filename in entry.get("outputs", ()):
+        try:
+            os.remove(os.path.join(outdir, filename))
+        except FileNotFoundError:
+            continue
+        except OSError as ex:
+            raise Error("Could not remove file: {}".format(ex),
+                        filename=filename)
+        if not quiet:
+            print("Removing", filename, file=sys.stderr)
+
+
+def emit_target(outdir, func, *args, **kw):
+    """Emit the output files for one target.
+
+    Arguments:
+      outdir: Directory to write output source code, or None to keep the
+        output in memory
+      func: Emitter function, called as func(open_file, *args, **kw)
+    Returns:
+      A list of (filename, data, changed) for each output file, where data is
+      the file contents as a bytestring
+    """
+    files = []
+
+    def open_file(name, **kw):
+        wfile = codegen.WriteFile(outdir, name, quiet=True, **kw)
+        files.append(wfile)
+        return wfile
+
+    func(open_file, *args, **kw)
+    return [(wfile.filename, wfile.data, wfile.changed) for wfile in files]
+
+
+def build_platform(platform, *, datadir, target_dirs, hid_names, stale,
+                   profile):
+    """Read the keycode table for a platform and emit its source files.
+
+    Arguments:
+      platform: Tuple (name, size), from tables.PLATFORMS
+      datadir: Directory containing data files
+      target_dirs: Map from target name to output directory, where a
+        missing target is kept in memory
+      hid_names: Map from name to Keycode for all HID keycodes
+      stale: Set of targets which must be emitted
+      profile: Record the time and memory used by each stage
+    Returns:
+      (keytable, files, metrics), where files is the result of emit_target,
+      or None if the platform's files are up to date, and metrics is the
+      recorded metrics or None
+    """
+    name, size = platform
+    with metrics.collect(name, profile) as recorder:
+        try:
+            keytable = tables.read_keytable(datadir, name, size, hid_names)
+            files = None
+            if name in stale:
+                files = emit_target(target_dirs.get(name),
+                                    codegen.emit_keytable, keytable)
+        except Error as ex:
+            ex.platform = name
+            raise
+    return keytable, files, metrics.data(recorder)
+
+
+def emit_platform(keytable, *, target_dirs, pool, profile):
+    """Emit the source files for a platform which has already been read.
+
+    Returns:
+      (files, metrics), where files is the result of emit_target
+    """
+    with metrics.collect(keytable.name, profile) as recorder:
+        try:
+            files = emit_target(target_dirs.get(keytable.name),
+                                codegen.emit_keytable,
+                                keytable,
+                                pool=pool)
+        except Error as ex:
+            ex.platform = keytable.name
+            raise
+    return files, metrics.data(recorder)
 
 
 def main(argv):
@@ -42,10 +568,62 @@ def main(argv):
         description="Generate keycode maps from extracted data files")
     p.add_argument("--data-dir", help="directory containing input CSV data")
     p.add_argument("--out-dir", help="directory to write generated code")
+    p.add_argument("--python-dir",
+                   help="directory to write generated Python module")
+    p.add_argument("--no-python",
+                   help="do not generate the Python module",
+                   action="store_true")
+    p.add_argument("--bench-dir",
+                   help="directory to write generated C benchmark program")
+    p.add_argument("--no-bench",
+                   help="do not generate the C benchmark program",
+                   action="store_true")
     p.add_argument("--quiet",
                    "-q",
                    help="print no informational messages",
                    action="store_true")
+    p.add_argument("--jobs",
+                   "-j",
+                   help="build up to N platforms in parallel",
+                   metavar="N",
+                   type=int,
+                   default=1)
+    p.add_argument("--force",
+                   help="regenerate files even if inputs are unchanged",
+                   action="store_true")
+    p.add_argument("--rule-stats",
+                   help="print the number of scancodes matched by each "
+                   "keymap rule",
+                   action="store_true")
+    p.add_argument("--profile",
+                   help="print the time and memory used by each stage",
+                   action="store_true")
+    p.add_argument("--metrics",
+                   help="write the time and memory used by each stage, and "
+                   "other counts, to a JSON file",
+                   metavar="FILE")
+    p.add_argument("--xkb-dir",
+                   help="directory containing XKB symbols files, such as "
+                   "/usr/share/X11/xkb/symbols")
+    p.add_argument("--shared-strings",
+                   help="use one string pool for every C name function",
+                   action="store_true")
+    p.add_argument("--footprint",
+                   help="print the size of each table in the generated code",
+                   action="store_true")
+    p.add_argument("--budget",
+                   help="fail if the generated tables are larger than the "
+                   "sizes in a CSV budget file",
+                   metavar="FILE")
+    p.add_argument("--translate",
+                   help="emit direct translation tables for these platform "
+                   "pairs, such as linux:windows,windows:linux, instead of "
+                   "every pair",
+                   metavar="PAIRS")
+    p.add_argument("--translate-report",
+                   help="print the keys which cannot be translated for each "
+                   "pair of platforms",
+                   action="store_true")
     args = p.parse_args(argv)
 
     repodir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -55,9 +633,45 @@ def main(argv):
     outdir = os.path.join(repodir, "src")
     if args.out_dir is not None:
         outdir = args.out_dir
+    pydir = os.path.join(repodir, "python")
+    if args.python_dir is not None:
+        pydir = args.python_dir
+    if args.no_python:
+        pydir = None
+    benchdir = os.path.join(repodir, "tests")
+    if args.bench_dir is not None:
+        benchdir = args.bench_dir
+    if args.no_bench:
+        benchdir = None
 
     try:
-        generate(datadir=datadir, outdir=outdir, quiet=args.quiet)
+        translate_pairs = None
+        if args.translate is not None:
+            translate_pairs = translate.parse_pairs(
+                args.translate, [name for name, size in tables.PLATFORMS])
+        data = generate(datadir=datadir,
+                        outdir=outdir,
+                        pydir=pydir,
+                        benchdir=benchdir,
+                        quiet=args.quiet,
+                        force=args.force,
+                        jobs=args.jobs,
+                        shared_strings=args.shared_strings,
+                        rule_stats=args.rule_stats,
+                        profile=args.profile or args.metrics is not None,
+                        xkbdir=args.xkb_dir,
+                        translate_pairs=translate_pairs,
+                        translate_report=args.translate_report)
+        if args.profile:
+            metrics.report(data, sys.stderr)
+        if args.metrics is not None:
+            metrics.write(data, args.metrics, jobs=args.jobs)
+        if args.footprint or args.budget is not None:
+            symbols = footprint.scan(outdir)
+            if args.footprint:
+                footprint.report(symbols, sys.stdout)
+            if args.budget is not None:
+                footprint.check_budget(symbols, args.budget)
     except Error as ex:
         print("Error:", ex, file=sys.stderr)
         raise SystemExit(1)
@@ -0,0 +1,134 @@
+
+/* ========================================================================== */
+/* Benchmark driver. This is appended to the generated benchmark tables. */
+
+enum {
+    /* Number of calibration doublings before giving up. */
+    BENCH_MAX_DOUBLINGS = 40,
+    /* Number of timed trials, the fastest is reported. */
+    BENCH_TRIALS = 5
+};
+
+/* Minimum duration of a timed trial, in seconds. */
+#define BENCH_MIN_TIME 0.01
+
+#if defined _WIN32
+static double bench_time(void) {
+    LARGE_INTEGER count, freq;
+    QueryPerformanceCounter(&count);
+    QueryPerformanceFrequency(&freq);
+    return (double)count.QuadPart / (double)freq.QuadPart;
+}
+#else
+static double bench_time(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec * 1e-9;
+}
+#endif
+
+/* Results are added to this so the calls are not optimized out. */
+static volatile unsigned long bench_sink;
+
+/* Output of batch functions. */
+static unsigned char bench_output[BENCH_INPUT_COUNT];
+
+static unsigned long bench_state = 1;
+
+/* Simple linear congruential generator, so inputs are the same everywhere. */
+static unsigned bench_random(unsigned limit) {
+    bench_state = (bench_state * 1103515245ul + 12345ul) & 0xfffffffful;
+    return (unsigned)((bench_state >> 8) % limit);
+}
+
+static void fill_uniform(unsigned *out, unsigned limit) {
+    unsigned i;
+    for (i = 0; i < BENCH_INPUT_COUNT; i++) {
+        out[i] = bench_random(limit);
+    }
+}
+
+static void run_once(const struct benchmark *b, unsigned long iters) {
+    unsigned long i, sum = 0;
+    switch (b->kind) {
+    case BENCH_TO_HID:
+        for (i = 0; i < iters; i++) {
+            sum += b->to_hid(b->codes[i & (BENCH_INPUT_COUNT - 1)]);
+        }
+        break;
+    case BENCH_TO_NAME:
+        for (i = 0; i < iters; i++) {
+            sum += b->to_name(b->codes[i & (BENCH_INPUT_COUNT - 1)]) != NULL;
+        }
+        break;
+    case BENCH_FROM_ID:
+        for (i = 0; i < iters; i++) {
+            sum += b->from_id(b->strings[i & (BENCH_INPUT_COUNT - 1)]);
+        }
+        break;
+    case BENCH_TABLE:
+        for (i = 0; i < iters; i++) {
+            sum += b->table[b->codes[i & (BENCH_INPUT_COUNT - 1)]];
+        }
+        break;
+    case BENCH_TO_HID_N:
+        /* Each call translates every input, and counts as that many
+           iterations. */
+        for (i = 0; i < iters; i += BENCH_INPUT_COUNT) {
+            b->to_hid_n(b->codes, bench_output, BENCH_INPUT_COUNT);
+            sum += bench_output[(i / BENCH_INPUT_COUNT) &
+                                (BENCH_INPUT_COUNT - 1)];
+        }
+        break;
+    }
+    bench_sink += sum;
+}
+
+/* Get the time per call, in nanoseconds. */
+static double run_benchmark(const struct benchmark *b) {
+    unsigned long iters = BENCH_INPUT_COUNT;
+    double start, elapsed, best;
+    int i;
+    for (i = 0; i < BENCH_MAX_DOUBLINGS; i++) {
+        start = bench_time();
+        run_once(b, iters);
+        elapsed = bench_time() - start;
+        if (elapsed >= BENCH_MIN_TIME) {
+            break;
+        }
+        iters *= 2;
+    }
+    best = elapsed;
+    for (i = 1; i < BENCH_TRIALS; i++) {
+        start = bench_time();
+        run_once(b, iters);
+        elapsed = bench_time() - start;
+        if (elapsed < best) {
+            best = elapsed;
+        }
+    }
+    return best * 1e9 / (double)iters;
+}
+
+int main(int argc, char **argv) {
+    const struct benchmark *b;
+    const char *filter = NULL;
+    if (argc > 2) {
+        fputs("Usage: keycode_bench [FILTER]\n", stderr);
+        return 2;
+    }
+    if (argc == 2) {
+        filter = argv[1];
+    }
+    init_inputs();
+    puts("# keycode lookup benchmark, version 1");
+    puts("# function distribution ns/call");
+    for (b = BENCHMARKS; b->name != NULL; b++) {
+        if (filter != NULL && strstr(b->name, filter) == NULL) {
+            continue;
+        }
+        printf("%-28s %-10s %8.2f\n", b->name, b->dist, run_benchmark(b));
+        fflush(stdout);
+    }
+    return 0;
+}
@@ -2,44 +2,43 @@
    This file is licensed under the terms of the MIT license. See LICENSE.txt
    for details. */
 unsigned keycode_from_id(const char *id) {
-    unsigned char c, buf[KEYCODE_ID_MAXLEN];
+    unsigned char c;
     const char *p;
-    int i, n, d;
-    int left = 0, right = sizeof(KEYCODE_ID_ORDER), center;
+    int i, n;
+    unsigned long h = 2166136261ul ^ KEYCODE_ID_SEED;
     unsigned code;
-    /* Normalize the ID to lower case. */
-    for (n = 0; n < KEYCODE_ID_MAXLEN && id[n] != '\0'; n++) {
+    /* Hash the ID, normalized to lower case. This must match phash.py. */
+    for (n = 0; id[n] != '\0'; n++) {
+        if (n >= KEYCODE_ID_MAXLEN) {
+            return 0;
+        }
         c = id[n];
         if ('A' <= c && c <= 'Z') {
             c |= 32;
         }
-        buf[n] = c;
-    }
-    if (id[n] != '\0') {
-        return 0;
+        h = ((h ^ c) * 16777619ul) & 0xfffffffful;
     }
-    /* Binary search in sorted list of identifiers. */
-    while (left < right) {
-        center = left + (right - left) / 2;
-        code = KEYCODE_ID_ORDER[center];
-        p = KEYCODE_TO_ID_DATA + KEYCODE_TO_ID_OFFSET[code];
-        for (i = 0;; i++) {
-            if (i >= n) {
-                if (p[i] != '\0') {
-                    right = center;
-                    break;
-                }
-                return code;
-            }
-            d = buf[i] - ((unsigned char)p[i] | 32);
-            if (d < 0) {
-                right = center;
-                break;
-            } else if (d > 0) {
-                left = center + 1;
-                break;
-            }
+    /* Displace and mix the hash to get the slot. */
+    h ^= KEYCODE_ID_DISPLACEMENT[h % KEYCODE_ID_BUCKETS];
+    h ^= h >> 16;
+    h = (h * 0x85ebca6bul) & 0xfffffffful;
+    h ^= h >> 13;
+    h = (h * 0xc2b2ae35ul) & 0xfffffffful;
+    h ^= h >> 16;
+    code = KEYCODE_ID_SLOT[h % KEYCODE_ID_SLOTS];
+    /* The slot only tells us which ID could match, compare against it. */
+    p = keycode_to_id(code);
+    for (i = 0; i < n; i++) {
+        c = id[i];
+        if ('A' <= c && c <= 'Z') {
+            c |= 32;
+        }
+        if (p[i] == '\0' || c != ((unsigned char)p[i] | 32)) {
+            return 0;
         }
     }
-    return 0;
+    if (p[n] != '\0') {
+        return 0;
+    }
+    return code;
 }
@@ -0,0 +1,66 @@
+/* Copyright 2019 Dietrich Epp.
+   This file is licensed under the terms of the MIT license. See LICENSE.txt
+   for details. */
+unsigned keycode_from_name(const char *name, unsigned sources,
+                           unsigned *found) {
+    unsigned char c;
+    const char *p;
+    int i, n;
+    unsigned long h = 2166136261ul ^ KEYCODE_NAME_SEED;
+    unsigned slot, entry;
+    if (found != NULL) {
+        *found = 0;
+    }
+    /* Hash the name, normalized to lower case without spaces. This must match
+       aliases.py and phash.py. */
+    for (n = 0, i = 0; name[i] != '\0'; i++) {
+        c = name[i];
+        if (c == ' ') {
+            continue;
+        }
+        if (n >= KEYCODE_NAME_MAXLEN) {
+            return 0;
+        }
+        if ('A' <= c && c <= 'Z') {
+            c |= 32;
+        }
+        h = ((h ^ c) * 16777619ul) & 0xfffffffful;
+        n++;
+    }
+    /* Displace and mix the hash to get the slot. */
+    h ^= KEYCODE_NAME_DISPLACEMENT[h % KEYCODE_NAME_BUCKETS];
+    h ^= h >> 16;
+    h = (h * 0x85ebca6bul) & 0xfffffffful;
+    h ^= h >> 13;
+    h = (h * 0xc2b2ae35ul) & 0xfffffffful;
+    h ^= h >> 16;
+    slot = h % KEYCODE_NAME_SLOTS;
+    /* The slot only tells us which name could match, compare against it. */
+    p = KEYCODE_NAME_TEXT + KEYCODE_NAME_OFFSET[slot];
+    for (i = 0; name[i] != '\0'; i++) {
+        c = name[i];
+        if (c == ' ') {
+            continue;
+        }
+        if ('A' <= c && c <= 'Z') {
+            c |= 32;
+        }
+        if (*p == '\0' || c != (unsigned char)*p) {
+            return 0;
+        }
+        p++;
+    }
+    if (*p != '\0') {
+        return 0;
+    }
+    for (entry = KEYCODE_NAME_START[slot]; entry < KEYCODE_NAME_START[slot + 1];
+         entry++) {
+        if ((KEYCODE_NAME_SOURCES[entry] & sources) != 0) {
+            if (found != NULL) {
+                *found = KEYCODE_NAME_SOURCES[entry];
+            }
+            return KEYCODE_NAME_KEY[entry];
+        }
+    }
+    return 0;
+}
@@ -0,0 +1,59 @@
+
+/* Get the index in the tables for a key, or -1 if it is out of range. */
+static long keycode_xkb_index(int layout, unsigned hid_keycode,
+                              unsigned level) {
+    if (layout < 0 || layout >= KEYCODE_XKB_COUNT ||
+        hid_keycode >= KEYCODE_XKB_KEYS || level >= KEYCODE_XKB_LEVELS) {
+        return -1;
+    }
+    return ((long)layout * KEYCODE_XKB_KEYS + (long)hid_keycode) *
+               KEYCODE_XKB_LEVELS +
+           (long)level;
+}
+
+int keycode_xkb_layout(const char *name) {
+    int i;
+    for (i = 0; i < KEYCODE_XKB_COUNT; i++) {
+        if (strcmp(name, KEYCODE_XKB_NAME[i]) == 0) {
+            return i;
+        }
+    }
+    return -1;
+}
+
+const char *keycode_xkb_layout_name(int layout) {
+    if (layout < 0 || layout >= KEYCODE_XKB_COUNT) {
+        return NULL;
+    }
+    return KEYCODE_XKB_NAME[layout];
+}
+
+const char *keycode_xkb_description(int layout) {
+    if (layout < 0 || layout >= KEYCODE_XKB_COUNT) {
+        return NULL;
+    }
+    return KEYCODE_XKB_DESCRIPTION[layout];
+}
+
+unsigned long keycode_xkb_char(int layout, unsigned hid_keycode,
+                               unsigned level) {
+    long index = keycode_xkb_index(layout, hid_keycode, level);
+    if (index < 0) {
+        return 0;
+    }
+    return KEYCODE_XKB_CHAR[index];
+}
+
+const char *keycode_xkb_label(int layout, unsigned hid_keycode,
+                              unsigned level) {
+    long index = keycode_xkb_index(layout, hid_keycode, level);
+    unsigned offset;
+    if (index < 0) {
+        return NULL;
+    }
+    offset = KEYCODE_XKB_LABEL_OFFSET[index];
+    if (offset == 0) {
+        return NULL;
+    }
+    return KEYCODE_XKB_LABEL_DATA + offset;
+}
@@ -0,0 +1,143 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Manifest of generator inputs and outputs.
+
+The manifest records a hash of every input file and every output file for each
+generation target. If the inputs of a target and the generator itself are
+unchanged, and its outputs still have the recorded contents, then the target
+does not need to be generated again.
+"""
+import hashlib
+import json
+import os
+
+from .common import Error
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+def hash_data(data):
+    """Hash a bytestring, returning a hex digest."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """Hash the contents of a file, or return None if it does not exist."""
+    try:
+        with open(path, "rb") as fp:
+            return hash_data(fp.read())
+    except FileNotFoundError:
+        return None
+
+
+def generator_version():
+    """Get a hash identifying the version of the generator scripts."""
+    dirpath = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(dirpath)):
+        if name.endswith(".py") or name.endswith(".c"):
+            with open(os.path.join(dirpath, name), "rb") as fp:
+                data = fp.read()
+            h.update("{}\0{}\0".format(name, len(data)).encode("UTF-8"))
+            h.update(data)
+    return h.hexdigest()
+
+
+class Manifest:
+    """Record of the inputs and outputs for each generation target.
+
+    Attributes:
+      path: Path to the manifest file
+      version: Hash of the generator which produced the outputs
+      targets: Map from target name to {"inputs": ..., "outputs": ...}, where
+        the inputs and outputs map file names to hashes
+    """
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+        self.targets = {}
+
+    @classmethod
+    def load(cls, dirname, version):
+        """Load the manifest in a directory.
+
+        If the manifest is missing, unreadable, or was produced by a different
+        version of the generator, an empty manifest is returned.
+        """
+        path = os.path.join(dirname, MANIFEST_NAME)
+        manifest = cls(path, version)
+        try:
+            with open(path) as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return manifest
+        if (not isinstance(data, dict)
+                or data.get("format") != MANIFEST_VERSION
+                or data.get("generator") != version):
+            return manifest
+        targets = data.get("targets")
+        if isinstance(targets, dict):
+            manifest.targets = targets
+        return manifest
+
+    def is_current(self, target, inputs, outdir):
+        """Test whether a target is up to date.
+
+        Arguments:
+          target: Target name
+          inputs: Map from input file name to hash
+          outdir: Directory containing outputs
+        """
+        entry = self.targets.get(target)
+        if entry is None or entry.get("inputs") != inputs:
+            return False
+        outputs = entry.get("outputs")
+        if not outputs:
+            return False
+        for name, digest in outputs.items():
+            if hash_file(os.path.join(outdir, name)) != digest:
+                return False
+        return True
+
+    def inputs(self, target):
+        """Get the recorded inputs of a target.
+
+        Returns:
+          A map from input file name to hash, or None if the target is not
+          recorded
+        """
+        entry = self.targets.get(target)
+        if entry is None:
+            return None
+        inputs = entry.get("inputs")
+        if not isinstance(inputs, dict):
+            return None
+        return inputs
+
+    def record(self, target, inputs, outputs):
+        """Record the inputs and outputs of a target.
+
+        Arguments:
+          target: Target name
+          inputs: Map from input file name to hash
+          outputs: Map from output file name to hash
+        """
+        self.targets[target] = {"inputs": inputs, "outputs": outputs}
+
+    def save(self):
+        """Write the manifest to disk."""
+        data = {
+            "format": MANIFEST_VERSION,
+            "generator": self.version,
+            "targets": self.targets,
+        }
+        try:
+            with open(self.path, "w") as fp:
+                json.dump(data, fp, indent=2, sort_keys=True)
+                fp.write("\n")
+        except OSError as ex:
+            raise Error("Could not write manifest: {}".format(ex),
+                        filename=self.path)
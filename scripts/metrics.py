@@ -0,0 +1,206 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Performance metrics for the generator.
+
+Metrics are only recorded while a Recorder is active, so the instrumentation
+costs almost nothing during normal runs. Each stage records its wall time and
+the peak amount of memory allocated while it ran, as measured by tracemalloc.
+Stages may be nested, and a stage which runs more than once accumulates its
+time and number of calls.
+
+Metrics are grouped by scope, which is the name of a platform, or "common" for
+work which is not specific to any platform. Worker processes record metrics
+with their own Recorder, and the results are merged into the main Recorder.
+"""
+import contextlib
+import functools
+import json
+import platform
+import time
+import tracemalloc
+
+from .common import Error
+
+METRICS_VERSION = 1
+
+_recorder = None
+
+
+class Recorder:
+    """Records stage times, memory use, and counts.
+
+    Attributes:
+      scope: Scope for new metrics
+      data: Map from scope to {"stages": ..., "counts": ...}
+    """
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.data = {}
+        # Stack of the peak memory use of the active stages, not counting
+        # nested stages which are still running.
+        self._peaks = []
+
+    def _scope(self):
+        return self.data.setdefault(self.scope, {"stages": {}, "counts": {}})
+
+    def add_stage(self, name, elapsed, peak_memory, calls=1):
+        """Record runs of a stage."""
+        stages = self._scope()["stages"]
+        entry = stages.get(name)
+        if entry is None:
+            stages[name] = {
+                "calls": calls,
+                "time": elapsed,
+                "peak_memory": peak_memory,
+            }
+        else:
+            entry["calls"] += calls
+            entry["time"] += elapsed
+            entry["peak_memory"] = max(entry["peak_memory"], peak_memory)
+
+    def add_count(self, name, value):
+        """Add to a count."""
+        counts = self._scope()["counts"]
+        counts[name] = counts.get(name, 0) + value
+
+    def merge(self, data):
+        """Merge data from another Recorder into this one."""
+        for scope, sdata in data.items():
+            saved = self.scope
+            self.scope = scope
+            try:
+                for name, entry in sdata["stages"].items():
+                    self.add_stage(name, entry["time"], entry["peak_memory"],
+                                   entry["calls"])
+                for name, value in sdata["counts"].items():
+                    self.add_count(name, value)
+            finally:
+                self.scope = saved
+
+
+@contextlib.contextmanager
+def collect(scope, enabled=True):
+    """Record metrics within a context.
+
+    Arguments:
+      scope: Scope for the metrics
+      enabled: If false, no metrics are recorded
+    Returns:
+      A context manager which yields the Recorder, or None if disabled
+    """
+    global _recorder
+    if not enabled:
+        yield None
+        return
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    saved = _recorder
+    _recorder = Recorder(scope)
+    try:
+        yield _recorder
+    finally:
+        _recorder = saved
+        if started:
+            tracemalloc.stop()
+
+
+def data(recorder):
+    """Get the data from a recorder, or None if the recorder is None."""
+    if recorder is None:
+        return None
+    return recorder.data
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Record the time and memory used within a context as a stage."""
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    peaks = recorder._peaks
+    current, peak = tracemalloc.get_traced_memory()
+    if peaks:
+        peaks[-1] = max(peaks[-1], peak)
+    peaks.append(current)
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = max(peaks.pop(), tracemalloc.get_traced_memory()[1])
+        if peaks:
+            peaks[-1] = max(peaks[-1], peak)
+        recorder.add_stage(name, elapsed, peak - current)
+
+
+def timed(name):
+    """Decorator which records each call to a function as a stage."""
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kw):
+            if _recorder is None:
+                return func(*args, **kw)
+            with stage(name):
+                return func(*args, **kw)
+
+        return wrapper
+
+    return decorator
+
+
+def merge(data):
+    """Merge data from another Recorder, if metrics are being recorded.
+
+    Arguments:
+      data: Data from metrics.data(), or None
+    """
+    if _recorder is not None and data is not None:
+        _recorder.merge(data)
+
+
+def count(name, value=1):
+    """Add to a count, if metrics are being recorded."""
+    if _recorder is not None:
+        _recorder.add_count(name, value)
+
+
+def report(data, fp):
+    """Write a human-readable summary of metrics to a file."""
+    for scope, sdata in sorted(data.items()):
+        print("{}:".format(scope), file=fp)
+        for name, entry in sorted(sdata["stages"].items()):
+            print("  {:<20} {:10.6f} s {:6} calls {:10.1f} KiB".format(
+                name, entry["time"], entry["calls"],
+                entry["peak_memory"] / 1024),
+                  file=fp)
+        for name, value in sorted(sdata["counts"].items()):
+            print("  {:<20} {:10}".format(name, value), file=fp)
+
+
+def write(data, path, **info):
+    """Write metrics to a JSON file.
+
+    Arguments:
+      data: Data from metrics.data()
+      path: Output file path
+      info: Additional information to include, such as generator options
+    """
+    result = {
+        "format": METRICS_VERSION,
+        "python": platform.python_version(),
+        "scopes": data,
+    }
+    result.update(info)
+    try:
+        with open(path, "w") as fp:
+            json.dump(result, fp, indent=2, sort_keys=True)
+            fp.write("\n")
+    except OSError as ex:
+        raise Error("Could not write metrics: {}".format(ex), filename=path)
@@ -0,0 +1,137 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Minimal perfect hash construction.
+
+The hash uses the "hash and displace" scheme. Each key is hashed once with a
+seeded 32-bit FNV-1a hash. The low bits of the hash select a bucket, and each
+bucket has a displacement value which is mixed into the hash to select the
+final slot. The generator searches for a seed and displacements which place
+every key in a distinct slot, so the table has exactly one slot per key.
+
+The C implementation of the same functions is in keycode_id.c.
+"""
+import collections
+
+from .common import Error
+
+MASK = 0xffffffff
+FNV_BASIS = 2166136261
+FNV_PRIME = 16777619
+
+# Maximum number of seeds to try before giving up.
+MAX_SEEDS = 1000
+# Maximum displacement value to try for each bucket, for a given seed.
+MAX_DISPLACEMENT = 1 << 16
+
+
+def hash_string(s, seed):
+    """Compute the seeded FNV-1a hash of an ASCII string."""
+    h = FNV_BASIS ^ seed
+    for c in s.encode("ASCII"):
+        h = ((h ^ c) * FNV_PRIME) & MASK
+    return h
+
+
+def mix(h):
+    """Mix the bits of a 32-bit hash value (the MurmurHash3 finalizer)."""
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & MASK
+    h ^= h >> 13
+    h = (h * 0xc2b2ae35) & MASK
+    h ^= h >> 16
+    return h
+
+
+PerfectHash = collections.namedtuple(
+    "PerfectHash", ["seed", "displacements", "slots"])
+PerfectHash.__doc__ = """A minimal perfect hash function.
+
+Attributes:
+  seed: Seed for the string hash
+  displacements: List of displacement values, one per bucket
+  slots: List of keys, in slot order
+"""
+
+
+def lookup_slot(phash, s):
+    """Get the slot for a key. The slot is only meaningful for known keys."""
+    h = hash_string(s, phash.seed)
+    d = phash.displacements[h % len(phash.displacements)]
+    return mix(h ^ d) % len(phash.slots)
+
+
+def _place(hashes, nbuckets):
+    """Try to place hashed keys in slots for a given seed.
+
+    Arguments:
+      hashes: Map from hash value to key
+      nbuckets: Number of buckets
+    Returns:
+      (displacements, slots), or None if no placement was found
+    """
+    n = len(hashes)
+    buckets = [[] for _ in range(nbuckets)]
+    for h in hashes:
+        buckets[h % nbuckets].append(h)
+    order = sorted(range(nbuckets), key=lambda b: len(buckets[b]),
+                   reverse=True)
+    displacements = [0] * nbuckets
+    slots = [None] * n
+    for b in order:
+        bucket = buckets[b]
+        if not bucket:
+            break
+        for d in range(MAX_DISPLACEMENT):
+            positions = [mix(h ^ d) % n for h in bucket]
+            if (len(set(positions)) == len(positions)
+                    and all(slots[pos] is None for pos in positions)):
+                break
+        else:
+            return None
+        displacements[b] = d
+        for h, pos in zip(bucket, positions):
+            slots[pos] = hashes[h]
+    return displacements, slots
+
+
+def make_perfect_hash(keys):
+    """Create a minimal perfect hash function for a set of strings.
+
+    Arguments:
+      keys: List of distinct ASCII strings
+    Returns:
+      A PerfectHash object
+    """
+    keys = list(keys)
+    if len(set(keys)) != len(keys):
+        raise Error("Duplicate keys in perfect hash")
+    if not keys:
+        raise Error("Cannot create perfect hash with no keys")
+    nbuckets = (len(keys) + 1) // 2
+    for seed in range(MAX_SEEDS):
+        hashes = {}
+        for key in keys:
+            hashes.setdefault(hash_string(key, seed), key)
+        if len(hashes) != len(keys):
+            continue
+        result = _place(hashes, nbuckets)
+        if result is not None:
+            displacements, slots = result
+            phash = PerfectHash(seed, displacements, slots)
+            check_perfect_hash(phash, keys)
+            return phash
+    raise Error("Could not find a perfect hash for {} keys".format(len(keys)))
+
+
+def check_perfect_hash(phash, keys):
+    """Check that a perfect hash maps every key to its own slot."""
+    if len(phash.slots) != len(keys):
+        raise Error("Perfect hash has {} slots for {} keys".format(
+            len(phash.slots), len(keys)))
+    for key in keys:
+        slot = lookup_slot(phash, key)
+        other = phash.slots[slot]
+        if other != key:
+            raise Error("Perfect hash collision: {!r} and {!r}".format(
+                key, other))
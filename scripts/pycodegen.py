@@ -0,0 +1,266 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Python code generation functions.
+
+The generated Python module contains the same tables as the generated C code.
+Translation tables are stored as bytes objects and name tables are stored as a
+single bytes object containing all names together with an array of offsets,
+which is a memoryview of a bytes object on little-endian systems. Importing the
+module does not need to parse or build anything.
+"""
+import io
+
+from .common import Error
+
+from . import codegen
+from . import phash
+
+MODULE_HEAD = '''\
+"""Keycode translation tables.
+
+HID keycodes are portable, and correspond to locations on the keyboard. This
+module translates between HID keycodes and platform-specific keycodes, and
+provides names for keycodes. It is the Python equivalent of keytable.h.
+"""
+import sys
+
+# Indicates that a platform-specific keycode does not exist, in tables which
+# translate HID keycodes to platform-specific keycodes.
+KEYCODE_NONE = 255
+
+# Linux keycodes are offset by this amount when they are sent by evdev.
+KEYCODE_EVDEV_OFFSET = 8
+
+# Zero, does not correspond to any key.
+KEY_None = 0
+
+# Keycode definitions.
+{enums}
+
+
+def _array(typecode, data):
+    """Create an array from little-endian data, without copying if possible."""
+    if sys.byteorder == "little":
+        return memoryview(data).cast(typecode)
+    import array
+    result = array.array(typecode)
+    result.frombytes(data)
+    result.byteswap()
+    return result
+
+
+def _string(data, offset):
+    """Get the NUL-terminated string at the given offset."""
+    if not offset:
+        return None
+    return data[offset:data.index(0, offset)].decode("UTF-8")
+'''
+
+ARRAY_TYPECODE = {1: "B", 2: "H", 4: "I"}
+
+NAMEMAP_TEMPLATE = '''
+
+_{uname}_DATA = (
+{ddata})
+_{uname}_OFFSET = _array("{typecode}", (
+{odata}))
+
+
+def {lname}({arg}):
+    """{doc}"""
+    if 0 <= {arg} < {count}:
+        return _string(_{uname}_DATA, _{uname}_OFFSET[{arg}])
+    return None
+'''
+
+
+def format_bytes(data):
+    """Format a bytestring as the body of a parenthesized Python expression."""
+    return codegen.format_data(data, "    ", prefix="b", terminated=False)
+
+
+def format_table(numbers):
+    """Format a table of numbers as a Python expression.
+
+    Tables of bytes are emitted as a bytes object, and tables with larger
+    values are emitted as an array.
+    """
+    typecode, data = pack_numbers(numbers)
+    if typecode == "B":
+        return "(\n{})".format(format_bytes(data))
+    return '_array("{}", (\n{}))'.format(typecode, format_bytes(data))
+
+
+def pack_numbers(numbers):
+    """Pack a list of numbers as little-endian unsigned integers.
+
+    Returns:
+      (typecode, data), where typecode is the array module type code
+    """
+    maxval = max(numbers)
+    for size, typecode in sorted(ARRAY_TYPECODE.items()):
+        if maxval < (1 << (size * 8)):
+            break
+    else:
+        raise Error("Value too large for array: {}".format(maxval))
+    data = b"".join(n.to_bytes(size, "little") for n in numbers)
+    return typecode, data
+
+
+def make_namemap(table, fname, arg, doc):
+    """Create a Python function that maps integers to strings.
+
+    Arguments:
+      table: List of (input, output) pairs, where inputs are integers and
+        outputs are strings
+      fname: The output function name
+      arg: The name of the function argument
+      doc: The function docstring
+    Returns:
+      A string containing Python source code
+    """
+    kmap = codegen.check_namemap(table)
+    data, strmap = codegen.make_string_table(list(kmap.values()))
+    count = max(kmap) + 1
+    stridx = [0] * count
+    for code, kname in kmap.items():
+        stridx[code] = strmap[kname]
+    typecode, odata = pack_numbers(stridx)
+    return NAMEMAP_TEMPLATE.format(
+        lname=fname.lower(),
+        uname=fname.upper(),
+        ddata=format_bytes(data),
+        odata=format_bytes(odata),
+        typecode=typecode,
+        count=count,
+        arg=arg,
+        doc=doc,
+    )
+
+
+KEYTABLE_TEMPLATE = '''
+
+# Mapping from {title} keycodes to HID keycodes.
+# KEY_None (0) indicates no mapping.
+{uname}_TO_HID = {to_hid}
+
+# Mapping from HID keycodes to {title} keycodes.
+# KEYCODE_NONE (255) indicates no mapping.
+{uname}_FROM_HID = (
+{from_hid})
+
+
+def {name}_to_hid(scancode):
+    """Get the HID keycode for the given {title} keycode.
+
+    Returns KEY_None (0) if the keycode is not mapped to an HID keycode.
+    """
+    if 0 <= scancode < {size}:
+        return {uname}_TO_HID[scancode]
+    return 0
+'''
+
+PLATFORM_TITLES = {"linux": "Linux", "macos": "macOS", "windows": "Windows"}
+
+
+def emit_keytable(fp, keytable):
+    """Emit the Python code for a keycode table."""
+    name = keytable.name.lower()
+    title = PLATFORM_TITLES.get(name, name)
+    fp.write(
+        KEYTABLE_TEMPLATE.format(
+            name=name,
+            uname=name.upper(),
+            title=title,
+            size=len(keytable.to_hid_table),
+            to_hid=format_table(keytable.to_hid_table),
+            from_hid=format_bytes(bytes(keytable.from_hid_table)),
+        ))
+    fp.write(
+        make_namemap(
+            keytable.displaynames, "{}_name".format(name), "keycode",
+            "Get the display name for an HID keycode on {}.".format(title)))
+    fp.write(
+        make_namemap(keytable.scancodes, "{}_rawname".format(name),
+                     "scancode",
+                     "Get the raw name of a {} keycode.".format(title)))
+
+
+KEYCODE_ID_TEMPLATE = '''
+
+_ID_SEED = {seed}
+_ID_MAXLEN = {maxlen}
+_ID_DISPLACEMENT = _array("{dtype}", (
+{displacements}))
+_ID_SLOT = _array("{stype}", (
+{slots}))
+
+
+def from_id(ident):
+    """Look up an HID keycode by its identifier.
+
+    Returns 0 if no keycode has the given identifier. Lookup is case
+    insensitive.
+    """
+    try:
+        data = ident.encode("ASCII").lower()
+    except UnicodeEncodeError:
+        return 0
+    if len(data) > _ID_MAXLEN:
+        return 0
+    h = {basis} ^ _ID_SEED
+    for c in data:
+        h = ((h ^ c) * {prime}) & 0xffffffff
+    h ^= _ID_DISPLACEMENT[h % {nbuckets}]
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & 0xffffffff
+    h ^= h >> 13
+    h = (h * 0xc2b2ae35) & 0xffffffff
+    h ^= h >> 16
+    code = _ID_SLOT[h % {nslots}]
+    name = to_id(code)
+    if name is None or name.lower().encode("ASCII") != data:
+        return 0
+    return code
+'''
+
+
+def emit_module(open_file, hid_table, keytables):
+    """Emit the Python module containing all keycode tables.
+
+    Arguments:
+      open_file: Function to open an output file
+      hid_table: List of HID Keycode objects which are used on any platform
+      keytables: List of Keytable objects
+    """
+    enums = io.StringIO()
+    for key in hid_table:
+        enums.write("{} = {}\n".format(codegen.enum_name(key.name), key.code))
+    idents = codegen.keycode_names(hid_table)
+    codes = {ident.lower(): code for code, ident in idents}
+    hashtable = phash.make_perfect_hash(sorted(codes))
+    slots = [codes[ident] for ident in hashtable.slots]
+    dtype, ddata = pack_numbers(hashtable.displacements)
+    stype, sdata = pack_numbers(slots)
+    with open_file("keycode.py") as fp:
+        fp.write(MODULE_HEAD.format(enums=enums.getvalue().rstrip("\n")))
+        fp.write(
+            make_namemap(
+                idents, "to_id", "keycode",
+                "Get the identifier for an HID keycode, or None."))
+        fp.write(
+            KEYCODE_ID_TEMPLATE.format(
+                seed=hashtable.seed,
+                maxlen=max(len(ident) for code, ident in idents),
+                basis=phash.FNV_BASIS,
+                prime=phash.FNV_PRIME,
+                nbuckets=len(hashtable.displacements),
+                nslots=len(slots),
+                dtype=dtype,
+                displacements=format_bytes(ddata),
+                stype=stype,
+                slots=format_bytes(sdata),
+            ))
+        for keytable in keytables:
+            emit_keytable(fp, keytable)
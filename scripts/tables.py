@@ -4,10 +4,13 @@
 """Keycode table generation functions."""
 import collections
 import csv
+import functools
 import os
 import re
 
-from common import Error
+from .common import Error, map_jobs
+
+from . import metrics
 
 
 class ReadFile:
@@ -41,8 +44,10 @@ Keycode = collections.namedtuple("Keycode", ["code", "name", "displayname"])
 
 VALID_NAME = re.compile(r"[_a-z0-9]*(?: [_a-z0-9]+)*", re.IGNORECASE)
 VALID_DISPLAYNAME = re.compile(r"[!-~]+(?: [!-~]+)*")
+VALID_CONSTANT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
 
 
+@metrics.timed("read_hid")
 def read_hid(fp):
     """Read the HID keycode table.
 
@@ -101,6 +106,7 @@ def read_hid(fp):
 Scancode = collections.namedtuple("Scancode", ["code", "name"])
 
 
+@metrics.timed("read_scancodes")
 def read_scancodes(fp):
     """Read a scancodes table mapping platform-specific scancodes to names.
 
@@ -147,6 +153,7 @@ def read_scancodes(fp):
     return result
 
 
+@metrics.timed("read_names")
 def read_names(fp):
     """Read a display name table mapping HID names to platform-specific names.
 
@@ -187,14 +194,279 @@ def read_names(fp):
     return result
 
 
+Modifier = collections.namedtuple("Modifier", ["code", "name", "bit"])
+
+# Modifier masks are C unsigned values, which have at least 16 bits.
+MODIFIER_BITS = 16
+
+
+def read_modifiers(fp, hid_names):
+    """Read the table of modifier keys.
+
+    Arguments:
+      fp: Input file
+      hid_names: Map from name to Keycode for all HID keycodes
+    Returns:
+      A list of Modifier objects, sorted by bit
+    """
+    result = []
+    names = set()
+    bits = set()
+    reader = csv.reader(fp)
+
+    def error(msg):
+        return Error(msg, lineno=lineno)
+
+    row = next(reader)
+    headers = ["Name", "Bit"]
+    if row != headers:
+        raise Error("Got headers {!r}, expected {!r}".format(row, headers),
+                    lineno=1)
+    for lineno, row in enumerate(reader, 2):
+        if not row:
+            continue
+        try:
+            name, bitstr = row
+        except ValueError:
+            raise error("Got {} columns, expected 2".format(len(row)))
+        key = hid_names.get(name)
+        if key is None:
+            raise error("Unknown HID name {!r}".format(name))
+        if name in names:
+            raise error("Duplicate name {!r}".format(name))
+        names.add(name)
+        try:
+            bit = int(bitstr)
+        except ValueError:
+            raise error("Invalid bit {!r}".format(bitstr))
+        if not 0 <= bit < MODIFIER_BITS:
+            raise error("Bit {} out of range, must be less than {}".format(
+                bit, MODIFIER_BITS))
+        if bit in bits:
+            raise error("Duplicate bit {}".format(bit))
+        bits.add(bit)
+        result.append(Modifier(key.code, name, bit))
+    result.sort(key=lambda mod: mod.bit)
+    return result
+
+
+ModifierFlag = collections.namedtuple(
+    "ModifierFlag", ["flag", "scancode", "code", "constant"])
+
+
+def read_modifier_flags(fp):
+    """Read a table mapping platform-specific modifier flags to scancodes.
+
+    Arguments:
+      fp: Input file
+    Returns:
+      A list of (name, flag, constant), where name is a scancode name and
+      constant is the name of the flag in the platform headers
+    """
+    result = []
+    names = set()
+    flags = set()
+    reader = csv.reader(fp)
+
+    def error(msg):
+        return Error(msg, lineno=lineno)
+
+    row = next(reader)
+    headers = ["Name", "Flag", "Constant"]
+    if row != headers:
+        raise Error("Got headers {!r}, expected {!r}".format(row, headers),
+                    lineno=1)
+    for lineno, row in enumerate(reader, 2):
+        if not row:
+            continue
+        try:
+            name, flagstr, constant = row
+        except ValueError:
+            raise error("Got {} columns, expected 3".format(len(row)))
+        if name in names:
+            raise error("Duplicate name {!r}".format(name))
+        names.add(name)
+        try:
+            flag = int(flagstr, 0)
+        except ValueError:
+            raise error("Invalid flag {!r}".format(flagstr))
+        if not 0 < flag <= 0xffffffff:
+            raise error("Flag {!r} out of range".format(flagstr))
+        if flag in flags:
+            raise error("Duplicate flag {!r}".format(flagstr))
+        flags.add(flag)
+        if not VALID_CONSTANT.fullmatch(constant):
+            raise error("Invalid constant {!r}".format(constant))
+        result.append((name, flag, constant))
+    return result
+
+
+Rule = collections.namedtuple("Rule", ["lineno", "match", "name", "regex"])
+Rule.__doc__ = """A rule in a keymap file.
+
+Attributes:
+  lineno: Line number of the rule
+  match: Scancode name, or regular expression between slashes
+  name: HID name, or an expansion template for regular expressions
+  regex: Compiled regular expression, or None for direct mapping rules
+"""
+
+RuleMatch = collections.namedtuple("RuleMatch", ["lineno", "match", "count"])
+
+# Characters which end the literal prefix of a regular expression.
+REGEX_SPECIAL = frozenset("\\.^$*+?{}[]()|")
+
+# Regular expressions which use these features cannot be combined with other
+# regular expressions into a single alternation.
+UNGROUPABLE = re.compile(r"\\[1-9]|\(\?P|\(\?[aiLmsux-]")
+
+
+def has_toplevel_alternation(pattern):
+    """Test whether a regular expression has a | outside any group."""
+    depth = 0
+    in_class = False
+    chars = iter(pattern)
+    for c in chars:
+        if c == "\\":
+            next(chars, None)
+        elif in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+            # A ] immediately after [ or [^ is a literal.
+            c = next(chars, None)
+            if c == "^":
+                c = next(chars, None)
+            if c == "\\":
+                next(chars, None)
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            return True
+    return False
+
+
+def literal_prefix(pattern):
+    """Get a literal string which every match of a regular expression starts
+    with.
+    """
+    if has_toplevel_alternation(pattern):
+        return ""
+    n = 0
+    while n < len(pattern) and pattern[n] not in REGEX_SPECIAL:
+        n += 1
+    if n < len(pattern) and pattern[n] in "*?{":
+        # The last character is optional.
+        n -= 1
+    return pattern[:max(n, 0)]
+
+
+class RuleGroup:
+    """Regular expression rules combined into a single alternation.
+
+    Attributes:
+      rules: List of (index, Rule), in order
+      regex: Compiled regular expression matching any rule in the group
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        if len(rules) == 1:
+            self.regex = rules[0][1].regex
+        else:
+            self.regex = re.compile("|".join(
+                "(?P<r{}>{})".format(n, rule.regex.pattern)
+                for n, (index, rule) in enumerate(rules)))
+
+    def first_match(self, sname):
+        """Get the position in the group of the first rule matching a name.
+
+        Returns:
+          The position in the rules list, or None if no rule matches
+        """
+        m = self.regex.fullmatch(sname)
+        if m is None:
+            return None
+        if len(self.rules) == 1:
+            return 0
+        return int(m.lastgroup[1:])
+
+
+class RuleTrie:
+    """Index of regular expression rules, keyed by literal prefix.
+
+    Each node of the trie contains the rules whose literal prefix is the path
+    to that node, so the rules which can match a name are found in the nodes
+    along that name's path. Groupable rules in the same node are combined into
+    a single alternation, so each node is usually tested with one match.
+
+    Attributes:
+      groups: List of RuleGroup in this node
+      children: Map from character to child node
+    """
+
+    def __init__(self):
+        self.groups = []
+        self.children = {}
+
+    @classmethod
+    def build(cls, rules):
+        """Build a trie from a list of (index, Rule)."""
+        root = cls()
+        node_rules = {}
+        for index, rule in rules:
+            node = root
+            for c in literal_prefix(rule.regex.pattern):
+                child = node.children.get(c)
+                if child is None:
+                    child = cls()
+                    node.children[c] = child
+                node = child
+            node_rules.setdefault(id(node), (node, []))[1].append(
+                (index, rule))
+        for node, nrules in node_rules.values():
+            group = []
+            for item in nrules:
+                if UNGROUPABLE.search(item[1].regex.pattern):
+                    if group:
+                        node.groups.append(RuleGroup(group))
+                        group = []
+                    node.groups.append(RuleGroup([item]))
+                else:
+                    group.append(item)
+            if group:
+                node.groups.append(RuleGroup(group))
+        return root
+
+    def nodes(self, sname):
+        """Iterate over the nodes along the path for a name."""
+        node = self
+        yield node
+        for c in sname:
+            node = node.children.get(c)
+            if node is None:
+                return
+            yield node
+
+
 class KeymapBuilder:
     """Platform-specific scancode to HID keycode map builder.
 
+    Rules in a keymap file are applied in order, and each scancode is mapped by
+    the first rule which matches it. Rather than testing every rule against
+    every scancode, the rules are compiled into a RuleTrie, and each scancode
+    is only tested against the rules whose literal prefix it starts with.
+
     Attributes:
       scancode_map: Map from platform scancode name to value
       used: Set of used scancode names
       keymap: Map from scancode to Keycode objects
       hid_names: Map from name to Keycode for all HID keycodes
+      rule_matches: List of RuleMatch, the number of scancodes matched by each
+        rule which has been applied
     """
 
     def __init__(self, scancodes, hid_names):
@@ -205,7 +477,9 @@ class KeymapBuilder:
         self.used = set()
         self.keymap = {}
         self.hid_names = hid_names
+        self.rule_matches = []
 
+    @metrics.timed("apply_keymap")
     def apply_keymap(self, fp):
         """Apply the rules in a keymap file."""
         reader = csv.reader(fp)
@@ -214,67 +488,138 @@ class KeymapBuilder:
         if row != headers:
             raise Error("Got headers {!r}, expected {!r}".format(row, headers),
                         lineno=1)
+        rules = []
+        # Rules are checked all at once, but the error reported is the one
+        # from the first rule that fails, as if they were applied one by one.
+        errors = []
         for lineno, row in enumerate(reader, 2):
             if not row:
                 continue
             try:
-                self.apply_row(row)
+                rules.append(parse_rule(row, lineno))
             except Error as ex:
                 ex.lineno = lineno
-                raise ex
-
-    def apply_row(self, row):
-        """Apply the rule in a single row of a keymap file."""
-        try:
-            match, name = row
-        except ValueError:
-            raise Error("Got {} columns, expected 2".format(len(row)))
-        if match.startswith("/"):
-            self.apply_regex(match, name)
-        else:
-            self.apply_single(match, name)
-
-    def apply_regex(self, match, name):
-        """Apply a regulare expression rule."""
-        if len(match) <= 2 or not match.endswith("/"):
-            raise Error("Invalid regular expression {!r}".format(match))
-        try:
-            regex = re.compile(match[1:-1])
-        except ValueError as ex:
-            raise Error("Invalid regular expression {!r}: {}".format(
-                match, ex))
-        used_size = len(self.used)
-        for sname in set(self.scancode_map).difference(self.used):
-            m = regex.fullmatch(sname)
-            if m is None:
-                continue
-            if not name:
-                self.used.add(sname)
+                errors.append(ex)
+                break
+        metrics.count("rules", len(rules))
+        claims = self.match_rules(rules)
+        counts = [0] * len(rules)
+        for index, hid_key in claims.values():
+            counts[index] += 1
+        for index, rule in enumerate(rules):
+            try:
+                if rule.regex is None:
+                    self.check_single(rule, index, claims)
+                elif not counts[index]:
+                    raise Error("No scancodes match {!r}".format(rule.match))
+            except Error as ex:
+                ex.lineno = rule.lineno
+                errors.append(ex)
+                break
+        if errors:
+            raise min(errors, key=lambda ex: ex.lineno)
+        for sname, (index, hid_key) in sorted(claims.items(),
+                                              key=lambda item: item[1][0]):
+            self.used.add(sname)
+            if hid_key is not None:
+                self.keymap[self.scancode_map[sname]] = hid_key
+        self.rule_matches.extend(
+            RuleMatch(rule.lineno, rule.match, count)
+            for rule, count in zip(rules, counts))
+
+    def match_rules(self, rules):
+        """Find the first rule which maps each unused scancode.
+
+        A direct rule always maps its scancode. A regular expression rule maps
+        a scancode if it matches and the scancode is ignored or the expanded
+        HID name exists.
+
+        Arguments:
+          rules: List of Rule
+        Returns:
+          A map from scancode name to (rule index, Keycode or None)
+        """
+        singles = {}
+        regex_rules = []
+        for index, rule in enumerate(rules):
+            if rule.regex is None:
+                singles.setdefault(rule.match, index)
+            else:
+                regex_rules.append((index, rule))
+        trie = RuleTrie.build(regex_rules)
+        claims = {}
+        for sname in self.scancode_map:
+            if sname in self.used:
                 continue
-            hname = m.expand(name)
-            hid_key = self.hid_names.get(hname)
-            if hid_key is None:
+            best = singles.get(sname, len(rules))
+            best_key = None
+            for node in trie.nodes(sname):
+                for group in node.groups:
+                    if group.rules[0][0] >= best:
+                        break
+                    claim = self.match_group(group, sname, best)
+                    if claim is not None:
+                        best, best_key = claim
+            if best < len(rules):
+                rule = rules[best]
+                if rule.regex is None and rule.name:
+                    best_key = self.hid_names.get(rule.name)
+                claims[sname] = best, best_key
+        return claims
+
+    def match_group(self, group, sname, limit):
+        """Find the first rule in a group which maps a scancode.
+
+        Arguments:
+          group: RuleGroup to search
+          sname: Scancode name
+          limit: Only rules with a smaller index are considered
+        Returns:
+          (rule index, Keycode or None), or None if no rule maps the scancode
+        """
+        pos = group.first_match(sname)
+        if pos is None:
+            return None
+        for index, rule in group.rules[pos:]:
+            if index >= limit:
+                break
+            m = rule.regex.fullmatch(sname)
+            if m is None:
                 continue
-            code = self.scancode_map[sname]
-            self.keymap[code] = hid_key
-            self.used.add(sname)
-        if len(self.used) == used_size:
-            raise Error("No scancodes match {!r}".format(match))
-
-    def apply_single(self, match, name):
-        """Apply a direct mapping rule."""
-        code = self.scancode_map.get(match)
-        if code is None:
-            raise Error("No scancode has name {!r}".format(match))
-        if match in self.used:
-            raise Error("Scancode {!r} already has mapping".format(match))
-        self.used.add(match)
-        if not name:
-            return
-        hid_key = self.hid_names.get(name)
-        if hid_key is None:
-            raise Error("No HID key is named {!r}".format(name))
-        self.keymap[code] = hid_key
+            if not rule.name:
+                return index, None
+            hid_key = self.hid_names.get(m.expand(rule.name))
+            if hid_key is not None:
+                return index, hid_key
+        return None
+
+    def check_single(self, rule, index, claims):
+        """Check that a direct mapping rule can be applied."""
+        if rule.match not in self.scancode_map:
+            raise Error("No scancode has name {!r}".format(rule.match))
+        claim = claims.get(rule.match)
+        if claim is None or claim[0] != index:
+            raise Error("Scancode {!r} already has mapping".format(
+                rule.match))
+        if rule.name and rule.name not in self.hid_names:
+            raise Error("No HID key is named {!r}".format(rule.name))
+
+
+def parse_rule(row, lineno):
+    """Parse the rule in a single row of a keymap file."""
+    try:
+        match, name = row
+    except ValueError:
+        raise Error("Got {} columns, expected 2".format(len(row)))
+    if not match.startswith("/"):
+        return Rule(lineno, match, name, None)
+    if len(match) <= 2 or not match.endswith("/"):
+        raise Error("Invalid regular expression {!r}".format(match))
+    try:
+        regex = re.compile(match[1:-1])
+    except ValueError as ex:
+        raise Error("Invalid regular expression {!r}: {}".format(match, ex))
+    return Rule(lineno, match, name, regex)
 
 
 class Keytable:
@@ -287,15 +632,72 @@ class Keytable:
         platform-specific human-readable names
       to_hid_table: Array mapping scancodes to HID keycodes
       from_hid_table: Array mapping HID keycodes to scancodes
+      from_hid_all: Array mapping HID keycodes to lists of every scancode
+        which maps to them, in increasing order
+      rule_matches: List of RuleMatch for the rules in the keymap file
+      modifier_flags: List of ModifierFlag objects, or None if the platform
+        has no modifier flags
     """
 
-    def __init__(self, name, scancodes, displaynames, to_hid_table,
-                 from_hid_table):
+    def __init__(self,
+                 name,
+                 scancodes,
+                 displaynames,
+                 to_hid_table,
+                 from_hid_table,
+                 rule_matches=(),
+                 modifier_flags=None):
         self.name = name
         self.scancodes = scancodes
         self.displaynames = displaynames
         self.to_hid_table = to_hid_table
         self.from_hid_table = from_hid_table
+        self.rule_matches = list(rule_matches)
+        self.modifier_flags = modifier_flags
+        self.from_hid_all = [[] for _ in range(len(from_hid_table))]
+        for code, hid in enumerate(to_hid_table):
+            if hid:
+                self.from_hid_all[hid].append(code)
+
+
+# Platforms which report modifier keys as flags, with a table of flags in
+# {name}_modifiers.csv.
+MODIFIER_PLATFORMS = frozenset(["macos"])
+
+
+def keytable_inputs(name):
+    """Get the names of the data files used for a platform's keycode table."""
+    inputs = [
+        "{}_scancodes.csv".format(name),
+        "{}_map.csv".format(name),
+        "{}_names.csv".format(name),
+    ]
+    if name in MODIFIER_PLATFORMS:
+        inputs.append("{}_modifiers.csv".format(name))
+    return inputs
+
+
+def make_modifier_flags(flag_table, scancodes, to_hid_table):
+    """Resolve the scancodes and HID keycodes for a table of modifier flags.
+
+    Arguments:
+      flag_table: List of (name, flag, constant), from read_modifier_flags
+      scancodes: List of Scancode objects
+      to_hid_table: Array mapping scancodes to HID keycodes
+    Returns:
+      A list of ModifierFlag objects
+    """
+    codes = {key.name: key.code for key in scancodes}
+    result = []
+    for name, flag, constant in flag_table:
+        code = codes.get(name)
+        if code is None:
+            raise Error("Unknown scancode name {!r}".format(name))
+        if code >= len(to_hid_table) or not to_hid_table[code]:
+            raise Error("Modifier {!r} has no HID keycode".format(name))
+        result.append(
+            ModifierFlag(flag, code, to_hid_table[code], constant))
+    return result
 
 
 def read_keytable(datadir, name, size, hid_names):
@@ -307,13 +709,16 @@ def read_keytable(datadir, name, size, hid_names):
     Returns:
       A Keytable object for the platform
     """
-    with ReadFile(datadir, "{}_scancodes.csv".format(name)) as fp:
+    inputs = keytable_inputs(name)
+    scancodes_file, map_file, names_file = inputs[:3]
+    with ReadFile(datadir, scancodes_file) as fp:
         scancodes = read_scancodes(fp)
+    metrics.count("scancodes", len(scancodes))
     builder = KeymapBuilder([key for key in scancodes if key.code < size],
                             hid_names)
-    with ReadFile(datadir, "{}_map.csv".format(name)) as fp:
+    with ReadFile(datadir, map_file) as fp:
         builder.apply_keymap(fp)
-    with ReadFile(datadir, "{}_names.csv".format(name)) as fp:
+    with ReadFile(datadir, names_file) as fp:
         name_table = read_names(fp)
     displaynames = []
     for key in builder.keymap.values():
@@ -326,27 +731,49 @@ def read_keytable(datadir, name, size, hid_names):
     from_hid_table = [255] * 256
     for code, key in sorted(builder.keymap.items()):
         to_hid_table[code] = key.code
-        if from_hid_table[key.code] == 255:
+        if key.code >= len(from_hid_table):
+            raise Error("HID keycode {} for {!r} does not fit in the table "
+                        "from HID keycodes".format(key.code, key.name))
+        # Scancodes which do not fit in a byte are left out of the table from
+        # HID keycodes, but are still in the table of every scancode.
+        if from_hid_table[key.code] == 255 and code < 255:
             from_hid_table[key.code] = code
+    modifier_flags = None
+    if name in MODIFIER_PLATFORMS:
+        modifiers_file = inputs[3]
+        with ReadFile(datadir, modifiers_file) as fp:
+            flag_table = read_modifier_flags(fp)
+            modifier_flags = make_modifier_flags(flag_table, scancodes,
+                                                 to_hid_table)
     return Keytable(name, scancodes, displaynames, to_hid_table,
-                    from_hid_table)
+                    from_hid_table, builder.rule_matches, modifier_flags)
 
 
-def read_all(datadir, hid_table):
+# List of (name, size) for each platform, where size is the number of entries
+# in the platform's scancode to HID table. Linux keycodes go up to KEY_MAX,
+# which is 0x2ff.
+PLATFORMS = [("linux", 0x300), ("macos", 128), ("windows", 256)]
+
+
+def _read_platform(platform, *, datadir, hid_names):
+    name, size = platform
+    try:
+        return read_keytable(datadir, name, size, hid_names)
+    except Error as ex:
+        ex.platform = name
+        raise
+
+
+def read_all(datadir, hid_table, jobs=1):
     """Read all keycode tables.
 
     Arguments:
       datadir: Directory containing input data
+      jobs: Number of platforms to read in parallel
     Returns:
       List of of Keytable objects
     """
     hid_names = {key.name: key for key in hid_table}
-    platforms = [("linux", 256), ("macos", 128), ("windows", 256)]
-    result = []
-    for name, size in platforms:
-        try:
-            result.append(read_keytable(datadir, name, size, hid_names))
-        except Error as ex:
-            ex.platform = name
-            raise
-    return result
+    return map_jobs(
+        functools.partial(_read_platform, datadir=datadir,
+                          hid_names=hid_names), PLATFORMS, jobs)
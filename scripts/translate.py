@@ -0,0 +1,198 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Direct translation tables between platforms.
+
+Translating a keycode from one platform to another normally takes two lookups,
+first to the HID keycode and then from the HID keycode. These tables compose
+the two lookups, so each translation is one bounds-checked load.
+"""
+import collections
+import io
+
+from .common import Error
+
+from . import codegen
+from . import pycodegen
+
+Untranslatable = collections.namedtuple("Untranslatable",
+                                        ["code", "name", "hid"])
+Untranslatable.__doc__ = """A keycode with no equivalent on a target platform.
+
+Attributes:
+  code: Source keycode
+  name: Raw name of the source keycode, or None
+  hid: HID keycode the source keycode maps to
+"""
+
+
+def parse_pairs(text, platforms):
+    """Parse a list of platform pairs to translate between.
+
+    Arguments:
+      text: Comma-separated list of SOURCE:TARGET pairs, such as
+        "linux:windows,windows:linux"
+      platforms: List of platform names
+    Returns:
+      A list of (source, target) tuples, in the order given
+    """
+    pairs = []
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        source, sep, target = item.partition(":")
+        if not sep:
+            raise Error("Invalid platform pair {!r}, expected SOURCE:TARGET"
+                        .format(item))
+        for name in (source, target):
+            if name not in platforms:
+                raise Error("Unknown platform {!r}".format(name))
+        if source == target:
+            raise Error("Cannot translate from {} to itself".format(source))
+        pair = source, target
+        if pair in pairs:
+            raise Error("Duplicate platform pair {!r}".format(item))
+        pairs.append(pair)
+    if not pairs:
+        raise Error("No platform pairs")
+    return pairs
+
+
+def all_pairs(platforms):
+    """Get every ordered pair of different platforms."""
+    return [(source, target) for source in platforms for target in platforms
+            if source != target]
+
+
+def format_pairs(pairs):
+    """Format a list of platform pairs in the form parsed by parse_pairs."""
+    return ",".join("{}:{}".format(source, target)
+                    for source, target in pairs)
+
+
+def make_table(source, target):
+    """Compose the tables for two platforms.
+
+    Arguments:
+      source: Keytable to translate from
+      target: Keytable to translate to
+    Returns:
+      A list mapping source keycodes to target keycodes, where KEYCODE_NONE
+      (255) indicates no mapping, with trailing unmapped entries removed
+    """
+    table = [
+        target.from_hid_table[hid] if hid else 255
+        for hid in source.to_hid_table
+    ]
+    while table and table[-1] == 255:
+        table.pop()
+    if not table:
+        raise Error("No keys can be translated from {} to {}".format(
+            source.name, target.name))
+    return table
+
+
+def untranslatable(source, target):
+    """Find the source keycodes which have no equivalent on a target platform.
+
+    Returns:
+      A list of Untranslatable objects, ordered by source keycode
+    """
+    names = {scancode.code: scancode.name for scancode in source.scancodes}
+    return [
+        Untranslatable(code, names.get(code), hid)
+        for code, hid in enumerate(source.to_hid_table)
+        if hid and target.from_hid_table[hid] == 255
+    ]
+
+
+def report(fp, keytables, pairs, hid_table):
+    """Print the keys which cannot be translated for each platform pair.
+
+    Arguments:
+      fp: Output text file
+      keytables: List of Keytable objects
+      pairs: List of (source, target) platform names
+      hid_table: List of Keycode objects
+    """
+    platforms = {keytable.name: keytable for keytable in keytables}
+    hid_names = {key.code: key.name for key in hid_table}
+    for source, target in pairs:
+        missing = untranslatable(platforms[source], platforms[target])
+        print("{} -> {}: {} keys cannot be translated".format(
+            source, target, len(missing)),
+              file=fp)
+        for item in missing:
+            print("    {} {} ({})".format(item.code, item.name or "?",
+                                          hid_names.get(item.hid, item.hid)),
+                  file=fp)
+
+
+HEADER_TEMPLATE = """\
+#ifdef __cplusplus
+extern "C" {{
+#endif
+
+/* Direct translations between platform keycodes. Each function gives the same
+   result as translating to an HID keycode and then from the HID keycode, with
+   one table lookup. The functions return KEYCODE_NONE (255) if the key has no
+   equivalent on the target platform, and are safe to call with any possible
+   input. The platform pairs are chosen when the tables are generated. */
+{functions}
+#ifdef __cplusplus
+}} /* extern "C" */
+#endif
+"""
+
+DECL_TEMPLATE = """
+/* Translate a {title} keycode to a {ttitle} keycode. Equivalent to
+   KEYCODE_{utarget}_FROM_HID[keycode_{source}_to_hid({source}_keycode)]. */
+unsigned keycode_{source}_to_{target}(unsigned {source}_keycode);
+"""
+
+FUNCTION_TEMPLATE = """\
+unsigned keycode_{source}_to_{target}(unsigned {source}_keycode) {{
+    if ({source}_keycode >= {size})
+        return KEYCODE_NONE;
+    return {tname}[{source}_keycode];
+}}
+"""
+
+
+def emit_translate(open_file, keytables, pairs):
+    """Emit the translation tables between platforms.
+
+    Arguments:
+      open_file: Function to open an output file
+      keytables: List of Keytable objects
+      pairs: List of (source, target) platform names
+    """
+    platforms = {keytable.name: keytable for keytable in keytables}
+    decls = io.StringIO()
+    code = io.StringIO()
+    for source, target in pairs:
+        table = make_table(platforms[source], platforms[target])
+        tname = "KEYCODE_{}_TO_{}".format(source.upper(), target.upper())
+        decls.write(
+            DECL_TEMPLATE.format(
+                source=source,
+                target=target,
+                utarget=target.upper(),
+                title=pycodegen.PLATFORM_TITLES.get(source, source),
+                ttitle=pycodegen.PLATFORM_TITLES.get(target, target),
+            ))
+        code.write("static " + codegen.make_xtable(table, tname))
+        code.write(
+            FUNCTION_TEMPLATE.format(
+                source=source,
+                target=target,
+                size=len(table),
+                tname=tname,
+            ))
+    with open_file("keycode_translate.h",
+                   guard="KEYCODE_KEYCODE_TRANSLATE_H") as fp:
+        fp.write(HEADER_TEMPLATE.format(functions=decls.getvalue()))
+    with open_file("keycode_translate.c") as fp:
+        fp.write('#include "keycode_translate.h"\n#include "keytable.h"\n')
+        fp.write(code.getvalue())
@@ -0,0 +1,727 @@
+# Copyright 2019 Dietrich Epp.
+# This file is licensed under the terms of the MIT license. See LICENSE.txt
+# for details.
+"""Compile XKB keyboard layouts into character tables.
+
+XKB symbols files, like the ones in /usr/share/X11/xkb/symbols, describe the
+characters produced by each key in a keyboard layout. This reads the symbols
+for each layout in xkb_layouts.csv and compiles them into a dense table mapping
+each HID keycode and shift level to a Unicode code point, so programs can show
+the label for a key on any of these layouts without calling into X.
+
+Only the first group of each layout is used. Keys are identified by their XKB
+names, like <AE01>, which are translated to Linux keycodes with
+xkb_keycodes.csv and then to HID keycodes with the Linux keycode table. Keysyms
+are translated to code points with xkb_keysyms.csv. Keys and keysyms which are
+not listed are ignored, so symbols files from a full XKB installation can be
+used without modification.
+"""
+import collections
+import csv
+import io
+import os
+import re
+import unicodedata
+
+from .common import Error
+
+from . import codegen
+from . import metrics
+from . import tables
+
+# Number of shift levels in each compiled layout: no modifiers, Shift, AltGr,
+# and Shift+AltGr.
+LEVELS = 4
+
+# Linux keycodes are offset by this amount in X11.
+EVDEV_OFFSET = 8
+
+TOKEN = re.compile(
+    r"""
+    (?P<space>[ \t\r]+|(?://|\#)[^\n]*)
+  | (?P<newline>\n)
+  | (?P<string>"[^"\n]*")
+  | (?P<keyname><[^>\s]+>)
+  | (?P<ident>[A-Za-z0-9_.+\-]+)
+  | (?P<punct>[{}\[\];,=()!])
+""", re.VERBOSE)
+
+# Keywords which can precede an include statement or key definition.
+MERGE_MODES = frozenset(["include", "augment", "override", "replace"])
+
+# Keysyms which mean that a level has no symbol.
+NO_SYMBOL = frozenset(["NoSymbol", "VoidSymbol"])
+
+# Keysyms for Unicode characters, in the form U20AC.
+UNICODE_KEYSYM = re.compile(r"U([0-9A-Fa-f]{4,6})")
+
+# Offset of Unicode characters in numeric keysyms.
+UNICODE_KEYSYM_OFFSET = 0x01000000
+
+VALID_LAYOUT_NAME = re.compile(r"[a-z][a-z0-9_]*")
+
+Token = collections.namedtuple("Token", ["kind", "value", "lineno"])
+
+Section = collections.namedtuple("Section", ["name", "flags", "statements"])
+Section.__doc__ = """A section of an XKB symbols file.
+
+Attributes:
+  name: Section name
+  flags: List of flags before the section, like "default"
+  statements: List of statements, where each statement is ("include", mode,
+    spec), ("key", mode, keyname, symbols), or ("name", description)
+"""
+
+Layout = collections.namedtuple("Layout",
+                                ["name", "description", "chars", "unknown"])
+Layout.__doc__ = """A compiled keyboard layout.
+
+Attributes:
+  name: Layout name, from xkb_layouts.csv
+  description: Human-readable name, from the symbols file, or None
+  chars: Map from HID keycode to a list of code points, one for each shift
+    level, where 0 means that the level has no character
+  unknown: Set of keysyms which are not in xkb_keysyms.csv
+"""
+
+
+def tokenize(text, filename):
+    """Split an XKB file into tokens."""
+    tokens = []
+    lineno = 1
+    pos = 0
+    while pos < len(text):
+        m = TOKEN.match(text, pos)
+        if m is None:
+            raise Error("Unexpected character {!r}".format(text[pos]),
+                        filename=filename,
+                        lineno=lineno)
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "newline":
+            lineno += 1
+        elif kind != "space":
+            tokens.append(Token(kind, m.group(), lineno))
+    return tokens
+
+
+class Parser:
+    """Parser for XKB symbols files."""
+
+    def __init__(self, text, filename):
+        self.filename = filename
+        self.tokens = tokenize(text, filename)
+        self.pos = 0
+
+    def error(self, msg):
+        if self.pos < len(self.tokens):
+            lineno = self.tokens[self.pos].lineno
+        elif self.tokens:
+            lineno = self.tokens[-1].lineno
+        else:
+            lineno = None
+        return Error(msg, filename=self.filename, lineno=lineno)
+
+    def peek(self, offset=0):
+        pos = self.pos + offset
+        if pos < len(self.tokens):
+            return self.tokens[pos].value
+        return None
+
+    def peek_kind(self, offset=0):
+        pos = self.pos + offset
+        if pos < len(self.tokens):
+            return self.tokens[pos].kind
+        return None
+
+    def next(self):
+        if self.pos >= len(self.tokens):
+            raise self.error("Unexpected end of file")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, kind, value=None):
+        token = self.next()
+        if token.kind != kind or (value is not None and token.value != value):
+            self.pos -= 1
+            raise self.error("Expected {}, got {!r}".format(
+                value or kind, token.value))
+        return token.value
+
+    def skip_to(self, stop):
+        """Skip tokens until one of the stop tokens, outside brackets."""
+        depth = 0
+        while True:
+            value = self.peek()
+            if value is None:
+                raise self.error("Unexpected end of file")
+            if depth == 0 and value in stop:
+                return
+            self.pos += 1
+            if value in ("{", "[", "("):
+                depth += 1
+            elif value in ("}", "]", ")"):
+                depth -= 1
+
+    def parse_file(self):
+        """Parse the file, returning a list of Section objects."""
+        sections = []
+        while self.pos < len(self.tokens):
+            flags = []
+            while self.peek() != "xkb_symbols":
+                flags.append(self.expect("ident"))
+            self.next()
+            name = self.expect("string")[1:-1]
+            self.expect("punct", "{")
+            statements = []
+            while self.peek() != "}":
+                statement = self.parse_statement()
+                if statement is not None:
+                    statements.append(statement)
+            self.next()
+            self.expect("punct", ";")
+            sections.append(Section(name, flags, statements))
+        return sections
+
+    def parse_statement(self):
+        value = self.peek()
+        if value in MERGE_MODES and self.peek_kind(1) == "string":
+            self.next()
+            spec = self.expect("string")[1:-1]
+            if self.peek() == ";":
+                self.next()
+            return ("include", value, spec)
+        mode = "override"
+        if value in MERGE_MODES and self.peek(1) == "key":
+            mode = value
+            self.next()
+            value = self.peek()
+        if value == "key" and self.peek_kind(1) == "keyname":
+            self.next()
+            keyname = self.expect("keyname")[1:-1]
+            self.expect("punct", "{")
+            symbols = self.parse_key()
+            self.expect("punct", "}")
+            self.expect("punct", ";")
+            return ("key", mode, keyname, symbols)
+        if value == "name" and self.peek(1) == "[":
+            self.pos += 2
+            group = self.expect("ident")
+            self.expect("punct", "]")
+            self.expect("punct", "=")
+            description = self.expect("string")[1:-1]
+            self.expect("punct", ";")
+            if group.lower() != "group1":
+                return None
+            return ("name", description)
+        # Other statements, like modifier_map, do not affect the symbols.
+        self.skip_to({";"})
+        self.next()
+        return None
+
+    def parse_key(self):
+        """Parse the body of a key definition.
+
+        Returns:
+          The list of keysyms in the first group, or None
+        """
+        groups = {}
+        implicit = 1
+        while self.peek() != "}":
+            if self.peek() == "[":
+                groups.setdefault(implicit, self.parse_keysyms())
+                implicit += 1
+            elif self.peek() == "symbols" and self.peek(1) == "[":
+                self.pos += 2
+                group = self.expect("ident")
+                self.expect("punct", "]")
+                self.expect("punct", "=")
+                m = re.fullmatch(r"group([1-4])", group, re.IGNORECASE)
+                if m is None:
+                    raise self.error("Invalid group {!r}".format(group))
+                groups[int(m.group(1))] = self.parse_keysyms()
+            else:
+                # Key types, actions, and other properties.
+                self.skip_to({",", "}"})
+            if self.peek() == ",":
+                self.next()
+        return groups.get(1)
+
+    def parse_keysyms(self):
+        self.expect("punct", "[")
+        keysyms = []
+        if self.peek() == "]":
+            self.next()
+            return keysyms
+        while True:
+            keysyms.append(self.expect("ident"))
+            if self.peek() != ",":
+                break
+            self.next()
+        self.expect("punct", "]")
+        return keysyms
+
+
+def merge_keysyms(old, new, mode):
+    """Merge the keysyms for a key, one level at a time."""
+    if new is None:
+        return old
+    if old is None:
+        return list(new)
+    result = []
+    for n in range(max(len(old), len(new))):
+        a = old[n] if n < len(old) else "NoSymbol"
+        b = new[n] if n < len(new) else "NoSymbol"
+        if mode == "augment":
+            result.append(b if a in NO_SYMBOL else a)
+        else:
+            result.append(a if b in NO_SYMBOL else b)
+    return result
+
+
+class Loader:
+    """Loads layouts from a directory of XKB symbols files.
+
+    Attributes:
+      files: Paths of the files which have been read
+    """
+
+    def __init__(self, symdir):
+        self.symdir = symdir
+        self.files = []
+        self.cache = {}
+
+    def read_file(self, name):
+        """Read and parse a symbols file, returning a list of Section."""
+        sections = self.cache.get(name)
+        if sections is not None:
+            return sections
+        if not re.fullmatch(r"[A-Za-z0-9_\-]+(?:/[A-Za-z0-9_\-]+)*", name):
+            raise Error("Invalid symbols file name {!r}".format(name))
+        path = os.path.join(self.symdir, name)
+        try:
+            with open(path, encoding="UTF-8") as fp:
+                text = fp.read()
+        except FileNotFoundError:
+            raise Error("Symbols file not found", filename=path)
+        except (OSError, UnicodeDecodeError) as ex:
+            raise Error("Could not read symbols file: {}".format(ex),
+                        filename=path)
+        self.files.append(path)
+        sections = Parser(text, path).parse_file()
+        self.cache[name] = sections
+        return sections
+
+    def find_section(self, spec):
+        """Find the section for a layout, like "fr" or "fr(oss)"."""
+        m = re.fullmatch(r"([^()]+)(?:\(([^()]*)\))?", spec)
+        if m is None:
+            raise Error("Invalid layout {!r}".format(spec))
+        name, section_name = m.groups()
+        sections = self.read_file(name)
+        if not sections:
+            raise Error("No sections in symbols file {!r}".format(name))
+        for section in sections:
+            if section_name is None:
+                if "default" in section.flags:
+                    return section
+            elif section.name == section_name:
+                return section
+        if section_name is None:
+            return sections[0]
+        raise Error("No section {!r} in symbols file {!r}".format(
+            section_name, name))
+
+    def load(self, spec, stack=()):
+        """Load the symbols for a layout.
+
+        Arguments:
+          spec: Layout, like "fr" or "fr(oss)"
+        Returns:
+          (keys, description), where keys maps XKB key names to lists of
+          keysyms for the first group
+        """
+        if spec in stack:
+            raise Error("Include loop: {}".format(" -> ".join(stack +
+                                                              (spec, ))))
+        stack += (spec, )
+        section = self.find_section(spec)
+        keys = {}
+        description = None
+        for statement in section.statements:
+            kind = statement[0]
+            if kind == "include":
+                mode, include = statement[1:]
+                # Parts after | are added as additional groups, and only the
+                # first group is compiled.
+                for part in include.split("|")[0].split("+"):
+                    if not part:
+                        continue
+                    part_keys, part_description = self.load(part, stack)
+                    for keyname, keysyms in part_keys.items():
+                        keys[keyname] = merge_keysyms(keys.get(keyname),
+                                                      keysyms, mode)
+                    if description is None:
+                        description = part_description
+            elif kind == "key":
+                mode, keyname, keysyms = statement[1:]
+                if mode == "replace":
+                    keys[keyname] = keysyms
+                else:
+                    keys[keyname] = merge_keysyms(keys.get(keyname), keysyms,
+                                                  mode)
+            elif kind == "name":
+                description = statement[1]
+        return keys, description
+
+
+def read_layouts(fp):
+    """Read the list of layouts to compile.
+
+    Returns:
+      A list of (name, spec), where spec is the layout in the symbols files
+    """
+    result = []
+    names = set()
+    reader = csv.reader(fp)
+
+    def error(msg):
+        return Error(msg, lineno=lineno)
+
+    row = next(reader)
+    headers = ["Name", "Symbols"]
+    if row != headers:
+        raise Error("Got headers {!r}, expected {!r}".format(row, headers),
+                    lineno=1)
+    for lineno, row in enumerate(reader, 2):
+        if not row:
+            continue
+        try:
+            name, spec = row
+        except ValueError:
+            raise error("Got {} columns, expected 2".format(len(row)))
+        if not VALID_LAYOUT_NAME.fullmatch(name):
+            raise error("Invalid layout name {!r}".format(name))
+        if name in names:
+            raise error("Duplicate layout name {!r}".format(name))
+        names.add(name)
+        result.append((name, spec))
+    if not result:
+        raise Error("No layouts")
+    return result
+
+
+def read_keycodes(fp):
+    """Read the table mapping XKB key names to X11 keycodes.
+
+    Returns:
+      A map from key name to keycode
+    """
+    result = {}
+    reader = csv.reader(fp)
+
+    def error(msg):
+        return Error(msg, lineno=lineno)
+
+    row = next(reader)
+    headers = ["Name", "Keycode"]
+    if row != headers:
+        raise Error("Got headers {!r}, expected {!r}".format(row, headers),
+                    lineno=1)
+    for lineno, row in enumerate(reader, 2):
+        if not row:
+            continue
+        try:
+            name, codestr = row
+        except ValueError:
+            raise error("Got {} columns, expected 2".format(len(row)))
+        if name in result:
+            raise error("Duplicate key name {!r}".format(name))
+        try:
+            code = int(codestr)
+        except ValueError:
+            raise error("Invalid keycode {!r}".format(codestr))
+        if code < EVDEV_OFFSET:
+            raise error("Keycode {} is below the evdev offset".format(code))
+        result[name] = code
+    return result
+
+
+def read_keysyms(fp):
+    """Read the table mapping keysym names to Unicode code points.
+
+    Returns:
+      A map from keysym name to code point
+    """
+    result = {}
+    reader = csv.reader(fp)
+
+    def error(msg):
+        return Error(msg, lineno=lineno)
+
+    row = next(reader)
+    headers = ["Name", "Codepoint"]
+    if row != headers:
+        raise Error("Got headers {!r}, expected {!r}".format(row, headers),
+                    lineno=1)
+    for lineno, row in enumerate(reader, 2):
+        if not row:
+            continue
+        try:
+            name, cpstr = row
+        except ValueError:
+            raise error("Got {} columns, expected 2".format(len(row)))
+        if name in result:
+            raise error("Duplicate keysym {!r}".format(name))
+        try:
+            codepoint = int(cpstr, 0)
+        except ValueError:
+            raise error("Invalid code point {!r}".format(cpstr))
+        if not 0 < codepoint < 0x110000:
+            raise error("Code point {!r} out of range".format(cpstr))
+        result[name] = codepoint
+    return result
+
+
+def keysym_codepoint(keysym, keysyms):
+    """Get the code point for a keysym.
+
+    Returns:
+      The code point, 0 if the keysym has no character, or None if the keysym
+      is unknown
+    """
+    if keysym in NO_SYMBOL:
+        return 0
+    codepoint = keysyms.get(keysym)
+    if codepoint is not None:
+        return codepoint
+    m = UNICODE_KEYSYM.fullmatch(keysym)
+    if m is not None:
+        return int(m.group(1), 16)
+    if keysym.startswith("0x"):
+        try:
+            value = int(keysym, 16)
+        except ValueError:
+            return None
+        if value >= UNICODE_KEYSYM_OFFSET:
+            return value - UNICODE_KEYSYM_OFFSET
+        # Latin-1 keysyms are equal to their code points.
+        if 0x20 <= value < 0x7f or 0xa0 <= value < 0x100:
+            return value
+        return 0
+    return None
+
+
+def load_layouts(datadir, symdir):
+    """Read the symbols for every layout in xkb_layouts.csv.
+
+    Arguments:
+      datadir: Directory containing input data
+      symdir: Directory containing XKB symbols files
+    Returns:
+      (sources, files), where sources is a list of (name, keys, description)
+      and files is a list of the symbols files which were read
+    """
+    with tables.ReadFile(datadir, "xkb_layouts.csv") as fp:
+        specs = read_layouts(fp)
+    loader = Loader(symdir)
+    sources = []
+    for name, spec in specs:
+        keys, description = loader.load(spec)
+        sources.append((name, keys, description))
+    return sources, loader.files
+
+
+@metrics.timed("compile_layouts")
+def compile_layouts(datadir, sources, to_hid_table):
+    """Compile layouts into character tables.
+
+    Arguments:
+      datadir: Directory containing input data
+      sources: List of (name, keys, description), from load_layouts
+      to_hid_table: Array mapping Linux keycodes to HID keycodes
+    Returns:
+      A list of Layout objects
+    """
+    with tables.ReadFile(datadir, "xkb_keycodes.csv") as fp:
+        keycodes = read_keycodes(fp)
+    with tables.ReadFile(datadir, "xkb_keysyms.csv") as fp:
+        keysyms = read_keysyms(fp)
+    layouts = []
+    for name, keys, description in sources:
+        chars = {}
+        unknown = set()
+        for keyname, keysym_list in keys.items():
+            code = keycodes.get(keyname)
+            if code is None or keysym_list is None:
+                continue
+            code -= EVDEV_OFFSET
+            hid = to_hid_table[code] if code < len(to_hid_table) else 0
+            if not hid:
+                raise Error("Key <{}> has no HID keycode".format(keyname))
+            levels = [0] * LEVELS
+            for level, keysym in enumerate(keysym_list[:LEVELS]):
+                codepoint = keysym_codepoint(keysym, keysyms)
+                if codepoint is None:
+                    unknown.add(keysym)
+                else:
+                    levels[level] = codepoint
+            if any(levels):
+                chars[hid] = levels
+        layouts.append(Layout(name, description, chars, unknown))
+    return layouts
+
+
+def label(codepoint):
+    """Get the UTF-8 label for a code point, or an empty string for none.
+
+    Combining characters, which are produced by some dead keys, are shown on a
+    no-break space.
+    """
+    if not codepoint:
+        return ""
+    char = chr(codepoint)
+    if unicodedata.category(char) == "Mn":
+        return " " + char
+    return char
+
+
+HEADER_TEMPLATE = """\
+#ifdef __cplusplus
+extern "C" {{
+#endif
+
+/* Character tables for keyboard layouts, compiled from XKB symbols files.
+   These give the character produced by each key on each layout, so the label
+   for a key can be shown without access to the user's keyboard layout. */
+
+enum {{
+    /* Number of shift levels: no modifiers, Shift, AltGr, and Shift+AltGr. */
+    KEYCODE_XKB_LEVELS = {levels}
+}};
+
+/* Layout indexes. */
+enum {{
+{enums}
+}};
+
+/* Get the index of a layout by its name, like "us". Returns -1 if there is no
+   layout with the given name. */
+int keycode_xkb_layout(const char *name);
+
+/* Get the name of a layout, like "us". Returns NULL if the layout does not
+   exist. */
+const char *keycode_xkb_layout_name(int layout);
+
+/* Get the human-readable name of a layout, like "English (US)", in UTF-8.
+   Returns NULL if the layout does not exist or has no name. */
+const char *keycode_xkb_description(int layout);
+
+/* Get the Unicode code point produced by a key at the given shift level.
+   Returns 0 if the key produces no character. Dead keys produce the accent
+   character. Safe to call with any possible input. */
+unsigned long keycode_xkb_char(int layout, unsigned hid_keycode,
+                               unsigned level);
+
+/* Get the label for a key at the given shift level, as a UTF-8 string. Returns
+   NULL if the key produces no character. Safe to call with any possible
+   input. */
+const char *keycode_xkb_label(int layout, unsigned hid_keycode,
+                              unsigned level);
+
+#ifdef __cplusplus
+}} /* extern "C" */
+#endif
+"""
+
+SOURCE_TEMPLATE = """\
+#include "keycode_xkb.h"
+
+#include <string.h>
+
+enum {{
+    /* Every HID keycode with a character is below this. */
+    KEYCODE_XKB_KEYS = {nkeys}
+}};
+
+static const char *const KEYCODE_XKB_NAME[KEYCODE_XKB_COUNT] = {{
+{names}
+}};
+
+static const char *const KEYCODE_XKB_DESCRIPTION[KEYCODE_XKB_COUNT] = {{
+{descriptions}
+}};
+
+/* Code points, indexed by layout, HID keycode, and level. */
+static const {ctype} KEYCODE_XKB_CHAR[{size}] = {{
+{chars}
+}};
+
+static const char KEYCODE_XKB_LABEL_DATA[] =
+{ldata};
+static const {otype} KEYCODE_XKB_LABEL_OFFSET[{size}] = {{
+{offsets}
+}};
+"""
+
+
+def char_type(maxval):
+    """Get the C type for an array of code points."""
+    if maxval < (1 << 16):
+        return codegen.ctype(maxval)
+    # The unsigned type may only have 16 bits.
+    return "unsigned long"
+
+
+def c_string(text):
+    """Format a string as a C string literal, or NULL for None."""
+    if text is None:
+        return "NULL"
+    return codegen.format_data(text.encode("UTF-8"), "")
+
+
+def emit_layouts(open_file, layouts):
+    """Emit the character tables for compiled layouts.
+
+    Arguments:
+      open_file: Function to open an output file
+      layouts: List of Layout objects
+    """
+    enums = io.StringIO()
+    for layout in layouts:
+        enums.write("    KEYCODE_XKB_{},\n".format(layout.name.upper()))
+    enums.write("    /* Number of layouts. */\n")
+    enums.write("    KEYCODE_XKB_COUNT")
+    with open_file("keycode_xkb.h", guard="KEYCODE_KEYCODE_XKB_H") as fp:
+        fp.write(
+            HEADER_TEMPLATE.format(levels=LEVELS, enums=enums.getvalue()))
+
+    nkeys = 1 + max(
+        (max(layout.chars, default=0) for layout in layouts), default=0)
+    chars = []
+    for layout in layouts:
+        for hid in range(nkeys):
+            chars.extend(layout.chars.get(hid, [0] * LEVELS))
+    labels = [label(codepoint) for codepoint in chars]
+    data, strmap = codegen.make_string_table(labels)
+    offsets = [strmap[text] for text in labels]
+    dirpath = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(dirpath, "keycode_xkb.c")) as fp:
+        functions = fp.read()
+    with open_file("keycode_xkb.c") as fp:
+        fp.write(
+            SOURCE_TEMPLATE.format(
+                nkeys=nkeys,
+                names=",\n".join("    " + c_string(layout.name)
+                                 for layout in layouts),
+                descriptions=",\n".join("    " + c_string(layout.description)
+                                        for layout in layouts),
+                ctype=char_type(max(chars)),
+                size=len(chars),
+                chars=codegen.format_numbers(chars, "    "),
+                ldata=codegen.format_data(data, "    "),
+                otype=codegen.ctype(max(offsets)),
+                offsets=codegen.format_numbers(offsets, "    "),
+            ))
+        fp.write(functions)
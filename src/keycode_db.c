@@ -0,0 +1,382 @@
+/* Copyright 2019 Dietrich Epp.
+   This file is licensed under the terms of the MIT license. See LICENSE.txt
+   for details. */
+#if !defined _WIN32
+#define _POSIX_C_SOURCE 200112L
+#endif
+#include "keycode_db.h"
+
+#include <string.h>
+
+#if defined _WIN32
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+/* Layout of the file, see scripts/bintable.py. */
+enum {
+    HDR_VERSION = 8,
+    HDR_SIZE = 12,
+    HDR_CHECKSUM = 16,
+    HDR_STRINGS_OFFSET = 20,
+    HDR_STRINGS_SIZE = 24,
+    HDR_ID_SEED = 28,
+    HDR_ID_MAXLEN = 32,
+    HDR_ID_BUCKETS = 36,
+    HDR_ID_SLOTS = 40,
+    HDR_ID_DISPLACEMENT = 44,
+    HDR_ID_SLOT = 48,
+    HDR_ID_COUNT = 52,
+    HDR_ID_OFFSET = 56,
+    HDR_PLATFORM_COUNT = 60,
+    HDR_PLATFORM_OFFSET = 64,
+    HEADER_SIZE = 68,
+
+    PLAT_NAME = 0,
+    PLAT_NAME_SIZE = 16,
+    PLAT_TO_HID_COUNT = 16,
+    PLAT_TO_HID = 20,
+    PLAT_FROM_HID = 24,
+    PLAT_RAWNAME_COUNT = 28,
+    PLAT_RAWNAME = 32,
+    PLAT_NAME_COUNT = 36,
+    PLAT_NAME_OFFSET = 40,
+    PLATFORM_SIZE = 48,
+
+    FORMAT_VERSION = 1
+};
+
+static const char KEYCODE_DB_MAGIC[8] = {'K', 'E', 'Y', 'T', 'A', 'B', 'L', 'E'};
+
+static unsigned long get32(const unsigned char *p) {
+    return (unsigned long)p[0] | ((unsigned long)p[1] << 8) |
+           ((unsigned long)p[2] << 16) | ((unsigned long)p[3] << 24);
+}
+
+static unsigned long header32(const struct keycode_db *db, unsigned offset) {
+    return get32(db->data + offset);
+}
+
+static unsigned long crc32(const unsigned char *p, size_t n) {
+    unsigned long crc = 0xfffffffful;
+    size_t i;
+    int bit;
+    for (i = 0; i < n; i++) {
+        crc ^= p[i];
+        for (bit = 0; bit < 8; bit++) {
+            crc = (crc >> 1) ^ (0xedb88320ul & (0ul - (crc & 1)));
+        }
+    }
+    return crc ^ 0xfffffffful;
+}
+
+/* Test whether an array is inside the file and aligned. */
+static int in_bounds(unsigned long size, unsigned long offset,
+                     unsigned long count, unsigned long width) {
+    if ((offset & 3) != 0 || offset > size) {
+        return 0;
+    }
+    return count <= (size - offset) / width;
+}
+
+static const unsigned char *platform_record(const struct keycode_db *db,
+                                            int platform) {
+    if (db->data == NULL || platform < 0 ||
+        (unsigned long)platform >= header32(db, HDR_PLATFORM_COUNT)) {
+        return NULL;
+    }
+    return db->data + header32(db, HDR_PLATFORM_OFFSET) +
+           (unsigned long)platform * PLATFORM_SIZE;
+}
+
+static int check_platform(const unsigned char *rec, unsigned long size) {
+    return rec[PLAT_NAME_SIZE - 1] == '\0' &&
+           in_bounds(size, get32(rec + PLAT_TO_HID),
+                     get32(rec + PLAT_TO_HID_COUNT), 1) &&
+           in_bounds(size, get32(rec + PLAT_FROM_HID), 256, 1) &&
+           in_bounds(size, get32(rec + PLAT_RAWNAME),
+                     get32(rec + PLAT_RAWNAME_COUNT), 4) &&
+           in_bounds(size, get32(rec + PLAT_NAME_OFFSET),
+                     get32(rec + PLAT_NAME_COUNT), 4);
+}
+
+int keycode_db_init(struct keycode_db *db, const void *data, size_t size) {
+    const unsigned char *p = data;
+    unsigned long fsize, strings, nstrings, count, i;
+    db->data = NULL;
+    db->size = 0;
+    db->mapping = NULL;
+    db->mapping_size = 0;
+    if (size < HEADER_SIZE || memcmp(p, KEYCODE_DB_MAGIC, 8) != 0) {
+        return KEYCODE_DB_ERR_FORMAT;
+    }
+    if (get32(p + HDR_VERSION) != FORMAT_VERSION) {
+        return KEYCODE_DB_ERR_VERSION;
+    }
+    fsize = get32(p + HDR_SIZE);
+    if (fsize < HEADER_SIZE || fsize > size) {
+        return KEYCODE_DB_ERR_FORMAT;
+    }
+    if (crc32(p + HDR_STRINGS_OFFSET, fsize - HDR_STRINGS_OFFSET) !=
+        get32(p + HDR_CHECKSUM)) {
+        return KEYCODE_DB_ERR_CHECKSUM;
+    }
+    strings = get32(p + HDR_STRINGS_OFFSET);
+    nstrings = get32(p + HDR_STRINGS_SIZE);
+    if (nstrings == 0 || !in_bounds(fsize, strings, nstrings, 1) ||
+        p[strings + nstrings - 1] != '\0') {
+        return KEYCODE_DB_ERR_FORMAT;
+    }
+    if (get32(p + HDR_ID_BUCKETS) == 0 || get32(p + HDR_ID_SLOTS) == 0 ||
+        !in_bounds(fsize, get32(p + HDR_ID_DISPLACEMENT),
+                   get32(p + HDR_ID_BUCKETS), 4) ||
+        !in_bounds(fsize, get32(p + HDR_ID_SLOT), get32(p + HDR_ID_SLOTS),
+                   1) ||
+        !in_bounds(fsize, get32(p + HDR_ID_OFFSET), get32(p + HDR_ID_COUNT),
+                   4)) {
+        return KEYCODE_DB_ERR_FORMAT;
+    }
+    count = get32(p + HDR_PLATFORM_COUNT);
+    if (!in_bounds(fsize, get32(p + HDR_PLATFORM_OFFSET), count,
+                   PLATFORM_SIZE)) {
+        return KEYCODE_DB_ERR_FORMAT;
+    }
+    for (i = 0; i < count; i++) {
+        if (!check_platform(
+                p + get32(p + HDR_PLATFORM_OFFSET) + i * PLATFORM_SIZE,
+                fsize)) {
+            return KEYCODE_DB_ERR_FORMAT;
+        }
+    }
+    db->data = p;
+    db->size = fsize;
+    return KEYCODE_DB_OK;
+}
+
+#if defined _WIN32
+
+int keycode_db_open(struct keycode_db *db, const char *path) {
+    HANDLE file, mapping;
+    LARGE_INTEGER size;
+    void *ptr;
+    int r;
+    db->data = NULL;
+    db->mapping = NULL;
+    file = CreateFileA(path, GENERIC_READ, FILE_SHARE_READ, NULL,
+                       OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, NULL);
+    if (file == INVALID_HANDLE_VALUE) {
+        return KEYCODE_DB_ERR_IO;
+    }
+    if (!GetFileSizeEx(file, &size)) {
+        CloseHandle(file);
+        return KEYCODE_DB_ERR_IO;
+    }
+    /* Files which are empty or larger than 4 GB cannot be valid tables. */
+    if (size.HighPart != 0 || size.LowPart == 0) {
+        CloseHandle(file);
+        return KEYCODE_DB_ERR_FORMAT;
+    }
+    mapping = CreateFileMappingA(file, NULL, PAGE_READONLY, 0, 0, NULL);
+    CloseHandle(file);
+    if (mapping == NULL) {
+        return KEYCODE_DB_ERR_IO;
+    }
+    ptr = MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0);
+    CloseHandle(mapping);
+    if (ptr == NULL) {
+        return KEYCODE_DB_ERR_IO;
+    }
+    r = keycode_db_init(db, ptr, size.LowPart);
+    if (r != KEYCODE_DB_OK) {
+        UnmapViewOfFile(ptr);
+        return r;
+    }
+    db->mapping = ptr;
+    db->mapping_size = size.LowPart;
+    return KEYCODE_DB_OK;
+}
+
+void keycode_db_close(struct keycode_db *db) {
+    if (db->mapping != NULL) {
+        UnmapViewOfFile(db->mapping);
+    }
+    db->data = NULL;
+    db->size = 0;
+    db->mapping = NULL;
+    db->mapping_size = 0;
+}
+
+#else
+
+int keycode_db_open(struct keycode_db *db, const char *path) {
+    struct stat st;
+    void *ptr;
+    size_t size;
+    int fd, r;
+    db->data = NULL;
+    db->mapping = NULL;
+    fd = open(path, O_RDONLY);
+    if (fd == -1) {
+        return KEYCODE_DB_ERR_IO;
+    }
+    if (fstat(fd, &st) != 0) {
+        close(fd);
+        return KEYCODE_DB_ERR_IO;
+    }
+    if (st.st_size <= 0) {
+        close(fd);
+        return KEYCODE_DB_ERR_FORMAT;
+    }
+    size = (size_t)st.st_size;
+    ptr = mmap(NULL, size, PROT_READ, MAP_SHARED, fd, 0);
+    close(fd);
+    if (ptr == MAP_FAILED) {
+        return KEYCODE_DB_ERR_IO;
+    }
+    r = keycode_db_init(db, ptr, size);
+    if (r != KEYCODE_DB_OK) {
+        munmap(ptr, size);
+        return r;
+    }
+    db->mapping = ptr;
+    db->mapping_size = size;
+    return KEYCODE_DB_OK;
+}
+
+void keycode_db_close(struct keycode_db *db) {
+    if (db->mapping != NULL) {
+        munmap(db->mapping, db->mapping_size);
+    }
+    db->data = NULL;
+    db->size = 0;
+    db->mapping = NULL;
+    db->mapping_size = 0;
+}
+
+#endif
+
+int keycode_db_platform(const struct keycode_db *db, const char *name) {
+    const unsigned char *rec;
+    int i;
+    for (i = 0; (rec = platform_record(db, i)) != NULL; i++) {
+        if (strcmp((const char *)rec + PLAT_NAME, name) == 0) {
+            return i;
+        }
+    }
+    return -1;
+}
+
+/* Get a string from an array of string offsets. */
+static const char *get_string(const struct keycode_db *db,
+                              unsigned long array, unsigned long count,
+                              unsigned index) {
+    unsigned long offset;
+    if (index >= count) {
+        return NULL;
+    }
+    offset = get32(db->data + array + 4 * (unsigned long)index);
+    if (offset == 0 || offset >= header32(db, HDR_STRINGS_SIZE)) {
+        return NULL;
+    }
+    return (const char *)db->data + header32(db, HDR_STRINGS_OFFSET) + offset;
+}
+
+unsigned keycode_db_to_hid(const struct keycode_db *db, int platform,
+                           unsigned keycode) {
+    const unsigned char *rec = platform_record(db, platform);
+    if (rec == NULL || keycode >= get32(rec + PLAT_TO_HID_COUNT)) {
+        return 0;
+    }
+    return db->data[get32(rec + PLAT_TO_HID) + keycode];
+}
+
+unsigned keycode_db_from_hid(const struct keycode_db *db, int platform,
+                             unsigned hid_keycode) {
+    const unsigned char *rec = platform_record(db, platform);
+    if (rec == NULL || hid_keycode >= 256) {
+        return 255;
+    }
+    return db->data[get32(rec + PLAT_FROM_HID) + hid_keycode];
+}
+
+const char *keycode_db_name(const struct keycode_db *db, int platform,
+                            unsigned hid_keycode) {
+    const unsigned char *rec = platform_record(db, platform);
+    if (rec == NULL) {
+        return NULL;
+    }
+    return get_string(db, get32(rec + PLAT_NAME_OFFSET),
+                      get32(rec + PLAT_NAME_COUNT), hid_keycode);
+}
+
+const char *keycode_db_rawname(const struct keycode_db *db, int platform,
+                               unsigned keycode) {
+    const unsigned char *rec = platform_record(db, platform);
+    if (rec == NULL) {
+        return NULL;
+    }
+    return get_string(db, get32(rec + PLAT_RAWNAME),
+                      get32(rec + PLAT_RAWNAME_COUNT), keycode);
+}
+
+const char *keycode_db_to_id(const struct keycode_db *db,
+                             unsigned hid_keycode) {
+    if (db->data == NULL) {
+        return NULL;
+    }
+    return get_string(db, header32(db, HDR_ID_OFFSET),
+                      header32(db, HDR_ID_COUNT), hid_keycode);
+}
+
+unsigned keycode_db_from_id(const struct keycode_db *db, const char *id) {
+    unsigned char c;
+    const char *p;
+    unsigned long i, n, h, maxlen;
+    unsigned code;
+    if (db->data == NULL) {
+        return 0;
+    }
+    maxlen = header32(db, HDR_ID_MAXLEN);
+    h = 2166136261ul ^ header32(db, HDR_ID_SEED);
+    /* Hash the ID, normalized to lower case. This must match phash.py. */
+    for (n = 0; id[n] != '\0'; n++) {
+        if (n >= maxlen) {
+            return 0;
+        }
+        c = id[n];
+        if ('A' <= c && c <= 'Z') {
+            c |= 32;
+        }
+        h = ((h ^ c) * 16777619ul) & 0xfffffffful;
+    }
+    h ^= get32(db->data + header32(db, HDR_ID_DISPLACEMENT) +
+               4 * (h % header32(db, HDR_ID_BUCKETS)));
+    h ^= h >> 16;
+    h = (h * 0x85ebca6bul) & 0xfffffffful;
+    h ^= h >> 13;
+    h = (h * 0xc2b2ae35ul) & 0xfffffffful;
+    h ^= h >> 16;
+    code = db->data[header32(db, HDR_ID_SLOT) +
+                    h % header32(db, HDR_ID_SLOTS)];
+    p = keycode_db_to_id(db, code);
+    if (p == NULL) {
+        return 0;
+    }
+    for (i = 0; i < n; i++) {
+        c = id[i];
+        if ('A' <= c && c <= 'Z') {
+            c |= 32;
+        }
+        if (p[i] == '\0' || c != ((unsigned char)p[i] | 32)) {
+            return 0;
+        }
+    }
+    if (p[n] != '\0') {
+        return 0;
+    }
+    return code;
+}
@@ -0,0 +1,90 @@
+/* Copyright 2019 Dietrich Epp.
+   This file is licensed under the terms of the MIT license. See LICENSE.txt
+   for details. */
+#ifndef KEYCODE_KEYCODE_DB_H
+#define KEYCODE_KEYCODE_DB_H
+#include <stddef.h>
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Loader for binary keycode table files, keycode_tables.bin. These files
+   contain the same tables as the functions in keytable.h, but can be replaced
+   at run time without recompiling. The file is memory-mapped and queries read
+   directly from the mapping, so processes which load the same file share one
+   copy. The file format is described in scripts/bintable.py.
+
+   To switch to an updated file while running, open the new file into a second
+   keycode_db, start using it, then close the old one. Queries do not modify
+   the keycode_db, so it can be shared between threads. */
+
+enum {
+    KEYCODE_DB_OK,
+    /* The file could not be opened or mapped. Check errno. */
+    KEYCODE_DB_ERR_IO,
+    /* The file is not a keycode table file, or is damaged. */
+    KEYCODE_DB_ERR_FORMAT,
+    /* The file has an unsupported format version. */
+    KEYCODE_DB_ERR_VERSION,
+    /* The file contents do not match the checksum. */
+    KEYCODE_DB_ERR_CHECKSUM
+};
+
+/* A loaded table file. The fields are private. */
+struct keycode_db {
+    const unsigned char *data;
+    size_t size;
+    void *mapping;
+    size_t mapping_size;
+};
+
+/* Memory-map a table file and check that it is valid. Returns KEYCODE_DB_OK on
+   success, or an error code. On failure, the keycode_db is left empty. */
+int keycode_db_open(struct keycode_db *db, const char *path);
+
+/* Use table data which is already in memory, and check that it is valid. The
+   data must stay valid until keycode_db_close is called, and must be aligned
+   to a multiple of four bytes. Returns KEYCODE_DB_OK on success, or an error
+   code. */
+int keycode_db_init(struct keycode_db *db, const void *data, size_t size);
+
+/* Close a table file, unmapping it if it was opened with keycode_db_open.
+   Strings returned by queries are no longer valid. */
+void keycode_db_close(struct keycode_db *db);
+
+/* Get the index of the tables for a platform, such as "linux", "macos", or
+   "windows". Returns -1 if the file has no tables for the platform. */
+int keycode_db_platform(const struct keycode_db *db, const char *name);
+
+/* Get the HID keycode for a platform keycode. Returns 0 if there is no
+   mapping. Equivalent to keycode_<platform>_to_hid. */
+unsigned keycode_db_to_hid(const struct keycode_db *db, int platform,
+                           unsigned keycode);
+
+/* Get the platform keycode for an HID keycode. Returns KEYCODE_NONE (255) if
+   there is no mapping. Equivalent to KEYCODE_<PLATFORM>_FROM_HID. */
+unsigned keycode_db_from_hid(const struct keycode_db *db, int platform,
+                             unsigned hid_keycode);
+
+/* Get the display name for an HID keycode on a platform. Returns NULL if there
+   is no name. Equivalent to keycode_<platform>_name. */
+const char *keycode_db_name(const struct keycode_db *db, int platform,
+                            unsigned hid_keycode);
+
+/* Get the raw name of a platform keycode. Returns NULL if there is no name.
+   Equivalent to keycode_<platform>_rawname. */
+const char *keycode_db_rawname(const struct keycode_db *db, int platform,
+                               unsigned keycode);
+
+/* Get the identifier for an HID keycode. Returns NULL if there is no
+   identifier. Equivalent to keycode_to_id. */
+const char *keycode_db_to_id(const struct keycode_db *db, unsigned hid_keycode);
+
+/* Look up an HID keycode by its identifier, case insensitive. Returns 0 if no
+   keycode has the identifier. Equivalent to keycode_from_id. */
+unsigned keycode_db_from_id(const struct keycode_db *db, const char *id);
+
+#ifdef __cplusplus
+} /* extern "C" */
+#endif
+#endif
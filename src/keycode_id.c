@@ -1,5 +1,7 @@
 /* This file is automatically generated. */
 #include "keytable.h"
+/* Name map encoding: bitmap, 286 bytes.
+   Sizes: dense 464, bitmap 286, sorted 369. */
 static const char KEYCODE_TO_ID_DATA[] =
     "\0A\0B\0C\0CapsLock\0Comma\0D\0Delete\0DeleteForward\0E\0End\0Escape\0F\0"
     "F1\0F10\0F11\0F12\0F13\0F14\0F15\0F16\0F17\0F18\0F19\0F2\0F20\0F21\0F22\0"
@@ -11,79 +13,99 @@ static const char KEYCODE_TO_ID_DATA[] =
     "eriod\0PrintScreen\0Q\0Quote\0R\0Return\0Right\0RightAlt\0RightBracket\0R"
     "ightControl\0RightGUI\0RightShift\0S\0ScrollLock\0Semicolon\0Slash\0Space"
     "\0SysReq\0T\0Tab\0U\0V\0W\0X\0Y\0Z";
+static const unsigned long KEYCODE_TO_ID_BITMAP[] = {
+    0xfffffff0ul,0xfffbfefful,0xfffffffful,0x806fff9ful,0x44000000ul,
+    0x00000000ul,0x11000000ul,0x000000fful
+};
+static const unsigned char KEYCODE_TO_ID_RANK[] = {
+    0,28,58,90,111,113,113,115
+};
 static const unsigned short KEYCODE_TO_ID_OFFSET[] = {
-    0,0,0,0,1,3,5,22,45,58,147,155,353,174,176,308,365,383,400,402,445,453,523,
-    565,571,573,575,577,579,581,61,73,77,81,85,89,93,97,101,65,0,51,24,567,552,
-    372,261,323,477,390,0,536,447,149,16,426,546,7,60,103,126,129,132,135,138,
-    141,144,63,67,71,433,525,420,167,162,413,31,47,404,462,310,408,417,279,242,
-    268,297,218,251,182,186,190,194,198,202,206,210,214,178,289,385,0,0,259,75,
-    79,83,87,91,95,99,106,110,114,118,122,0,157,367,0,0,0,0,0,0,0,0,378,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,558,0,0,0,455,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,224,0,0,0,232,0,0,0,335,355,315,347,490,512,468,503
+    1,3,5,22,45,58,147,155,353,174,176,308,365,383,400,402,445,453,523,565,571,
+    573,575,577,579,581,69,73,77,81,85,89,93,97,101,65,51,24,567,552,372,261,
+    323,477,390,536,447,149,16,426,546,7,60,103,126,129,132,135,138,141,144,63,
+    67,71,433,525,420,167,162,413,31,47,404,462,310,408,417,279,242,268,297,218,
+    251,182,186,190,194,198,202,206,210,214,178,289,385,259,75,79,83,87,91,95,
+    99,106,110,114,118,122,157,367,378,558,455,224,232,335,355,315,347,490,512,
+    468,503
 };
 const char *keycode_to_id(unsigned index) {
-    unsigned offset;
+    unsigned long word, bit;
+    unsigned rank;
     if (232 <= index)
         return 0;
-    offset = KEYCODE_TO_ID_OFFSET[index];
-    if (offset == 0)
+    word = KEYCODE_TO_ID_BITMAP[index >> 5];
+    bit = 1ul << (index & 31);
+    if ((word & bit) == 0)
         return 0;
-    return KEYCODE_TO_ID_DATA + offset;
+    /* Count the names below this one in the same word. */
+    word &= bit - 1;
+    word -= (word >> 1) & 0x55555555ul;
+    word = (word & 0x33333333ul) + ((word >> 2) & 0x33333333ul);
+    word = (word + (word >> 4)) & 0x0f0f0f0ful;
+    rank = KEYCODE_TO_ID_RANK[index >> 5] +
+           (unsigned)(((word * 0x01010101ul) & 0xfffffffful) >> 24);
+    return KEYCODE_TO_ID_DATA + KEYCODE_TO_ID_OFFSET[rank];
 }
 enum {
-    KEYCODE_ID_MAXLEN = 14
+    KEYCODE_ID_MAXLEN = 14,
+    KEYCODE_ID_SEED = 0,
+    KEYCODE_ID_BUCKETS = 62,
+    KEYCODE_ID_SLOTS = 123
+};
+static const unsigned char KEYCODE_ID_DISPLACEMENT[] = {
+    5,3,10,2,8,2,5,1,0,0,7,2,3,0,3,0,2,13,0,0,0,2,2,1,21,0,2,5,22,9,3,32,12,9,2,
+    2,14,12,0,4,11,1,6,8,21,0,14,0,4,10,1,72,1,185,1,70,122,49,1,1,2,0
 };
-static const unsigned char KEYCODE_ID_ORDER[] = {
-    39,30,31,32,33,34,35,36,37,38,4,5,49,6,57,54,7,42,76,81,8,77,46,41,9,58,67,
-    68,69,104,105,106,107,108,109,110,59,111,112,113,114,115,60,61,62,63,64,65,
-    66,10,53,11,117,74,12,73,13,14,98,89,90,91,92,93,94,95,96,97,87,216,220,84,
-    88,103,85,83,99,86,15,80,226,47,224,227,225,16,118,45,127,17,100,18,19,78,
-    75,72,55,70,20,52,21,158,79,230,48,228,231,229,22,71,51,56,44,154,23,43,24,
-    82,25,26,27,28,29
+static const unsigned char KEYCODE_ID_SLOT[] = {
+    75,51,104,45,96,230,29,16,216,97,158,24,68,44,114,111,112,10,72,15,32,91,22,
+    47,220,86,59,21,25,65,117,231,94,90,58,106,74,26,43,83,49,92,53,70,99,36,62,
+    18,37,61,225,57,9,89,33,228,67,23,46,66,100,110,55,38,105,154,227,60,17,73,
+    79,69,19,229,64,34,13,48,88,107,115,35,6,103,84,28,52,39,108,54,93,4,85,224,
+    78,20,113,77,127,82,95,27,8,41,7,5,42,226,56,63,71,14,12,87,11,76,80,31,109,
+    118,81,98,30
 };
 /* Copyright 2019 Dietrich Epp.
    This file is licensed under the terms of the MIT license. See LICENSE.txt
    for details. */
 unsigned keycode_from_id(const char *id) {
-    unsigned char c, buf[KEYCODE_ID_MAXLEN];
+    unsigned char c;
     const char *p;
-    int i, n, d;
-    int left = 0, right = sizeof(KEYCODE_ID_ORDER), center;
+    int i, n;
+    unsigned long h = 2166136261ul ^ KEYCODE_ID_SEED;
     unsigned code;
-    /* Normalize the ID to lower case. */
-    for (n = 0; n < KEYCODE_ID_MAXLEN && id[n] != '\0'; n++) {
+    /* Hash the ID, normalized to lower case. This must match phash.py. */
+    for (n = 0; id[n] != '\0'; n++) {
+        if (n >= KEYCODE_ID_MAXLEN) {
+            return 0;
+        }
         c = id[n];
         if ('A' <= c && c <= 'Z') {
             c |= 32;
         }
-        buf[n] = c;
-    }
-    if (id[n] != '\0') {
-        return 0;
+        h = ((h ^ c) * 16777619ul) & 0xfffffffful;
     }
-    /* Binary search in sorted list of identifiers. */
-    while (left < right) {
-        center = left + (right - left) / 2;
-        code = KEYCODE_ID_ORDER[center];
-        p = KEYCODE_TO_ID_DATA + KEYCODE_TO_ID_OFFSET[code];
-        for (i = 0;; i++) {
-            if (i >= n) {
-                if (p[i] != '\0') {
-                    right = center;
-                    break;
-                }
-                return code;
-            }
-            d = buf[i] - ((unsigned char)p[i] | 32);
-            if (d < 0) {
-                right = center;
-                break;
-            } else if (d > 0) {
-                left = center + 1;
-                break;
-            }
+    /* Displace and mix the hash to get the slot. */
+    h ^= KEYCODE_ID_DISPLACEMENT[h % KEYCODE_ID_BUCKETS];
+    h ^= h >> 16;
+    h = (h * 0x85ebca6bul) & 0xfffffffful;
+    h ^= h >> 13;
+    h = (h * 0xc2b2ae35ul) & 0xfffffffful;
+    h ^= h >> 16;
+    code = KEYCODE_ID_SLOT[h % KEYCODE_ID_SLOTS];
+    /* The slot only tells us which ID could match, compare against it. */
+    p = keycode_to_id(code);
+    for (i = 0; i < n; i++) {
+        c = id[i];
+        if ('A' <= c && c <= 'Z') {
+            c |= 32;
+        }
+        if (p[i] == '\0' || c != ((unsigned char)p[i] | 32)) {
+            return 0;
         }
     }
-    return 0;
+    if (p[n] != '\0') {
+        return 0;
+    }
+    return code;
 }
@@ -0,0 +1,136 @@
+/* This file is automatically generated. */
+#include "keycode_name.h"
+
+#include <stddef.h>
+
+enum {
+    KEYCODE_NAME_MAXLEN = 16,
+    KEYCODE_NAME_SEED = 0,
+    KEYCODE_NAME_BUCKETS = 85,
+    KEYCODE_NAME_SLOTS = 170
+};
+static const unsigned char KEYCODE_NAME_DISPLACEMENT[] = {
+    5,1,5,0,4,0,8,0,1,0,13,0,0,11,1,1,5,0,0,2,20,0,16,4,0,3,0,3,22,0,0,3,1,56,1,
+    11,2,0,11,0,6,20,10,28,8,0,0,3,27,0,23,4,0,0,3,14,10,5,15,0,1,48,0,29,26,43,
+    51,8,51,70,0,0,6,7,1,29,4,0,84,52,0,191,59,0,0
+};
+static const char KEYCODE_NAME_TEXT[] =
+    "\0'\0,\0;\0[\0]\0`\0backspace\0capslock\0cmd\0comma\0ctrl\0del\0delete\0d"
+    "eleteforward\0end\0esc\0escape\0f\0f1\0f10\0f11\0f12\0f13\0f14\0f15\0f16"
+    "\0f17\0f18\0f19\0f2\0f20\0f21\0f22\0f23\0f24\0f3\0f4\0f5\0f6\0f7\0f8\0f9"
+    "\0g\0grave\0help\0home\0ins\0insert\0j\0kp*\0kp+\0kp-\0kp.\0kp/\0kp0\0kp1"
+    "\0kp2\0kp3\0kp4\0kp5\0kp6\0kp7\0kp8\0kp9\0kp=\0kpadd\0kpclear\0kpdecimal"
+    "\0kpdivide\0kpenter\0kpequals\0kpmultiply\0kpnumlock\0kppoint\0kpsubtract"
+    "\0left\0leftalt\0leftbracket\0leftcommand\0leftcontrol\0leftgui\0leftopti"
+    "on\0leftshift\0leftsuper\0leftwindows\0m\0menu\0meta\0minus\0mute\0non-us"
+    "\\\0nonusbackslash\0o\0pagedown\0pageup\0pause\0period\0pgdn\0pgup\0print"
+    "screen\0prtsc\0quote\0return\0right\0rightalt\0rightbracket\0rightcommand"
+    "\0rightcontrol\0rightgui\0rightoption\0rightshift\0rightsuper\0rightwindo"
+    "ws\0scrolllock\0semicolon\0spacebar\0sysreq\0sysreq/attention\0tab\0v\0w"
+    "\0win\0x\0z";
+static const unsigned short KEYCODE_NAME_OFFSET[] = {
+    312,205,719,306,170,102,350,158,72,104,463,642,594,132,572,513,198,525,219,
+    223,235,724,497,710,269,184,402,304,143,665,429,122,92,479,227,490,11,21,
+    267,9,112,386,314,221,239,173,757,361,620,330,747,698,161,654,468,548,251,
+    433,17,293,271,259,108,126,128,178,7,124,51,374,98,135,116,231,13,106,225,
+    255,155,755,247,560,176,36,443,40,509,96,501,110,167,87,538,1,164,217,531,
+    484,585,189,541,700,47,215,285,114,5,94,207,418,100,211,3,151,147,751,194,
+    743,321,263,416,689,89,139,726,23,120,275,717,543,518,492,359,319,745,58,
+    130,277,366,76,633,579,566,422,522,410,676,507,466,473,607,42,332,453,187,
+    398,439,295,449,78,390,461,118,342,243,749,80,505,370,32
+};
+static const unsigned char KEYCODE_NAME_START[] = {
+    0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,
+    28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,
+    53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,70,71,72,73,74,75,76,77,78,
+    79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,
+    103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,
+    122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,139,140,
+    141,142,143,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,159,
+    160,161,162,163,164,165,166,167,168,169,170,171
+};
+static const unsigned char KEYCODE_NAME_KEY[] = {
+    103,13,154,158,65,31,86,61,77,104,118,230,48,59,158,81,73,72,99,84,90,20,49,
+    44,46,117,224,88,113,231,225,36,67,127,98,49,53,8,103,48,106,227,46,55,91,
+    66,29,80,228,28,25,14,62,229,227,70,94,225,44,15,87,96,105,37,110,53,47,109,
+    42,76,47,30,111,107,89,42,32,56,95,60,27,93,70,10,54,227,4,78,68,56,33,64,9,
+    78,52,63,45,55,100,230,74,17,51,76,86,220,34,51,39,85,226,69,87,54,115,114,
+    227,73,43,85,97,12,71,58,112,154,57,108,7,21,75,75,100,23,22,5,76,38,216,
+    226,41,231,79,52,226,82,227,231,18,24,45,231,224,83,227,19,224,227,84,227,6,
+    227,16,35,99,92,26,41,11,226,227
+};
+static const unsigned char KEYCODE_NAME_SOURCES[] = {
+    8,15,8,5,15,15,8,15,15,11,9,2,8,15,10,15,13,13,9,11,11,15,8,7,15,10,7,11,9,
+    1,15,15,15,10,11,15,15,15,11,15,11,2,8,15,11,15,15,15,15,15,15,15,15,15,1,
+    12,11,7,11,15,8,11,11,15,11,8,15,11,10,5,8,15,11,11,11,5,15,15,11,15,15,11,
+    7,15,8,1,15,15,15,8,15,15,15,7,15,15,15,8,9,13,15,15,8,7,11,10,15,15,15,11,
+    2,15,11,15,9,9,4,7,15,8,11,15,13,15,9,9,15,11,15,15,7,15,8,15,15,15,10,15,
+    10,13,7,8,15,8,2,15,8,4,15,15,8,2,7,9,4,15,15,1,8,4,15,2,15,15,8,11,15,15,
+    15,7,2
+};
+/* Copyright 2019 Dietrich Epp.
+   This file is licensed under the terms of the MIT license. See LICENSE.txt
+   for details. */
+unsigned keycode_from_name(const char *name, unsigned sources,
+                           unsigned *found) {
+    unsigned char c;
+    const char *p;
+    int i, n;
+    unsigned long h = 2166136261ul ^ KEYCODE_NAME_SEED;
+    unsigned slot, entry;
+    if (found != NULL) {
+        *found = 0;
+    }
+    /* Hash the name, normalized to lower case without spaces. This must match
+       aliases.py and phash.py. */
+    for (n = 0, i = 0; name[i] != '\0'; i++) {
+        c = name[i];
+        if (c == ' ') {
+            continue;
+        }
+        if (n >= KEYCODE_NAME_MAXLEN) {
+            return 0;
+        }
+        if ('A' <= c && c <= 'Z') {
+            c |= 32;
+        }
+        h = ((h ^ c) * 16777619ul) & 0xfffffffful;
+        n++;
+    }
+    /* Displace and mix the hash to get the slot. */
+    h ^= KEYCODE_NAME_DISPLACEMENT[h % KEYCODE_NAME_BUCKETS];
+    h ^= h >> 16;
+    h = (h * 0x85ebca6bul) & 0xfffffffful;
+    h ^= h >> 13;
+    h = (h * 0xc2b2ae35ul) & 0xfffffffful;
+    h ^= h >> 16;
+    slot = h % KEYCODE_NAME_SLOTS;
+    /* The slot only tells us which name could match, compare against it. */
+    p = KEYCODE_NAME_TEXT + KEYCODE_NAME_OFFSET[slot];
+    for (i = 0; name[i] != '\0'; i++) {
+        c = name[i];
+        if (c == ' ') {
+            continue;
+        }
+        if ('A' <= c && c <= 'Z') {
+            c |= 32;
+        }
+        if (*p == '\0' || c != (unsigned char)*p) {
+            return 0;
+        }
+        p++;
+    }
+    if (*p != '\0') {
+        return 0;
+    }
+    for (entry = KEYCODE_NAME_START[slot]; entry < KEYCODE_NAME_START[slot + 1];
+         entry++) {
+        if ((KEYCODE_NAME_SOURCES[entry] & sources) != 0) {
+            if (found != NULL) {
+                *found = KEYCODE_NAME_SOURCES[entry];
+            }
+            return KEYCODE_NAME_KEY[entry];
+        }
+    }
+    return 0;
+}
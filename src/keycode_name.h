@@ -0,0 +1,31 @@
+/* This file is automatically generated. */
+#ifndef KEYCODE_KEYCODE_NAME_H
+#define KEYCODE_KEYCODE_NAME_H
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Sources of key names, for keycode_from_name. */
+enum {
+    KEYCODE_NAME_LINUX = 0x01,
+    KEYCODE_NAME_MACOS = 0x02,
+    KEYCODE_NAME_WINDOWS = 0x04,
+    KEYCODE_NAME_HID = 0x08,
+    KEYCODE_NAME_ALL = 0x0f
+};
+
+/* Look up an HID keycode by name. The name may be an HID name or identifier,
+   such as "Left Control" or "LeftControl", a platform display name, such as
+   "Left Command", or an alias, such as "Ctrl". Lookup ignores case and spaces.
+   Only names from the given sources match, and a name may refer to different
+   keys for different sources. If it does, the HID name is used, then the
+   first platform in the order of the KEYCODE_NAME constants. Returns 0 if no
+   key has the name. If found is not NULL, it is set to the sources which use
+   the name for the returned key, or 0 if no key was found. */
+unsigned keycode_from_name(const char *name, unsigned sources,
+                           unsigned *found);
+
+#ifdef __cplusplus
+} /* extern "C" */
+#endif
+#endif
@@ -0,0 +1,232 @@
+/* Copyright 2019 Dietrich Epp.
+   This file is licensed under the terms of the MIT license. See LICENSE.txt
+   for details. */
+#if defined _WIN32
+#define _CRT_SECURE_NO_WARNINGS
+#endif
+#include "keycode_rec.h"
+
+#include <stdlib.h>
+#include <string.h>
+
+/* Layout of the file, see python/keycode_rec.py. */
+enum {
+    HEADER_SIZE = 16,
+    CHUNK_HEADER_SIZE = 20,
+    INDEX_HEADER_SIZE = 16,
+    INDEX_ENTRY_SIZE = 24,
+    TRAILER_SIZE = 12,
+
+    FORMAT_VERSION = 1,
+
+    HAS_SCANCODE = 0x04,
+    HAS_PLATFORM = 0x08,
+
+    /* Longer gaps between events start a new chunk, so the time since the
+       previous event fits in 32 bits. */
+    MAX_DELTA_SEC = 4000
+};
+
+static const char KEYCODE_REC_MAGIC[8] = {'K', 'E', 'Y', 'E',
+                                          'V', 'E', 'N', 'T'};
+
+static void put32(unsigned char *p, unsigned long v) {
+    p[0] = v & 255;
+    p[1] = (v >> 8) & 255;
+    p[2] = (v >> 16) & 255;
+    p[3] = (v >> 24) & 255;
+}
+
+static void put64(unsigned char *p, unsigned long v) {
+    int i;
+    for (i = 0; i < 8; i++) {
+        p[i] = v & 255;
+        v >>= 8;
+    }
+}
+
+/* Store sec * 1000000 + usec as a 64-bit integer, without 64-bit types. */
+static void put_time(unsigned char *p, unsigned long sec, unsigned long usec) {
+    unsigned long carry = usec;
+    int i;
+    for (i = 0; i < 8; i++) {
+        carry += (sec & 255) * 1000000ul;
+        sec >>= 8;
+        p[i] = carry & 255;
+        carry >>= 8;
+    }
+}
+
+static unsigned put_varint(unsigned char *p, unsigned long v) {
+    unsigned n = 0;
+    while (v >= 0x80) {
+        p[n++] = (unsigned char)((v & 0x7f) | 0x80);
+        v >>= 7;
+    }
+    p[n++] = (unsigned char)v;
+    return n;
+}
+
+static void write_bytes(struct keycode_rec *rec, const void *p, size_t n) {
+    if (rec->error == KEYCODE_REC_ERR_IO) {
+        return;
+    }
+    if (fwrite(p, 1, n, rec->fp) != n) {
+        rec->error = KEYCODE_REC_ERR_IO;
+        return;
+    }
+    rec->offset += n;
+}
+
+static void end_chunk(struct keycode_rec *rec) {
+    unsigned char header[CHUNK_HEADER_SIZE], *entry;
+    size_t nalloc;
+    if (rec->count == 0) {
+        return;
+    }
+    if (rec->index_count >= rec->index_alloc) {
+        nalloc = rec->index_alloc ? rec->index_alloc * 2 : 64;
+        entry = realloc(rec->index, nalloc * INDEX_ENTRY_SIZE);
+        if (entry == NULL) {
+            /* Without the index, readers scan the chunk headers instead. */
+            if (rec->error == KEYCODE_REC_OK) {
+                rec->error = KEYCODE_REC_ERR_NOMEM;
+            }
+        } else {
+            rec->index = entry;
+            rec->index_alloc = nalloc;
+        }
+    }
+    if (rec->index_count < rec->index_alloc) {
+        entry = rec->index + rec->index_count * INDEX_ENTRY_SIZE;
+        put64(entry, rec->offset);
+        memcpy(entry + 8, rec->time, 8);
+        put64(entry + 16, rec->total);
+        rec->index_count++;
+    }
+    memcpy(header, "CHNK", 4);
+    put32(header + 4, rec->size);
+    put32(header + 8, rec->count);
+    memcpy(header + 12, rec->time, 8);
+    write_bytes(rec, header, sizeof(header));
+    write_bytes(rec, rec->data, rec->size);
+    rec->total += rec->count;
+    rec->count = 0;
+    rec->size = 0;
+}
+
+int keycode_rec_open(struct keycode_rec *rec, const char *path) {
+    FILE *fp = fopen(path, "wb");
+    if (fp == NULL) {
+        rec->fp = NULL;
+        rec->index = NULL;
+        return KEYCODE_REC_ERR_IO;
+    }
+    return keycode_rec_init(rec, fp);
+}
+
+int keycode_rec_init(struct keycode_rec *rec, FILE *fp) {
+    unsigned char header[HEADER_SIZE];
+    rec->fp = fp;
+    rec->error = KEYCODE_REC_OK;
+    rec->offset = 0;
+    rec->total = 0;
+    rec->count = 0;
+    rec->sec = 0;
+    rec->usec = 0;
+    rec->platform = KEYCODE_REC_NONE;
+    memset(rec->time, 0, sizeof(rec->time));
+    rec->index = NULL;
+    rec->index_count = 0;
+    rec->index_alloc = 0;
+    rec->size = 0;
+    memcpy(header, KEYCODE_REC_MAGIC, 8);
+    put32(header + 8, FORMAT_VERSION);
+    put32(header + 12, 0);
+    write_bytes(rec, header, sizeof(header));
+    return rec->error;
+}
+
+void keycode_rec_event(struct keycode_rec *rec, unsigned long sec,
+                       unsigned long usec, unsigned hid_keycode,
+                       unsigned value, unsigned platform, long scancode) {
+    unsigned char *p;
+    unsigned long delta = 0;
+    unsigned flags;
+    if (hid_keycode > 255 || value > KEYCODE_REC_REPEAT ||
+        platform > KEYCODE_REC_WINDOWS) {
+        return;
+    }
+    sec += usec / 1000000ul;
+    usec %= 1000000ul;
+    if (rec->count != 0) {
+        if (sec < rec->sec || (sec == rec->sec && usec < rec->usec) ||
+            sec - rec->sec > MAX_DELTA_SEC) {
+            end_chunk(rec);
+        } else {
+            delta = (sec - rec->sec) * 1000000ul + usec - rec->usec;
+        }
+    }
+    if (rec->count == 0) {
+        put_time(rec->time, sec, usec);
+        rec->platform = KEYCODE_REC_NONE;
+    }
+    p = rec->data + rec->size;
+    p += put_varint(p, delta);
+    flags = value;
+    if (scancode >= 0) {
+        flags |= HAS_SCANCODE;
+    }
+    if (platform != rec->platform) {
+        flags |= HAS_PLATFORM;
+    }
+    *p++ = (unsigned char)flags;
+    *p++ = (unsigned char)hid_keycode;
+    if (platform != rec->platform) {
+        *p++ = (unsigned char)platform;
+        rec->platform = platform;
+    }
+    if (scancode >= 0) {
+        p += put_varint(p, (unsigned long)scancode);
+    }
+    rec->sec = sec;
+    rec->usec = usec;
+    rec->count++;
+    rec->size = (size_t)(p - rec->data);
+    if (rec->size >= KEYCODE_REC_CHUNK_SIZE) {
+        end_chunk(rec);
+    }
+}
+
+int keycode_rec_flush(struct keycode_rec *rec) {
+    end_chunk(rec);
+    if (rec->error != KEYCODE_REC_ERR_IO && fflush(rec->fp) != 0) {
+        rec->error = KEYCODE_REC_ERR_IO;
+    }
+    return rec->error;
+}
+
+int keycode_rec_close(struct keycode_rec *rec) {
+    unsigned char header[INDEX_HEADER_SIZE], trailer[TRAILER_SIZE];
+    if (rec->fp == NULL) {
+        return KEYCODE_REC_ERR_IO;
+    }
+    end_chunk(rec);
+    if (rec->error == KEYCODE_REC_OK) {
+        memcpy(header, "INDX", 4);
+        put32(header + 4, rec->index_count);
+        put64(header + 8, rec->total);
+        put64(trailer, rec->offset);
+        memcpy(trailer + 8, "KEND", 4);
+        write_bytes(rec, header, sizeof(header));
+        write_bytes(rec, rec->index, rec->index_count * INDEX_ENTRY_SIZE);
+        write_bytes(rec, trailer, sizeof(trailer));
+    }
+    if (fclose(rec->fp) != 0 && rec->error == KEYCODE_REC_OK) {
+        rec->error = KEYCODE_REC_ERR_IO;
+    }
+    rec->fp = NULL;
+    free(rec->index);
+    rec->index = NULL;
+    return rec->error;
+}
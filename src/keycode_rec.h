@@ -0,0 +1,102 @@
+/* Copyright 2019 Dietrich Epp.
+   This file is licensed under the terms of the MIT license. See LICENSE.txt
+   for details. */
+#ifndef KEYCODE_KEYCODE_REC_H
+#define KEYCODE_KEYCODE_REC_H
+#include <stddef.h>
+#include <stdio.h>
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Writer for key event recordings. A recording is a compact log of key
+   events, keyed on HID keycodes, which can be read with the keycode_rec Python
+   module. The file format is described in python/keycode_rec.py.
+
+   Events are buffered and written a chunk at a time. If the program exits
+   without calling keycode_rec_close, the chunks which were written can still
+   be read. */
+
+enum {
+    KEYCODE_REC_OK,
+    /* The file could not be created or written. Check errno. */
+    KEYCODE_REC_ERR_IO,
+    /* Memory could not be allocated for the index. The file is still
+       readable, but readers must scan it to find the chunks. */
+    KEYCODE_REC_ERR_NOMEM
+};
+
+/* Event values. */
+enum {
+    KEYCODE_REC_RELEASE,
+    KEYCODE_REC_PRESS,
+    KEYCODE_REC_REPEAT
+};
+
+/* Platform tags for native keycodes. */
+enum {
+    KEYCODE_REC_NONE,
+    KEYCODE_REC_LINUX,
+    KEYCODE_REC_MACOS,
+    KEYCODE_REC_WINDOWS
+};
+
+/* Pass as the native keycode for events without one. */
+#define KEYCODE_REC_NO_SCANCODE (-1L)
+
+enum {
+    /* Size of the event data in each chunk, in bytes. */
+    KEYCODE_REC_CHUNK_SIZE = 4096,
+    /* Maximum size of one encoded event. */
+    KEYCODE_REC_EVENT_SIZE = 20
+};
+
+/* A recording being written. The fields are private. */
+struct keycode_rec {
+    FILE *fp;
+    int error;
+    unsigned long offset;
+    unsigned long total;
+    unsigned long count;
+    unsigned long sec;
+    unsigned long usec;
+    unsigned platform;
+    unsigned char time[8];
+    unsigned char *index;
+    size_t index_count;
+    size_t index_alloc;
+    size_t size;
+    unsigned char data[KEYCODE_REC_CHUNK_SIZE + KEYCODE_REC_EVENT_SIZE];
+};
+
+/* Create a recording file. Returns KEYCODE_REC_OK on success, or an error
+   code. */
+int keycode_rec_open(struct keycode_rec *rec, const char *path);
+
+/* Start a recording in a file which is already open for writing in binary
+   mode, at the start of the file. The file is closed by keycode_rec_close.
+   Returns KEYCODE_REC_OK on success, or an error code. */
+int keycode_rec_init(struct keycode_rec *rec, FILE *fp);
+
+/* Add an event to the recording. The time is given in seconds and
+   microseconds, on any clock, and times should not go backwards. The value is
+   KEYCODE_REC_RELEASE, KEYCODE_REC_PRESS, or KEYCODE_REC_REPEAT. The platform
+   is one of the KEYCODE_REC platform tags, and scancode is the native keycode
+   on that platform, or KEYCODE_REC_NO_SCANCODE. Errors are reported by
+   keycode_rec_flush and keycode_rec_close. */
+void keycode_rec_event(struct keycode_rec *rec, unsigned long sec,
+                       unsigned long usec, unsigned hid_keycode,
+                       unsigned value, unsigned platform, long scancode);
+
+/* Write the buffered events to the file. Returns KEYCODE_REC_OK, or the first
+   error which occurred while writing. */
+int keycode_rec_flush(struct keycode_rec *rec);
+
+/* Write the remaining events and the index, and close the file. Returns
+   KEYCODE_REC_OK, or the first error which occurred while writing. */
+int keycode_rec_close(struct keycode_rec *rec);
+
+#ifdef __cplusplus
+} /* extern "C" */
+#endif
+#endif
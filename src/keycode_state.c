@@ -0,0 +1,83 @@
+/* This file is automatically generated. */
+#include "keycode_state.h"
+const unsigned char KEYCODE_HID_MODIFIER[256] = {
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,2,4,8,
+    16,32,64,128,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0
+};
+
+unsigned keycode_state_modifiers(const struct keycode_state *state) {
+    return (unsigned)state->bits[7] & 0xffu;
+}
+/* Copyright 2019 Dietrich Epp.
+   This file is licensed under the terms of the MIT license. See LICENSE.txt
+   for details. */
+void keycode_state_reset(struct keycode_state *state) {
+    int i;
+    for (i = 0; i < KEYCODE_STATE_WORDS; i++) {
+        state->bits[i] = 0;
+    }
+}
+
+void keycode_state_set(struct keycode_state *state, unsigned hid_keycode) {
+    if (hid_keycode < 256) {
+        state->bits[hid_keycode >> 5] |= 1ul << (hid_keycode & 31);
+    }
+}
+
+void keycode_state_clear(struct keycode_state *state, unsigned hid_keycode) {
+    if (hid_keycode < 256) {
+        state->bits[hid_keycode >> 5] &= ~(1ul << (hid_keycode & 31));
+    }
+}
+
+int keycode_state_test(const struct keycode_state *state,
+                       unsigned hid_keycode) {
+    if (hid_keycode >= 256) {
+        return 0;
+    }
+    return (state->bits[hid_keycode >> 5] >> (hid_keycode & 31)) & 1;
+}
+
+void keycode_state_diff(const struct keycode_state *prev,
+                        const struct keycode_state *cur,
+                        struct keycode_state *pressed,
+                        struct keycode_state *released) {
+    unsigned long p, c;
+    int i;
+    for (i = 0; i < KEYCODE_STATE_WORDS; i++) {
+        p = prev->bits[i];
+        c = cur->bits[i];
+        pressed->bits[i] = c & ~p;
+        released->bits[i] = p & ~c;
+    }
+}
+
+unsigned keycode_state_next(const struct keycode_state *state,
+                            unsigned hid_keycode) {
+    unsigned long word;
+    unsigned i;
+    if (hid_keycode >= 256) {
+        return 256;
+    }
+    i = hid_keycode >> 5;
+    word = (state->bits[i] & 0xfffffffful) >> (hid_keycode & 31);
+    if (word == 0) {
+        do {
+            if (++i >= KEYCODE_STATE_WORDS) {
+                return 256;
+            }
+            word = state->bits[i] & 0xfffffffful;
+        } while (word == 0);
+        hid_keycode = i << 5;
+    }
+    while ((word & 1) == 0) {
+        word >>= 1;
+        hid_keycode++;
+    }
+    return hid_keycode;
+}
@@ -0,0 +1,74 @@
+/* This file is automatically generated. */
+#ifndef KEYCODE_KEYCODE_STATE_H
+#define KEYCODE_KEYCODE_STATE_H
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Modifier masks. Each modifier key has one bit in a modifier mask, and
+   KEYCODE_MOD_ALL contains every modifier key. */
+enum {
+    KEYCODE_MOD_LEFT_CONTROL = 0x0001,
+    KEYCODE_MOD_LEFT_SHIFT = 0x0002,
+    KEYCODE_MOD_LEFT_ALT = 0x0004,
+    KEYCODE_MOD_LEFT_GUI = 0x0008,
+    KEYCODE_MOD_RIGHT_CONTROL = 0x0010,
+    KEYCODE_MOD_RIGHT_SHIFT = 0x0020,
+    KEYCODE_MOD_RIGHT_ALT = 0x0040,
+    KEYCODE_MOD_RIGHT_GUI = 0x0080,
+    KEYCODE_MOD_ALL = 0x00ff
+};
+
+enum {
+    /* Number of words in a key state bitmap. */
+    KEYCODE_STATE_WORDS = 8
+};
+
+/* The set of keys which are pressed, with one bit for each HID keycode. The
+   state for HID keycode N is bit (N & 31) of bits[N >> 5]. Only the low 32 bits
+   of each word are used. Key states are compared and combined with bitwise
+   operations on the words, instead of one test per key. */
+struct keycode_state {
+    unsigned long bits[KEYCODE_STATE_WORDS];
+};
+
+/* Mapping from HID keycodes to modifier masks. Keys which are not modifiers
+   map to 0. */
+extern const unsigned char KEYCODE_HID_MODIFIER[256];
+
+/* Clear every key in a key state. */
+void keycode_state_reset(struct keycode_state *state);
+
+/* Mark a key as pressed. Keycodes 256 and higher are ignored. */
+void keycode_state_set(struct keycode_state *state, unsigned hid_keycode);
+
+/* Mark a key as released. Keycodes 256 and higher are ignored. */
+void keycode_state_clear(struct keycode_state *state, unsigned hid_keycode);
+
+/* Test whether a key is pressed. Returns 0 for keycodes 256 and higher. */
+int keycode_state_test(const struct keycode_state *state,
+                       unsigned hid_keycode);
+
+/* Get the modifier mask for the pressed modifier keys. */
+unsigned keycode_state_modifiers(const struct keycode_state *state);
+
+/* Compare the key states from two frames. Keys which are pressed in cur but
+   not prev are set in pressed, and keys which are pressed in prev but not cur
+   are set in released. The outputs may be the same as the inputs. */
+void keycode_state_diff(const struct keycode_state *prev,
+                        const struct keycode_state *cur,
+                        struct keycode_state *pressed,
+                        struct keycode_state *released);
+
+/* Get the first pressed key with a keycode greater than or equal to the given
+   keycode. Returns 256 if there is none. To loop over the pressed keys:
+
+   for (k = keycode_state_next(s, 0); k < 256; k = keycode_state_next(s, k+1))
+*/
+unsigned keycode_state_next(const struct keycode_state *state,
+                            unsigned hid_keycode);
+
+#ifdef __cplusplus
+} /* extern "C" */
+#endif
+#endif
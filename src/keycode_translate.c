@@ -0,0 +1,94 @@
+/* This file is automatically generated. */
+#include "keycode_translate.h"
+#include "keytable.h"
+static const unsigned char KEYCODE_LINUX_TO_MACOS[191] = {
+    255,53,18,19,20,21,23,22,26,28,25,29,27,24,51,48,12,13,14,15,17,16,32,34,31,
+    35,33,30,36,59,0,1,2,3,5,4,38,40,37,41,39,50,56,42,6,7,8,9,11,45,46,43,47,
+    44,60,67,58,49,57,122,120,99,118,96,97,98,100,101,109,255,255,89,91,92,78,
+    86,87,88,69,83,84,85,82,255,255,255,255,103,111,255,255,255,255,255,255,255,
+    76,62,75,255,61,255,115,126,116,123,124,119,125,121,255,117,255,255,255,255,
+    255,81,255,255,255,255,255,255,255,55,54,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,105,107,113,106,64,79,80,90
+};
+unsigned keycode_linux_to_macos(unsigned linux_keycode) {
+    if (linux_keycode >= 191)
+        return KEYCODE_NONE;
+    return KEYCODE_LINUX_TO_MACOS[linux_keycode];
+}
+static const unsigned char KEYCODE_LINUX_TO_WINDOWS[127] = {
+    255,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,
+    28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,
+    53,54,255,56,255,58,59,60,61,62,63,64,65,66,67,68,255,70,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,87,88,255,255,255,255,255,
+    255,255,255,157,255,255,184,255,199,200,201,203,205,207,208,209,210,211,255,
+    255,255,255,255,255,255,69,255,255,255,255,255,219,220
+};
+unsigned keycode_linux_to_windows(unsigned linux_keycode) {
+    if (linux_keycode >= 127)
+        return KEYCODE_NONE;
+    return KEYCODE_LINUX_TO_WINDOWS[linux_keycode];
+}
+static const unsigned char KEYCODE_MACOS_TO_LINUX[127] = {
+    30,31,32,33,35,34,44,45,46,47,255,48,16,17,18,19,21,20,2,3,4,5,7,6,13,10,8,
+    12,9,11,27,24,22,26,23,25,28,38,36,40,37,39,43,51,53,49,50,52,15,57,41,14,
+    255,1,126,125,42,58,56,29,54,100,97,255,187,255,255,55,255,78,255,255,255,
+    255,255,98,96,255,74,188,189,117,82,79,80,81,75,76,77,71,190,72,73,255,255,
+    255,63,64,65,61,66,67,255,87,255,183,186,184,255,68,255,88,255,185,255,102,
+    104,111,62,107,60,109,59,105,106,108,103
+};
+unsigned keycode_macos_to_linux(unsigned macos_keycode) {
+    if (macos_keycode >= 127)
+        return KEYCODE_NONE;
+    return KEYCODE_MACOS_TO_LINUX[macos_keycode];
+}
+static const unsigned char KEYCODE_MACOS_TO_WINDOWS[127] = {
+    30,31,32,33,35,34,44,45,46,47,255,48,16,17,18,19,21,20,2,3,4,5,7,6,13,10,8,
+    12,9,11,27,24,22,26,23,25,28,38,36,40,37,39,43,51,53,49,50,52,15,255,41,14,
+    255,1,220,219,42,58,56,29,54,184,157,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,63,64,65,61,66,67,255,87,255,255,255,255,255,68,255,88,
+    255,255,255,199,201,211,62,207,60,209,59,203,205,208,200
+};
+unsigned keycode_macos_to_windows(unsigned macos_keycode) {
+    if (macos_keycode >= 127)
+        return KEYCODE_NONE;
+    return KEYCODE_MACOS_TO_WINDOWS[macos_keycode];
+}
+static const unsigned char KEYCODE_WINDOWS_TO_LINUX[221] = {
+    255,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,
+    28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,
+    53,54,255,56,255,58,59,60,61,62,63,64,65,66,67,68,119,70,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,87,88,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,97,255,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,100,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,102,103,104,255,105,255,106,255,107,
+    108,109,110,111,255,255,255,255,255,255,255,125,126
+};
+unsigned keycode_windows_to_linux(unsigned windows_keycode) {
+    if (windows_keycode >= 221)
+        return KEYCODE_NONE;
+    return KEYCODE_WINDOWS_TO_LINUX[windows_keycode];
+}
+static const unsigned char KEYCODE_WINDOWS_TO_MACOS[221] = {
+    255,53,18,19,20,21,23,22,26,28,25,29,27,24,51,48,12,13,14,15,17,16,32,34,31,
+    35,33,30,36,59,0,1,2,3,5,4,38,40,37,41,39,50,56,42,6,7,8,9,11,45,46,43,47,
+    44,60,255,58,255,57,122,120,99,118,96,97,98,100,101,109,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,103,111,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,62,255,255,255,255,255,255,255,255,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,255,255,255,255,61,255,255,255,
+    255,255,255,255,255,255,255,255,255,255,255,115,126,116,255,123,255,124,255,
+    119,125,121,255,117,255,255,255,255,255,255,255,55,54
+};
+unsigned keycode_windows_to_macos(unsigned windows_keycode) {
+    if (windows_keycode >= 221)
+        return KEYCODE_NONE;
+    return KEYCODE_WINDOWS_TO_MACOS[windows_keycode];
+}
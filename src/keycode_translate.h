@@ -0,0 +1,41 @@
+/* This file is automatically generated. */
+#ifndef KEYCODE_KEYCODE_TRANSLATE_H
+#define KEYCODE_KEYCODE_TRANSLATE_H
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Direct translations between platform keycodes. Each function gives the same
+   result as translating to an HID keycode and then from the HID keycode, with
+   one table lookup. The functions return KEYCODE_NONE (255) if the key has no
+   equivalent on the target platform, and are safe to call with any possible
+   input. The platform pairs are chosen when the tables are generated. */
+
+/* Translate a Linux keycode to a macOS keycode. Equivalent to
+   KEYCODE_MACOS_FROM_HID[keycode_linux_to_hid(linux_keycode)]. */
+unsigned keycode_linux_to_macos(unsigned linux_keycode);
+
+/* Translate a Linux keycode to a Windows keycode. Equivalent to
+   KEYCODE_WINDOWS_FROM_HID[keycode_linux_to_hid(linux_keycode)]. */
+unsigned keycode_linux_to_windows(unsigned linux_keycode);
+
+/* Translate a macOS keycode to a Linux keycode. Equivalent to
+   KEYCODE_LINUX_FROM_HID[keycode_macos_to_hid(macos_keycode)]. */
+unsigned keycode_macos_to_linux(unsigned macos_keycode);
+
+/* Translate a macOS keycode to a Windows keycode. Equivalent to
+   KEYCODE_WINDOWS_FROM_HID[keycode_macos_to_hid(macos_keycode)]. */
+unsigned keycode_macos_to_windows(unsigned macos_keycode);
+
+/* Translate a Windows keycode to a Linux keycode. Equivalent to
+   KEYCODE_LINUX_FROM_HID[keycode_windows_to_hid(windows_keycode)]. */
+unsigned keycode_windows_to_linux(unsigned windows_keycode);
+
+/* Translate a Windows keycode to a macOS keycode. Equivalent to
+   KEYCODE_MACOS_FROM_HID[keycode_windows_to_hid(windows_keycode)]. */
+unsigned keycode_windows_to_macos(unsigned windows_keycode);
+
+#ifdef __cplusplus
+} /* extern "C" */
+#endif
+#endif
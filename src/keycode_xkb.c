@@ -0,0 +1,159 @@
+/* This file is automatically generated. */
+#include "keycode_xkb.h"
+
+#include <string.h>
+
+enum {
+    /* Every HID keycode with a character is below this. */
+    KEYCODE_XKB_KEYS = 101
+};
+
+static const char *const KEYCODE_XKB_NAME[KEYCODE_XKB_COUNT] = {
+    "us",
+    "fr"
+};
+
+static const char *const KEYCODE_XKB_DESCRIPTION[KEYCODE_XKB_COUNT] = {
+    "English (US)",
+    "French"
+};
+
+/* Code points, indexed by layout, HID keycode, and level. */
+static const unsigned short KEYCODE_XKB_CHAR[808] = {
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,97,65,0,0,98,66,0,0,99,67,0,0,100,68,0,0,
+    101,69,0,0,102,70,0,0,103,71,0,0,104,72,0,0,105,73,0,0,106,74,0,0,107,75,0,
+    0,108,76,0,0,109,77,0,0,110,78,0,0,111,79,0,0,112,80,0,0,113,81,0,0,114,82,
+    0,0,115,83,0,0,116,84,0,0,117,85,0,0,118,86,0,0,119,87,0,0,120,88,0,0,121,
+    89,0,0,122,90,0,0,49,33,0,0,50,64,0,0,51,35,0,0,52,36,0,0,53,37,0,0,54,94,0,
+    0,55,38,0,0,56,42,0,0,57,40,0,0,48,41,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,45,95,0,0,61,43,0,0,91,123,0,0,93,125,0,0,92,124,0,0,0,0,0,0,59,58,0,
+    0,39,34,0,0,96,126,0,0,44,60,0,0,46,62,0,0,47,63,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,113,81,64,937,98,
+    66,8221,8217,99,67,162,169,100,68,240,208,101,69,8364,162,102,70,273,170,
+    103,71,331,330,104,72,295,294,105,73,8594,305,106,74,777,795,107,75,312,38,
+    108,76,322,321,44,63,180,733,110,78,110,78,111,79,248,216,112,80,254,222,97,
+    65,230,198,114,82,182,174,115,83,223,167,116,84,359,358,117,85,8595,8593,
+    118,86,8220,8216,122,90,171,60,120,88,187,62,121,89,8592,165,119,87,322,321,
+    38,49,185,161,233,50,126,8539,34,51,35,163,39,52,123,36,40,53,91,8540,45,54,
+    124,8541,232,55,96,8542,95,56,92,8482,231,57,94,177,224,48,64,176,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,41,176,93,191,61,43,125,731,94,168,168,730,36,
+    163,164,175,42,181,96,728,0,0,0,0,109,77,181,186,249,37,94,711,178,126,172,
+    172,59,46,9472,215,58,47,183,247,33,167,803,729,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,60,62,124,166
+};
+
+static const char KEYCODE_XKB_LABEL_DATA[] =
+    "\0!\0\"\0#\0$\0%\0&\0'\0(\0)\0*\0+\0,\0-\0.\0/\0000\0001\0002\0003\0004"
+    "\0005\0006\0007\08\09\0:\0;\0<\0=\0>\0?\0@\0A\0B\0C\0D\0E\0F\0G\0H\0I\0J"
+    "\0K\0L\0M\0N\0O\0P\0Q\0R\0S\0T\0U\0V\0W\0X\0Y\0Z\0[\0\\\0]\0^\0_\0`\0a\0b"
+    "\0c\0d\0e\0f\0g\0h\0i\0j\0k\0l\0m\0n\0o\0p\0q\0r\0s\0t\0u\0v\0w\0x\0y\0z"
+    "\0{\0|\0}\0~\0\302\240\314\211\0\302\240\314\233\0\302\240\314\243\0\302"
+    "\241\0\302\242\0\302\243\0\302\244\0\302\245\0\302\246\0\302\247\0\302"
+    "\250\0\302\251\0\302\252\0\302\253\0\302\254\0\302\256\0\302\257\0\302"
+    "\260\0\302\261\0\302\262\0\302\264\0\302\265\0\302\266\0\302\267\0\302"
+    "\271\0\302\272\0\302\273\0\302\277\0\303\206\0\303\220\0\303\227\0\303"
+    "\230\0\303\236\0\303\237\0\303\240\0\303\246\0\303\247\0\303\250\0\303"
+    "\251\0\303\260\0\303\267\0\303\270\0\303\271\0\303\276\0\304\221\0\304"
+    "\246\0\304\247\0\304\261\0\304\270\0\305\201\0\305\202\0\305\212\0\305"
+    "\213\0\305\246\0\305\247\0\313\207\0\313\230\0\313\231\0\313\232\0\313"
+    "\233\0\313\235\0\316\251\0\342\200\230\0\342\200\231\0\342\200\234\0\342"
+    "\200\235\0\342\202\254\0\342\204\242\0\342\205\233\0\342\205\234\0\342"
+    "\205\235\0\342\205\236\0\342\206\220\0\342\206\221\0\342\206\222\0\342"
+    "\206\223\0\342\224\200";
+static const unsigned short KEYCODE_XKB_LABEL_OFFSET[808] = {
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,129,65,0,0,131,67,0,0,133,69,0,0,135,71,0,0,
+    137,73,0,0,139,75,0,0,141,77,0,0,143,79,0,0,145,81,0,0,147,83,0,0,149,85,0,
+    0,151,87,0,0,153,89,0,0,155,91,0,0,157,93,0,0,159,95,0,0,161,97,0,0,163,99,
+    0,0,165,101,0,0,167,103,0,0,169,105,0,0,171,107,0,0,173,109,0,0,175,111,0,0,
+    177,113,0,0,179,115,0,0,33,1,0,0,35,63,0,0,37,5,0,0,39,7,0,0,41,9,0,0,43,
+    123,0,0,45,11,0,0,47,19,0,0,49,15,0,0,31,17,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,25,125,0,0,57,21,0,0,117,181,0,0,121,185,0,0,119,183,0,0,0,0,0,
+    0,53,51,0,0,13,3,0,0,127,187,0,0,23,55,0,0,27,59,0,0,29,61,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,161,97,
+    63,378,131,67,393,385,133,69,207,228,135,71,312,282,137,73,397,207,139,75,
+    327,231,141,77,351,348,143,79,333,330,145,81,429,336,147,83,189,194,149,85,
+    339,11,151,87,345,342,23,61,255,375,155,91,155,91,157,93,318,288,159,95,324,
+    291,129,65,300,279,163,99,261,240,165,101,294,222,167,103,357,354,169,105,
+    433,425,171,107,389,381,179,115,234,55,175,111,273,59,177,113,421,216,173,
+    109,345,342,11,33,267,204,309,35,187,405,3,37,5,210,13,39,181,7,15,41,117,
+    409,25,43,183,413,306,45,127,417,125,47,119,401,303,49,123,249,297,31,63,
+    246,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,17,246,121,276,57,21,185,372,
+    123,225,225,369,7,210,213,243,19,258,127,363,0,0,0,0,153,89,258,270,321,9,
+    123,360,252,187,237,237,53,27,437,285,51,29,264,315,1,222,199,366,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,55,59,183,219
+};
+
+/* Get the index in the tables for a key, or -1 if it is out of range. */
+static long keycode_xkb_index(int layout, unsigned hid_keycode,
+                              unsigned level) {
+    if (layout < 0 || layout >= KEYCODE_XKB_COUNT ||
+        hid_keycode >= KEYCODE_XKB_KEYS || level >= KEYCODE_XKB_LEVELS) {
+        return -1;
+    }
+    return ((long)layout * KEYCODE_XKB_KEYS + (long)hid_keycode) *
+               KEYCODE_XKB_LEVELS +
+           (long)level;
+}
+
+int keycode_xkb_layout(const char *name) {
+    int i;
+    for (i = 0; i < KEYCODE_XKB_COUNT; i++) {
+        if (strcmp(name, KEYCODE_XKB_NAME[i]) == 0) {
+            return i;
+        }
+    }
+    return -1;
+}
+
+const char *keycode_xkb_layout_name(int layout) {
+    if (layout < 0 || layout >= KEYCODE_XKB_COUNT) {
+        return NULL;
+    }
+    return KEYCODE_XKB_NAME[layout];
+}
+
+const char *keycode_xkb_description(int layout) {
+    if (layout < 0 || layout >= KEYCODE_XKB_COUNT) {
+        return NULL;
+    }
+    return KEYCODE_XKB_DESCRIPTION[layout];
+}
+
+unsigned long keycode_xkb_char(int layout, unsigned hid_keycode,
+                               unsigned level) {
+    long index = keycode_xkb_index(layout, hid_keycode, level);
+    if (index < 0) {
+        return 0;
+    }
+    return KEYCODE_XKB_CHAR[index];
+}
+
+const char *keycode_xkb_label(int layout, unsigned hid_keycode,
+                              unsigned level) {
+    long index = keycode_xkb_index(layout, hid_keycode, level);
+    unsigned offset;
+    if (index < 0) {
+        return NULL;
+    }
+    offset = KEYCODE_XKB_LABEL_OFFSET[index];
+    if (offset == 0) {
+        return NULL;
+    }
+    return KEYCODE_XKB_LABEL_DATA + offset;
+}
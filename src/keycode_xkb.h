@@ -0,0 +1,52 @@
+/* This file is automatically generated. */
+#ifndef KEYCODE_KEYCODE_XKB_H
+#define KEYCODE_KEYCODE_XKB_H
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Character tables for keyboard layouts, compiled from XKB symbols files.
+   These give the character produced by each key on each layout, so the label
+   for a key can be shown without access to the user's keyboard layout. */
+
+enum {
+    /* Number of shift levels: no modifiers, Shift, AltGr, and Shift+AltGr. */
+    KEYCODE_XKB_LEVELS = 4
+};
+
+/* Layout indexes. */
+enum {
+    KEYCODE_XKB_US,
+    KEYCODE_XKB_FR,
+    /* Number of layouts. */
+    KEYCODE_XKB_COUNT
+};
+
+/* Get the index of a layout by its name, like "us". Returns -1 if there is no
+   layout with the given name. */
+int keycode_xkb_layout(const char *name);
+
+/* Get the name of a layout, like "us". Returns NULL if the layout does not
+   exist. */
+const char *keycode_xkb_layout_name(int layout);
+
+/* Get the human-readable name of a layout, like "English (US)", in UTF-8.
+   Returns NULL if the layout does not exist or has no name. */
+const char *keycode_xkb_description(int layout);
+
+/* Get the Unicode code point produced by a key at the given shift level.
+   Returns 0 if the key produces no character. Dead keys produce the accent
+   character. Safe to call with any possible input. */
+unsigned long keycode_xkb_char(int layout, unsigned hid_keycode,
+                               unsigned level);
+
+/* Get the label for a key at the given shift level, as a UTF-8 string. Returns
+   NULL if the key produces no character. Safe to call with any possible
+   input. */
+const char *keycode_xkb_label(int layout, unsigned hid_keycode,
+                              unsigned level);
+
+#ifdef __cplusplus
+} /* extern "C" */
+#endif
+#endif
@@ -3,6 +3,7 @@
    for details. */
 #ifndef KEYCODE_KEYTABLE_H
 #define KEYCODE_KEYTABLE_H
+#include <stddef.h>
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -14,6 +15,14 @@ enum {
     KEYCODE_NONE = 255,
 };
 
+/* A platform-specific modifier flag, and the key which sets it. Tables of
+   these are terminated by an entry where flag is 0. */
+struct keycode_modifier_flag {
+    unsigned long flag;
+    unsigned short keycode;
+    unsigned char hid_keycode;
+};
+
 /* Get the identifier for the give HID keycode. The identifier is a unique
    alphanumeric string that uniquely identifies the key. Returns NULL if the
    keycode does not exist or is not used in any mapping. */
@@ -42,6 +51,17 @@ enum {
    KEYCODE_EVEV_OFFSET. Safe to call with any possible input. */
 unsigned keycode_linux_to_hid(unsigned linux_keycode);
 
+/* Translate an array of Linux keycodes to HID keycodes. Each result is equal
+   to the result of keycode_linux_to_hid. The arrays must not overlap. */
+void keycode_linux_to_hid_n(const unsigned *linux_keycodes,
+                            unsigned char *hid_keycodes, size_t n);
+
+/* Translate an array of HID keycodes to Linux keycodes, using
+   KEYCODE_LINUX_FROM_HID. HID keycodes outside the table translate to
+   KEYCODE_NONE. The arrays must not overlap. */
+void keycode_linux_from_hid_n(const unsigned *hid_keycodes,
+                              unsigned char *linux_keycodes, size_t n);
+
 /* Get the display name for an HID key code on Linux. This returns "Super" as
    the name for the "GUI" keys. Returns NULL if the no Linux keycode is mapped
    to this HID keycode. Safe to call with any possible input. */
@@ -52,14 +72,32 @@ const char *keycode_linux_name(unsigned hid_keycode);
    prefix removed. */
 const char *keycode_linux_rawname(unsigned linux_keycode);
 
-/* Mapping from Linux key codes to HID key codes.
-   KEY_None (0) indicates no mapping. */
+/* Mapping from Linux key codes to HID key codes, for key codes below 256.
+   KEY_None (0) indicates no mapping. Linux key codes go up to 0x2ff, so use
+   keycode_linux_to_hid to translate arbitrary key codes. */
 extern const unsigned char KEYCODE_LINUX_TO_HID[256];
 
 /* Mapping from HID key codes to native key codes.
    KEYCODE_NONE (255) indicates no mapping. */
 extern const unsigned char KEYCODE_LINUX_FROM_HID[256];
 
+/* Get every Linux key code which maps to an HID key code, for translating
+   in the reverse direction when more than one Linux key code maps to the same
+   HID key code. Sets *scancodes to point to the key codes, in increasing
+   order, and returns how many there are. The first key code is the one in
+   KEYCODE_LINUX_FROM_HID, if it fits in that table. Returns 0 if no Linux key
+   code is mapped to this HID key code. Safe to call with any possible
+   input. */
+unsigned keycode_linux_from_hid_all(unsigned hid_keycode,
+                                    const unsigned short **scancodes);
+
+/* Every Linux key code for each HID key code, in compressed sparse row form.
+   The key codes for HID key code N are the entries of
+   KEYCODE_LINUX_FROM_HID_ALL starting at KEYCODE_LINUX_FROM_HID_OFFSET[N] and
+   ending before KEYCODE_LINUX_FROM_HID_OFFSET[N+1]. */
+extern const unsigned short KEYCODE_LINUX_FROM_HID_OFFSET[257];
+extern const unsigned short KEYCODE_LINUX_FROM_HID_ALL[];
+
 /*
  * =============================================================================
  * macOS
@@ -72,12 +110,32 @@ extern const unsigned char KEYCODE_LINUX_FROM_HID[256];
    input. */
 unsigned keycode_macos_to_hid(unsigned macos_keycode);
 
+/* Translate an array of macOS keycodes to HID keycodes. Each result is equal
+   to the result of keycode_macos_to_hid. The arrays must not overlap. */
+void keycode_macos_to_hid_n(const unsigned *macos_keycodes,
+                            unsigned char *hid_keycodes, size_t n);
+
+/* Translate an array of HID keycodes to macOS keycodes, using
+   KEYCODE_MACOS_FROM_HID. HID keycodes outside the table translate to
+   KEYCODE_NONE. The arrays must not overlap. */
+void keycode_macos_from_hid_n(const unsigned *hid_keycodes,
+                              unsigned char *macos_keycodes, size_t n);
+
 /* Get the modifier flags for a given macOS keycode. Returns 0 if the keycode is
    not a modifier key. This can be used to distinguish key up and key down
    events for modifier keys, since modifier key events always have the event
    type "flagsChanged" and do not distinguish between key up and key down. */
 unsigned keycode_macos_modifier(unsigned macos_keycode);
 
+/* Get the modifier mask, from keycode_state.h, for macOS modifier flags. The
+   flags can be taken from the "modifierFlags" property of an NSEvent. Flags
+   without a modifier mask, like Caps Lock, are ignored. */
+unsigned keycode_macos_modifiers(unsigned long flags);
+
+/* The modifier flags for each macOS modifier key. The flag values can be found
+   in IOLLEvent.h. The function key is not included. */
+extern const struct keycode_modifier_flag KEYCODE_MACOS_MODIFIER_FLAGS[];
+
 /* Get the raw name of the macOS key code. This is used for debugging. The
    resulting name is a constant in macos/input-event-codes.h, with the "KEY_"
    prefix removed. */
@@ -96,6 +154,23 @@ extern const unsigned char KEYCODE_MACOS_TO_HID[128];
    KEYCODE_NONE (255) indicates no mapping. */
 extern const unsigned char KEYCODE_MACOS_FROM_HID[256];
 
+/* Get every macOS key code which maps to an HID key code, for translating
+   in the reverse direction when more than one macOS key code maps to the same
+   HID key code. Sets *scancodes to point to the key codes, in increasing
+   order, and returns how many there are. The first key code is the one in
+   KEYCODE_MACOS_FROM_HID, if it fits in that table. Returns 0 if no macOS key
+   code is mapped to this HID key code. Safe to call with any possible
+   input. */
+unsigned keycode_macos_from_hid_all(unsigned hid_keycode,
+                                    const unsigned short **scancodes);
+
+/* Every macOS key code for each HID key code, in compressed sparse row form.
+   The key codes for HID key code N are the entries of
+   KEYCODE_MACOS_FROM_HID_ALL starting at KEYCODE_MACOS_FROM_HID_OFFSET[N] and
+   ending before KEYCODE_MACOS_FROM_HID_OFFSET[N+1]. */
+extern const unsigned short KEYCODE_MACOS_FROM_HID_OFFSET[257];
+extern const unsigned short KEYCODE_MACOS_FROM_HID_ALL[];
+
 /*
  * =============================================================================
  * Windows
@@ -108,12 +183,32 @@ extern const unsigned char KEYCODE_MACOS_FROM_HID[256];
    This function is safe to call with any possible input. */
 unsigned keycode_windows_to_hid(unsigned windows_keycode);
 
+/* Translate an array of Windows keycodes to HID keycodes. Each result is equal
+   to the result of keycode_windows_to_hid. The arrays must not overlap. */
+void keycode_windows_to_hid_n(const unsigned *windows_keycodes,
+                              unsigned char *hid_keycodes, size_t n);
+
+/* Translate an array of HID keycodes to Windows keycodes, using
+   KEYCODE_WINDOWS_FROM_HID. HID keycodes outside the table translate to
+   KEYCODE_NONE. The arrays must not overlap. */
+void keycode_windows_from_hid_n(const unsigned *hid_keycodes,
+                                unsigned char *windows_keycodes, size_t n);
+
 /* Get the Windows keycode from the lparam passed to event handlers. This is
    equal to:
 
    return ((lparam >> 16) & 0x7f) | ((lparam & (1 << 24)) != 0 ? 0x80 : 0); */
 unsigned keycode_windows_from_lparam(unsigned lparam);
 
+/* Translate an array of lparam values from keyboard events directly to HID
+   keycodes. Each result is equal to:
+
+   keycode_windows_to_hid(keycode_windows_from_lparam(lparam))
+
+   The arrays must not overlap. */
+void keycode_windows_lparam_to_hid_n(const unsigned *lparams,
+                                     unsigned char *hid_keycodes, size_t n);
+
 /* Get the raw name of the Windows key code. This is used for debugging. The
    resulting name is a constant in Windows/input-event-codes.h, with the "KEY_"
    prefix removed. */
@@ -132,6 +227,24 @@ extern const unsigned char KEYCODE_WINDOWS_TO_HID[256];
    KEYCODE_NONE (255) indicates no mapping. */
 extern const unsigned char KEYCODE_WINDOWS_FROM_HID[256];
 
+/* Get every Windows key code which maps to an HID key code, for translating
+   in the reverse direction when more than one Windows key code maps to the
+   same HID key code. Sets *scancodes to point to the key codes, in increasing
+   order, and returns how many there are. The first key code is the one in
+   KEYCODE_WINDOWS_FROM_HID, if it fits in that table. Returns 0 if no Windows
+   key code is mapped to this HID key code. Safe to call with any possible
+   input. */
+unsigned keycode_windows_from_hid_all(unsigned hid_keycode,
+                                      const unsigned short **scancodes);
+
+/* Every Windows key code for each HID key code, in compressed sparse row form.
+   The key codes for HID key code N are the entries of
+   KEYCODE_WINDOWS_FROM_HID_ALL starting at
+   KEYCODE_WINDOWS_FROM_HID_OFFSET[N] and ending before
+   KEYCODE_WINDOWS_FROM_HID_OFFSET[N+1]. */
+extern const unsigned short KEYCODE_WINDOWS_FROM_HID_OFFSET[257];
+extern const unsigned short KEYCODE_WINDOWS_FROM_HID_ALL[];
+
 #ifdef __cplusplus
 } /* extern "C" */
 #endif
@@ -0,0 +1,34 @@
+/* This file is automatically generated. */
+#include "keytable.h"
+const unsigned short KEYCODE_LINUX_FROM_HID_OFFSET[257] = {
+    0,0,0,0,0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,
+    26,27,28,29,30,31,32,33,34,35,36,36,37,38,39,40,41,42,43,44,45,45,46,47,48,
+    49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,64,65,66,67,68,69,70,71,72,
+    73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,94,94,95,
+    96,97,98,99,100,101,102,103,104,105,106,107,107,107,108,108,108,108,108,108,
+    108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,
+    108,108,108,108,108,108,108,108,108,108,108,109,109,109,109,110,110,110,110,
+    110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,
+    110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,
+    110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,
+    110,110,110,110,110,111,112,113,114,115,116,117,118,118,118,118,118,118,118,
+    118,118,118,118,118,118,118,118,118,118,118,118,118,118,118,118,118,118
+};
+const unsigned short KEYCODE_LINUX_FROM_HID_ALL[118] = {
+    30,48,46,32,18,33,34,35,23,36,37,38,50,49,24,25,16,19,31,20,22,47,17,45,21,
+    44,2,3,4,5,6,7,8,9,10,11,1,14,15,57,12,13,26,27,43,39,40,41,51,52,53,58,59,
+    60,61,62,63,64,65,66,67,68,87,88,70,119,110,102,104,111,107,109,106,105,108,
+    103,69,98,55,74,78,96,79,80,81,75,76,77,71,72,73,82,83,86,117,183,184,185,
+    186,187,188,189,190,191,192,193,194,139,99,28,29,42,56,125,97,54,100,126
+};
+unsigned keycode_linux_from_hid_all(unsigned hid_keycode,
+                                    const unsigned short **scancodes) {
+    unsigned start;
+    if (hid_keycode >= 256) {
+        *scancodes = KEYCODE_LINUX_FROM_HID_ALL;
+        return 0;
+    }
+    start = KEYCODE_LINUX_FROM_HID_OFFSET[hid_keycode];
+    *scancodes = KEYCODE_LINUX_FROM_HID_ALL + start;
+    return KEYCODE_LINUX_FROM_HID_OFFSET[hid_keycode + 1] - start;
+}
@@ -1,5 +1,7 @@
 /* This file is automatically generated. */
 #include "keytable.h"
+/* Name map encoding: bitmap, 276 bytes.
+   Sizes: dense 464, bitmap 276, sorted 354. */
 static const char KEYCODE_LINUX_NAME_DATA[] =
     "\0'\0,\0;\0A\0B\0Backspace\0C\0Caps Lock\0D\0Delete\0E\0End\0Escape\0F\0F"
     "1\0F10\0F11\0F12\0F13\0F14\0F15\0F16\0F17\0F18\0F19\0F2\0F20\0F21\0F22\0F"
@@ -9,23 +11,36 @@ static const char KEYCODE_LINUX_NAME_DATA[] =
     "ft Shift\0Left Super\0M\0Menu\0N\0Non-US \\\0O\0P\0Page Down\0Page Up\0Pa"
     "use\0Q\0R\0Right\0Right Alt\0Right Control\0Right Shift\0Right Super\0S\0"
     "Scroll Lock\0Space\0SysReq/Attention\0T\0Tab\0U\0V\0W\0X\0Y\0Z\0[\0]\0`";
+static const unsigned long KEYCODE_LINUX_NAME_BITMAP[] = {
+    0xfffffff0ul,0xfffbfefful,0xffffffbful,0x004fff9ful,0x44000000ul,
+    0x00000000ul,0x00000000ul,0x000000fful
+};
+static const unsigned char KEYCODE_LINUX_NAME_RANK[] = {
+    0,28,58,89,108,110,110,110
+};
 static const unsigned short KEYCODE_LINUX_NAME_OFFSET[] = {
-    0,0,0,0,7,9,21,33,42,55,144,146,153,162,164,266,317,324,335,337,363,365,421,
-    458,464,466,468,470,472,474,58,70,74,78,82,86,90,94,98,62,0,48,11,460,435,
-    179,244,476,478,333,0,5,1,480,3,184,189,23,57,100,123,126,129,132,135,138,
-    141,60,64,68,0,423,357,155,148,349,35,44,339,367,268,344,354,255,186,166,
-    176,171,246,196,201,206,211,216,221,226,231,236,191,181,326,0,0,241,72,76,
-    80,84,88,92,96,103,107,111,115,119,0,0,319,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,441,0,0,0,249,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,282,295,273,306,383,397,373,409
+    7,9,21,33,42,55,144,146,153,162,164,266,317,324,335,337,363,365,421,458,464,
+    466,468,470,472,474,199,204,209,214,219,224,229,234,239,194,48,11,460,435,
+    179,244,476,478,333,5,1,480,3,184,189,23,57,100,123,126,129,132,135,138,141,
+    60,64,68,423,357,155,148,349,35,44,339,367,268,344,354,255,186,166,176,171,
+    246,196,201,206,211,216,221,226,231,236,191,181,326,241,72,76,80,84,88,92,
+    96,103,107,111,115,119,319,441,249,282,295,273,306,383,397,373,409
 };
 const char *keycode_linux_name(unsigned index) {
-    unsigned offset;
+    unsigned long word, bit;
+    unsigned rank;
     if (232 <= index)
         return 0;
-    offset = KEYCODE_LINUX_NAME_OFFSET[index];
-    if (offset == 0)
+    word = KEYCODE_LINUX_NAME_BITMAP[index >> 5];
+    bit = 1ul << (index & 31);
+    if ((word & bit) == 0)
         return 0;
-    return KEYCODE_LINUX_NAME_DATA + offset;
+    /* Count the names below this one in the same word. */
+    word &= bit - 1;
+    word -= (word >> 1) & 0x55555555ul;
+    word = (word & 0x33333333ul) + ((word >> 2) & 0x33333333ul);
+    word = (word + (word >> 4)) & 0x0f0f0f0ful;
+    rank = KEYCODE_LINUX_NAME_RANK[index >> 5] +
+           (unsigned)(((word * 0x01010101ul) & 0xfffffffful) >> 24);
+    return KEYCODE_LINUX_NAME_DATA + KEYCODE_LINUX_NAME_OFFSET[rank];
 }
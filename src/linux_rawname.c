@@ -1,5 +1,7 @@
 /* This file is automatically generated. */
 #include "keytable.h"
+/* Name map encoding: bitmap, 1020 bytes.
+   Sizes: dense 1536, bitmap 1020, sorted 1752. */
 static const char KEYCODE_LINUX_RAWNAME_DATA[] =
     "\000102ND\00010CHANNELSDOWN\00010CHANNELSUP\0003D_MODE\0ADDRESSBOOK\0AGAI"
     "N\0ALS_TOGGLE\0ALTERASE\0ANGLE\0APOSTROPHE\0APPSELECT\0ARCHIVE\0ASSISTANT"
@@ -47,50 +49,62 @@ static const char KEYCODE_LINUX_RAWNAME_DATA[] =
     "HONE\0VIDEO_NEXT\0VIDEO_PREV\0VOD\0VOICECOMMAND\0VOICEMAIL\0VOLUMEDOWN\0V"
     "OLUMEUP\0WAKEUP\0WLAN\0WORDPROCESSOR\0WPS_BUTTON\0WWAN\0WWW\0XFER\0YELLOW"
     "\0YEN\0Z\0ZENKAKUHANKAKU\0ZOOM\0ZOOMRESET";
+static const unsigned long KEYCODE_LINUX_RAWNAME_BITMAP[] = {
+    0xfffffffful,0xfffffffful,0xffeffffful,0xfffffffful,0xfffffffful,
+    0xfffffffful,0xffffff07ul,0x01fffffful,0x00000000ul,0x00000000ul,
+    0x00000000ul,0xfffffffful,0xfffffffful,0x07fffffful,0xffff000ful,
+    0x07fe001ful,0x7ffffffful,0x00030000ul,0x000300fful,0x01fffffful,
+    0x00000000ul,0x00000000ul,0x00000000ul,0x80000000ul
+};
+static const unsigned short KEYCODE_LINUX_RAWNAME_RANK[] = {
+    0,32,64,95,127,159,191,218,243,243,243,243,275,307,334,354,369,400,402,412,
+    437,437,437,437
+};
 static const unsigned short KEYCODE_LINUX_RAWNAME_OFFSET[] = {
-    2266,183,358,377,386,395,404,413,422,431,440,368,1553,1523,201,2653,2651,
-    1805,41,467,106,227,664,1205,174,33,1621,2306,1515,1631,474,252,5,138,453,
-    199,1239,53,580,2489,87,1160,1649,191,2936,189,185,1421,989,20,2216,1501,
-    1509,195,2337,1488,1613,205,565,1016,1043,1049,1055,1061,1067,1073,1079,
-    1085,1022,2024,2462,1476,1480,1484,1551,1464,1468,1472,1559,1452,1456,1460,
-    1448,1507,0,2938,1,1029,1036,864,1249,1266,1796,1258,1794,1529,1513,2317,
-    1591,2647,2297,1691,1191,32,2071,508,520,2500,17,2062,1219,725,1712,1774,
-    2854,2865,2132,1521,1566,2126,2426,1499,1172,1180,2932,1640,2327,628,2590,
-    55,2218,2748,1128,679,2050,2078,962,684,1186,661,455,2513,2532,2874,738,
-    2504,732,2920,2186,2192,2916,1788,621,2378,688,1100,244,636,1110,924,850,
-    837,845,1812,2122,2167,2595,2098,2283,2799,1235,448,1196,2252,867,1779,832,
-    2473,2451,1539,1578,1803,2247,872,876,880,884,888,892,896,900,904,908,912,
-    916,0,0,0,0,0,2108,2084,2198,2204,701,2623,615,2388,920,211,2180,1768,469,
-    2555,2228,2848,604,2482,645,954,2572,2519,72,1351,260,275,1718,2631,1288,
-    1275,1303,2499,2260,1093,2421,811,221,234,2881,2768,2753,2805,2816,304,288,
-    799,2911,2290,1771,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    52,101,1140,609,2138,2055,1214,2684,2781,108,2210,574,944,858,2224,1767,
-    1599,2617,2614,81,2953,38,2041,2432,2105,2736,2739,2772,2776,2412,2416,842,
-    2657,2237,2730,2115,2679,828,187,1784,170,2788,775,1700,1752,460,2243,1166,
-    2925,229,594,582,967,1608,2654,1373,2275,2538,2524,254,2158,768,2674,2743,
-    2794,1134,543,557,2958,2886,1153,2578,1145,2145,716,1807,2844,43,1757,785,
-    2561,1705,821,862,1105,1115,653,1724,22,7,1207,0,0,0,0,0,743,751,1226,759,0,
-    0,0,0,0,0,0,0,0,0,0,0,973,1001,1013,1040,1046,1052,1058,1064,1070,1076,1082,
-    1019,1026,1033,976,981,991,996,1008,1088,986,0,0,0,0,0,0,0,0,0,0,0,0,351,
-    370,379,388,397,406,415,424,433,360,0,0,0,0,0,1835,1845,1877,1887,1897,1907,
-    1917,1927,1937,1947,2011,1997,1957,1967,1977,1987,488,2900,2714,2702,2689,
-    536,550,526,476,501,513,140,126,153,1677,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    61,2393,0,0,0,0,0,0,0,0,0,0,0,0,0,0,442,2662,1241,666,98,2439,2831,116,0,0,
-    0,0,0,0,0,0,336,321,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1403,1358,1423,1378,1314,
-    1336,2359,2348,1669,1659,2368,1737,1855,1866,176,35,1821,2602,2092,2827,
-    2761,932,2543,711,2032,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,332
+    2266,183,1031,1038,874,878,882,886,890,894,898,1024,1553,1523,201,2653,2651,
+    1805,209,467,1735,2391,2951,1205,2250,2536,1621,2306,1515,1631,1722,1212,
+    856,1710,453,2487,1239,258,1247,2489,87,1160,1649,191,2936,334,458,2825,
+    2655,1801,2216,1533,1509,195,2337,1488,1613,205,565,1016,1043,1049,1055,
+    1061,1067,1073,1079,1085,1022,2024,2462,1476,1480,1484,1551,1464,1468,1472,
+    1559,1452,1456,1460,1448,1507,2938,1,1029,1036,1715,1249,1266,1796,1258,
+    1794,1529,1513,2317,1591,2647,2297,1691,1191,2075,2071,508,520,2627,2066,
+    2062,1219,725,1712,1774,2854,2865,2132,1521,1566,2126,2426,1499,1172,1180,
+    2932,1640,2327,628,2590,55,2218,2748,1128,679,2050,2078,962,684,1186,1747,
+    455,2513,2532,2874,2508,2504,732,2920,2186,2192,2916,1788,621,2378,688,1100,
+    244,636,1110,1120,850,837,845,1812,2122,2167,2595,2098,2283,2799,1235,448,
+    1196,2252,867,1779,832,2473,2451,1539,1578,1803,2247,872,876,880,884,888,
+    892,896,900,904,908,912,916,2108,2084,2198,2204,701,2623,615,2388,920,211,
+    2180,1768,469,2555,2228,2848,604,2482,645,954,2572,2519,72,1351,260,275,
+    1718,2631,1288,1275,1303,2499,2260,1093,2421,811,221,234,2881,2768,2753,
+    2805,2816,304,288,799,2911,2290,1771,52,101,1140,609,2138,2055,1214,2684,
+    2781,108,2210,574,944,858,2224,1767,1599,2617,2614,81,2953,2642,2041,2432,
+    2105,2736,2739,2772,2776,2412,2416,855,2657,2237,2730,2115,2679,828,187,
+    1784,170,2788,775,1700,1752,460,2243,1166,2925,229,594,582,967,1608,2654,
+    2811,2275,2538,2524,254,2158,768,2674,2743,2794,1134,543,557,2958,2886,1153,
+    2578,1145,2145,716,1807,2844,43,1757,785,2561,1705,821,862,1105,1115,653,
+    1724,22,7,1207,743,751,1226,759,973,1001,1013,1040,1046,1052,1058,1064,1070,
+    1076,1082,1019,1026,1033,976,981,991,996,1008,1088,986,351,370,379,388,397,
+    406,415,424,433,360,1835,1845,1877,1887,1897,1907,1917,1927,1937,1947,2011,
+    1997,1957,1967,1977,1987,488,2900,2714,2702,2689,536,550,526,476,501,513,
+    140,126,153,1677,61,2393,442,2662,1241,666,98,2439,2831,116,336,321,1403,
+    1358,1423,1378,1314,1336,2359,2348,1669,1659,2368,1737,1855,1866,176,35,
+    1821,2602,2092,2827,2761,932,2543,711,2032,332
 };
 const char *keycode_linux_rawname(unsigned index) {
-    unsigned offset;
+    unsigned long word, bit;
+    unsigned rank;
     if (768 <= index)
         return 0;
-    offset = KEYCODE_LINUX_RAWNAME_OFFSET[index];
-    if (offset == 0)
+    word = KEYCODE_LINUX_RAWNAME_BITMAP[index >> 5];
+    bit = 1ul << (index & 31);
+    if ((word & bit) == 0)
         return 0;
-    return KEYCODE_LINUX_RAWNAME_DATA + offset;
+    /* Count the names below this one in the same word. */
+    word &= bit - 1;
+    word -= (word >> 1) & 0x55555555ul;
+    word = (word & 0x33333333ul) + ((word >> 2) & 0x33333333ul);
+    word = (word + (word >> 4)) & 0x0f0f0f0ful;
+    rank = KEYCODE_LINUX_RAWNAME_RANK[index >> 5] +
+           (unsigned)(((word * 0x01010101ul) & 0xfffffffful) >> 24);
+    return KEYCODE_LINUX_RAWNAME_DATA + KEYCODE_LINUX_RAWNAME_OFFSET[rank];
 }
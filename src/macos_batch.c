@@ -0,0 +1,26 @@
+/* This file is automatically generated. */
+#include "keytable.h"
+
+/* The loops read the tables in bounds for any input and select the result
+   afterwards, so they have no branches. */
+void keycode_macos_to_hid_n(const unsigned *scancodes,
+                            unsigned char *hid_keycodes, size_t n) {
+    size_t i;
+    unsigned x, y;
+    for (i = 0; i < n; i++) {
+        x = scancodes[i];
+        y = KEYCODE_MACOS_TO_HID[x & 127];
+        hid_keycodes[i] = (unsigned char)(x < 128 ? y : 0);
+    }
+}
+
+void keycode_macos_from_hid_n(const unsigned *hid_keycodes,
+                              unsigned char *scancodes, size_t n) {
+    size_t i;
+    unsigned x, y;
+    for (i = 0; i < n; i++) {
+        x = hid_keycodes[i];
+        y = KEYCODE_MACOS_FROM_HID[x & 255];
+        scancodes[i] = (unsigned char)(x < 256 ? y : KEYCODE_NONE);
+    }
+}
@@ -0,0 +1,34 @@
+/* This file is automatically generated. */
+#include "keytable.h"
+const unsigned short KEYCODE_MACOS_FROM_HID_OFFSET[257] = {
+    0,0,0,0,0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,
+    26,27,28,29,30,31,32,33,34,35,36,36,37,38,39,40,41,42,43,44,45,45,46,47,48,
+    49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,64,64,64,64,65,66,67,68,69,
+    70,71,72,73,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,88,88,88,88,89,
+    90,91,92,93,94,95,96,97,97,97,97,97,97,98,98,98,98,98,98,98,98,98,98,99,99,
+    99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,
+    99,99,99,99,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,
+    100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,
+    100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,
+    100,100,100,100,101,101,101,101,102,102,102,102,103,104,105,106,107,108,109,
+    110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,110,
+    110,110,110,110,110,110
+};
+const unsigned short KEYCODE_MACOS_FROM_HID_ALL[110] = {
+    0,11,8,2,14,3,5,4,34,38,40,37,46,45,31,35,12,15,1,17,32,9,13,7,16,6,18,19,
+    20,21,23,22,26,28,25,29,53,51,48,49,27,24,33,30,42,41,39,50,43,47,44,57,122,
+    120,99,118,96,97,98,100,101,109,103,111,115,116,117,119,121,124,123,125,126,
+    75,67,78,69,76,83,84,85,86,87,88,89,91,92,82,81,105,107,113,106,64,79,80,90,
+    114,74,36,71,65,59,56,58,55,62,60,61,54
+};
+unsigned keycode_macos_from_hid_all(unsigned hid_keycode,
+                                    const unsigned short **scancodes) {
+    unsigned start;
+    if (hid_keycode >= 256) {
+        *scancodes = KEYCODE_MACOS_FROM_HID_ALL;
+        return 0;
+    }
+    start = KEYCODE_MACOS_FROM_HID_OFFSET[hid_keycode];
+    *scancodes = KEYCODE_MACOS_FROM_HID_ALL + start;
+    return KEYCODE_MACOS_FROM_HID_OFFSET[hid_keycode + 1] - start;
+}
@@ -0,0 +1,27 @@
+/* This file is automatically generated. */
+#include "keytable.h"
+#include "keycode_state.h"
+
+const struct keycode_modifier_flag KEYCODE_MACOS_MODIFIER_FLAGS[] = {
+    {0x00000001ul, 59, 224}, /* Control */
+    {0x00000002ul, 56, 225}, /* Shift */
+    {0x00000004ul, 60, 229}, /* RightShift */
+    {0x00000008ul, 55, 227}, /* Command */
+    {0x00000010ul, 54, 231}, /* RightCommand */
+    {0x00000020ul, 58, 226}, /* Option */
+    {0x00000040ul, 61, 230}, /* RightOption */
+    {0x00002000ul, 62, 228}, /* RightControl */
+    {0x00010000ul, 57, 57}, /* CapsLock */
+    {0, 0, 0}
+};
+
+unsigned keycode_macos_modifiers(unsigned long flags) {
+    const struct keycode_modifier_flag *p;
+    unsigned mask = 0;
+    for (p = KEYCODE_MACOS_MODIFIER_FLAGS; p->flag != 0; p++) {
+        if ((flags & p->flag) != 0) {
+            mask |= KEYCODE_HID_MODIFIER[p->hid_keycode];
+        }
+    }
+    return mask;
+}
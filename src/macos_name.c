@@ -1,5 +1,7 @@
 /* This file is automatically generated. */
 #include "keytable.h"
+/* Name map encoding: bitmap, 260 bytes.
+   Sizes: dense 464, bitmap 260, sorted 330. */
 static const char KEYCODE_MACOS_NAME_DATA[] =
     "\0'\0,\0.\0;\0A\0B\0C\0Caps Lock\0D\0Delete\0Delete Forward\0E\0End\0Esca"
     "pe\0F\0F1\0F10\0F11\0F12\0F13\0F14\0F15\0F16\0F17\0F18\0F19\0F2\0F20\0F3"
@@ -9,23 +11,36 @@ static const char KEYCODE_MACOS_NAME_DATA[] =
     "tion\0Left Shift\0M\0Mute\0N\0O\0P\0Page Down\0Page Up\0Q\0R\0Return\0Rig"
     "ht\0Right Command\0Right Control\0Right Option\0Right Shift\0S\0Space\0T"
     "\0Tab\0U\0V\0W\0X\0Y\0Z\0[\0\\\0]\0`";
+static const unsigned long KEYCODE_MACOS_NAME_BITMAP[] = {
+    0xfffffff0ul,0xfffbfefful,0xfff7fc3ful,0x8020ff87ul,0x40000000ul,
+    0x00000000ul,0x11000000ul,0x000000fful
+};
+static const unsigned char KEYCODE_MACOS_NAME_RANK[] = {
+    0,28,58,85,99,100,100,102
+};
 static const unsigned short KEYCODE_MACOS_NAME_OFFSET[] = {
-    0,0,0,0,9,11,13,25,49,62,135,137,149,151,153,259,315,322,324,326,346,348,
-    416,424,430,432,434,436,438,440,65,77,81,85,89,93,97,101,105,69,0,55,27,426,
-    418,168,228,442,446,444,0,7,1,448,3,5,173,15,64,107,114,117,120,123,126,129,
-    132,67,71,75,0,0,0,0,144,338,34,51,328,357,261,333,343,0,170,155,165,160,
-    250,180,185,190,195,200,205,210,215,220,175,0,0,0,0,225,79,83,87,91,95,99,
-    103,110,0,0,0,0,0,139,0,0,0,0,0,0,0,0,0,317,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,350,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,230,0,
-    0,0,239,0,0,0,279,304,292,266,377,404,391,363
+    9,11,13,25,49,62,135,137,149,151,153,259,315,322,324,326,346,348,416,424,
+    430,432,434,436,438,440,183,188,193,198,203,208,213,218,223,178,55,27,426,
+    418,168,228,442,446,444,7,1,448,3,5,173,15,64,107,114,117,120,123,126,129,
+    132,67,71,75,144,338,34,51,328,357,261,333,343,170,155,165,160,250,180,185,
+    190,195,200,205,210,215,220,175,225,79,83,87,91,95,99,103,110,139,317,350,
+    230,239,279,304,292,266,377,404,391,363
 };
 const char *keycode_macos_name(unsigned index) {
-    unsigned offset;
+    unsigned long word, bit;
+    unsigned rank;
     if (232 <= index)
         return 0;
-    offset = KEYCODE_MACOS_NAME_OFFSET[index];
-    if (offset == 0)
+    word = KEYCODE_MACOS_NAME_BITMAP[index >> 5];
+    bit = 1ul << (index & 31);
+    if ((word & bit) == 0)
         return 0;
-    return KEYCODE_MACOS_NAME_DATA + offset;
+    /* Count the names below this one in the same word. */
+    word &= bit - 1;
+    word -= (word >> 1) & 0x55555555ul;
+    word = (word & 0x33333333ul) + ((word >> 2) & 0x33333333ul);
+    word = (word + (word >> 4)) & 0x0f0f0f0ful;
+    rank = KEYCODE_MACOS_NAME_RANK[index >> 5] +
+           (unsigned)(((word * 0x01010101ul) & 0xfffffffful) >> 24);
+    return KEYCODE_MACOS_NAME_DATA + KEYCODE_MACOS_NAME_OFFSET[rank];
 }
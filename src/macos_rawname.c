@@ -1,5 +1,7 @@
 /* This file is automatically generated. */
 #include "keytable.h"
+/* Name map encoding: dense, 254 bytes.
+   Sizes: dense 254, bitmap 258, sorted 357. */
 static const char KEYCODE_MACOS_RAWNAME_DATA[] =
     "\0ANSI_0\0ANSI_1\0ANSI_2\0ANSI_3\0ANSI_4\0ANSI_5\0ANSI_6\0ANSI_7\0ANSI_8"
     "\0ANSI_9\0ANSI_A\0ANSI_B\0ANSI_Backslash\0ANSI_C\0ANSI_Comma\0ANSI_D\0ANS"
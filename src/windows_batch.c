@@ -0,0 +1,39 @@
+/* This file is automatically generated. */
+#include "keytable.h"
+
+/* The loops read the tables in bounds for any input and select the result
+   afterwards, so they have no branches. */
+void keycode_windows_to_hid_n(const unsigned *scancodes,
+                              unsigned char *hid_keycodes, size_t n) {
+    size_t i;
+    unsigned x, y;
+    for (i = 0; i < n; i++) {
+        x = scancodes[i];
+        y = KEYCODE_WINDOWS_TO_HID[x & 255];
+        hid_keycodes[i] = (unsigned char)(x < 256 ? y : 0);
+    }
+}
+
+void keycode_windows_from_hid_n(const unsigned *hid_keycodes,
+                                unsigned char *scancodes, size_t n) {
+    size_t i;
+    unsigned x, y;
+    for (i = 0; i < n; i++) {
+        x = hid_keycodes[i];
+        y = KEYCODE_WINDOWS_FROM_HID[x & 255];
+        scancodes[i] = (unsigned char)(x < 256 ? y : KEYCODE_NONE);
+    }
+}
+
+void keycode_windows_lparam_to_hid_n(const unsigned *lparams,
+                                     unsigned char *hid_keycodes, size_t n) {
+    size_t i;
+    unsigned x;
+    /* Same as keycode_windows_from_lparam: bit 24, the extended key flag,
+       moves to bit 7. The result is always in bounds. */
+    for (i = 0; i < n; i++) {
+        x = lparams[i];
+        hid_keycodes[i] =
+            KEYCODE_WINDOWS_TO_HID[((x >> 16) & 0x7f) | ((x >> 17) & 0x80)];
+    }
+}
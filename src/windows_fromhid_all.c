@@ -0,0 +1,32 @@
+/* This file is automatically generated. */
+#include "keytable.h"
+const unsigned short KEYCODE_WINDOWS_FROM_HID_OFFSET[257] = {
+    0,0,0,0,0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,
+    26,27,28,29,30,31,32,33,34,35,36,36,37,38,39,39,40,41,42,43,44,44,45,46,47,
+    48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,
+    73,74,75,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,
+    76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,
+    76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,
+    76,76,76,76,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,
+    77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,
+    77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,78,79,80,81,82,
+    83,84,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,
+    85,85
+};
+const unsigned short KEYCODE_WINDOWS_FROM_HID_ALL[85] = {
+    30,48,46,32,18,33,34,35,23,36,37,38,50,49,24,25,16,19,31,20,22,47,17,45,21,
+    44,2,3,4,5,6,7,8,9,10,11,1,14,15,12,13,26,27,43,39,40,41,51,52,53,58,59,60,
+    61,62,63,64,65,66,67,68,87,88,183,70,69,210,199,201,211,207,209,205,203,208,
+    200,28,29,42,56,219,157,54,184,220
+};
+unsigned keycode_windows_from_hid_all(unsigned hid_keycode,
+                                      const unsigned short **scancodes) {
+    unsigned start;
+    if (hid_keycode >= 256) {
+        *scancodes = KEYCODE_WINDOWS_FROM_HID_ALL;
+        return 0;
+    }
+    start = KEYCODE_WINDOWS_FROM_HID_OFFSET[hid_keycode];
+    *scancodes = KEYCODE_WINDOWS_FROM_HID_ALL + start;
+    return KEYCODE_WINDOWS_FROM_HID_OFFSET[hid_keycode + 1] - start;
+}
@@ -1,5 +1,7 @@
 /* This file is automatically generated. */
 #include "keytable.h"
+/* Name map encoding: bitmap, 210 bytes.
+   Sizes: dense 464, bitmap 210, sorted 255. */
 static const char KEYCODE_WINDOWS_NAME_DATA[] =
     "\0'\0,\0-\0.\0/\0;\0=\0A\0B\0Backspace\0C\0Caps Lock\0D\0Delete\0E\0End\0"
     "Enter\0Escape\0F\0F1\0F10\0F11\0F12\0F2\0F3\0F4\0F5\0F6\0F7\0F8\0F9\0G\0H"
@@ -7,22 +9,34 @@ static const char KEYCODE_WINDOWS_NAME_DATA[] =
     "t Windows\0M\0N\0O\0P\0Page Down\0Page Up\0Pause\0Print Screen\0Q\0R\0Rig"
     "ht\0Right Alt\0Right Control\0Right Shift\0Right Windows\0S\0Scroll Lock"
     "\0T\0Tab\0U\0V\0W\0X\0Y\0Z\0[\0\\\0]\0`";
+static const unsigned long KEYCODE_WINDOWS_NAME_BITMAP[] = {
+    0xfffffff0ul,0xfffbeefful,0x0007fffful,0x00000000ul,0x40000000ul,
+    0x00000000ul,0x00000000ul,0x000000fful
+};
+static const unsigned char KEYCODE_WINDOWS_NAME_RANK[] = {
+    0,28,57,76,76,77,77,77
+};
 static const unsigned short KEYCODE_WINDOWS_NAME_OFFSET[] = {
-    0,0,0,0,15,17,29,41,50,69,110,112,119,128,130,132,185,187,189,191,230,232,
-    290,304,310,312,314,316,318,320,72,84,90,93,96,99,102,105,108,76,0,62,19,
-    306,0,5,13,322,326,324,0,11,1,328,3,7,9,31,71,86,89,92,95,98,101,104,107,74,
-    78,82,217,292,211,121,114,203,43,52,193,234,134,198,208,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,56,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,148,161,139,172,250,264,240,276
+    15,17,29,41,50,69,110,112,119,128,130,132,185,187,189,191,230,232,290,304,
+    310,312,314,316,318,320,80,84,90,93,96,99,102,105,108,76,62,19,306,5,13,322,
+    326,324,11,1,328,3,7,9,31,71,86,89,92,95,98,101,104,107,74,78,82,217,292,
+    211,121,114,203,43,52,193,234,134,198,208,56,148,161,139,172,250,264,240,276
 };
 const char *keycode_windows_name(unsigned index) {
-    unsigned offset;
+    unsigned long word, bit;
+    unsigned rank;
     if (232 <= index)
         return 0;
-    offset = KEYCODE_WINDOWS_NAME_OFFSET[index];
-    if (offset == 0)
+    word = KEYCODE_WINDOWS_NAME_BITMAP[index >> 5];
+    bit = 1ul << (index & 31);
+    if ((word & bit) == 0)
         return 0;
-    return KEYCODE_WINDOWS_NAME_DATA + offset;
+    /* Count the names below this one in the same word. */
+    word &= bit - 1;
+    word -= (word >> 1) & 0x55555555ul;
+    word = (word & 0x33333333ul) + ((word >> 2) & 0x33333333ul);
+    word = (word + (word >> 4)) & 0x0f0f0f0ful;
+    rank = KEYCODE_WINDOWS_NAME_RANK[index >> 5] +
+           (unsigned)(((word * 0x01010101ul) & 0xfffffffful) >> 24);
+    return KEYCODE_WINDOWS_NAME_DATA + KEYCODE_WINDOWS_NAME_OFFSET[rank];
 }
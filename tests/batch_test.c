@@ -0,0 +1,77 @@
+#include "keytable.h"
+
+#include <stdio.h>
+
+/* Check that the batch translation functions give the same results as the
+   scalar functions. */
+
+enum {
+    /* Number of inputs, which includes inputs outside every table. */
+    INPUT_COUNT = 4096
+};
+
+static unsigned (*const TO_HID[3])(unsigned) = {
+    keycode_linux_to_hid, keycode_macos_to_hid, keycode_windows_to_hid};
+
+static void (*const TO_HID_N[3])(const unsigned *, unsigned char *,
+                                 size_t) = {
+    keycode_linux_to_hid_n, keycode_macos_to_hid_n, keycode_windows_to_hid_n};
+
+static const unsigned char *const FROM_HID[3] = {
+    KEYCODE_LINUX_FROM_HID, KEYCODE_MACOS_FROM_HID, KEYCODE_WINDOWS_FROM_HID};
+
+static void (*const FROM_HID_N[3])(const unsigned *, unsigned char *,
+                                   size_t) = {keycode_linux_from_hid_n,
+                                              keycode_macos_from_hid_n,
+                                              keycode_windows_from_hid_n};
+
+static const char *const PLATFORM_NAMES[3] = {"linux", "macos", "windows"};
+
+static unsigned input[INPUT_COUNT];
+static unsigned char output[INPUT_COUNT];
+
+int main(void) {
+    unsigned i, expect;
+    unsigned long rand = 1;
+    int p, result = 0;
+    for (i = 0; i < INPUT_COUNT; i++) {
+        input[i] = i;
+    }
+    for (p = 0; p < 3; p++) {
+        TO_HID_N[p](input, output, INPUT_COUNT);
+        for (i = 0; i < INPUT_COUNT; i++) {
+            if (output[i] != TO_HID[p](i)) {
+                fprintf(stderr, "Error: keycode_%s_to_hid_n(%u) = %u\n",
+                        PLATFORM_NAMES[p], i, output[i]);
+                result = 1;
+            }
+        }
+        FROM_HID_N[p](input, output, INPUT_COUNT);
+        for (i = 0; i < INPUT_COUNT; i++) {
+            expect = i < 256 ? FROM_HID[p][i] : KEYCODE_NONE;
+            if (output[i] != expect) {
+                fprintf(stderr, "Error: keycode_%s_from_hid_n(%u) = %u\n",
+                        PLATFORM_NAMES[p], i, output[i]);
+                result = 1;
+            }
+        }
+    }
+    for (i = 0; i < INPUT_COUNT; i++) {
+        rand = (rand * 1103515245ul + 12345ul) & 0xfffffffful;
+        input[i] = (unsigned)rand;
+    }
+    keycode_windows_lparam_to_hid_n(input, output, INPUT_COUNT);
+    for (i = 0; i < INPUT_COUNT; i++) {
+        expect =
+            keycode_windows_to_hid(keycode_windows_from_lparam(input[i]));
+        if (output[i] != expect) {
+            fprintf(stderr,
+                    "Error: keycode_windows_lparam_to_hid_n(0x%08x) = %u\n",
+                    input[i], output[i]);
+            result = 1;
+        }
+    }
+    /* Empty batches must not touch the arrays. */
+    keycode_linux_to_hid_n(NULL, NULL, 0);
+    return result;
+}
@@ -0,0 +1,73 @@
+"""Test batch translation of NumPy arrays, in scripts/batch.py.
+
+Run from the repository root with "python -m unittest discover tests -p
+'*_test.py'". The tests are skipped if NumPy is not installed.
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import batch  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATADIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class BatchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.translators = batch.read_translators(DATADIR)
+
+    def check(self, func, table, default, codes):
+        """Check a translation against a lookup of each element."""
+        expect = [
+            table[code] if 0 <= code < len(table) else default
+            for code in codes.tolist()
+        ]
+        self.assertEqual(func(codes).tolist(), expect)
+
+    def check_dtypes(self, func, table, default):
+        """Check a translation with inputs of every integer type."""
+        values = {0, 1, 4, 30, 127, 255, 256, len(table) - 1, len(table)}
+        for dtype in ("uint8", "int8", "uint16", "int16", "int32", "int64",
+                      "uint64"):
+            with self.subTest(dtype=dtype):
+                info = np.iinfo(dtype)
+                codes = {v for v in values if info.min <= v <= info.max}
+                codes |= {info.min, info.max}
+                self.check(func, table, default,
+                           np.array(sorted(codes), dtype=dtype))
+
+    def test_from_hid(self):
+        for name, tr in sorted(self.translators.items()):
+            with self.subTest(platform=name):
+                self.check_dtypes(tr.from_hid,
+                                  tr.from_hid_table[:-1].tolist(),
+                                  batch.KEYCODE_NONE)
+
+    def test_to_hid(self):
+        for name, tr in sorted(self.translators.items()):
+            with self.subTest(platform=name):
+                self.check_dtypes(tr.to_hid, tr.to_hid_table[:-1].tolist(),
+                                  batch.KEY_NONE)
+
+    def test_negative(self):
+        tr = self.translators["linux"]
+        codes = np.array([-1, -256, -(1 << 40)], dtype=np.int64)
+        self.assertEqual(tr.to_hid(codes).tolist(), [batch.KEY_NONE] * 3)
+        self.assertEqual(
+            tr.from_hid(codes).tolist(), [batch.KEYCODE_NONE] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
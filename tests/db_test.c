@@ -0,0 +1,81 @@
+#include "keycode_db.h"
+#include "keytable.h"
+
+#include <stdio.h>
+#include <string.h>
+
+/* Check that the binary table file gives the same results as the compiled
+   tables. */
+
+static const char *const PLATFORM_NAMES[3] = {"linux", "macos", "windows"};
+
+static unsigned (*const TO_HID[3])(unsigned) = {
+    keycode_linux_to_hid, keycode_macos_to_hid, keycode_windows_to_hid};
+
+static const char *(*const NAME[3])(unsigned) = {
+    keycode_linux_name, keycode_macos_name, keycode_windows_name};
+
+static const char *(*const RAWNAME[3])(unsigned) = {
+    keycode_linux_rawname, keycode_macos_rawname, keycode_windows_rawname};
+
+static const unsigned char *const FROM_HID[3] = {
+    KEYCODE_LINUX_FROM_HID, KEYCODE_MACOS_FROM_HID, KEYCODE_WINDOWS_FROM_HID};
+
+static int same_string(const char *x, const char *y) {
+    if (x == NULL || y == NULL) {
+        return x == y;
+    }
+    return strcmp(x, y) == 0;
+}
+
+int main(int argc, char **argv) {
+    struct keycode_db db;
+    const char *path, *name;
+    unsigned code;
+    int result, r, i, platform;
+    path = "../src/keycode_tables.bin";
+    if (argc > 1) {
+        path = argv[1];
+    }
+    r = keycode_db_open(&db, path);
+    if (r != KEYCODE_DB_OK) {
+        fprintf(stderr, "Error: keycode_db_open(\"%s\") = %d\n", path, r);
+        return 1;
+    }
+    result = 0;
+    for (i = 0; i < 3; i++) {
+        platform = keycode_db_platform(&db, PLATFORM_NAMES[i]);
+        if (platform < 0) {
+            fprintf(stderr, "Error: no tables for %s\n", PLATFORM_NAMES[i]);
+            result = 1;
+            continue;
+        }
+        for (code = 0; code < 1024; code++) {
+            if (keycode_db_to_hid(&db, platform, code) != TO_HID[i](code) ||
+                !same_string(keycode_db_name(&db, platform, code),
+                             NAME[i](code)) ||
+                !same_string(keycode_db_rawname(&db, platform, code),
+                             RAWNAME[i](code)) ||
+                (code < 256 && keycode_db_from_hid(&db, platform, code) !=
+                                   FROM_HID[i][code])) {
+                fprintf(stderr, "Error: %s: mismatch for 0x%02x\n",
+                        PLATFORM_NAMES[i], code);
+                result = 1;
+            }
+        }
+    }
+    for (code = 0; code < 256; code++) {
+        name = keycode_to_id(code);
+        if (!same_string(keycode_db_to_id(&db, code), name) ||
+            (name != NULL && keycode_db_from_id(&db, name) != code)) {
+            fprintf(stderr, "Error: identifier mismatch for 0x%02x\n", code);
+            result = 1;
+        }
+    }
+    if (keycode_db_from_id(&db, "xx") != 0) {
+        fputs("Error: keycode_db_from_id(\"xx\") != 0\n", stderr);
+        result = 1;
+    }
+    keycode_db_close(&db);
+    return result;
+}
@@ -0,0 +1,125 @@
+"""Test translation of evdev event logs, in scripts/evdevlog.py.
+
+Run from the repository root with "python -m unittest discover tests -p
+'*_test.py'". The tests are skipped if NumPy is not installed.
+"""
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scripts import evdevlog  # noqa: E402
+from scripts.common import Error  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EV_SYN = 0
+KEY_ESC = 1
+KEY_A = 30
+# Linux keycode with no HID keycode.
+KEY_UNMAPPED = 0
+
+HID_ESCAPE = 41
+HID_A = 4
+
+# Layout of struct input_event, for each size of the struct timeval fields.
+INPUT_EVENT = {64: struct.Struct("<qqHHi"), 32: struct.Struct("<iiHHi")}
+HID_EVENT = struct.Struct("<QHB")
+
+# Events as (sec, usec, type, code, value).
+EVENTS = [
+    (100, 250000, evdevlog.EV_KEY, KEY_A, 1),
+    (100, 250000, EV_SYN, 0, 0),
+    (100, 300000, evdevlog.EV_KEY, KEY_UNMAPPED, 1),
+    (100, 300000, EV_SYN, 0, 0),
+    (100, 999999, evdevlog.EV_KEY, KEY_A, 2),
+    (101, 5, evdevlog.EV_KEY, KEY_A, 0),
+    (2000000000, 1, evdevlog.EV_KEY, KEY_ESC, 1),
+]
+
+# The events in EVENTS which are written, as (time, code, value).
+HID_EVENTS = [
+    (100250000, HID_A, 1),
+    (100999999, HID_A, 2),
+    (101000005, HID_A, 0),
+    (2000000000000001, HID_ESCAPE, 1),
+]
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TranslateTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.translator = evdevlog.read_linux_translator(
+            os.path.join(ROOT, "data"))
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.infile = os.path.join(self.tempdir, "events.bin")
+        self.outfile = os.path.join(self.tempdir, "hid.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def write_log(self, events, time_bits=64, extra=b""):
+        record = INPUT_EVENT[time_bits]
+        with open(self.infile, "wb") as fp:
+            for event in events:
+                fp.write(record.pack(*event))
+            fp.write(extra)
+
+    def translate(self, time_bits=64):
+        count = evdevlog.translate(infile=self.infile,
+                                   outfile=self.outfile,
+                                   translator=self.translator,
+                                   time_bits=time_bits)
+        with open(self.outfile, "rb") as fp:
+            data = fp.read()
+        events = list(HID_EVENT.iter_unpack(data))
+        self.assertEqual(count, len(events))
+        return events
+
+    def test_translate(self):
+        for time_bits in (64, 32):
+            with self.subTest(time_bits=time_bits):
+                events = EVENTS
+                expect = HID_EVENTS
+                if time_bits == 32:
+                    events = events[:-1]
+                    expect = expect[:-1]
+                self.write_log(events, time_bits)
+                self.assertEqual(self.translate(time_bits), expect)
+
+    def test_chunks(self):
+        # Chunks which end in the middle of the events, and a chunk with no
+        # key events to write.
+        for chunk_records in (1, 2, 3):
+            with self.subTest(chunk_records=chunk_records):
+                self.write_log(EVENTS)
+                with mock.patch.object(evdevlog, "CHUNK_RECORDS",
+                                       chunk_records):
+                    self.assertEqual(self.translate(), HID_EVENTS)
+
+    def test_empty(self):
+        self.write_log([])
+        self.assertEqual(self.translate(), [])
+
+    def test_truncated(self):
+        self.write_log(EVENTS, extra=INPUT_EVENT[64].pack(*EVENTS[0])[:10])
+        with self.assertRaises(Error) as cm:
+            self.translate()
+        self.assertEqual(cm.exception.filename, self.infile)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+#include "keytable.h"
+
+#include <stdio.h>
+
+/* Check that the tables of every keycode for each HID keycode agree with the
+   tables to and from HID keycodes. */
+
+enum {
+    /* Largest native keycode to check, exclusive. */
+    KEYCODE_LIMIT = 1024
+};
+
+static unsigned (*const TO_HID[3])(unsigned) = {
+    keycode_linux_to_hid, keycode_macos_to_hid, keycode_windows_to_hid};
+
+static unsigned (*const FROM_HID_ALL[3])(unsigned, const unsigned short **) = {
+    keycode_linux_from_hid_all, keycode_macos_from_hid_all,
+    keycode_windows_from_hid_all};
+
+static const unsigned char *const FROM_HID[3] = {
+    KEYCODE_LINUX_FROM_HID, KEYCODE_MACOS_FROM_HID, KEYCODE_WINDOWS_FROM_HID};
+
+static const char *const PLATFORM_NAMES[3] = {"linux", "macos", "windows"};
+
+int main(void) {
+    const unsigned short *codes;
+    unsigned hid, code, i, n, total[256];
+    int p, result = 0;
+    for (p = 0; p < 3; p++) {
+        for (hid = 0; hid < 256; hid++) {
+            total[hid] = 0;
+        }
+        for (code = 0; code < KEYCODE_LIMIT; code++) {
+            hid = TO_HID[p](code);
+            if (hid != 0) {
+                total[hid]++;
+            }
+        }
+        for (hid = 0; hid < 256; hid++) {
+            n = FROM_HID_ALL[p](hid, &codes);
+            if (n != (hid == 0 ? 0 : total[hid])) {
+                fprintf(stderr,
+                        "Error: keycode_%s_from_hid_all(%u) returned %u, "
+                        "expected %u\n",
+                        PLATFORM_NAMES[p], hid, n, total[hid]);
+                result = 1;
+            }
+            for (i = 0; i < n; i++) {
+                if (TO_HID[p](codes[i]) != hid ||
+                    (i > 0 && codes[i] <= codes[i - 1])) {
+                    fprintf(stderr,
+                            "Error: keycode_%s_from_hid_all(%u)[%u] = %u\n",
+                            PLATFORM_NAMES[p], hid, i, codes[i]);
+                    result = 1;
+                }
+            }
+            if (n > 0 && codes[0] < KEYCODE_NONE &&
+                FROM_HID[p][hid] != codes[0]) {
+                fprintf(stderr, "Error: KEYCODE_%s_FROM_HID[%u] = %u\n",
+                        PLATFORM_NAMES[p], hid, FROM_HID[p][hid]);
+                result = 1;
+            }
+        }
+        if (FROM_HID_ALL[p](256, &codes) != 0) {
+            fprintf(stderr, "Error: keycode_%s_from_hid_all(256) != 0\n",
+                    PLATFORM_NAMES[p]);
+            result = 1;
+        }
+    }
+    return result;
+}
@@ -0,0 +1,548 @@
+/* This file is automatically generated. */
+#if !defined _WIN32
+#define _POSIX_C_SOURCE 199309L
+#endif
+#include "keytable.h"
+
+#include <stdio.h>
+#include <string.h>
+#if defined _WIN32
+#include <windows.h>
+#else
+#include <time.h>
+#endif
+
+enum {
+    /* Number of inputs in each distribution, must be a power of two. */
+    BENCH_INPUT_COUNT = 1024
+};
+
+enum {
+    BENCH_TO_HID,
+    BENCH_TO_NAME,
+    BENCH_FROM_ID,
+    BENCH_TABLE,
+    BENCH_TO_HID_N
+};
+
+struct benchmark {
+    /* Name of the function or table. */
+    const char *name;
+    /* Name of the input distribution. */
+    const char *dist;
+    int kind;
+    unsigned (*to_hid)(unsigned);
+    const char *(*to_name)(unsigned);
+    unsigned (*from_id)(const char *);
+    const unsigned char *table;
+    void (*to_hid_n)(const unsigned *, unsigned char *, size_t);
+    const unsigned *codes;
+    const char *const *strings;
+};
+
+static void fill_uniform(unsigned *out, unsigned limit);
+
+/* HID keycodes, weighted by how often the keys are typed. */
+static const unsigned BENCH_HID_TYPED[BENCH_INPUT_COUNT] = {
+    78,44,21,14,25,21,54,16,24,28,97,25,15,44,30,14,97,225,63,94,17,44,93,39,23,
+    8,22,29,99,224,24,81,14,61,27,4,44,20,70,37,4,24,82,14,17,82,12,27,14,224,
+    60,22,7,17,25,109,8,27,43,27,65,26,220,29,28,22,29,20,28,16,11,11,29,35,24,
+    7,44,83,105,77,93,105,26,20,43,15,64,79,91,28,117,28,23,36,230,100,56,7,29,
+    24,31,78,14,44,8,13,57,18,66,8,10,42,5,28,98,26,39,5,32,29,28,20,19,225,5,4,
+    216,11,9,12,59,111,4,21,8,14,13,34,18,11,25,5,8,228,12,19,44,75,103,11,37,
+    224,6,38,78,18,14,29,22,11,23,21,28,25,17,19,75,14,27,4,44,18,5,15,14,127,
+    18,16,19,115,32,30,44,20,21,34,4,12,18,14,32,19,83,27,21,20,42,21,36,5,22,
+    14,10,26,24,27,44,86,24,17,23,63,83,64,11,231,32,7,44,227,20,38,17,13,44,4,
+    69,26,8,9,34,82,15,225,8,80,20,7,15,23,56,81,9,25,34,18,82,15,4,5,39,27,115,
+    112,97,5,44,42,35,44,94,33,19,26,12,28,4,10,18,55,44,18,30,5,10,225,16,20,
+    27,16,24,14,6,11,26,6,21,17,21,8,97,24,76,225,18,24,42,21,16,44,91,104,31,
+    19,225,33,6,7,44,6,4,20,25,22,24,28,38,21,19,228,15,53,22,19,6,81,42,95,23,
+    38,9,20,12,5,117,13,10,12,19,27,10,228,225,10,21,38,84,24,100,17,25,25,37,
+    12,29,13,18,220,93,67,5,10,14,54,77,28,44,62,6,7,82,5,13,5,4,78,17,10,10,35,
+    224,25,94,25,28,38,61,44,229,44,96,12,26,29,70,24,55,20,28,79,58,35,4,11,25,
+    14,6,80,113,16,21,63,6,33,9,16,72,6,5,21,24,81,44,38,10,227,21,29,20,5,23,
+    10,5,30,31,8,27,18,20,53,24,85,29,23,32,18,9,39,30,55,9,98,59,100,82,39,63,
+    25,55,11,54,22,44,23,55,7,5,110,24,94,114,37,28,13,7,67,89,54,42,21,16,8,21,
+    27,105,110,21,8,52,44,5,22,39,5,103,220,44,7,6,19,5,18,4,225,67,6,91,12,12,
+    38,111,9,4,19,5,29,80,11,8,18,158,9,224,19,23,16,111,158,32,11,229,8,28,10,
+    92,115,61,17,14,44,16,21,5,9,4,7,7,21,27,44,10,21,32,7,22,19,117,6,21,21,44,
+    17,12,16,23,118,58,15,27,41,57,22,20,48,22,14,23,111,10,23,32,24,12,4,42,30,
+    4,16,49,31,27,10,43,23,38,45,13,46,15,226,9,86,5,14,26,28,20,8,14,15,44,97,
+    29,5,56,16,18,26,14,104,10,21,16,25,28,31,26,21,32,21,54,55,16,19,31,10,42,
+    20,28,9,37,18,23,21,24,42,17,35,6,16,44,6,30,5,23,88,4,26,6,81,39,44,37,4,5,
+    30,231,82,42,44,13,44,16,8,23,17,11,21,92,22,22,43,26,9,98,22,55,20,62,20,
+    13,12,112,28,6,20,13,7,11,6,33,11,29,29,43,25,16,84,18,23,32,25,154,127,108,
+    110,28,24,43,13,15,5,10,4,35,9,55,39,224,20,104,23,18,8,86,57,17,23,17,5,5,
+    19,12,26,11,12,37,44,17,80,14,18,44,5,110,7,23,44,6,63,225,23,8,7,8,48,21,
+    103,22,7,22,44,71,5,11,24,9,82,110,17,22,27,16,26,12,16,22,29,26,15,13,9,54,
+    8,44,14,16,44,36,44,25,80,9,34,8,44,19,38,42,36,13,73,14,25,38,13,31,16,11,
+    63,27,17,28,5,9,20,225,25,7,47,54,52,28,42,13,44,66,45,18,28,31,94,8,73,26,
+    19,23,4,13,35,36,24,127,24,17,79,14,29,42,68,55,20,6,5,44,216,18,22,44,35,
+    14,37,16,19,26,44,10,4,31,5,5,13,35,6,6,225,21,90,13,22,19,11,17,227,44,20,
+    21,15,26,44,39,23,5,104,21,20,4,9,82,25,44,10,17,76,68,14,4,62,11,55,39,11,
+    7,107,29,30,23,10,29,14,62,44,5,109,5,7,16,10,13,19,44,21,15,24,20,17,94,27,
+    225,52,28,15,39,23,44,21,24,4,44,5,39,28,53,16,39,12,26,18,225,225,12,27,17,
+    224,106,28,44,39,18,100,93,17,44,4,66,27,118,19,31,17,54,29,227,4,9,5,9,108,
+    117,24,115,67,54,44,11,27,21,117,11,11,36,10,8,25,58,29,44,15,16,22,229,44,
+    115,26
+};
+static unsigned BENCH_HID_UNIFORM[BENCH_INPUT_COUNT];
+
+/* Identifiers which do not match any keycode. */
+static const char *const BENCH_ID_MISS_LIST[64] = {
+    "DeletMeForward",
+    "Quo9e",
+    "LeftShft",
+    "7LeftControl",
+    "RihtShift",
+    "KPSubract",
+    "E0",
+    "Rig2t",
+    "Rig2tGUI",
+    "LZeftGUI",
+    "Righ1tShift",
+    "ReturnU",
+    "Perod",
+    "P7",
+    "KA",
+    "ZLeftGUI",
+    "LetControl",
+    "Capsock",
+    "P8",
+    "919",
+    "Equal",
+    "Le9ftShift",
+    "EKPEnter",
+    "KP",
+    "PageDowYn",
+    "ScrolLock",
+    "KPVoint",
+    "KPC0ear",
+    "PEnter",
+    "SDemicolon",
+    "31",
+    "F1Y",
+    "3CapsLock",
+    "F18F",
+    "enu",
+    "WM",
+    "RCightGUI",
+    "Co9ma",
+    "KL7",
+    "RightShifBt",
+    "5K",
+    "RetXurn",
+    "RetuYn",
+    "AageDown",
+    "DcrollLock",
+    "16",
+    "1F17",
+    "PageDwn",
+    "Le6ftGUI",
+    "MP",
+    "FZ",
+    "5E",
+    "F273",
+    "Grav4",
+    "RCeturn",
+    "KPDivGide",
+    "Zome",
+    "KPNumLoKk",
+    "RightBrKacket",
+    "Don",
+    "RightJControl",
+    "KPSub7tract",
+    "Q13",
+    "WY"
+};
+static const char *BENCH_ID_HITS[BENCH_INPUT_COUNT];
+static const char *BENCH_ID_MISSES[BENCH_INPUT_COUNT];
+
+/* linux keycodes, weighted by how often the keys are typed. */
+static const unsigned BENCH_LINUX_TYPED[BENCH_INPUT_COUNT] = {
+    45,23,33,47,23,49,28,17,44,18,33,31,11,48,47,54,37,38,18,20,21,37,57,30,77,
+    49,49,25,16,119,66,32,69,86,26,36,25,48,99,188,50,24,77,191,28,108,36,125,
+    193,57,47,18,2,44,48,106,36,48,46,20,46,187,16,48,44,30,57,2,82,57,35,16,34,
+    42,22,35,53,103,38,57,12,67,103,18,57,64,76,36,44,20,48,32,4,17,31,79,38,
+    102,105,14,42,25,36,34,35,16,57,35,46,34,19,37,18,65,57,17,10,10,31,109,38,
+    22,21,16,17,57,17,70,57,17,38,2,69,38,50,35,48,105,38,74,27,15,2,21,59,24,
+    21,35,108,36,26,12,40,21,30,31,50,21,106,50,35,77,30,31,17,54,31,36,34,46,
+    30,100,33,30,31,51,192,71,35,23,33,27,21,19,110,36,16,31,31,36,186,185,38,
+    45,47,36,35,24,47,14,25,81,21,126,188,40,6,14,20,25,16,57,30,21,7,31,1,16,
+    44,105,20,50,20,1,83,62,10,19,21,105,31,57,33,31,51,44,23,42,48,57,47,46,44,
+    14,108,49,23,48,45,46,31,40,46,20,36,16,16,98,16,82,34,34,25,32,30,38,25,57,
+    21,22,35,105,4,49,2,32,51,33,33,22,35,21,23,46,44,105,139,36,14,24,36,47,
+    108,18,6,72,57,51,34,47,32,19,31,57,57,117,80,47,36,49,19,103,49,44,33,45,
+    45,86,38,20,33,21,96,61,38,19,7,17,33,47,21,47,69,50,32,46,190,79,25,47,18,
+    38,30,33,33,46,62,34,17,50,50,109,31,34,37,82,48,4,20,66,42,74,32,20,1,193,
+    17,46,35,31,37,12,139,35,3,32,50,24,50,51,21,126,5,70,36,18,22,44,23,59,20,
+    31,36,25,57,22,14,18,45,38,10,192,35,25,49,4,33,47,119,51,79,16,33,5,23,31,
+    27,30,57,19,57,37,25,38,18,35,4,69,25,27,192,44,32,57,10,38,36,69,42,35,36,
+    55,28,38,48,193,48,119,31,44,50,29,23,183,29,194,65,20,57,188,23,47,52,14,
+    57,24,48,108,6,44,23,16,48,186,36,28,33,32,37,32,13,186,193,19,21,33,48,5,
+    58,45,23,73,46,25,38,186,8,48,64,48,17,44,56,32,42,22,24,57,35,33,16,30,36,
+    21,57,31,21,24,57,96,117,3,50,37,16,22,23,32,34,106,9,48,66,30,22,21,24,17,
+    38,22,5,21,57,32,78,107,21,38,77,42,18,22,189,24,71,57,50,49,57,63,10,18,36,
+    20,37,35,17,14,2,57,14,117,188,50,33,23,32,27,31,49,82,18,21,20,7,66,36,10,
+    33,33,54,51,17,45,36,3,17,47,30,119,36,48,17,35,49,57,20,31,34,33,35,24,57,
+    99,29,45,31,42,48,36,47,50,61,19,20,36,36,57,36,87,54,36,57,35,26,33,34,46,
+    8,49,126,34,10,20,16,22,57,1,74,106,19,19,125,30,57,2,191,3,44,105,57,24,57,
+    31,36,30,29,42,55,48,52,3,37,29,20,103,20,19,19,46,44,36,42,106,69,96,8,86,
+    5,46,105,36,32,25,102,104,45,49,25,17,186,46,23,185,44,25,83,12,57,18,16,22,
+    49,44,32,18,103,51,47,57,52,16,52,59,50,35,47,15,51,22,56,45,36,37,11,7,3,
+    53,17,16,31,185,79,24,57,14,31,42,189,8,32,103,5,44,31,38,48,32,81,110,188,
+    8,58,76,17,106,17,20,110,57,41,23,22,32,2,45,8,52,11,2,23,52,57,36,106,16,
+    25,50,25,17,42,10,30,22,25,35,37,14,24,31,32,35,32,11,20,46,57,36,17,11,18,
+    31,38,46,37,38,29,47,49,31,57,50,96,34,27,54,6,31,185,26,36,22,12,16,33,45,
+    37,36,16,6,30,107,19,23,35,100,108,1,46,21,46,50,79,47,63,56,18,7,50,37,194,
+    18,31,23,76,35,99,48,194,44,185,19,33,42,185,38,70,45,36,31,30,24,20,119,37,
+    71,79,106,21,25,45,25,17,50,38,37,48,16,103,35,48,44,44,48,14,35,20,31,36,
+    29,32,49,7,110,44,18,38,13,36,48,32,24,47,106,74,31,70,16,9,187,51,44,38,24,
+    86,65,35,20,47,49,193,57,14,190,66,42,25,49,44,15,38,4,57,57,49,14,42,31,17,
+    82,106,103,37,70,20,24,97,43,21,17,21,35,24,49,23,12,86,46,184,19,72,3,37,
+    35,17,57,23,86,48,65,71,57,50,1,17,20,41,1,17,35,7,25,20,19,25,77,21,46,49,
+    47,19,29,23,37,139,20,38,10,30,109,97,15,65,49
+};
+static unsigned BENCH_LINUX_UNIFORM[BENCH_INPUT_COUNT];
+
+/* macos keycodes, weighted by how often the keys are typed. */
+static const unsigned BENCH_MACOS_TYPED[BENCH_INPUT_COUNT] = {
+    96,24,18,84,32,49,7,2,21,14,31,15,64,46,16,5,45,32,6,1,37,31,35,18,25,17,3,
+    32,4,40,48,6,8,9,36,17,80,34,32,8,3,99,4,5,7,35,38,20,17,38,11,49,38,37,1,
+    15,49,8,38,123,21,31,8,0,9,26,37,56,12,14,46,40,46,75,3,5,31,37,40,9,5,97,9,
+    0,12,31,38,47,5,31,14,46,15,51,7,126,32,19,46,16,1,21,12,40,32,56,29,6,6,35,
+    11,8,109,5,92,32,106,57,13,26,3,15,100,4,11,1,64,43,35,25,11,35,45,49,6,38,
+    42,35,46,31,116,39,38,0,5,37,49,5,38,6,49,53,37,2,12,12,25,49,35,125,45,5,
+    124,2,14,38,16,0,13,9,49,35,5,71,8,14,74,49,18,31,124,45,46,40,125,98,13,22,
+    38,9,38,87,13,16,22,16,38,2,49,12,37,19,37,34,31,6,0,4,16,11,28,26,31,5,31,
+    114,7,0,14,45,64,4,1,13,37,97,14,49,5,38,11,49,91,21,44,15,59,17,35,125,34,
+    23,3,114,32,45,40,9,38,3,2,57,37,13,32,34,42,0,5,3,49,23,8,16,40,24,33,106,
+    17,4,4,46,13,4,49,81,4,37,47,11,56,43,21,6,11,56,6,45,34,34,0,5,13,38,16,11,
+    16,25,35,34,16,19,51,35,122,37,12,31,26,60,46,78,46,11,12,6,76,86,14,0,26,
+    49,45,41,0,4,46,53,7,51,115,37,34,1,17,25,115,21,0,34,2,125,40,46,45,107,17,
+    12,3,0,27,47,47,0,37,56,67,49,18,45,45,2,1,15,38,16,38,49,49,12,123,34,38,
+    38,40,6,40,20,122,46,123,125,56,35,37,26,16,18,91,38,6,1,21,21,2,9,14,16,38,
+    6,54,31,2,4,109,1,39,7,40,125,96,20,20,12,21,117,1,27,84,4,4,51,12,49,13,1,
+    53,14,24,2,40,56,8,103,38,34,8,75,19,1,99,16,13,2,1,1,74,67,26,3,5,113,34,
+    49,3,2,49,4,53,105,20,4,46,22,31,81,32,5,16,59,31,3,31,1,76,11,46,126,84,32,
+    14,45,33,89,9,45,6,17,49,15,12,15,16,0,5,47,45,40,5,4,29,28,5,121,53,71,7,
+    40,51,14,125,3,49,5,11,7,4,40,9,49,49,117,49,125,34,1,14,17,121,18,12,49,97,
+    1,124,46,126,39,0,42,9,125,103,64,45,11,99,54,38,6,8,34,35,17,51,42,11,1,37,
+    14,81,9,34,8,121,38,49,82,23,33,22,37,14,54,15,49,0,15,28,86,46,46,38,86,46,
+    38,97,49,0,69,7,48,17,17,6,19,126,56,46,38,8,2,103,89,0,90,48,4,6,7,11,87,
+    18,32,19,25,11,13,11,12,37,0,106,31,31,18,46,49,46,120,17,3,49,45,1,29,51,
+    113,15,26,21,47,45,26,7,35,1,15,13,2,3,49,23,5,105,13,21,45,6,49,59,29,45,
+    46,125,49,15,31,17,32,84,3,83,31,5,103,7,1,26,35,2,38,34,34,3,15,5,25,16,14,
+    78,38,4,40,126,15,49,40,26,17,8,18,11,28,40,80,5,51,49,38,7,2,5,14,12,51,15,
+    6,123,45,50,31,3,35,21,14,3,13,12,15,45,4,16,49,13,61,65,7,39,38,6,34,26,9,
+    45,84,84,4,16,3,25,40,45,2,4,38,56,37,3,3,35,8,48,13,55,86,32,45,49,38,38,
+    17,83,7,6,46,8,31,86,15,46,69,40,3,31,49,126,23,2,15,31,101,2,92,21,4,48,4,
+    5,9,33,40,62,35,38,28,31,40,12,13,37,37,7,8,34,56,13,7,1,32,32,37,33,40,69,
+    13,49,9,14,30,31,46,1,47,51,0,34,0,5,71,2,89,40,49,41,49,46,83,15,16,39,32,
+    42,16,18,17,1,46,34,80,46,17,49,2,38,101,82,13,12,13,80,14,17,14,11,69,21,
+    32,17,14,17,84,12,45,8,89,25,13,19,47,61,51,5,121,27,115,6,107,7,69,12,57,6,
+    60,40,4,106,20,7,59,2,1,46,3,48,3,107,5,34,38,15,3,29,14,82,8,9,36,21,12,5,
+    57,3,87,107,5,99,11,49,14,22,45,33,49,17,2,15,79,50,99,35,14,28,29,11,71,2,
+    14,124,34,111,0,51,38,61,46,126,14,47,59,45,49,53,12,12,17,0,88,51,5,53,14,
+    37,29,21,37,89,17,1,60,115,51,6,18,49,65,69,98,38,5,18,118,5,103,15,35,51,3,
+    4,27,87,122,40,7,49,16,11,35,21,31,122,1,74,20
+};
+static unsigned BENCH_MACOS_UNIFORM[BENCH_INPUT_COUNT];
+
+/* windows keycodes, weighted by how often the keys are typed. */
+static const unsigned BENCH_WINDOWS_TYPED[BENCH_INPUT_COUNT] = {
+    50,51,46,32,34,36,28,45,50,24,200,35,22,17,45,22,48,199,24,25,22,21,220,49,
+    50,4,200,49,49,69,30,10,35,34,19,46,208,45,48,47,48,17,37,37,51,31,21,34,33,
+    3,7,18,33,41,34,36,211,11,25,35,48,52,37,40,56,48,36,2,30,9,203,49,24,14,35,
+    24,45,49,36,49,2,20,30,32,48,18,36,34,38,2,6,13,27,37,46,38,15,50,27,49,18,
+    25,42,38,34,67,48,36,44,30,33,38,49,19,31,18,18,5,16,46,23,22,17,36,30,8,25,
+    48,46,205,50,33,48,47,30,25,35,31,37,49,66,38,34,19,29,19,45,34,17,17,4,15,
+    37,38,34,48,35,21,47,25,6,19,31,37,47,50,47,46,36,18,42,44,21,25,22,219,44,
+    24,18,24,20,49,18,25,34,20,17,203,60,4,34,6,31,15,48,19,22,11,205,33,30,35,
+    18,48,22,50,46,22,32,22,183,50,34,44,10,48,24,21,23,54,14,209,32,38,33,8,47,
+    29,32,49,23,16,6,44,9,36,9,15,27,22,15,183,199,203,208,62,35,29,46,34,20,47,
+    17,38,200,34,17,24,33,30,17,37,52,205,18,41,3,17,33,37,20,46,54,205,14,44,
+    34,44,87,22,52,13,6,68,21,45,19,36,24,45,46,60,48,31,16,42,31,45,209,24,31,
+    24,23,20,24,25,24,199,25,3,203,36,23,48,4,50,16,4,17,49,7,64,22,18,40,20,35,
+    47,42,23,38,38,3,32,38,25,17,64,2,50,17,210,63,13,47,42,50,33,23,48,46,34,
+    208,47,33,68,33,50,7,16,19,20,16,6,35,36,45,37,31,31,3,37,38,38,203,44,19,
+    37,35,42,36,46,31,35,68,21,42,46,49,36,205,203,33,31,14,36,23,44,45,50,46,
+    48,50,219,23,36,35,36,42,88,3,23,32,34,62,33,20,50,33,47,21,184,29,31,32,23,
+    46,36,37,37,22,24,13,25,21,24,38,44,46,19,18,205,32,32,11,44,18,7,20,203,23,
+    8,42,18,22,32,34,22,68,46,38,10,49,49,48,49,18,59,22,21,1,17,24,20,51,7,31,
+    25,50,49,23,44,31,20,44,32,44,46,35,21,16,2,30,42,49,22,9,32,24,24,7,34,31,
+    45,44,25,6,205,19,46,35,4,46,205,17,45,36,34,31,31,18,24,43,50,46,38,20,1,
+    50,47,199,16,205,23,35,3,48,88,199,17,16,35,30,3,22,47,47,20,66,25,47,24,
+    209,43,25,9,18,199,36,48,19,34,37,157,33,68,23,36,38,14,17,21,21,18,30,14,
+    17,50,18,31,11,48,21,42,49,30,19,17,31,36,41,36,20,1,16,31,205,35,208,49,
+    219,22,44,30,51,37,29,184,50,33,30,29,29,23,17,49,16,37,17,50,20,16,3,61,48,
+    23,50,33,19,35,4,44,21,25,50,37,203,20,2,50,37,16,21,199,36,35,47,59,26,49,
+    51,200,32,54,49,32,45,16,46,28,49,24,48,22,33,28,219,20,50,48,199,44,33,183,
+    5,62,46,19,22,50,14,21,17,19,16,24,51,36,17,14,220,21,22,18,21,184,25,30,24,
+    36,34,21,15,35,35,8,24,30,32,23,42,48,16,30,42,36,51,51,35,54,48,17,2,25,25,
+    4,48,34,207,49,48,29,184,45,14,35,19,38,29,6,59,66,38,19,30,44,16,19,13,87,
+    46,16,20,40,205,19,50,31,50,2,34,30,48,203,14,46,25,52,50,220,33,33,19,7,61,
+    15,30,14,5,23,15,22,211,20,48,48,9,26,17,23,16,16,45,7,32,35,30,20,37,14,18,
+    22,31,19,38,21,32,48,42,37,49,29,30,26,16,36,33,48,37,24,50,21,22,51,208,19,
+    20,36,4,49,30,45,4,48,35,4,7,30,37,31,38,59,25,30,48,6,24,8,39,43,42,37,46,
+    3,38,38,49,46,5,36,30,22,15,16,17,20,32,37,21,19,34,33,10,20,27,87,31,20,51,
+    220,17,51,33,21,48,35,35,44,26,44,46,48,7,22,36,42,36,48,23,38,34,50,22,34,
+    20,68,203,22,50,31,22,25,46,208,49,50,22,18,20,184,17,19,48,50,20,34,25,50,
+    36,32,44,208,38,48,48,21,26,19,37,48,30,23,30,45,6,68,42,36,3,11,17,37,35,
+    17,50,23,16,22,46,32,38,21,37,20,2,45,31,22,34,25,48,205,39,6,39,2,29,13,50,
+    4,44,32,33,21,25,31,31,33,49,38,50,34,34,38,45,46,35,29,21,46,8,201,210,58,
+    53,201,37,49,18,31,4,24,31,18,45,18,17,46,63,68,50,19,37,34
+};
+static unsigned BENCH_WINDOWS_UNIFORM[BENCH_INPUT_COUNT];
+
+static void init_inputs(void) {
+    unsigned i;
+    fill_uniform(BENCH_HID_UNIFORM, 256);
+    fill_uniform(BENCH_LINUX_UNIFORM, 768);
+    fill_uniform(BENCH_MACOS_UNIFORM, 128);
+    fill_uniform(BENCH_WINDOWS_UNIFORM, 256);
+    for (i = 0; i < BENCH_INPUT_COUNT; i++) {
+        BENCH_ID_HITS[i] = keycode_to_id(BENCH_HID_TYPED[i]);
+        BENCH_ID_MISSES[i] = BENCH_ID_MISS_LIST[i % 64];
+    }
+}
+
+static const struct benchmark BENCHMARKS[] = {
+    {"keycode_to_id", "uniform", BENCH_TO_NAME,
+     NULL, keycode_to_id, NULL, NULL, NULL,
+     BENCH_HID_UNIFORM, NULL},
+    {"keycode_to_id", "typed", BENCH_TO_NAME,
+     NULL, keycode_to_id, NULL, NULL, NULL,
+     BENCH_HID_TYPED, NULL},
+    {"keycode_from_id", "hit", BENCH_FROM_ID,
+     NULL, NULL, keycode_from_id, NULL, NULL,
+     NULL, BENCH_ID_HITS},
+    {"keycode_from_id", "miss", BENCH_FROM_ID,
+     NULL, NULL, keycode_from_id, NULL, NULL,
+     NULL, BENCH_ID_MISSES},
+    {"keycode_linux_to_hid", "uniform", BENCH_TO_HID,
+     keycode_linux_to_hid, NULL, NULL, NULL, NULL,
+     BENCH_LINUX_UNIFORM, NULL},
+    {"keycode_linux_to_hid", "typed", BENCH_TO_HID,
+     keycode_linux_to_hid, NULL, NULL, NULL, NULL,
+     BENCH_LINUX_TYPED, NULL},
+    {"keycode_linux_rawname", "uniform", BENCH_TO_NAME,
+     NULL, keycode_linux_rawname, NULL, NULL, NULL,
+     BENCH_LINUX_UNIFORM, NULL},
+    {"keycode_linux_rawname", "typed", BENCH_TO_NAME,
+     NULL, keycode_linux_rawname, NULL, NULL, NULL,
+     BENCH_LINUX_TYPED, NULL},
+    {"keycode_linux_name", "uniform", BENCH_TO_NAME,
+     NULL, keycode_linux_name, NULL, NULL, NULL,
+     BENCH_HID_UNIFORM, NULL},
+    {"keycode_linux_name", "typed", BENCH_TO_NAME,
+     NULL, keycode_linux_name, NULL, NULL, NULL,
+     BENCH_HID_TYPED, NULL},
+    {"KEYCODE_LINUX_FROM_HID", "uniform", BENCH_TABLE,
+     NULL, NULL, NULL, KEYCODE_LINUX_FROM_HID, NULL,
+     BENCH_HID_UNIFORM, NULL},
+    {"KEYCODE_LINUX_FROM_HID", "typed", BENCH_TABLE,
+     NULL, NULL, NULL, KEYCODE_LINUX_FROM_HID, NULL,
+     BENCH_HID_TYPED, NULL},
+    {"keycode_linux_to_hid_n", "uniform", BENCH_TO_HID_N,
+     NULL, NULL, NULL, NULL, keycode_linux_to_hid_n,
+     BENCH_LINUX_UNIFORM, NULL},
+    {"keycode_linux_to_hid_n", "typed", BENCH_TO_HID_N,
+     NULL, NULL, NULL, NULL, keycode_linux_to_hid_n,
+     BENCH_LINUX_TYPED, NULL},
+    {"keycode_macos_to_hid", "uniform", BENCH_TO_HID,
+     keycode_macos_to_hid, NULL, NULL, NULL, NULL,
+     BENCH_MACOS_UNIFORM, NULL},
+    {"keycode_macos_to_hid", "typed", BENCH_TO_HID,
+     keycode_macos_to_hid, NULL, NULL, NULL, NULL,
+     BENCH_MACOS_TYPED, NULL},
+    {"keycode_macos_rawname", "uniform", BENCH_TO_NAME,
+     NULL, keycode_macos_rawname, NULL, NULL, NULL,
+     BENCH_MACOS_UNIFORM, NULL},
+    {"keycode_macos_rawname", "typed", BENCH_TO_NAME,
+     NULL, keycode_macos_rawname, NULL, NULL, NULL,
+     BENCH_MACOS_TYPED, NULL},
+    {"keycode_macos_name", "uniform", BENCH_TO_NAME,
+     NULL, keycode_macos_name, NULL, NULL, NULL,
+     BENCH_HID_UNIFORM, NULL},
+    {"keycode_macos_name", "typed", BENCH_TO_NAME,
+     NULL, keycode_macos_name, NULL, NULL, NULL,
+     BENCH_HID_TYPED, NULL},
+    {"KEYCODE_MACOS_FROM_HID", "uniform", BENCH_TABLE,
+     NULL, NULL, NULL, KEYCODE_MACOS_FROM_HID, NULL,
+     BENCH_HID_UNIFORM, NULL},
+    {"KEYCODE_MACOS_FROM_HID", "typed", BENCH_TABLE,
+     NULL, NULL, NULL, KEYCODE_MACOS_FROM_HID, NULL,
+     BENCH_HID_TYPED, NULL},
+    {"keycode_macos_to_hid_n", "uniform", BENCH_TO_HID_N,
+     NULL, NULL, NULL, NULL, keycode_macos_to_hid_n,
+     BENCH_MACOS_UNIFORM, NULL},
+    {"keycode_macos_to_hid_n", "typed", BENCH_TO_HID_N,
+     NULL, NULL, NULL, NULL, keycode_macos_to_hid_n,
+     BENCH_MACOS_TYPED, NULL},
+    {"keycode_windows_to_hid", "uniform", BENCH_TO_HID,
+     keycode_windows_to_hid, NULL, NULL, NULL, NULL,
+     BENCH_WINDOWS_UNIFORM, NULL},
+    {"keycode_windows_to_hid", "typed", BENCH_TO_HID,
+     keycode_windows_to_hid, NULL, NULL, NULL, NULL,
+     BENCH_WINDOWS_TYPED, NULL},
+    {"keycode_windows_rawname", "uniform", BENCH_TO_NAME,
+     NULL, keycode_windows_rawname, NULL, NULL, NULL,
+     BENCH_WINDOWS_UNIFORM, NULL},
+    {"keycode_windows_rawname", "typed", BENCH_TO_NAME,
+     NULL, keycode_windows_rawname, NULL, NULL, NULL,
+     BENCH_WINDOWS_TYPED, NULL},
+    {"keycode_windows_name", "uniform", BENCH_TO_NAME,
+     NULL, keycode_windows_name, NULL, NULL, NULL,
+     BENCH_HID_UNIFORM, NULL},
+    {"keycode_windows_name", "typed", BENCH_TO_NAME,
+     NULL, keycode_windows_name, NULL, NULL, NULL,
+     BENCH_HID_TYPED, NULL},
+    {"KEYCODE_WINDOWS_FROM_HID", "uniform", BENCH_TABLE,
+     NULL, NULL, NULL, KEYCODE_WINDOWS_FROM_HID, NULL,
+     BENCH_HID_UNIFORM, NULL},
+    {"KEYCODE_WINDOWS_FROM_HID", "typed", BENCH_TABLE,
+     NULL, NULL, NULL, KEYCODE_WINDOWS_FROM_HID, NULL,
+     BENCH_HID_TYPED, NULL},
+    {"keycode_windows_to_hid_n", "uniform", BENCH_TO_HID_N,
+     NULL, NULL, NULL, NULL, keycode_windows_to_hid_n,
+     BENCH_WINDOWS_UNIFORM, NULL},
+    {"keycode_windows_to_hid_n", "typed", BENCH_TO_HID_N,
+     NULL, NULL, NULL, NULL, keycode_windows_to_hid_n,
+     BENCH_WINDOWS_TYPED, NULL},
+    {NULL, NULL, 0, NULL, NULL, NULL, NULL, NULL, NULL, NULL}
+};
+
+/* ========================================================================== */
+/* Benchmark driver. This is appended to the generated benchmark tables. */
+
+enum {
+    /* Number of calibration doublings before giving up. */
+    BENCH_MAX_DOUBLINGS = 40,
+    /* Number of timed trials, the fastest is reported. */
+    BENCH_TRIALS = 5
+};
+
+/* Minimum duration of a timed trial, in seconds. */
+#define BENCH_MIN_TIME 0.01
+
+#if defined _WIN32
+static double bench_time(void) {
+    LARGE_INTEGER count, freq;
+    QueryPerformanceCounter(&count);
+    QueryPerformanceFrequency(&freq);
+    return (double)count.QuadPart / (double)freq.QuadPart;
+}
+#else
+static double bench_time(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec * 1e-9;
+}
+#endif
+
+/* Results are added to this so the calls are not optimized out. */
+static volatile unsigned long bench_sink;
+
+/* Output of batch functions. */
+static unsigned char bench_output[BENCH_INPUT_COUNT];
+
+static unsigned long bench_state = 1;
+
+/* Simple linear congruential generator, so inputs are the same everywhere. */
+static unsigned bench_random(unsigned limit) {
+    bench_state = (bench_state * 1103515245ul + 12345ul) & 0xfffffffful;
+    return (unsigned)((bench_state >> 8) % limit);
+}
+
+static void fill_uniform(unsigned *out, unsigned limit) {
+    unsigned i;
+    for (i = 0; i < BENCH_INPUT_COUNT; i++) {
+        out[i] = bench_random(limit);
+    }
+}
+
+static void run_once(const struct benchmark *b, unsigned long iters) {
+    unsigned long i, sum = 0;
+    switch (b->kind) {
+    case BENCH_TO_HID:
+        for (i = 0; i < iters; i++) {
+            sum += b->to_hid(b->codes[i & (BENCH_INPUT_COUNT - 1)]);
+        }
+        break;
+    case BENCH_TO_NAME:
+        for (i = 0; i < iters; i++) {
+            sum += b->to_name(b->codes[i & (BENCH_INPUT_COUNT - 1)]) != NULL;
+        }
+        break;
+    case BENCH_FROM_ID:
+        for (i = 0; i < iters; i++) {
+            sum += b->from_id(b->strings[i & (BENCH_INPUT_COUNT - 1)]);
+        }
+        break;
+    case BENCH_TABLE:
+        for (i = 0; i < iters; i++) {
+            sum += b->table[b->codes[i & (BENCH_INPUT_COUNT - 1)]];
+        }
+        break;
+    case BENCH_TO_HID_N:
+        /* Each call translates every input, and counts as that many
+           iterations. */
+        for (i = 0; i < iters; i += BENCH_INPUT_COUNT) {
+            b->to_hid_n(b->codes, bench_output, BENCH_INPUT_COUNT);
+            sum += bench_output[(i / BENCH_INPUT_COUNT) &
+                                (BENCH_INPUT_COUNT - 1)];
+        }
+        break;
+    }
+    bench_sink += sum;
+}
+
+/* Get the time per call, in nanoseconds. */
+static double run_benchmark(const struct benchmark *b) {
+    unsigned long iters = BENCH_INPUT_COUNT;
+    double start, elapsed, best;
+    int i;
+    for (i = 0; i < BENCH_MAX_DOUBLINGS; i++) {
+        start = bench_time();
+        run_once(b, iters);
+        elapsed = bench_time() - start;
+        if (elapsed >= BENCH_MIN_TIME) {
+            break;
+        }
+        iters *= 2;
+    }
+    best = elapsed;
+    for (i = 1; i < BENCH_TRIALS; i++) {
+        start = bench_time();
+        run_once(b, iters);
+        elapsed = bench_time() - start;
+        if (elapsed < best) {
+            best = elapsed;
+        }
+    }
+    return best * 1e9 / (double)iters;
+}
+
+int main(int argc, char **argv) {
+    const struct benchmark *b;
+    const char *filter = NULL;
+    if (argc > 2) {
+        fputs("Usage: keycode_bench [FILTER]\n", stderr);
+        return 2;
+    }
+    if (argc == 2) {
+        filter = argv[1];
+    }
+    init_inputs();
+    puts("# keycode lookup benchmark, version 1");
+    puts("# function distribution ns/call");
+    for (b = BENCHMARKS; b->name != NULL; b++) {
+        if (filter != NULL && strstr(b->name, filter) == NULL) {
+            continue;
+        }
+        printf("%-28s %-10s %8.2f\n", b->name, b->dist, run_benchmark(b));
+        fflush(stdout);
+    }
+    return 0;
+}
@@ -0,0 +1,69 @@
+#include "keycode.h"
+#include "keycode_name.h"
+
+#include <stdio.h>
+
+/* Check lookups in the index of key names and aliases. */
+
+struct name_case {
+    const char *name;
+    unsigned sources;
+    unsigned keycode;
+    unsigned found;
+};
+
+static const struct name_case NAME_CASES[] = {
+    {"Left Control", KEYCODE_NAME_ALL, KEY_LeftControl, KEYCODE_NAME_ALL},
+    {"leftcontrol", KEYCODE_NAME_HID, KEY_LeftControl, KEYCODE_NAME_ALL},
+    {"LEFT COMMAND", KEYCODE_NAME_ALL, KEY_LeftGUI, KEYCODE_NAME_MACOS},
+    {"Left Command", KEYCODE_NAME_LINUX, KEY_None, 0},
+    {"Option", KEYCODE_NAME_MACOS, KEY_LeftAlt, KEYCODE_NAME_MACOS},
+    {"Option", KEYCODE_NAME_WINDOWS, KEY_None, 0},
+    {"Super", KEYCODE_NAME_LINUX, KEY_LeftGUI, KEYCODE_NAME_LINUX},
+    {"Ctrl", KEYCODE_NAME_HID, KEY_None, 0},
+    {"ctrl", KEYCODE_NAME_LINUX, KEY_LeftControl,
+     KEYCODE_NAME_LINUX | KEYCODE_NAME_MACOS | KEYCODE_NAME_WINDOWS},
+    /* "Delete" is a different key in HID and in the Linux display names. */
+    {"Delete", KEYCODE_NAME_HID, KEY_Delete,
+     KEYCODE_NAME_HID | KEYCODE_NAME_MACOS},
+    {"Delete", KEYCODE_NAME_LINUX, KEY_DeleteForward,
+     KEYCODE_NAME_LINUX | KEYCODE_NAME_WINDOWS},
+    {"Delete", KEYCODE_NAME_ALL, KEY_Delete,
+     KEYCODE_NAME_HID | KEYCODE_NAME_MACOS},
+    {"Backspace", KEYCODE_NAME_ALL, KEY_Delete,
+     KEYCODE_NAME_LINUX | KEYCODE_NAME_WINDOWS},
+    {"Enter", KEYCODE_NAME_WINDOWS, KEY_Return,
+     KEYCODE_NAME_LINUX | KEYCODE_NAME_WINDOWS},
+    {"KP /", KEYCODE_NAME_HID, KP_Divide,
+     KEYCODE_NAME_HID | KEYCODE_NAME_LINUX | KEYCODE_NAME_MACOS},
+    {"", KEYCODE_NAME_ALL, KEY_None, 0},
+    {" ", KEYCODE_NAME_ALL, KEY_None, 0},
+    {"Left", KEYCODE_NAME_ALL, KEY_Left, KEYCODE_NAME_ALL},
+    {"Lef", KEYCODE_NAME_ALL, KEY_None, 0},
+    {"Leftt", KEYCODE_NAME_ALL, KEY_None, 0},
+    {"xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx", KEYCODE_NAME_ALL, KEY_None,
+     0},
+};
+
+int main(void) {
+    const struct name_case *c;
+    unsigned keycode, found;
+    int result = 0;
+    for (c = NAME_CASES;
+         c != NAME_CASES + sizeof(NAME_CASES) / sizeof(*NAME_CASES); c++) {
+        keycode = keycode_from_name(c->name, c->sources, &found);
+        if (keycode != c->keycode || found != c->found) {
+            fprintf(stderr,
+                    "Error: keycode_from_name(\"%s\", 0x%02x) = %u, found "
+                    "0x%02x; expected %u, found 0x%02x\n",
+                    c->name, c->sources, keycode, found, c->keycode,
+                    c->found);
+            result = 1;
+        }
+    }
+    if (keycode_from_name("Escape", KEYCODE_NAME_ALL, NULL) != KEY_Escape) {
+        fputs("Error: keycode_from_name with NULL found\n", stderr);
+        result = 1;
+    }
+    return result;
+}
@@ -0,0 +1,131 @@
+#include "keycode_rec.h"
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+/* Check the recording writer against a recording encoded by hand, and check
+   that longer recordings are split into chunks which account for every
+   event. */
+
+static const char kPath[] = "rec_test.rec";
+
+static int failed;
+
+static void check(int cond, const char *what) {
+    if (!cond) {
+        fprintf(stderr, "Error: %s\n", what);
+        failed = 1;
+    }
+}
+
+static const unsigned char kExpected[] = {
+    /* Header. */
+    'K', 'E', 'Y', 'E', 'V', 'E', 'N', 'T', 1, 0, 0, 0, 0, 0, 0, 0,
+    /* Chunk with three events at 1.0 seconds. */
+    'C', 'H', 'N', 'K', 15, 0, 0, 0, 3, 0, 0, 0, 0x40, 0x42, 0x0f, 0, 0, 0, 0,
+    0,
+    /* Press 4 on Linux, scancode 30. */
+    0x00, 0x0d, 4, 1, 30,
+    /* Release 4 after 250000 microseconds, same platform. */
+    0x90, 0xa1, 0x0f, 0x04, 4, 30,
+    /* Press 42 with no platform or scancode. */
+    0x00, 0x09, 42, 0,
+    /* Index. */
+    'I', 'N', 'D', 'X', 1, 0, 0, 0, 3, 0, 0, 0, 0, 0, 0, 0,
+    16, 0, 0, 0, 0, 0, 0, 0, 0x40, 0x42, 0x0f, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0,
+    /* Trailer. */
+    51, 0, 0, 0, 0, 0, 0, 0, 'K', 'E', 'N', 'D'};
+
+static unsigned char *read_file(size_t *size) {
+    FILE *fp = fopen(kPath, "rb");
+    unsigned char *data;
+    long n;
+    if (fp == NULL) {
+        perror("rec_test.rec");
+        exit(1);
+    }
+    fseek(fp, 0, SEEK_END);
+    n = ftell(fp);
+    fseek(fp, 0, SEEK_SET);
+    data = malloc(n ? n : 1);
+    if (data == NULL || fread(data, 1, n, fp) != (size_t)n) {
+        fputs("Error: could not read recording\n", stderr);
+        exit(1);
+    }
+    fclose(fp);
+    *size = n;
+    return data;
+}
+
+static unsigned long get32(const unsigned char *p) {
+    return (unsigned long)p[0] | ((unsigned long)p[1] << 8) |
+           ((unsigned long)p[2] << 16) | ((unsigned long)p[3] << 24);
+}
+
+static void test_small(void) {
+    struct keycode_rec rec;
+    unsigned char *data;
+    size_t size;
+    check(keycode_rec_open(&rec, kPath) == KEYCODE_REC_OK, "open");
+    keycode_rec_event(&rec, 1, 0, 4, KEYCODE_REC_PRESS, KEYCODE_REC_LINUX, 30);
+    keycode_rec_event(&rec, 1, 250000, 4, KEYCODE_REC_RELEASE,
+                      KEYCODE_REC_LINUX, 30);
+    keycode_rec_event(&rec, 0, 1250000, 42, KEYCODE_REC_PRESS,
+                      KEYCODE_REC_NONE, KEYCODE_REC_NO_SCANCODE);
+    check(keycode_rec_close(&rec) == KEYCODE_REC_OK, "close");
+    data = read_file(&size);
+    check(size == sizeof(kExpected) && !memcmp(data, kExpected, size),
+          "small recording does not match");
+    free(data);
+}
+
+static void test_chunks(void) {
+    struct keycode_rec rec;
+    unsigned char *data;
+    size_t size, offset, index;
+    unsigned long i, sec = 100, usec = 0, count = 0, nchunks = 0;
+    const unsigned long nevents = 20000;
+    check(keycode_rec_open(&rec, kPath) == KEYCODE_REC_OK, "open");
+    for (i = 0; i < nevents; i++) {
+        usec += (i * 7919) % 300000;
+        if (i == nevents / 2) {
+            /* Time going backwards starts a new chunk. */
+            sec -= 50;
+        }
+        if (i % 1000 == 999) {
+            /* So does a gap too long to encode. */
+            sec += 5000;
+        }
+        keycode_rec_event(&rec, sec, usec, i & 255, i % 3,
+                          KEYCODE_REC_WINDOWS, (long)(i * 31));
+    }
+    check(keycode_rec_close(&rec) == KEYCODE_REC_OK, "close");
+    data = read_file(&size);
+    check(size > 28 && !memcmp(data + size - 4, "KEND", 4), "trailer");
+    index = get32(data + size - 12);
+    offset = 16;
+    while (offset < index && !memcmp(data + offset, "CHNK", 4)) {
+        check(get32(data + offset + 4) <
+                  KEYCODE_REC_CHUNK_SIZE + KEYCODE_REC_EVENT_SIZE,
+              "chunk size");
+        count += get32(data + offset + 8);
+        offset += 20 + get32(data + offset + 4);
+        nchunks++;
+    }
+    check(offset == index, "chunks do not end at index");
+    check(count == nevents, "event count");
+    check(nchunks >= 20, "chunk count");
+    check(!memcmp(data + index, "INDX", 4), "index");
+    check(get32(data + index + 4) == nchunks, "index chunk count");
+    check(get32(data + index + 8) == nevents, "index event count");
+    free(data);
+}
+
+int main(void) {
+    test_small();
+    test_chunks();
+    remove(kPath);
+    return failed;
+}
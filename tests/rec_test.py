@@ -0,0 +1,60 @@
+"""Test the recording reader in python/keycode_rec.py.
+
+Run from the repository root with "python -m unittest discover tests -p
+'*_test.py'".
+"""
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 "python"))
+
+import keycode_rec  # noqa: E402
+
+
+def record(events, **kw):
+    """Write events to a recording in memory, and open it for reading."""
+    fp = io.BytesIO()
+    writer = keycode_rec.Writer(fp, **kw)
+    for time, code in events:
+        writer.write(time, code, keycode_rec.PRESS)
+    writer.close()
+    fp.seek(0)
+    return keycode_rec.Reader(fp)
+
+
+class ReaderTest(unittest.TestCase):
+
+    def check_from_time(self, events, **kw):
+        reader = record(events, **kw)
+        times = sorted({time for time, code in events} |
+                       {time + 1 for time, code in events} | {0})
+        for time in times:
+            with self.subTest(time=time):
+                expect = [(t, c) for t, c in events if t >= time]
+                self.assertEqual(
+                    [(event.time, event.code)
+                     for event in reader.events_from_time(time)], expect)
+
+    def test_equal_times_across_chunks(self):
+        events = [(1000, code) for code in range(4, 11)]
+        reader = record(events, chunk_size=6)
+        self.assertGreater(len(reader.chunks), 1)
+        self.assertEqual(len(list(reader.events_from_time(1000))), 7)
+        self.check_from_time(events, chunk_size=6)
+
+    def test_mixed_times(self):
+        events = [(time, 4 + i % 100)
+                  for i, time in enumerate([0, 0, 5, 5, 5, 5, 9, 12, 12, 12,
+                                            12, 12, 12, 40, 41, 41, 41])]
+        for chunk_size in (1, 4, 6, 10, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                self.check_from_time(events, chunk_size=chunk_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#include "keycode.h"
+#include "keycode_state.h"
+#include "keytable.h"
+
+#include <stdio.h>
+
+/* Check the key state bitmap against a simple array of pressed keys. */
+
+static int failed;
+
+static void check(int cond, const char *what, unsigned code) {
+    if (!cond) {
+        fprintf(stderr, "Error: %s (keycode %u)\n", what, code);
+        failed = 1;
+    }
+}
+
+static unsigned slow_modifiers(const unsigned char *pressed) {
+    unsigned code, mask = 0;
+    for (code = 0; code < 256; code++) {
+        if (pressed[code]) {
+            mask |= KEYCODE_HID_MODIFIER[code];
+        }
+    }
+    return mask;
+}
+
+int main(void) {
+    struct keycode_state prev, cur, down, up;
+    unsigned char pressed[256], was_pressed[256];
+    unsigned long rand = 1;
+    unsigned code, next, frame, i;
+
+    keycode_state_reset(&cur);
+    for (code = 0; code < 256; code++) {
+        pressed[code] = 0;
+    }
+    check(keycode_state_next(&cur, 0) == 256, "empty state has keys", 0);
+    for (frame = 0; frame < 200; frame++) {
+        prev = cur;
+        for (code = 0; code < 256; code++) {
+            was_pressed[code] = pressed[code];
+        }
+        for (i = 0; i < 8; i++) {
+            rand = (rand * 1103515245ul + 12345ul) & 0xfffffffful;
+            /* Favor the modifier keys, so they are often held together. */
+            code = (rand >> 8) & 255;
+            if ((rand >> 20) & 1) {
+                code = KEY_LeftControl + (code & 7);
+            }
+            if (pressed[code]) {
+                keycode_state_clear(&cur, code);
+            } else {
+                keycode_state_set(&cur, code);
+            }
+            pressed[code] = !pressed[code];
+        }
+        keycode_state_diff(&prev, &cur, &down, &up);
+        for (code = 0; code < 256; code++) {
+            check(keycode_state_test(&cur, code) == pressed[code], "test",
+                  code);
+            check(keycode_state_test(&down, code) ==
+                      (pressed[code] && !was_pressed[code]),
+                  "pressed", code);
+            check(keycode_state_test(&up, code) ==
+                      (!pressed[code] && was_pressed[code]),
+                  "released", code);
+        }
+        check(keycode_state_modifiers(&cur) == slow_modifiers(pressed),
+              "modifiers", 0);
+        next = keycode_state_next(&cur, 0);
+        for (code = 0; code < 256; code++) {
+            if (pressed[code]) {
+                check(next == code, "next", code);
+                next = keycode_state_next(&cur, code + 1);
+            }
+        }
+        check(next == 256, "next", 256);
+    }
+    keycode_state_set(&cur, 256);
+    check(!keycode_state_test(&cur, 256), "out of range", 256);
+
+    check(keycode_macos_modifiers(0x00000002ul | 0x00000010ul) ==
+              (KEYCODE_MOD_LEFT_SHIFT | KEYCODE_MOD_RIGHT_GUI),
+          "macOS modifiers", 0);
+    check(keycode_macos_modifiers(0x00010000ul) == 0, "macOS caps lock", 0);
+    check(keycode_macos_modifier(54) == 0x00000010, "macOS modifier", 54);
+    check(keycode_macos_modifier(63) == 0, "macOS modifier", 63);
+    return failed;
+}
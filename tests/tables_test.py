@@ -0,0 +1,118 @@
+"""Test Linux keycodes which do not fit in a byte, in scripts/tables.py.
+
+Run from the repository root with "python -m unittest discover tests -p
+'*_test.py'". The generated C code is only compiled if a C compiler is
+available.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scripts  # noqa: E402
+
+# KEY_ONSCREEN_KEYBOARD, which is the only Linux keycode for Execute in the
+# test data.
+HIGH_NAME = "ONSCREEN_KEYBOARD"
+HIGH_CODE = 0x278
+HID_NAME = "Execute"
+HID_CODE = 116
+
+CHECK_PROGRAM = """\
+#include "keytable.h"
+#include <stdio.h>
+int main(void) {{
+    static const unsigned scancodes[4] = {{30, {high}, {high} + 1, 100000}};
+    unsigned char hid_keycodes[4];
+    const unsigned short *codes;
+    unsigned n;
+    int failed = 0;
+    if (keycode_linux_to_hid({high}) != {hid}) {{
+        fputs("Error: to_hid\\n", stderr);
+        failed = 1;
+    }}
+    if (keycode_linux_to_hid({high} + 1) != 0) {{
+        fputs("Error: to_hid unmapped\\n", stderr);
+        failed = 1;
+    }}
+    if (keycode_linux_to_hid(30) != 4) {{
+        fputs("Error: to_hid first page\\n", stderr);
+        failed = 1;
+    }}
+    keycode_linux_to_hid_n(scancodes, hid_keycodes, 4);
+    if (hid_keycodes[0] != 4 || hid_keycodes[1] != {hid} ||
+        hid_keycodes[2] != 0 || hid_keycodes[3] != 0) {{
+        fputs("Error: to_hid_n\\n", stderr);
+        failed = 1;
+    }}
+    if (KEYCODE_LINUX_FROM_HID[{hid}] != 255) {{
+        fputs("Error: from_hid\\n", stderr);
+        failed = 1;
+    }}
+    n = keycode_linux_from_hid_all({hid}, &codes);
+    if (n != 1 || codes[0] != {high}) {{
+        fputs("Error: from_hid_all\\n", stderr);
+        failed = 1;
+    }}
+    return failed;
+}}
+"""
+
+
+class HighKeycodeTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        datadir = os.path.join(cls.tempdir, "data")
+        shutil.copytree(os.path.join(ROOT, "data"), datadir)
+        with open(os.path.join(datadir, "linux_map.csv"), "a") as fp:
+            fp.write("{},{}\n".format(HIGH_NAME, HID_NAME))
+        cls.output = scripts.build(datadir=datadir, only=["linux"])
+        cls.keytable, = [
+            keytable for keytable in cls.output.keytables
+            if keytable.name == "linux"
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_tables(self):
+        self.assertEqual(self.keytable.to_hid_table[HIGH_CODE], HID_CODE)
+        self.assertEqual(self.keytable.from_hid_table[HID_CODE], 255)
+        self.assertEqual(self.keytable.from_hid_all[HID_CODE], [HIGH_CODE])
+
+    def test_paged(self):
+        source = self.output.files["linux"]["linux_tohid.c"].decode("UTF-8")
+        self.assertIn("KEYCODE_LINUX_TO_HID_PAGES", source)
+
+    @unittest.skipIf(shutil.which("cc") is None, "No C compiler")
+    def test_compiled(self):
+        srcdir = os.path.join(self.tempdir, "src")
+        os.mkdir(srcdir)
+        shutil.copy(os.path.join(ROOT, "src", "keytable.h"), srcdir)
+        sources = [
+            "linux_tohid.c", "linux_fromhid.c", "linux_fromhid_all.c",
+            "linux_batch.c"
+        ]
+        for filename in sources:
+            with open(os.path.join(srcdir, filename), "wb") as fp:
+                fp.write(self.output.files["linux"][filename])
+        with open(os.path.join(srcdir, "check.c"), "w") as fp:
+            fp.write(CHECK_PROGRAM.format(high=HIGH_CODE, hid=HID_CODE))
+        exe = os.path.join(srcdir, "check")
+        subprocess.run(["cc", "-o", exe, "check.c"] + sources,
+                       cwd=srcdir,
+                       check=True)
+        proc = subprocess.run([exe], stderr=subprocess.PIPE)
+        self.assertEqual(proc.returncode, 0, proc.stderr.decode("UTF-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
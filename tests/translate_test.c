@@ -0,0 +1,52 @@
+#include "keycode_translate.h"
+#include "keytable.h"
+
+#include <stdio.h>
+
+/* Check that the direct translation functions give the same results as
+   translating through HID keycodes. This assumes the tables were generated for
+   every pair of platforms, which is the default. */
+
+enum {
+    /* Largest native keycode to check, exclusive. */
+    KEYCODE_LIMIT = 1024
+};
+
+static unsigned (*const TO_HID[3])(unsigned) = {
+    keycode_linux_to_hid, keycode_macos_to_hid, keycode_windows_to_hid};
+
+static const unsigned char *const FROM_HID[3] = {
+    KEYCODE_LINUX_FROM_HID, KEYCODE_MACOS_FROM_HID, KEYCODE_WINDOWS_FROM_HID};
+
+static const char *const PLATFORM_NAMES[3] = {"linux", "macos", "windows"};
+
+/* Translation functions, indexed by source and then target platform. */
+static unsigned (*const TRANSLATE[3][3])(unsigned) = {
+    {NULL, keycode_linux_to_macos, keycode_linux_to_windows},
+    {keycode_macos_to_linux, NULL, keycode_macos_to_windows},
+    {keycode_windows_to_linux, keycode_windows_to_macos, NULL}};
+
+int main(void) {
+    unsigned code, hid, expect, value;
+    int src, dest, result = 0;
+    for (src = 0; src < 3; src++) {
+        for (dest = 0; dest < 3; dest++) {
+            if (src == dest) {
+                continue;
+            }
+            for (code = 0; code < KEYCODE_LIMIT; code++) {
+                hid = TO_HID[src](code);
+                expect = hid != 0 ? FROM_HID[dest][hid] : KEYCODE_NONE;
+                value = TRANSLATE[src][dest](code);
+                if (value != expect) {
+                    fprintf(stderr,
+                            "Error: keycode_%s_to_%s(%u) = %u, expected %u\n",
+                            PLATFORM_NAMES[src], PLATFORM_NAMES[dest], code,
+                            value, expect);
+                    result = 1;
+                }
+            }
+        }
+    }
+    return result;
+}
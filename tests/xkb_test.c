@@ -0,0 +1,73 @@
+#include "keycode.h"
+#include "keycode_xkb.h"
+
+#include <stdio.h>
+#include <string.h>
+
+/* Check a few characters from the compiled layouts. */
+
+struct xkb_test {
+    const char *layout;
+    unsigned hid_keycode;
+    unsigned level;
+    unsigned long codepoint;
+    const char *label;
+};
+
+static const struct xkb_test XKB_TESTS[] = {
+    {"us", KEY_Q, 0, 'q', "q"},
+    {"us", KEY_Q, 1, 'Q', "Q"},
+    {"us", KEY_Q, 2, 0, NULL},
+    {"us", KEY_Semicolon, 1, ':', ":"},
+    {"fr", KEY_Q, 0, 'a', "a"},
+    {"fr", KEY_W, 0, 'z', "z"},
+    {"fr", KEY_A, 1, 'Q', "Q"},
+    {"fr", KEY_2, 0, 0xe9, "\303\251"},
+    {"fr", KEY_E, 2, 0x20ac, "\342\202\254"},
+    {"fr", KEY_LeftBracket, 0, '^', "^"},
+    {"fr", KEY_Slash, 2, 0x323, "\302\240\314\243"},
+    {"fr", KEY_Space, 0, 0, NULL},
+    {NULL, 0, 0, 0, NULL}
+};
+
+static int same_string(const char *x, const char *y) {
+    if (x == NULL || y == NULL) {
+        return x == y;
+    }
+    return strcmp(x, y) == 0;
+}
+
+int main(void) {
+    const struct xkb_test *t;
+    int layout, result = 0;
+    for (t = XKB_TESTS; t->layout != NULL; t++) {
+        layout = keycode_xkb_layout(t->layout);
+        if (layout < 0) {
+            fprintf(stderr, "Error: no layout %s\n", t->layout);
+            result = 1;
+            continue;
+        }
+        if (keycode_xkb_char(layout, t->hid_keycode, t->level) !=
+                t->codepoint ||
+            !same_string(keycode_xkb_label(layout, t->hid_keycode, t->level),
+                         t->label)) {
+            fprintf(stderr, "Error: %s: keycode %u level %u: got U+%04lX\n",
+                    t->layout, t->hid_keycode, t->level,
+                    keycode_xkb_char(layout, t->hid_keycode, t->level));
+            result = 1;
+        }
+    }
+    if (keycode_xkb_layout("xx") != -1 ||
+        keycode_xkb_char(KEYCODE_XKB_COUNT, KEY_A, 0) != 0 ||
+        keycode_xkb_label(0, 256, 0) != NULL ||
+        keycode_xkb_char(0, KEY_A, KEYCODE_XKB_LEVELS) != 0) {
+        fputs("Error: out of range lookup succeeded\n", stderr);
+        result = 1;
+    }
+    if (!same_string(keycode_xkb_description(keycode_xkb_layout("fr")),
+                     "French")) {
+        fputs("Error: wrong description for fr\n", stderr);
+        result = 1;
+    }
+    return result;
+}